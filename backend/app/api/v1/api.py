@@ -13,7 +13,9 @@ from backend.app.api.v1.endpoints import (
     google_drive,
     sync,
     gdrive,
-    rag  # RAG endpoints
+    rag,  # RAG endpoints
+    search,
+    system
 )
 
 # All endpoints are now required - no fallback logic
@@ -27,7 +29,9 @@ api_router.include_router(nodes.router, prefix="/nodes", tags=["nodes"])
 api_router.include_router(literature.router, prefix="/literature", tags=["literature"])
 api_router.include_router(youtube.router, prefix="/youtube", tags=["youtube"])
 api_router.include_router(simple_crud.router, prefix="/simple-curriculums", tags=["simple-curriculums"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(gcp.router)  # GCP endpoints at /gcp
+api_router.include_router(system.router, prefix="/system", tags=["system"])  # Admin diagnostics
 
 # Only include Google Drive router if available
 if GOOGLE_DRIVE_AVAILABLE and google_drive is not None:
@@ -6,11 +6,12 @@ Also handles Google OAuth2 integration.
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends, Request
-from sqlalchemy.orm import Session
-import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 
-from backend.app.db.session import get_db
+from backend.app.db.session import get_async_db
+from backend.app.core.dependencies import get_current_user, get_current_db_user
+from backend.app.auth.principal_cache import Principal
 from backend.app.services.auth_service import (
     AuthService,
     InvalidCredentialsError,
@@ -19,7 +20,7 @@ from backend.app.services.auth_service import (
     TokenRefreshError,
 )
 from backend.app.auth.jwt_handler import get_jwt_handler, InvalidTokenFormatError
-from backend.app.auth.password_handler import get_password_handler
+from backend.app.auth.password_handler import get_password_handler, PasswordHashingBusyError
 from backend.app.auth.oauth_handler import get_oauth_handler, InvalidOAuthTokenError, OAuthError
 from backend.app.schemas.auth import (
     RegisterRequest,
@@ -36,40 +37,23 @@ from backend.app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
-    """Dependency: Get AuthService instance"""
-    jwt_handler = get_jwt_handler()
-    password_handler = get_password_handler()
-    return AuthService(db, jwt_handler, password_handler)
+# Seconds clients are asked to wait when the password hashing pool is full
+HASHING_RETRY_AFTER = 1
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> User:
-    """Dependency: Get current authenticated user from JWT token"""
-    # Extract token from Authorization header
-    auth_header = request.headers.get("Authorization", "")
-    token = auth_header.replace("Bearer ", "") if auth_header.startswith("Bearer ") else ""
+def _hashing_busy(error: PasswordHashingBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(HASHING_RETRY_AFTER)},
+    )
 
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authentication token"
-        )
 
+def get_auth_service(db: AsyncSession = Depends(get_async_db)) -> AuthService:
+    """Dependency: Get AuthService instance"""
     jwt_handler = get_jwt_handler()
-    claims = jwt_handler.verify_access_token(token)
-    user_id = claims.get("sub")
-
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
+    password_handler = get_password_handler()
+    return AuthService(db, jwt_handler, password_handler)
 
 
 @router.post(
@@ -81,6 +65,7 @@ def get_current_user(
         201: {"description": "User registered successfully"},
         400: {"description": "Invalid input or weak password"},
         409: {"description": "Email already registered"},
+        503: {"description": "Too many password operations in progress (see Retry-After)"},
     }
 )
 async def register(
@@ -88,11 +73,14 @@ async def register(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
     """Register a new user account."""
-    user, access_token, refresh_token = auth_service.register(
-        email=request.email,
-        name=request.name,
-        password=request.password
-    )
+    try:
+        user, access_token, refresh_token = await auth_service.register(
+            email=request.email,
+            name=request.name,
+            password=request.password
+        )
+    except PasswordHashingBusyError as e:
+        raise _hashing_busy(e)
 
     return TokenResponse(
         access_token=access_token,
@@ -110,6 +98,7 @@ async def register(
     responses={
         200: {"description": "Login successful"},
         401: {"description": "Invalid credentials"},
+        503: {"description": "Too many password operations in progress (see Retry-After)"},
     }
 )
 async def login(
@@ -117,10 +106,13 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
     """Authenticate user and return JWT tokens."""
-    user, access_token, refresh_token = auth_service.login(
-        email=request.email,
-        password=request.password
-    )
+    try:
+        user, access_token, refresh_token = await auth_service.login(
+            email=request.email,
+            password=request.password
+        )
+    except PasswordHashingBusyError as e:
+        raise _hashing_busy(e)
 
     return TokenResponse(
         access_token=access_token,
@@ -137,7 +129,7 @@ async def login(
     summary="Refresh access token",
     responses={
         200: {"description": "Token refreshed successfully"},
-        401: {"description": "Invalid or expired refresh token"},
+        401: {"description": "Invalid, expired, revoked or reused refresh token"},
     }
 )
 async def refresh_token(
@@ -145,14 +137,17 @@ async def refresh_token(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
     """Refresh access token using refresh token."""
-    new_access_token, new_refresh_token = auth_service.refresh_token(
-        refresh_token=request.refresh_token
-    )
+    try:
+        new_access_token, new_refresh_token = await auth_service.refresh_token(
+            refresh_token=request.refresh_token
+        )
+    except TokenRefreshError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
     jwt_handler = get_jwt_handler()
     claims = jwt_handler.verify_refresh_token(request.refresh_token)
     user_id = claims.get("sub")
-    user = auth_service.get_user_by_id(user_id)
+    user = await auth_service.get_user_by_id(user_id)
 
     return TokenResponse(
         access_token=new_access_token,
@@ -172,11 +167,11 @@ async def refresh_token(
     }
 )
 async def logout(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> dict:
     """Log out user by revoking refresh token."""
-    auth_service.logout(user_id=current_user.user_id)
+    await auth_service.logout(user_id=current_user.user_id)
     return {"message": "Logout successful", "status": "success"}
 
 
@@ -191,7 +186,7 @@ async def logout(
     }
 )
 async def get_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_db_user)
 ) -> UserResponse:
     """Get current authenticated user profile."""
     return UserResponse.from_orm(current_user)
@@ -205,19 +200,23 @@ async def get_profile(
         200: {"description": "Password changed successfully"},
         400: {"description": "Invalid current password or weak new password"},
         401: {"description": "Not authenticated"},
+        503: {"description": "Too many password operations in progress (see Retry-After)"},
     }
 )
 async def change_password(
     request: PasswordChangeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> dict:
     """Change user password."""
-    auth_service.change_password(
-        user_id=current_user.user_id,
-        current_password=request.current_password,
-        new_password=request.new_password
-    )
+    try:
+        await auth_service.change_password(
+            user_id=current_user.user_id,
+            current_password=request.current_password,
+            new_password=request.new_password
+        )
+    except PasswordHashingBusyError as e:
+        raise _hashing_busy(e)
     return {"message": "Password changed successfully", "status": "success"}
 
 
@@ -269,7 +268,6 @@ async def get_google_auth_url(
 )
 async def verify_google_token(
     request: GoogleOAuthTokenRequest,
-    db: Session = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
     """
@@ -291,41 +289,16 @@ async def verify_google_token(
 
     # Verify the token signature and get user info
     try:
-        token_payload = oauth_handler.verify_id_token(request.id_token)
+        token_payload = await oauth_handler.verify_id_token_async(request.id_token)
         user_info = oauth_handler.extract_user_info(token_payload)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Token verification failed: invalid token")
 
-    # Check if user exists
-    user = db.query(User).filter(User.email == user_info["email"]).first()
-
-    if user:
-        # Existing user
-        if not user.is_active:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User account is inactive")
-
-        # Update profile picture if provided
-        if user_info.get("profile_picture_url"):
-            user.profile_picture_url = user_info["profile_picture_url"]
-        db.commit()
-    else:
-        # New user - create account
-        user = User(
-            user_id=str(uuid.uuid4()),
-            email=user_info["email"],
-            name=user_info["name"],
-            profile_picture_url=user_info.get("profile_picture_url"),
-            password_hash=None,  # OAuth users don't have password
-            role="user",
-            is_active=True
-        )
-        db.add(user)
-        db.commit()
-
-    # Generate JWT tokens
-    jwt_handler = get_jwt_handler()
-    access_token = jwt_handler.create_access_token(user.user_id)
-    refresh_token = jwt_handler.create_refresh_token(user.user_id)
+    # Create or update the user and issue tokens with a refresh session
+    try:
+        user, access_token, refresh_token = await auth_service.login_with_google(user_info)
+    except InvalidCredentialsError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
     return TokenResponse(
         access_token=access_token,
@@ -349,7 +322,6 @@ async def verify_google_token(
 )
 async def handle_google_callback(
     request: GoogleOAuthCallbackRequest,
-    db: Session = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
     """
@@ -370,7 +342,7 @@ async def handle_google_callback(
 
     # Exchange authorization code for tokens
     try:
-        token_response = oauth_handler.exchange_code_for_token(
+        token_response = await oauth_handler.exchange_code_for_token(
             code=request.code,
             redirect_uri=request.redirect_uri,
             client_secret=os.getenv("GOOGLE_OAUTH_CLIENT_SECRET")
@@ -385,41 +357,16 @@ async def handle_google_callback(
 
     # Verify ID token and get user info
     try:
-        token_payload = oauth_handler.verify_id_token(id_token_str)
+        token_payload = await oauth_handler.verify_id_token_async(id_token_str)
         user_info = oauth_handler.extract_user_info(token_payload)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Token verification failed: invalid token")
 
-    # Check if user exists
-    user = db.query(User).filter(User.email == user_info["email"]).first()
-
-    if user:
-        # Existing user
-        if not user.is_active:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User account is inactive")
-
-        # Update profile picture if provided
-        if user_info.get("profile_picture_url"):
-            user.profile_picture_url = user_info["profile_picture_url"]
-        db.commit()
-    else:
-        # New user - create account
-        user = User(
-            user_id=str(uuid.uuid4()),
-            email=user_info["email"],
-            name=user_info["name"],
-            profile_picture_url=user_info.get("profile_picture_url"),
-            password_hash=None,  # OAuth users don't have password
-            role="user",
-            is_active=True
-        )
-        db.add(user)
-        db.commit()
-
-    # Generate JWT tokens
-    jwt_handler = get_jwt_handler()
-    access_token = jwt_handler.create_access_token(user.user_id)
-    refresh_token = jwt_handler.create_refresh_token(user.user_id)
+    # Create or update the user and issue tokens with a refresh session
+    try:
+        user, access_token, refresh_token = await auth_service.login_with_google(user_info)
+    except InvalidCredentialsError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
     return TokenResponse(
         access_token=access_token,
@@ -1,15 +1,20 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from backend.app.schemas.curriculum import CurriculumCreate, CurriculumResponse, CurriculumUpdate
+from backend.app.schemas.curriculum import CurriculumCreate, CurriculumResponse, CurriculumUpdate, CurriculumImportResponse
 from backend.app.schemas.node import NodeCreate, NodeResponse
 from backend.app.services.curriculum_service import CurriculumService
+from backend.app.services.curriculum_bundle_service import CurriculumBundleService, SUPPORTED_COMPRESSIONS
 from backend.app.services.node_service import NodeService
+from backend.app.services.dependency_graph import DependencyCycleError, DependencyGraphService
 from backend.app.db.session import get_db
-from backend.app.core.dependencies import get_current_user
+from backend.app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
+from backend.app.core.dependencies import get_current_user, get_current_db_user
+from backend.app.auth.principal_cache import Principal
 from backend.app.models.user import User
 
 router = APIRouter()
@@ -22,20 +27,43 @@ def get_curriculum_service(db: Session = Depends(get_db)) -> CurriculumService:
 def get_node_service(db: Session = Depends(get_db)) -> NodeService:
     return NodeService(db)
 
+# Dependency to get DependencyGraphService
+def get_dependency_graph_service(db: Session = Depends(get_db)) -> DependencyGraphService:
+    return DependencyGraphService(db)
+
+# Dependency to get CurriculumBundleService
+def get_curriculum_bundle_service(db: Session = Depends(get_db)) -> CurriculumBundleService:
+    return CurriculumBundleService(db)
+
+_BUNDLE_MEDIA_TYPES = {
+    "none": ("application/x-ndjson", ".ndjson"),
+    "gzip": ("application/gzip", ".ndjson.gz"),
+    "zstd": ("application/zstd", ".ndjson.zst"),
+}
+
 @router.get("/", response_model=list[CurriculumResponse])
 def read_all_curriculums(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    include_total: bool = Query(False, description="X-Total-Count 헤더로 전체 개수 추정치 반환"),
     curriculum_service: CurriculumService = Depends(get_curriculum_service)
 ):
     """
-    모든 커리큘럼 맵의 목록을 조회합니다.
+    모든 커리큘럼 맵의 목록을 생성 순으로 조회합니다 (커서 기반 페이지네이션).
     """
-    return curriculum_service.get_all_curriculums()
+    try:
+        page = curriculum_service.get_curriculums_page(limit=limit, cursor=cursor, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.post("/", response_model=CurriculumResponse, status_code=status.HTTP_201_CREATED)
 def create_curriculum(
     curriculum_in: CurriculumCreate,
     curriculum_service: CurriculumService = Depends(get_curriculum_service),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_db_user)
 ):
     """
     새로운 커리큘럼 맵을 생성합니다.
@@ -45,15 +73,65 @@ def create_curriculum(
 
 @router.get("/public", response_model=List[CurriculumResponse])
 def read_public_curriculums(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0, description="(deprecated) 오프셋 페이지네이션, cursor 사용 권장"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    include_total: bool = Query(False, description="X-Total-Count 헤더로 전체 개수 추정치 반환"),
     curriculum_service: CurriculumService = Depends(get_curriculum_service)
 ):
     """
-    공개된 모든 커리큘럼 맵 목록을 조회합니다.
+    공개된 모든 커리큘럼 맵 목록을 생성 순으로 조회합니다 (커서 기반 페이지네이션).
+    """
+    if skip:
+        return curriculum_service.get_public_curriculums(skip=skip, limit=limit)
+    try:
+        page = curriculum_service.get_curriculums_page(
+            limit=limit, cursor=cursor, public_only=True, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_page_headers(response, page)
+    return page["items"]
+
+@router.post("/import", response_model=CurriculumImportResponse, status_code=status.HTTP_201_CREATED)
+def import_curriculum(
+    bundle: UploadFile = File(..., description="커리큘럼 번들 파일 (NDJSON, gzip/zstd 압축 가능)"),
+    title: Optional[str] = Form(None, description="가져온 커리큘럼의 제목 (미지정 시 번들의 제목 사용)"),
+    bundle_service: CurriculumBundleService = Depends(get_curriculum_bundle_service),
+    current_user: User = Depends(get_current_db_user)
+):
+    """
+    번들 파일을 스트리밍으로 읽어 새로운 커리큘럼 맵으로 가져옵니다.
     """
-    public_curriculums = curriculum_service.get_public_curriculums(skip=skip, limit=limit)
-    return public_curriculums
+    try:
+        return bundle_service.import_curriculum(bundle.file, owner_user=current_user, title=title)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/{curriculum_id}/export")
+def export_curriculum(
+    curriculum_id: UUID,
+    compression: str = Query("none", enum=list(SUPPORTED_COMPRESSIONS), description="번들 압축 방식"),
+    curriculum_service: CurriculumService = Depends(get_curriculum_service),
+    bundle_service: CurriculumBundleService = Depends(get_curriculum_bundle_service)
+):
+    """
+    커리큘럼 맵(노드 트리, 노드 내용, 링크)을 NDJSON 번들로 스트리밍 내보내기합니다.
+    """
+    if curriculum_service.get_curriculum(curriculum_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curriculum not found")
+    try:
+        chunks = bundle_service.export_curriculum(curriculum_id, compression=compression)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    media_type, extension = _BUNDLE_MEDIA_TYPES[compression]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="curriculum_{curriculum_id}{extension}"'}
+    )
 
 @router.get("/{curriculum_id}", response_model=CurriculumResponse)
 def read_curriculum(
@@ -106,7 +184,7 @@ def create_node_for_curriculum(
     curriculum_id: UUID,
     node_in: NodeCreate,
     node_service: NodeService = Depends(get_node_service),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     특정 커리큘럼에 새로운 노드를 생성합니다.
@@ -119,6 +197,25 @@ def create_node_for_curriculum(
     db_node = node_service.create_node(node_in, curriculum_id, owner_user=current_user)
     return db_node
 
+@router.get("/{curriculum_id}/nodes", response_model=List[NodeResponse])
+def read_nodes_for_curriculum(
+    curriculum_id: UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    include_total: bool = Query(False, description="X-Total-Count 헤더로 전체 개수 추정치 반환"),
+    node_service: NodeService = Depends(get_node_service)
+):
+    """
+    특정 커리큘럼의 활성 노드 목록을 order_index 순으로 조회합니다 (커서 기반 페이지네이션).
+    """
+    try:
+        page = node_service.get_nodes_page(curriculum_id, limit=limit, cursor=cursor, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_page_headers(response, page)
+    return page["items"]
+
 @router.get("/{curriculum_id}/nodes/{node_id}", response_model=NodeResponse)
 def read_node(
     curriculum_id: UUID,
@@ -131,4 +228,65 @@ def read_node(
     db_node = node_service.get_node(curriculum_id, node_id)
     if db_node is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found in this curriculum")
-    return db_node
\ No newline at end of file
+    return db_node
+
+@router.get("/{curriculum_id}/learning-order", response_model=List[str])
+def read_learning_order(
+    curriculum_id: UUID,
+    graph_service: DependencyGraphService = Depends(get_dependency_graph_service)
+):
+    """
+    선수 관계(DEPENDS_ON, EXTENDS)를 만족하는 학습 순서(위상 정렬)로 노드 ID 목록을 조회합니다.
+    """
+    try:
+        return graph_service.learning_order(curriculum_id)
+    except DependencyCycleError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+@router.get("/{curriculum_id}/nodes/{node_id}/prerequisites", response_model=List[str])
+def read_node_prerequisites(
+    curriculum_id: UUID,
+    node_id: UUID,
+    transitive: bool = Query(True, description="간접 선수 노드까지 포함"),
+    graph_service: DependencyGraphService = Depends(get_dependency_graph_service)
+):
+    """
+    노드의 선수 노드 ID 목록을 학습 순서로 조회합니다.
+    """
+    try:
+        return graph_service.prerequisites(curriculum_id, node_id, transitive=transitive)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+@router.get("/{curriculum_id}/nodes/{node_id}/dependents", response_model=List[str])
+def read_node_dependents(
+    curriculum_id: UUID,
+    node_id: UUID,
+    transitive: bool = Query(True, description="간접 후속 노드까지 포함"),
+    graph_service: DependencyGraphService = Depends(get_dependency_graph_service)
+):
+    """
+    노드를 선수로 요구하는 후속 노드 ID 목록을 학습 순서로 조회합니다.
+    """
+    try:
+        return graph_service.dependents(curriculum_id, node_id, transitive=transitive)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+@router.get("/{curriculum_id}/nodes/{node_id}/prerequisite-path", response_model=List[str])
+def read_prerequisite_path(
+    curriculum_id: UUID,
+    node_id: UUID,
+    from_node_id: UUID = Query(..., description="출발(선수) 노드 ID"),
+    graph_service: DependencyGraphService = Depends(get_dependency_graph_service)
+):
+    """
+    from_node_id에서 node_id까지 이어지는 가장 짧은 선수 관계 경로를 조회합니다.
+    """
+    try:
+        path = graph_service.shortest_prerequisite_path(curriculum_id, from_node_id, node_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No prerequisite path between these nodes")
+    return path
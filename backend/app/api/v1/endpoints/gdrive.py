@@ -16,7 +16,7 @@ from googleapiclient.discovery import build
 from backend.app.db.session import get_db
 from backend.app.models.user import User
 from backend.app.core.config import settings
-from backend.app.api.dependencies import get_current_user
+from backend.app.core.dependencies import get_current_db_user
 
 router = APIRouter()
 
@@ -26,7 +26,7 @@ SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
 @router.get("/auth/url")
 async def get_gdrive_auth_url(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_db_user)
 ):
     """
     Generate Google Drive OAuth authorization URL
@@ -64,7 +64,7 @@ async def get_gdrive_auth_url(
 @router.post("/auth/callback")
 async def gdrive_auth_callback(
     code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -113,7 +113,7 @@ async def gdrive_auth_callback(
 
 @router.get("/auth/status")
 async def get_gdrive_auth_status(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_db_user)
 ):
     """
     Check if user has connected Google Drive
@@ -131,7 +131,7 @@ async def get_gdrive_auth_status(
 
 @router.post("/auth/disconnect")
 async def disconnect_gdrive(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1,8 +1,9 @@
 import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from backend.app.db.session import get_db
+from backend.app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 from backend.app.schemas.literature_item import (
     LiteratureItemSchema,
     LiteratureItemCreate,
@@ -29,21 +30,32 @@ def create_literature_item(
 
 @router.get("/", response_model=List[LiteratureItemSchema])
 def read_literature_items(
+    response: Response,
     tags: Optional[str] = Query(None, description="Comma-separated tags to search for"),
     match: str = Query("all", enum=["all", "any"], description="Match all or any of the tags"),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0, description="(Deprecated) offset pagination; prefer cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Return an estimated total in X-Total-Count"),
     service: LiteratureService = Depends(get_literature_service),
 ):
     """
     Retrieve literature items. Can be filtered by tags.
+
+    Pages are ordered by creation time; follow the X-Next-Cursor response header
+    to fetch the next page.
     """
-    if tags:
-        tag_list = [tag.strip() for tag in tags.split(",")]
-        items = service.get_multi_by_tags(tags=tag_list, match=match, skip=skip, limit=limit)
-    else:
-        items = service.get_multi(skip=skip, limit=limit)
-    return items
+    tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
+    if skip:
+        if tag_list:
+            return service.get_multi_by_tags(tags=tag_list, match=match, skip=skip, limit=limit)
+        return service.get_multi(skip=skip, limit=limit)
+    try:
+        page = service.get_page(tags=tag_list, match=match, limit=limit, cursor=cursor, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.get("/{item_id}", response_model=LiteratureItemSchema)
 def read_literature_item(
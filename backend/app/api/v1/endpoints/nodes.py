@@ -12,6 +12,7 @@ from backend.app.schemas.node import (
     NodeLinkPDFCreate, NodeLinkNodeCreate
 )
 from backend.app.services.node_service import NodeService
+from backend.app.services.dependency_graph import DependencyCycleError
 
 router = APIRouter()
 
@@ -275,11 +276,14 @@ def create_node_to_node_link(
     """
     다른 노드를 현재 노드에 연결합니다.
     """
-    db_link = node_service.create_node_link(
-        source_node_id=node_id,
-        target_node_id=link_in.linked_node_id,
-        link_relationship=link_in.link_relationship
-    )
+    try:
+        db_link = node_service.create_node_link(
+            source_node_id=node_id,
+            target_node_id=link_in.linked_node_id,
+            link_relationship=link_in.link_relationship
+        )
+    except DependencyCycleError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     return db_link
 
 @router.get("/{node_id}/links/node", response_model=List[NodeLinkResponse])
@@ -7,6 +7,7 @@ FastAPI가 자동으로 Swagger UI를 생성합니다: http://localhost:8000/doc
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 import json
@@ -21,9 +22,9 @@ from backend.app.schemas.rag_schemas import (
     AnalyticsResponse,
     ErrorResponse
 )
-from backend.app.db.session import get_db
-from backend.app.auth.dependencies import get_current_user
-from backend.app.models.user import User
+from backend.app.db.session import get_async_db, get_db
+from backend.app.core.dependencies import get_current_user
+from backend.app.auth.principal_cache import Principal
 
 # TODO: 서비스 임포트 (구현 후)
 # from backend.app.services.rag.rag_service import RAGService
@@ -51,8 +52,8 @@ router = APIRouter(prefix="/rag", tags=["RAG"])
 )
 async def query_rag(
     request: RAGQueryRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     RAG 질의 응답
@@ -102,8 +103,8 @@ async def query_rag(
 )
 async def query_rag_stream(
     request: RAGQueryRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     RAG 질의 (스트리밍)
@@ -153,7 +154,7 @@ async def index_document(
     file: UploadFile = File(..., description="PDF 또는 HWP 파일 (최대 50MB)"),
     document_type: str = Form(..., description="문서 유형 (curriculum/school_plan)"),
     metadata: str = Form(..., description="문서 메타데이터 (JSON)"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -191,7 +192,7 @@ async def index_document(
 )
 async def get_indexing_status(
     job_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """인덱싱 작업 상태 조회"""
@@ -221,7 +222,7 @@ async def search_chunks(
     policy_version: Optional[str] = None,
     scope_type: Optional[str] = None,
     grade_level: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """청크 검색 (디버깅용)"""
@@ -245,7 +246,7 @@ async def search_chunks(
 )
 async def submit_feedback(
     request: FeedbackRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """답변 피드백 제출"""
@@ -269,7 +270,7 @@ async def submit_feedback(
 async def get_analytics(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """사용 통계 조회"""
@@ -0,0 +1,35 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import get_db
+from backend.app.schemas.search import NodeSearchResponse
+from backend.app.services.search_service import SearchService, SearchUnavailableError
+
+router = APIRouter()
+
+# Dependency to get SearchService
+def get_search_service(db: Session = Depends(get_db)) -> SearchService:
+    return SearchService(db)
+
+@router.get("/nodes", response_model=NodeSearchResponse)
+def search_nodes(
+    q: str = Query(..., min_length=1, description="검색어 (노드 제목 및 마크다운 본문)"),
+    curriculum_id: Optional[UUID] = Query(None, description="검색할 커리큘럼 맵 ID"),
+    node_type: Optional[str] = Query(None, description="검색할 노드 타입"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    노드 제목과 본문을 전문 검색하여 관련도 순으로 반환합니다.
+    """
+    try:
+        page = search_service.search_nodes(q, curriculum_id=curriculum_id, node_type=node_type, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    return NodeSearchResponse(query=q, limit=limit, offset=offset, **page)
@@ -5,7 +5,7 @@ REST API endpoints for managing synchronization between local DB and Google Driv
 Provides endpoints for manual sync, status checking, and sync control.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
@@ -31,16 +31,17 @@ from backend.app.schemas.sync import (
     SyncStartResponse,
     SyncStatusResponse,
     SyncHistoryResponse,
+    SyncPlanResponse,
 )
 
 router = APIRouter(prefix="/sync", tags=["sync"])
 
 
-def get_sync_dependencies(db: Session = Depends(get_db)):
-    """Get sync service dependencies."""
+def get_sync_dependencies(request: Request, db: Session = Depends(get_db)):
+    """Get sync service dependencies (the scheduler is the application's, built at startup)."""
     drive_service = get_google_drive_service()
     sync_service = get_sync_service(db, drive_service)
-    sync_scheduler = get_sync_scheduler(db, sync_service)
+    sync_scheduler = getattr(request.app.state, "sync_scheduler", None) or get_sync_scheduler()
     return sync_service, sync_scheduler
 
 
@@ -50,16 +51,15 @@ def get_sync_dependencies(db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
     summary="Start manual synchronization",
     responses={
-        200: {"description": "Sync started successfully"},
-        400: {"description": "Invalid curriculum ID or sync already in progress"},
+        200: {"description": "Sync completed (or queued for the worker running scheduled syncs)"},
         404: {"description": "Curriculum not found"},
+        409: {"description": "A sync of this curriculum is already running"},
         500: {"description": "Sync failed"},
     }
 )
 async def start_sync(
     request: SyncStartRequest,
     deps=Depends(get_sync_dependencies),
-    db: Session = Depends(get_db),
 ) -> SyncStartResponse:
     """
     Start manual synchronization of a curriculum.
@@ -69,10 +69,13 @@ async def start_sync(
     - direction: "up" (local→Drive), "down" (Drive→local), or "bidirectional"
 
     **Returns:**
-    - sync_id: Unique identifier for this sync operation
     - curriculum_id: The curriculum being synced
-    - status: Current sync status
-    - started_at: Timestamp when sync started
+    - status: "completed", or "pending" when another worker runs the
+      scheduled syncs and was asked to sync the curriculum
+    - Counts of synced, updated, deleted, unchanged and conflicting nodes
+
+    The sync runs through the scheduler, so it never overlaps a scheduled or
+    debounced sync of the same curriculum; if one is running, 409.
 
     **Usage:**
     1. Call this endpoint to start manual sync
@@ -81,11 +84,9 @@ async def start_sync(
     """
     sync_service, sync_scheduler = deps
 
-    # Start sync immediately
-    result = await sync_service.sync_curriculum(
-        request.curriculum_id,
-        direction=request.direction,
-    )
+    result = await sync_scheduler.run_manual_sync(request.curriculum_id, direction=request.direction)
+    if result["status"] == "already_running":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="already_running")
 
     return SyncStartResponse(
         curriculum_id=request.curriculum_id,
@@ -93,6 +94,7 @@ async def start_sync(
         synced_count=result.get("synced_count", 0),
         updated_count=result.get("updated_count", 0),
         deleted_count=result.get("deleted_count", 0),
+        unchanged_count=result.get("unchanged_count", 0),
         conflict_count=result.get("conflict_count", 0),
         direction=request.direction,
     )
@@ -145,6 +147,45 @@ async def get_status(
     )
 
 
+@router.get(
+    "/plan",
+    response_model=SyncPlanResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Preview a synchronization (dry run)",
+    responses={
+        200: {"description": "Sync plan computed"},
+        404: {"description": "Curriculum has no Drive folder mapping"},
+    }
+)
+async def get_plan(
+    curriculum_id: str,
+    direction: str = "bidirectional",
+    deps=Depends(get_sync_dependencies),
+) -> SyncPlanResponse:
+    """
+    Compute what a sync would do without changing anything locally or on Drive.
+
+    **Query Parameters:**
+    - curriculum_id: UUID of curriculum
+    - direction: "up", "down", or "bidirectional" (default)
+
+    **Returns:**
+    - Node and Drive file IDs per planned action (uploads, downloads,
+      deletions, conflicts) and their counts
+
+    **Usage:**
+    Check the impact of a sync before calling /api/v1/sync/start.
+    """
+    sync_service, sync_scheduler = deps
+
+    try:
+        plan = await sync_service.plan_sync(curriculum_id, direction)
+    except SyncException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return SyncPlanResponse(**plan.to_dict())
+
+
 @router.get(
     "/history",
     response_model=SyncHistoryResponse,
@@ -152,13 +193,15 @@ async def get_status(
     summary="Get sync history",
     responses={
         200: {"description": "Sync history retrieved"},
+        400: {"description": "Invalid cursor"},
         404: {"description": "Curriculum not found"},
         500: {"description": "Failed to get history"},
     }
 )
 async def get_history(
     curriculum_id: str,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     deps=Depends(get_sync_dependencies),
 ) -> SyncHistoryResponse:
     """
@@ -167,23 +210,29 @@ async def get_history(
     **Query Parameters:**
     - curriculum_id: UUID of curriculum
     - limit: Maximum number of history entries (default: 10)
+    - cursor: next_cursor of the previous page
 
     **Returns:**
     - curriculum_id: The curriculum ID
-    - entries: List of sync history entries with timestamps and statistics
-    - total_entries: Total number of history entries available
+    - entries: Sync history entries, newest first
+    - total_entries: Number of entries in this page
+    - next_cursor: Cursor for the next (older) page, null on the last page
 
     **Usage:**
     View past sync operations and their results.
     """
     sync_service, sync_scheduler = deps
 
-    history = sync_scheduler.get_sync_history(curriculum_id, limit)
+    try:
+        page = sync_scheduler.get_sync_history(curriculum_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return SyncHistoryResponse(
         curriculum_id=curriculum_id,
-        entries=history,
-        total_entries=len(history),
+        entries=page["items"],
+        total_entries=len(page["items"]),
+        next_cursor=page["next_cursor"],
     )
 
 
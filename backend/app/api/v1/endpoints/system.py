@@ -0,0 +1,18 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from backend.app.auth.principal_cache import Principal
+from backend.app.core.dependencies import get_admin_user
+from backend.app.db.engine import get_engine_metrics
+from backend.app.db.session import engine
+
+router = APIRouter()
+
+
+@router.get("/database")
+def get_database_stats(admin: Principal = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Connection pool state, pool checkout waits and statement durations of the database engine.
+    """
+    return get_engine_metrics(engine).snapshot()
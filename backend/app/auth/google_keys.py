@@ -0,0 +1,196 @@
+"""
+Google Signing Key Cache for MATHESIS LAB
+
+Google ID tokens are verified locally against Google's published JSON Web
+Key Set. The key set is fetched once and kept for as long as the response's
+``Cache-Control: max-age`` allows:
+
+- once 80% of that lifetime has passed, a background thread refetches it
+  while requests keep using the current keys
+- a token signed with a key id not in the set (Google rotated its keys)
+  triggers one refetch, at most every MIN_REFETCH_SECONDS
+- if a refetch fails, the previous keys stay in use and the fetch is
+  retried after MIN_REFETCH_SECONDS; Google publishes new keys well before
+  it signs with them
+
+so signing in does not wait on a certificate download once the set is warm.
+"""
+
+import base64
+import logging
+import re
+import threading
+import time
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, Optional
+
+import httpx
+import rsa
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class KeySetFetchError(Exception):
+    """Raised when the key set cannot be fetched and no keys are cached"""
+    pass
+
+
+def _b64_int(value: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "big")
+
+
+def jwk_to_pem(jwk: Dict[str, str]) -> str:
+    """PEM encoding (PKCS#1) of an RSA JSON Web Key."""
+    return rsa.PublicKey(_b64_int(jwk["n"]), _b64_int(jwk["e"])).save_pkcs1().decode("ascii")
+
+
+def cache_lifetime(headers: httpx.Headers, default: float) -> float:
+    """Seconds a response may be cached for: Cache-Control max-age less Age."""
+    match = _MAX_AGE.search(headers.get("cache-control", ""))
+    if not match:
+        return default
+    return max(0.0, int(match.group(1)) - float(headers.get("age") or 0))
+
+
+class GoogleKeySet(Mapping):
+    """
+    Google's current signing keys as a ``{key id: PEM}`` mapping.
+
+    Lookups fetch or refresh the set as needed, so an instance can be passed
+    straight to ``google.auth.jwt.decode(token, certs=...)``.
+    """
+
+    DEFAULT_MAX_AGE = 3600.0  # When the response has no max-age
+    REFRESH_AHEAD = 0.8  # Fraction of the lifetime after which to refresh in the background
+    MIN_REFETCH_SECONDS = 60.0  # Unknown key ids, and failed refreshes, refetch at most this often
+
+    def __init__(
+        self,
+        url: str = GOOGLE_JWKS_URL,
+        transport: Optional[httpx.BaseTransport] = None,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            url: JWKS endpoint
+            transport: httpx transport (a local stub in tests)
+            timeout: Seconds to wait for the key set
+            clock: Monotonic clock
+        """
+        self.url = url
+        self.clock = clock
+        self._http = httpx.Client(transport=transport, timeout=timeout)
+        self._keys: Dict[str, str] = {}
+        self._attempted_at: Optional[float] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.fetch_count = 0
+
+    # --- Mapping interface (what google.auth.jwt.decode uses) ---
+
+    def __getitem__(self, kid: str) -> str:
+        keys = self._current_keys()
+        if kid not in keys:
+            keys = self._refetch_for_unknown_key(kid)
+        return keys[kid]
+
+    def __contains__(self, kid: object) -> bool:
+        try:
+            self[kid]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current_keys())
+
+    def __len__(self) -> int:
+        return len(self._current_keys())
+
+    # --- fetching ---
+
+    def refresh(self) -> Dict[str, str]:
+        """
+        Fetch the key set now.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            ValueError: If the response is not a key set
+        """
+        self._attempted_at = self.clock()
+        response = self._http.get(self.url)
+        response.raise_for_status()
+        keys = {
+            jwk["kid"]: jwk_to_pem(jwk)
+            for jwk in response.json()["keys"]
+            if jwk.get("kty") == "RSA" and jwk.get("kid")
+        }
+        if not keys:
+            raise ValueError("Key set contains no RSA keys")
+        lifetime = cache_lifetime(response.headers, self.DEFAULT_MAX_AGE)
+        now = self.clock()
+        with self._lock:
+            self._keys = keys
+            self._expires_at = now + lifetime
+            self._refresh_at = now + lifetime * self.REFRESH_AHEAD
+            self.fetch_count += 1
+        return keys
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh on a daemon thread unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="google-jwks-refresh", daemon=True).start()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.warning("Background refresh of Google signing keys failed", exc_info=True)
+            self._back_off()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _current_keys(self) -> Dict[str, str]:
+        now = self.clock()
+        if self._keys and now < self._expires_at:
+            if now >= self._refresh_at:
+                self.refresh_in_background()
+            return self._keys
+        return self._fetch_or_keep_stale()
+
+    def _fetch_or_keep_stale(self) -> Dict[str, str]:
+        try:
+            return self.refresh()
+        except Exception as e:
+            if self._keys:
+                logger.warning("Refreshing Google signing keys failed; using the previous set: %s", e)
+                self._back_off()
+                return self._keys
+            raise KeySetFetchError(f"Could not fetch Google signing keys: {e}")
+
+    def _back_off(self) -> None:
+        """Keep serving the cached keys for a while before fetching again."""
+        retry_at = self.clock() + self.MIN_REFETCH_SECONDS
+        with self._lock:
+            self._refresh_at = retry_at
+            self._expires_at = max(self._expires_at, retry_at)
+
+    def _refetch_for_unknown_key(self, kid: str) -> Dict[str, str]:
+        if self._attempted_at is not None and self.clock() - self._attempted_at < self.MIN_REFETCH_SECONDS:
+            return self._keys
+        logger.info("Unknown Google key id %s; refetching the key set", kid)
+        return self._fetch_or_keep_stale()
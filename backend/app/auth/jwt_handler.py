@@ -6,6 +6,7 @@ Uses HS256 algorithm with environment-based secret key.
 """
 
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 
@@ -116,8 +117,9 @@ class JWTHandler:
         if expires_delta is None:
             expires_delta = timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
 
+        # jti makes every refresh token unique, even two issued in the same second
         return self._create_token(
-            data={"sub": subject, "type": "refresh", **(additional_claims or {})},
+            data={"sub": subject, "type": "refresh", "jti": uuid.uuid4().hex, **(additional_claims or {})},
             expires_delta=expires_delta
         )
 
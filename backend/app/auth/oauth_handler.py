@@ -3,18 +3,27 @@ OAuth2 Handler for MATHESIS LAB
 
 Handles Google OAuth2 integration including token verification and user creation.
 Supports linking OAuth2 accounts to existing user accounts.
+
+ID tokens are verified locally against cached Google signing keys (see
+google_keys.py), on a worker thread from async code since a key fetch
+blocks, and the authorization code exchange goes through a pooled async
+HTTP client.
 """
 
+import asyncio
 import os
 from typing import Optional, Dict, Any
 from datetime import datetime, UTC
 
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from google.auth import jwt as google_jwt
 import httpx
 
+from backend.app.auth.google_keys import GoogleKeySet
 from backend.app.models.user import User
 
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
 
 class OAuthError(Exception):
     """Base exception for OAuth errors"""
@@ -39,17 +48,47 @@ class GoogleOAuthHandler:
     Supports both Authorization Code flow and ID Token verification.
     """
 
-    def __init__(self, google_client_id: Optional[str] = None):
+    CLOCK_SKEW_SECONDS = 10
+    HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+    def __init__(
+        self,
+        google_client_id: Optional[str] = None,
+        key_set: Optional[GoogleKeySet] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         """
         Initialize Google OAuth handler.
 
         Args:
             google_client_id: Google OAuth2 Client ID.
                              If None, loads from GOOGLE_OAUTH_CLIENT_ID environment variable.
+            key_set: Google signing keys (default: fetched from Google's JWKS endpoint)
+            transport: httpx transport for the code exchange (a local stub in tests)
         """
         self.google_client_id = google_client_id or os.getenv("GOOGLE_OAUTH_CLIENT_ID")
         # Note: GOOGLE_OAUTH_CLIENT_ID may not be set until it's actually needed for OAuth
         # This allows the handler to be initialized without immediate failure
+        # Not `key_set or ...`: the truth test of a key set (len) would fetch the keys
+        self.key_set = key_set if key_set is not None else GoogleKeySet()
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Pooled client for the running event loop (a client cannot outlive its loop)."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(transport=self._transport, timeout=10, limits=self.HTTP_LIMITS)
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (call on application shutdown)."""
+        if self._http is not None and self._http_loop is asyncio.get_running_loop():
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
 
     def verify_id_token(self, id_token_str: str) -> Dict[str, Any]:
         """
@@ -77,13 +116,14 @@ class GoogleOAuthHandler:
                 "Please set it to your Google OAuth2 Client ID."
             )
 
-        # Verify the token signature using Google's public keys
-        # This validates that the token is actually from Google
+        # Verify the token signature using Google's public keys (cached, see
+        # google_keys.py). This validates that the token is actually from Google
         try:
-            payload = id_token.verify_oauth2_token(
+            payload = google_jwt.decode(
                 id_token_str,
-                requests.Request(),
-                self.google_client_id
+                certs=self.key_set,
+                audience=self.google_client_id,
+                clock_skew_in_seconds=self.CLOCK_SKEW_SECONDS,
             )
         except Exception as e:
             raise InvalidOAuthTokenError(f"Token verification failed: {str(e)}")
@@ -91,9 +131,21 @@ class GoogleOAuthHandler:
         # Additional validation
         if payload.get("aud") != self.google_client_id:
             raise InvalidOAuthTokenError("Token audience does not match client ID")
+        if payload.get("iss") not in GOOGLE_ISSUERS:
+            raise InvalidOAuthTokenError("Token was not issued by Google")
 
         return payload
 
+    async def verify_id_token_async(self, id_token_str: str) -> Dict[str, Any]:
+        """
+        verify_id_token on a worker thread.
+
+        Verification may fetch the signing keys (cold or expired cache, or an
+        unknown key id) with a blocking request; the thread keeps that off
+        the event loop.
+        """
+        return await asyncio.to_thread(self.verify_id_token, id_token_str)
+
     def verify_access_token(self, access_token: str) -> Dict[str, Any]:
         """
         Verify Google access token and retrieve user information.
@@ -182,7 +234,7 @@ class GoogleOAuthHandler:
         query_string = "&".join(f"{k}={v}" for k, v in params.items())
         return f"https://accounts.google.com/o/oauth2/v2/auth?{query_string}"
 
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         code: str,
         redirect_uri: str,
@@ -210,7 +262,6 @@ class GoogleOAuthHandler:
         if not client_secret:
             raise OAuthError("GOOGLE_OAUTH_CLIENT_SECRET not configured")
 
-        url = "https://oauth2.googleapis.com/token"
         data = {
             "client_id": self.google_client_id,
             "client_secret": client_secret,
@@ -220,7 +271,7 @@ class GoogleOAuthHandler:
         }
 
         try:
-            response = httpx.post(url, data=data, timeout=10)
+            response = await self._async_client().post(GOOGLE_TOKEN_URL, data=data)
 
             if response.status_code != 200:
                 raise InvalidOAuthTokenError(
@@ -254,6 +305,12 @@ def get_oauth_handler(google_client_id: Optional[str] = None) -> GoogleOAuthHand
     return _oauth_handler_instance
 
 
+async def close_oauth_handler() -> None:
+    """Close the OAuth handler's HTTP client, if the handler was created."""
+    if _oauth_handler_instance is not None:
+        await _oauth_handler_instance.aclose()
+
+
 def reset_oauth_handler():
     """Reset OAuth handler instance (useful for testing)"""
     global _oauth_handler_instance
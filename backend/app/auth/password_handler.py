@@ -3,13 +3,28 @@ Password Handler for MATHESIS LAB
 
 Handles password hashing, validation, and strength checking.
 Uses bcrypt for secure password hashing.
+
+bcrypt at 12 rounds costs a few hundred milliseconds of CPU. The async
+methods (``hash_password_async``, ``verify_password_async``) run it on a
+bounded worker pool instead of the event loop. A process pool is the default
+because not every bcrypt backend releases the GIL (passlib's ``os_crypt``
+fallback does not), so a thread would still stall the loop. Admission
+control caps the queued jobs: past ``max_pending`` callers get
+``PasswordHashingBusyError`` at once, so a login storm is shed quickly
+instead of freezing every other request behind it.
 """
 
+import asyncio
 import re
-from typing import Tuple
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from passlib.context import CryptContext
 
+from backend.app.core.config import settings
+
 
 class PasswordError(Exception):
     """Base exception for password-related errors"""
@@ -21,6 +36,37 @@ class WeakPasswordError(PasswordError):
     pass
 
 
+class PasswordHashingBusyError(PasswordError):
+    """Raised when the hashing pool already has max_pending jobs (retry later)"""
+    pass
+
+
+# Pool kinds: "process" (default), "thread" (enough when the bcrypt backend
+# releases the GIL) and "inline" (on the calling thread; for comparison only)
+POOL_KINDS = ("process", "thread", "inline")
+
+# Crypt contexts of pool workers, by rounds (one per process)
+_worker_contexts: Dict[int, CryptContext] = {}
+
+
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _worker_context(rounds: int) -> CryptContext:
+    if rounds not in _worker_contexts:
+        _worker_contexts[rounds] = _crypt_context(rounds)
+    return _worker_contexts[rounds]
+
+
+def _hash_in_worker(password: str, rounds: int) -> str:
+    return _worker_context(rounds).hash(password)
+
+
+def _verify_in_worker(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    return _worker_context(rounds).verify(plain_password, hashed_password)
+
+
 class PasswordHandler:
     """
     Password Handler
@@ -39,14 +85,35 @@ class PasswordHandler:
     # Special characters allowed in password
     SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
 
-    def __init__(self):
-        """Initialize password context with bcrypt"""
-        # Using bcrypt with rounds=12 for good security/performance balance
-        self.pwd_context = CryptContext(
-            schemes=["bcrypt"],
-            deprecated="auto",
-            bcrypt__rounds=12
-        )
+    def __init__(
+        self,
+        rounds: int = 12,
+        pool: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Initialize password context with bcrypt.
+
+        Args:
+            rounds: bcrypt cost (12 is a good security/performance balance)
+            pool: Where async hashing runs: "process", "thread" or "inline"
+                (default: settings.PASSWORD_HASH_POOL)
+            max_workers: Hashing workers (default: settings.PASSWORD_HASH_WORKERS)
+            max_pending: Jobs running or queued before callers are turned away
+                (default: settings.PASSWORD_HASH_MAX_PENDING)
+        """
+        self.rounds = rounds
+        self.pwd_context = _crypt_context(rounds)
+        self.pool = pool or settings.PASSWORD_HASH_POOL
+        if self.pool not in POOL_KINDS:
+            raise ValueError(f"Unknown password hashing pool {self.pool!r}; expected one of {POOL_KINDS}")
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
 
     def hash_password(self, password: str) -> str:
         """
@@ -82,6 +149,66 @@ class PasswordHandler:
         """
         return self.pwd_context.verify(plain_password, hashed_password)
 
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Hash a plaintext password on the hashing pool.
+
+        Raises:
+            PasswordHashingBusyError: If max_pending jobs are already queued
+        """
+        return await self._run(_hash_in_worker, password, self.rounds)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plaintext password against a hash on the hashing pool.
+
+        Raises:
+            PasswordHashingBusyError: If max_pending jobs are already queued
+        """
+        return await self._run(_verify_in_worker, plain_password, hashed_password, self.rounds)
+
+    async def _run(self, function: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHashingBusyError("Too many password operations in progress, try again shortly")
+            self._pending += 1
+        try:
+            if self.pool == "inline":
+                return function(*args)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), function, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.pool == "process":
+                    # spawn: forking a process that runs threads is unsafe
+                    self._executor = ProcessPoolExecutor(self.max_workers, mp_context=get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def get_stats(self) -> dict:
+        """Pool load for monitoring: jobs in progress or queued, and jobs turned away."""
+        with self._lock:
+            return {
+                "pool": self.pool,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the hashing workers (they are started again on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
     def validate_password_strength(self, password: str) -> Tuple[bool, str]:
         """
         Validate password meets strength requirements.
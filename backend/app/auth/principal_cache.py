@@ -0,0 +1,242 @@
+"""
+Authenticated Principal Cache for MATHESIS LAB
+
+Every authenticated request used to verify the JWT signature and then load
+the user row. This module keeps both results in process memory for a short
+time:
+
+- verified access-token claims, keyed by a SHA-256 digest of the token and
+  never kept past the token's own ``exp``
+- a ``Principal`` per user (``sub``): only the fields authorization needs
+
+Both maps are LRU-bounded and expire after AUTH_CACHE_TTL_SECONDS, so a
+change made by another worker is picked up within that window. Changes made
+through this process invalidate immediately: committing a change to a
+user's password, role or active flag (through any ORM session), or revoking
+all of a user's sessions, drops that user's entries.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.user import User
+
+# User columns a Principal is built from, plus the password hash (a password
+# change must end the cached view of the user even though it is not copied)
+_WATCHED_FIELDS = ("email", "name", "role", "is_active", "password_hash")
+_CHANGED_USERS_KEY = "principal_cache_changed_users"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as far as authorization is concerned."""
+    user_id: str
+    email: str
+    name: str
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            is_active=bool(user.is_active),
+        )
+
+
+def token_cache_key(token: str) -> str:
+    """Digest a token is cached under (the token itself is never stored)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Size-bounded TTL cache of verified token claims and user principals.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            ttl_seconds: How long an entry is trusted (0 disables the cache)
+            max_entries: Largest number of principals, and of tokens, kept
+            clock: Current time in epoch seconds (token ``exp`` uses the same scale)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._claims: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._principals: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Invalidation counter. Read it before loading a principal from the
+        database and pass it to ``put_principal``, so a load that raced with
+        an invalidation is not cached.
+        """
+        return self._generation
+
+    # --- token claims ---
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verified claims of ``token``, or None if it has to be verified."""
+        return self._get(self._claims, token_cache_key(token))
+
+    def put_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        """Remember verified claims until the TTL or the token's expiry, whichever is first."""
+        if not self.enabled:
+            return
+        expires_at = self.clock() + self.ttl_seconds
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+        user_id = claims.get("sub")
+        key = token_cache_key(token)
+        with self._lock:
+            if expires_at <= self.clock():
+                return
+            self._claims[key] = (expires_at, claims)
+            self._claims.move_to_end(key)
+            if user_id:
+                self._tokens_by_user.setdefault(user_id, set()).add(key)
+            while len(self._claims) > self.max_entries:
+                evicted, (_, old) = self._claims.popitem(last=False)
+                self._forget_token(old.get("sub"), evicted)
+
+    # --- principals ---
+
+    def get_principal(self, user_id: str) -> Optional[Principal]:
+        return self._get(self._principals, user_id)
+
+    def put_principal(self, principal: Principal, generation: Optional[int] = None) -> None:
+        """
+        Cache a principal loaded from the database.
+
+        Args:
+            principal: Principal to cache
+            generation: ``generation`` read before the load; if anything was
+                invalidated since, the principal may be stale and is dropped
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._principals[principal.user_id] = (self.clock() + self.ttl_seconds, principal)
+            self._principals.move_to_end(principal.user_id)
+            while len(self._principals) > self.max_entries:
+                self._principals.popitem(last=False)
+
+    # --- invalidation ---
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a user's principal and every cached token of that user."""
+        with self._lock:
+            self._generation += 1
+            self._principals.pop(user_id, None)
+            for key in self._tokens_by_user.pop(user_id, ()):
+                self._claims.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._claims.clear()
+            self._principals.clear()
+            self._tokens_by_user.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tokens": len(self._claims),
+                "principals": len(self._principals),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _get(self, entries: "OrderedDict[str, Tuple[float, Any]]", key: str) -> Optional[Any]:
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del entries[key]
+                    if entries is self._claims:
+                        self._forget_token(entry[1].get("sub"), key)
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _forget_token(self, user_id: Optional[str], key: str) -> None:
+        keys = self._tokens_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tokens_by_user[user_id]
+
+
+# Global principal cache instance
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get or create the global principal cache"""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+            max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+        )
+    return _principal_cache
+
+
+# --- invalidation on commit ---
+
+def invalidate_on_commit(session: Session, user_id: str) -> None:
+    """Drop a user's cache entries once ``session`` commits (nothing happens on rollback)."""
+    session.info.setdefault(_CHANGED_USERS_KEY, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+def _note_user_change(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if state.session is not None and any(
+        state.attrs[name].history.has_changes() for name in _WATCHED_FIELDS
+    ):
+        invalidate_on_commit(state.session, target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS_KEY, ()):
+        get_principal_cache().invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS_KEY, None)
@@ -0,0 +1,35 @@
+"""
+Refresh Token Digests for MATHESIS LAB
+
+Refresh tokens are stored as keyed HMAC-SHA256 digests rather than bcrypt
+hashes. A token is a long random-looking JWT, so a slow password hash adds
+nothing but cost; the digest is deterministic, so the session holding a
+token is found with one indexed equality lookup instead of a bcrypt compare
+against every session of the user.
+
+The key (REFRESH_TOKEN_DIGEST_KEY, falling back to JWT_SECRET_KEY) keeps a
+leaked sessions table from being matched against guessed tokens, and since
+nobody can compute digests without it, comparing digests in the database
+leaks nothing useful through timing.
+"""
+
+import hashlib
+import hmac
+from typing import Optional
+
+from backend.app.core.config import settings
+
+
+def refresh_token_digest(token: str, key: Optional[str] = None) -> str:
+    """
+    HMAC-SHA256 digest of a refresh token, as 64 hex characters.
+
+    Args:
+        token: Refresh token (JWT string)
+        key: HMAC key (default: REFRESH_TOKEN_DIGEST_KEY or JWT_SECRET_KEY)
+
+    Returns:
+        Hex digest stored in UserSession.refresh_token_hash
+    """
+    key = key or settings.REFRESH_TOKEN_DIGEST_KEY or settings.JWT_SECRET_KEY
+    return hmac.new(key.encode("utf-8"), token.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -5,6 +5,9 @@ Celery 애플리케이션 설정
 from celery import Celery
 import os
 
+from backend.app.core.config import settings
+from backend.app.db.query_audit import install_celery_hooks
+
 # Celery 설정
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
@@ -31,3 +34,7 @@ celery_app.conf.update(
 
 # Task 자동 발견
 celery_app.autodiscover_tasks(['backend.app.tasks.rag'])
+
+# 개발/스테이징: 태스크별 쿼리 감사 (N+1, 느린 태스크 탐지; db/query_audit.py 참고)
+if settings.QUERY_AUDIT_ENABLED:
+    install_celery_hooks(celery_app)
@@ -17,6 +17,34 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "sqlite+pysqlite:///./mathesis_lab.db" # Default to local SQLite for development
 
+    # Request metrics (see middleware/request_metrics.py)
+    METRICS_ENABLED: bool = True  # timing middleware and GET /metrics
+
+    # Response compression (see middleware/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller responses go out as is
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+
+    # Query audit for development and staging (see db/query_audit.py)
+    QUERY_AUDIT_ENABLED: bool = False  # audit every request and Celery task
+    QUERY_AUDIT_MAX_REPEATS: int = 10  # identical statements per request or task
+    QUERY_AUDIT_MAX_DB_TIME_MS: float = 500.0  # total database time per request or task
+    QUERY_AUDIT_REPORT_PATH: Optional[str] = None  # ranked report written at shutdown
+
+    # Engine profiles (see db/engine.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # server-backed databases only
+    DB_POOL_PRE_PING: bool = True  # server-backed databases only
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL; 0 disables it
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # writers wait this long for the lock
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+
     # Vertex AI Settings
     VERTEX_AI_PROJECT_ID: Optional[str] = None
     VERTEX_AI_LOCATION: Optional[str] = None
@@ -42,15 +70,45 @@ class Settings(BaseSettings):
     GOOGLE_DRIVE_CURRICULUM_FOLDER_ID: str = "root"
 
     # Sync Configuration
+    SYNC_SCHEDULER_ENABLED: bool = True  # background and debounced syncs (see services/sync_scheduler.py)
     SYNC_INTERVAL_MINUTES: int = 5
     MAX_SYNC_RETRIES: int = 3
+    SYNC_MAX_CONCURRENT: int = 4  # curriculum syncs running at once
+    SYNC_RETRY_DELAY_SECONDS: float = 5.0  # base delay, doubled per retry plus jitter
+    SYNC_DEBOUNCE_SECONDS: float = 2.0  # quiet period after a local edit before syncing
+    SYNC_MAX_DEBOUNCE_SECONDS: float = 30.0  # cap on how long continuous edits delay a sync
+    SYNC_REMOTE_POLL_MINUTES: int = 30  # poll Drive for curriculums without local changes
+    SYNC_LEASE_SECONDS: float = 60.0  # scheduler leader lease (renewed every third of it)
     CONFLICT_RESOLUTION_MODE: str = "manual"  # manual | auto_latest | auto_local
 
+    # Drive API worker pool (see services/drive_executor.py)
+    DRIVE_MAX_WORKERS: int = 8
+    DRIVE_REQUESTS_PER_SECOND: float = 10.0
+    DRIVE_MAX_RETRIES: int = 5
+
     # JWT Settings
     JWT_SECRET_KEY: str = "your-super-secret-jwt-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_DIGEST_KEY: Optional[str] = None  # HMAC key for stored refresh tokens (defaults to JWT_SECRET_KEY)
+
+    # Expired session cleanup (see services/session_sweeper.py)
+    SESSION_SWEEP_INTERVAL_MINUTES: float = 15  # 0 disables it
+    SESSION_SWEEP_BATCH_SIZE: int = 1000  # rows deleted per transaction
+    SESSION_SWEEP_MAX_BATCHES: int = 100  # per run; the rest waits for the next run
+
+    # Authenticated principal cache (see auth/principal_cache.py)
+    AUTH_CACHE_TTL_SECONDS: float = 30.0  # 0 disables it
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Dependency graph cache (see services/dependency_graph.py)
+    DEPENDENCY_GRAPH_CACHE_TTL_SECONDS: float = 60.0  # bounds staleness from other workers' writes; 0 disables it
+
+    # Password hashing pool (see auth/password_handler.py)
+    PASSWORD_HASH_POOL: str = "process"  # "process", "thread" or "inline"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32  # running + queued; beyond this requests get 503
 
     # CORS Settings
     ALLOWED_ORIGINS: list = ["http://localhost:3000", "http://localhost:3002"]
@@ -2,63 +2,94 @@
 FastAPI Dependency Injection for MATHESIS LAB
 
 Provides dependency functions for route handlers.
+
+Authentication loads users through an AsyncSession, so a cache miss waits
+on the database without blocking the event loop.
 """
 
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.app.db.session import SessionLocal
+from backend.app.db.session import get_async_db, get_db
 from backend.app.auth.jwt_handler import get_jwt_handler, JWTHandler, JWTTokenError
+from backend.app.auth.principal_cache import Principal, PrincipalCache, get_principal_cache
 from backend.app.models.user import User
 
-# HTTP Bearer authentication
-security = HTTPBearer()
+# HTTP Bearer authentication (a missing header is answered with 401 below)
+security = HTTPBearer(auto_error=False)
 
 
-def get_db() -> Session:
+async def _resolve_principal(
+    token: str,
+    db: AsyncSession,
+    jwt_handler: JWTHandler,
+    cache: PrincipalCache,
+) -> Optional[Principal]:
     """
-    Get database session dependency.
+    Principal for an access token, or None if its user does not exist.
 
-    Yields:
-        Database session
+    Claims of a token verified recently and the principal of a user loaded
+    recently come from the cache, so a hot client costs neither a signature
+    check nor a query.
 
-    Example:
-        >>> @router.get("/curriculums")
-        >>> async def get_curriculums(db: Session = Depends(get_db)):
-        >>>     return db.query(Curriculum).all()
+    Raises:
+        HTTPException: If the token has no subject
+        JWTTokenError: If token verification fails
     """
-    db = SessionLocal()
-    yield db
-    db.close()
+    claims = cache.get_claims(token)
+    if claims is None:
+        claims = jwt_handler.verify_access_token(token)
+        cache.put_claims(token, claims)
+
+    user_id = claims.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token claims",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = cache.get_principal(user_id)
+    if principal is None:
+        generation = cache.generation
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        cache.put_principal(principal, generation)
+    return principal
 
 
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     jwt_handler: JWTHandler = Depends(get_jwt_handler),
-) -> User:
+    cache: PrincipalCache = Depends(get_principal_cache),
+) -> Principal:
     """
-    Get current authenticated user from JWT token.
+    Get the current authenticated principal from the JWT token.
 
     Args:
         credentials: HTTP Bearer token
-        db: Database session
+        db: Async database session
         jwt_handler: JWT handler instance
+        cache: Principal cache
 
     Returns:
-        Current User object
+        Principal of the current user (use get_current_db_user for the User row)
 
     Raises:
-        HTTPException: If token is missing, invalid, or expired
+        HTTPException: If token is missing or the user is unknown or inactive
         JWTTokenError: If token verification fails (propagated from jwt_handler)
 
     Example:
-        >>> @router.get("/me")
-        >>> async def get_me(current_user: User = Depends(get_current_user)):
-        >>>     return current_user
+        >>> @router.get("/items")
+        >>> async def get_items(current_user: Principal = Depends(get_current_user)):
+        >>>     return list_items(owner_id=current_user.user_id)
     """
     if not credentials:
         raise HTTPException(
@@ -67,42 +98,55 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-
     # Verify and decode token - let JWTTokenError propagate
-    claims = jwt_handler.verify_access_token(token)
-    user_id = claims.get("sub")
-
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token claims",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Get user from database
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
+    principal = await _resolve_principal(credentials.credentials, db, jwt_handler, cache)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive",
         )
 
+    return principal
+
+
+def get_current_db_user(
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    Get the current user's database row, for handlers that read profile
+    fields or modify the user.
+
+    A plain function, so FastAPI runs the blocking query in its threadpool;
+    the row belongs to the request's ``get_db`` session, which handlers use
+    to save changes to it.
+
+    Raises:
+        HTTPException: If the user was deleted since the principal was cached
+    """
+    user = db.get(User, principal.user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     jwt_handler: JWTHandler = Depends(get_jwt_handler),
-) -> Optional[User]:
+    cache: PrincipalCache = Depends(get_principal_cache),
+) -> Optional[Principal]:
     """
     Get current user if authenticated, otherwise return None.
 
@@ -113,18 +157,19 @@ async def get_current_user_optional(
 
     Args:
         credentials: HTTP Bearer token (optional)
-        db: Database session
+        db: Async database session
         jwt_handler: JWT handler instance
+        cache: Principal cache
 
     Returns:
-        User object if authenticated, None otherwise
+        Principal if authenticated, None otherwise
 
     Raises:
         JWTTokenError: If token is present but invalid (let it propagate for debugging)
 
     Example:
         >>> @router.get("/items")
-        >>> async def get_items(current_user: Optional[User] = Depends(get_current_user_optional)):
+        >>> async def get_items(current_user: Optional[Principal] = Depends(get_current_user_optional)):
         >>>     if current_user:
         >>>         return db.query(Item).filter(Item.owner_id == current_user.user_id).all()
         >>>     return db.query(Item).filter(Item.is_public == True).all()
@@ -132,26 +177,17 @@ async def get_current_user_optional(
     if not credentials:
         return None
 
-    token = credentials.credentials
-
     # Verify and decode token - let JWTTokenError propagate for debugging
-    claims = jwt_handler.verify_access_token(token)
-    user_id = claims.get("sub")
-
-    if not user_id:
-        return None
-
-    # Get user from database
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if user and user.is_active:
-        return user
+    principal = await _resolve_principal(credentials.credentials, db, jwt_handler, cache)
+    if principal and principal.is_active:
+        return principal
 
     return None
 
 
 async def get_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Get current user and verify they have admin role.
 
@@ -159,14 +195,14 @@ async def get_admin_user(
         current_user: Current authenticated user
 
     Returns:
-        User object if user is admin
+        Principal if user is admin
 
     Raises:
         HTTPException: If user is not admin
 
     Example:
         >>> @router.post("/users")
-        >>> async def create_user(user: UserCreate, admin: User = Depends(get_admin_user)):
+        >>> async def create_user(user: UserCreate, admin: Principal = Depends(get_admin_user)):
         >>>     # Only admins can create users
         >>>     return create_new_user(user)
     """
@@ -0,0 +1,262 @@
+"""
+Database Engine Profiles for MATHESIS LAB
+
+``create_configured_engine`` builds the SQLAlchemy engine with settings
+chosen by the URL's backend:
+
+- SQLite files: WAL journal (readers no longer block the writer or each
+  other), ``synchronous=NORMAL`` (safe with WAL, no fsync per commit),
+  ``busy_timeout`` (a writer waits for the lock instead of failing with
+  "database is locked"), plus mmap and page cache sizes. The pragmas run on
+  every new connection.
+- PostgreSQL: pool size, overflow, recycle time, checkout timeout and
+  pre-ping from settings, and a server-side ``statement_timeout``.
+- In-memory SQLite keeps SQLAlchemy's defaults (one shared connection).
+
+``create_configured_async_engine`` builds the asyncio counterpart from the
+same settings, with the URL's driver swapped for aiosqlite or asyncpg.
+
+Every engine records how long requests wait to check out a pooled
+connection and how long statements take (see ``get_engine_metrics``).
+"""
+
+import bisect
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.app.core.config import settings
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# asyncio driver per backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+class LatencyStats:
+    """Count, total, maximum and a cumulative histogram of durations."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative[bound] = running
+            return {
+                "count": self.count,
+                "total_seconds": round(self.total_seconds, 6),
+                "max_seconds": round(self.max_seconds, 6),
+                "buckets": cumulative,
+            }
+
+
+class EngineMetrics:
+    """Pool checkout waits and statement durations of one engine."""
+
+    def __init__(self, engine: Engine):
+        self._engine = weakref.ref(engine)
+        self.checkout_wait = LatencyStats()
+        self.query_time = LatencyStats()
+
+    def pool_status(self) -> Dict[str, Any]:
+        engine = self._engine()
+        pool = engine.pool if engine is not None else None
+        status: Dict[str, Any] = {"class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return status
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pool": self.pool_status(),
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "query_time": self.query_time.snapshot(),
+        }
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout waited."""
+
+    metrics: Optional[EngineMetrics] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            if self.metrics is not None:
+                self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records how long each checkout waited."""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+
+
+_metrics_by_engine: "weakref.WeakKeyDictionary[Engine, EngineMetrics]" = weakref.WeakKeyDictionary()
+
+
+def get_engine_metrics(engine: Engine) -> EngineMetrics:
+    """Metrics of an engine (recording starts on first call for engines not built here)."""
+    metrics = _metrics_by_engine.get(engine)
+    if metrics is None:
+        metrics = _metrics_by_engine[engine] = EngineMetrics(engine)
+        _time_queries(engine, metrics)
+        if isinstance(engine.pool, _TimedCheckout):
+            engine.pool.metrics = metrics
+    return metrics
+
+
+def _time_queries(engine: Engine, metrics: EngineMetrics) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        metrics.query_time.observe(time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            metrics.query_time.observe(time.perf_counter() - started.pop())
+
+
+def _sqlite_pragmas() -> Dict[str, Any]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # Negative means KiB rather than pages
+    }
+
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return (
+        parsed.get_backend_name() == "sqlite"
+        and parsed.database not in (None, "", ":memory:")
+        and parsed.query.get("mode") != "memory"
+    )
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver replaced by the backend's asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend} databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine (or create_async_engine) keyword arguments for the profile matching ``url``."""
+    backend = make_url(url).get_backend_name()
+    poolclass = TimedAsyncQueuePool if is_async else TimedQueuePool
+    if backend == "sqlite":
+        if not _is_sqlite_file(url):
+            return {}
+        return {
+            "poolclass": poolclass,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        }
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def create_configured_engine(url: Optional[str] = None, **overrides) -> Engine:
+    """
+    Create an engine tuned for its backend, with metrics recording.
+
+    Args:
+        url: Database URL (default: settings.DATABASE_URL)
+        **overrides: create_engine arguments that replace the profile's
+
+    Returns:
+        Engine; its metrics come from get_engine_metrics(engine)
+    """
+    url = url or settings.DATABASE_URL
+    options = {**engine_options(url), **overrides}
+    engine = create_engine(url, **options)
+    if _is_sqlite_file(url):
+        _install_sqlite_pragmas(engine, _sqlite_pragmas())
+    get_engine_metrics(engine)
+    return engine
+
+
+def create_configured_async_engine(url: Optional[str] = None, **overrides) -> AsyncEngine:
+    """
+    Create an asyncio engine with the same profile as create_configured_engine.
+
+    Args:
+        url: Database URL (default: settings.DATABASE_URL); a sync driver is
+            replaced by aiosqlite or asyncpg
+        **overrides: create_async_engine arguments that replace the profile's
+
+    Returns:
+        AsyncEngine; its metrics come from get_engine_metrics(engine.sync_engine)
+    """
+    url = async_database_url(url or settings.DATABASE_URL)
+    options = {**engine_options(url, is_async=True), **overrides}
+    engine = create_async_engine(url, **options)
+    if _is_sqlite_file(url):
+        _install_sqlite_pragmas(engine.sync_engine, _sqlite_pragmas())
+    get_engine_metrics(engine.sync_engine)
+    return engine
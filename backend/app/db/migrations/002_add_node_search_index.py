@@ -0,0 +1,136 @@
+"""
+Database Migration: Add full-text search index over node titles and content
+
+Existing databases were created before the search index existed. This migration
+installs the engine-specific index (FTS5 on SQLite, tsvector + GIN on PostgreSQL)
+together with the sync triggers, then backfills it from all active nodes.
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, text
+
+from backend.app.db.search_index import (
+    DOCUMENTS_TABLE,
+    drop_search_index,
+    install_search_index,
+    is_search_supported,
+    rebuild_search_index,
+)
+
+
+class Migration:
+    """
+    Database schema migration for node full-text search
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def migrate_up(self):
+        """
+        Apply migration: Create search index, triggers and backfill
+        """
+        print("🔄 Starting migration: Adding node full-text search index...")
+
+        with self.engine.begin() as connection:
+            if not is_search_supported(connection.dialect.name):
+                print(f"  ⚠️  Full-text search is not supported on '{connection.dialect.name}', skipping...")
+                return
+
+            install_search_index(connection)
+            print("  ✅ Search index and sync triggers created")
+
+            rebuild_search_index(connection)
+            print("  ✅ Search index backfilled from active nodes")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop search index and triggers
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            drop_search_index(connection)
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        with self.engine.connect() as connection:
+            if not is_search_supported(connection.dialect.name):
+                print("  ⚠️  Search index not applicable (non-critical)")
+                return
+
+            indexed = connection.execute(text(f"SELECT count(*) FROM {DOCUMENTS_TABLE}")).scalar()
+            active = connection.execute(text("SELECT count(*) FROM nodes WHERE deleted_at IS NULL")).scalar()
+
+            if indexed == active:
+                print(f"  ✅ {indexed} active nodes indexed")
+            else:
+                print(f"  ❌ Index out of sync: {indexed} indexed, {active} active nodes")
+
+            print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.002_add_node_search_index
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
@@ -0,0 +1,132 @@
+"""
+Database Migration: Add composite indexes for keyset-paginated listings
+
+Curriculum and literature listings page on (created_at, id) instead of
+OFFSET/LIMIT. These indexes let every page start with an index seek, so deep
+pages cost the same as the first one.
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+_INDEXES = [
+    ("curriculums", "idx_curriculums_created", "created_at, curriculum_id"),
+    ("curriculums", "idx_curriculums_public_created", "is_public, created_at, curriculum_id"),
+    ("literature_items", "idx_literature_items_created", "created_at, id"),
+]
+
+
+class Migration:
+    """
+    Database schema migration for keyset pagination indexes
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def migrate_up(self):
+        """
+        Apply migration: Create listing indexes
+        """
+        print("🔄 Starting migration: Adding keyset pagination indexes...")
+
+        with self.engine.begin() as connection:
+            tables = set(inspect(connection).get_table_names())
+            for table, name, columns in _INDEXES:
+                if table not in tables:
+                    print(f"  ⚠️  Table '{table}' does not exist, skipping {name}...")
+                    continue
+                connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+                print(f"  ✅ Index {name} created")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop listing indexes
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            for _, name, _ in _INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                print(f"  ✅ Index {name} dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        inspector = inspect(self.engine)
+        tables = set(inspector.get_table_names())
+        for table, name, _ in _INDEXES:
+            if table not in tables:
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table)}
+            if name in existing:
+                print(f"  ✅ {name} exists")
+            else:
+                print(f"  ❌ {name} missing")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.003_add_listing_keyset_indexes
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
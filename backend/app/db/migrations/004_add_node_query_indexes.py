@@ -0,0 +1,152 @@
+"""
+Database Migration: Add indexes for hot node and node link query paths
+
+- nodes (curriculum_id, parent_node_id, deleted_at, order_index):
+  sibling lookups in create_node and reorder_nodes
+- nodes (curriculum_id, order_index, node_id) WHERE deleted_at IS NULL:
+  ordered curriculum listings (get_nodes_by_curriculum, get_nodes_page)
+- nodes (parent_node_id) WHERE deleted_at IS NULL: descendant walks in delete_node
+- node_links (node_id, link_type): get_node_links, get_node_to_node_links, get_pdf_links
+- node_links (linked_node_id) WHERE linked_node_id IS NOT NULL: incoming node links
+
+Partial indexes are created on engines that support them (SQLite, PostgreSQL);
+elsewhere the same columns are indexed without the predicate.
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+PARTIAL_INDEX_DIALECTS = ("sqlite", "postgresql")
+
+# (table, index name, columns, partial predicate)
+_INDEXES = [
+    ("nodes", "idx_nodes_siblings", "curriculum_id, parent_node_id, deleted_at, order_index", None),
+    ("nodes", "idx_nodes_active_order", "curriculum_id, order_index, node_id", "deleted_at IS NULL"),
+    ("nodes", "idx_nodes_active_children", "parent_node_id", "deleted_at IS NULL"),
+    ("node_links", "idx_node_links_node", "node_id, link_type", None),
+    ("node_links", "idx_node_links_linked_node", "linked_node_id", "linked_node_id IS NOT NULL"),
+]
+
+
+class Migration:
+    """
+    Database schema migration for node/link query indexes
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def migrate_up(self):
+        """
+        Apply migration: Create node and node link indexes
+        """
+        print("🔄 Starting migration: Adding node/link query indexes...")
+
+        with self.engine.begin() as connection:
+            supports_partial = connection.dialect.name in PARTIAL_INDEX_DIALECTS
+            tables = set(inspect(connection).get_table_names())
+
+            for table, name, columns, predicate in _INDEXES:
+                if table not in tables:
+                    print(f"  ⚠️  Table '{table}' does not exist, skipping {name}...")
+                    continue
+                statement = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+                if predicate and supports_partial:
+                    statement += f" WHERE {predicate}"
+                connection.execute(text(statement))
+                print(f"  ✅ Index {name} created")
+
+            # Refresh planner statistics so the new indexes are picked up immediately
+            connection.execute(text("ANALYZE"))
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop node and node link indexes
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            for _, name, _, _ in _INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                print(f"  ✅ Index {name} dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        inspector = inspect(self.engine)
+        tables = set(inspector.get_table_names())
+        for table, name, _, _ in _INDEXES:
+            if table not in tables:
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table)}
+            if name in existing:
+                print(f"  ✅ {name} exists")
+            else:
+                print(f"  ❌ {name} missing")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.004_add_node_query_indexes
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
@@ -0,0 +1,128 @@
+"""
+Database Migration: Add Drive changes feed token to curriculum Drive folders
+
+- curriculum_drive_folders.changes_page_token: start page token for Drive's
+  changes.list, so syncs read only the changes since the previous run instead
+  of listing the whole curriculum folder
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+TABLE = "curriculum_drive_folders"
+COLUMN = "changes_page_token"
+
+
+class Migration:
+    """
+    Database schema migration for incremental Drive sync
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def _columns(self, connection) -> set:
+        return {column["name"] for column in inspect(connection).get_columns(TABLE)}
+
+    def migrate_up(self):
+        """
+        Apply migration: Add changes_page_token column
+        """
+        print("🔄 Starting migration: Adding Drive changes page token...")
+
+        with self.engine.begin() as connection:
+            if TABLE not in inspect(connection).get_table_names():
+                print(f"  ⚠️  Table '{TABLE}' does not exist, skipping...")
+                return
+            if COLUMN in self._columns(connection):
+                print(f"  ✓ '{COLUMN}' already exists")
+            else:
+                connection.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {COLUMN} VARCHAR"))
+                print(f"  ✅ '{COLUMN}' column added")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop changes_page_token column
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            if COLUMN in self._columns(connection):
+                connection.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN {COLUMN}"))
+                print(f"  ✅ '{COLUMN}' column dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        with self.engine.connect() as connection:
+            if COLUMN in self._columns(connection):
+                print(f"  ✅ {TABLE}.{COLUMN} exists")
+            else:
+                print(f"  ❌ {TABLE}.{COLUMN} missing")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.005_add_drive_changes_page_token
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
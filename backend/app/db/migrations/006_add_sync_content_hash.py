@@ -0,0 +1,138 @@
+"""
+Database Migration: Add content hashes to sync metadata
+
+- sync_metadata.content_hash: SHA-256 of the node payload at the last sync,
+  so uploads are skipped when the node's content has not actually changed
+- sync_metadata.drive_md5: MD5 of the node file as last written or read,
+  compared with Drive's md5Checksum to detect remote edits without downloading
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+TABLE = "sync_metadata"
+COLUMNS = {
+    "content_hash": "VARCHAR(64)",
+    "drive_md5": "VARCHAR(32)",
+}
+
+
+class Migration:
+    """
+    Database schema migration for content-hash change detection
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def _columns(self, connection) -> set:
+        return {column["name"] for column in inspect(connection).get_columns(TABLE)}
+
+    def migrate_up(self):
+        """
+        Apply migration: Add content_hash and drive_md5 columns
+        """
+        print("🔄 Starting migration: Adding sync content hashes...")
+
+        with self.engine.begin() as connection:
+            if TABLE not in inspect(connection).get_table_names():
+                print(f"  ⚠️  Table '{TABLE}' does not exist, skipping...")
+                return
+            existing = self._columns(connection)
+            for column, column_type in COLUMNS.items():
+                if column in existing:
+                    print(f"  ✓ '{column}' already exists")
+                else:
+                    connection.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {column} {column_type}"))
+                    print(f"  ✅ '{column}' column added")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop content_hash and drive_md5 columns
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            existing = self._columns(connection)
+            for column in COLUMNS:
+                if column in existing:
+                    connection.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN {column}"))
+                    print(f"  ✅ '{column}' column dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        with self.engine.connect() as connection:
+            existing = self._columns(connection)
+            for column in COLUMNS:
+                if column in existing:
+                    print(f"  ✅ {TABLE}.{column} exists")
+                else:
+                    print(f"  ❌ {TABLE}.{column} missing")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.006_add_sync_content_hash
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
@@ -0,0 +1,133 @@
+"""
+Database Migration: Add sync job, history and lease tables
+
+- sync_jobs: latest job of each curriculum, shared by all workers
+- sync_history: finished syncs, read newest first per curriculum through
+  idx_sync_history_curriculum_created (keyset pagination)
+- scheduler_leases: lease naming the one worker that runs scheduled syncs
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes
+"""
+
+from sqlalchemy import create_engine, inspect
+
+from backend.app.models.sync_job import SchedulerLease, SyncHistory, SyncJob
+
+TABLES = [SyncJob.__table__, SyncHistory.__table__, SchedulerLease.__table__]
+
+
+class Migration:
+    """
+    Database schema migration for persistent sync scheduler state
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def migrate_up(self):
+        """
+        Apply migration: Create sync_jobs, sync_history and scheduler_leases (with indexes)
+        """
+        print("🔄 Starting migration: Adding sync job tables...")
+
+        with self.engine.begin() as connection:
+            existing = set(inspect(connection).get_table_names())
+            for table in TABLES:
+                if table.name in existing:
+                    print(f"  ✓ '{table.name}' already exists")
+                else:
+                    table.create(connection)
+                    print(f"  ✅ '{table.name}' table created")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop the sync job tables
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            for table in reversed(TABLES):
+                table.drop(connection, checkfirst=True)
+                print(f"  ✅ '{table.name}' table dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        with self.engine.connect() as connection:
+            inspector = inspect(connection)
+            existing = set(inspector.get_table_names())
+            for table in TABLES:
+                if table.name not in existing:
+                    print(f"  ❌ {table.name} missing")
+                    continue
+                print(f"  ✅ {table.name} exists")
+                indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    mark = "✅" if index.name in indexes else "❌"
+                    print(f"  {mark} {index.name}")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.007_add_sync_jobs
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
@@ -0,0 +1,147 @@
+"""
+Database Migration: Store refresh tokens as HMAC digests
+
+- user_sessions.replaced_by_session_id: successor of a rotated session, so a
+  rotated refresh token presented again is detected as reuse
+- Sessions still holding bcrypt hashes of refresh tokens are revoked: their
+  tokens can no longer be looked up, so those users simply sign in again
+
+Version: 1.0
+Date: 2026-10-18
+Reversible: Yes (the revoked legacy sessions stay revoked)
+"""
+
+from datetime import datetime, UTC
+
+from sqlalchemy import create_engine, inspect, text
+
+TABLE = "user_sessions"
+COLUMNS = {
+    "replaced_by_session_id": "VARCHAR(36)",
+}
+# bcrypt hashes start with $2a$, $2b$ or $2y$; HMAC digests are hex
+LEGACY_HASH_PATTERN = "$2%"
+
+
+class Migration:
+    """
+    Database schema migration for HMAC refresh token digests
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initialize migration
+
+        Args:
+            db_url: Database connection string (e.g., 'sqlite:///mathesis_lab.db')
+        """
+        self.db_url = db_url
+        self.engine = create_engine(db_url)
+
+    def _columns(self, connection) -> set:
+        return {column["name"] for column in inspect(connection).get_columns(TABLE)}
+
+    def migrate_up(self):
+        """
+        Apply migration: Add replaced_by_session_id and revoke bcrypt-hashed sessions
+        """
+        print("🔄 Starting migration: Switching refresh tokens to HMAC digests...")
+
+        with self.engine.begin() as connection:
+            if TABLE not in inspect(connection).get_table_names():
+                print(f"  ⚠️  Table '{TABLE}' does not exist, skipping...")
+                return
+            existing = self._columns(connection)
+            for column, column_type in COLUMNS.items():
+                if column in existing:
+                    print(f"  ✓ '{column}' already exists")
+                else:
+                    connection.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {column} {column_type}"))
+                    print(f"  ✅ '{column}' column added")
+
+            revoked = connection.execute(
+                text(f"UPDATE {TABLE} SET revoked_at = :now WHERE revoked_at IS NULL AND refresh_token_hash LIKE :pattern"),
+                {"now": datetime.now(UTC).replace(tzinfo=None), "pattern": LEGACY_HASH_PATTERN},
+            ).rowcount
+            print(f"  ✅ {revoked} bcrypt-hashed session(s) revoked")
+
+        print("\n✅ Migration completed successfully!")
+
+    def migrate_down(self):
+        """
+        Rollback migration: Drop replaced_by_session_id
+        """
+        print("🔄 Starting rollback...")
+
+        with self.engine.begin() as connection:
+            existing = self._columns(connection)
+            for column in COLUMNS:
+                if column in existing:
+                    connection.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN {column}"))
+                    print(f"  ✅ '{column}' column dropped")
+
+        print("\n✅ Rollback completed!")
+
+    def validate(self):
+        """
+        Validate that migration was applied correctly
+        """
+        print("\n🔍 Validating migration...")
+
+        with self.engine.connect() as connection:
+            existing = self._columns(connection)
+            for column in COLUMNS:
+                if column in existing:
+                    print(f"  ✅ {TABLE}.{column} exists")
+                else:
+                    print(f"  ❌ {TABLE}.{column} missing")
+
+        print("\n✅ Validation complete!")
+
+
+# ============================================
+# Helper Functions for Direct Execution
+# ============================================
+
+def run_migration(db_url: str = None):
+    """
+    Run migration directly (for scripts)
+
+    Args:
+        db_url: Database URL (default: from environment or config)
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_up()
+    migration.validate()
+
+
+def run_rollback(db_url: str = None):
+    """
+    Run rollback
+
+    Args:
+        db_url: Database URL
+    """
+    if db_url is None:
+        from backend.app.core.config import settings
+        db_url = settings.DATABASE_URL
+
+    migration = Migration(db_url)
+    migration.migrate_down()
+
+
+if __name__ == '__main__':
+    """
+    Direct execution:
+    python -m backend.app.db.migrations.008_hash_refresh_tokens_with_hmac
+    """
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        run_rollback()
+    else:
+        run_migration()
@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by a unique key tuple such as ``(created_at, id)`` or
+``(order_index, id)``. Instead of ``OFFSET`` the next page starts strictly
+after the last row of the previous page (``WHERE (a, b) > (:a, :b)``), so with
+a matching composite index every page costs the same as the first one.
+
+Cursors are opaque to clients: the last row's key values, JSON encoded and
+base64url wrapped.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import literal, text, tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response headers used by list endpoints (the body stays a plain JSON array)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the key values of a row into an opaque cursor string."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the listing's key
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("cursor does not match the listing key")
+        return [_decode_value(v) for v in values]
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+
+
+def estimate_count(query: Query) -> int:
+    """
+    Estimate the number of rows a listing query matches.
+
+    On PostgreSQL this reads the planner's row estimate from ``EXPLAIN`` so it
+    stays cheap on large tables; other engines run an exact ``COUNT``.
+    """
+    count_query = query.order_by(None)
+    session = query.session
+    if session.get_bind().dialect.name == "postgresql":
+        statement = count_query.statement.compile(
+            dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True}
+        )
+        plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return count_query.count()
+
+
+def paginate_keyset(
+    query: Query,
+    keys: Sequence[ColumnElement],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    descending: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fetch one page of ``query`` ordered by ``keys`` (ascending unless ``descending``).
+
+    The last key must be unique (the primary key) so the ordering is total.
+
+    Args:
+        query: Filtered ORM query without ORDER BY / LIMIT
+        keys: Columns defining the sort order, e.g. ``(Model.created_at, Model.id)``
+        limit: Page size
+        cursor: Cursor returned with the previous page, or None for the first page
+        include_total: Also return an estimate of the total number of rows
+        descending: Newest/largest first (e.g. history listings)
+
+    Returns:
+        Dict with "items", "next_cursor" (None on the last page) and
+        "total_estimate" (None unless requested)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    total_estimate = estimate_count(query) if include_total else None
+
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        # Bind with each column's type so e.g. datetimes compare in storage format
+        after = tuple_(*[literal(value, type_=key.type) for key, value in zip(keys, values)])
+        query = query.filter(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+
+    order = [key.desc() for key in keys] if descending else list(keys)
+    rows = query.order_by(*order).limit(limit + 1).all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+
+    return {"items": items, "next_cursor": next_cursor, "total_estimate": total_estimate}
+
+
+def set_page_headers(response: Any, page: Dict[str, Any]) -> None:
+    """Expose a page's cursor and total estimate on an API response's headers."""
+    if page["next_cursor"] is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    if page["total_estimate"] is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page["total_estimate"])
@@ -0,0 +1,281 @@
+"""
+Query Audit for MATHESIS LAB
+
+Development and staging instrumentation that finds N+1 query patterns and
+database-heavy units of work. A unit is one HTTP request (see
+middleware/query_audit.py), one Celery task, or one test (see
+tests/query_audit_plugin.py).
+
+While a unit is active, a ``before_cursor_execute`` hook on every engine
+fingerprints each statement (literals, placeholders and IN lists
+normalised, so ``WHERE parent_node_id = ?`` issued for fifty different
+parents is one fingerprint) and times it. When the unit ends it is flagged
+if one fingerprint repeated more than ``max_repeats`` times, if it ran more
+than ``max_queries`` statements, or if its statements took more than
+``max_db_time_ms`` in total.
+
+Flagged units are logged and kept (the worst occurrence per unit name) in
+the process-wide ``QueryAuditLog``, which renders a report ranked by
+database time. Nothing is recorded outside an active unit, and the hooks
+are only installed once ``install()`` is called (QUERY_AUDIT_ENABLED).
+"""
+
+import functools
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Statement with its variable parts replaced, so repeats of one query
+    with different values compare equal.
+
+    >>> fingerprint("SELECT * FROM nodes WHERE node_id IN (?, ?, ?) AND depth > 3")
+    'SELECT * FROM nodes WHERE node_id IN (...) AND depth > ?'
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Limits a unit of work must stay within (None: no limit)."""
+    max_repeats: Optional[int] = None
+    max_queries: Optional[int] = None
+    max_db_time_ms: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "QueryBudget":
+        return cls(
+            max_repeats=settings.QUERY_AUDIT_MAX_REPEATS,
+            max_db_time_ms=settings.QUERY_AUDIT_MAX_DB_TIME_MS,
+        )
+
+
+@dataclass
+class StatementStats:
+    """Executions of one fingerprint within a unit."""
+    fingerprint: str
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+@dataclass
+class AuditUnit:
+    """Statements executed by one request, task or test."""
+    name: str
+    budget: QueryBudget
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    query_count: int = 0
+    db_seconds: float = 0.0
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        stats = self.statements.get(key)
+        if stats is None:
+            stats = self.statements[key] = StatementStats(key)
+        stats.count += 1
+        stats.total_seconds += seconds
+        self.query_count += 1
+        self.db_seconds += seconds
+
+    def ranked_statements(self) -> List[StatementStats]:
+        """Fingerprints by repeat count, then time."""
+        return sorted(self.statements.values(), key=lambda s: (s.count, s.total_seconds), reverse=True)
+
+    @property
+    def violations(self) -> List[str]:
+        """Budget limits this unit exceeded, worded for a report."""
+        budget, found = self.budget, []
+        if budget.max_repeats is not None and self.statements:
+            worst = self.ranked_statements()[0]
+            if worst.count > budget.max_repeats:
+                found.append(f"{worst.count} identical statements (limit {budget.max_repeats})")
+        if budget.max_queries is not None and self.query_count > budget.max_queries:
+            found.append(f"{self.query_count} statements (limit {budget.max_queries})")
+        if budget.max_db_time_ms is not None and self.db_seconds * 1000 > budget.max_db_time_ms:
+            found.append(f"{self.db_seconds * 1000:.1f} ms in the database (limit {budget.max_db_time_ms:g} ms)")
+        return found
+
+    def describe(self, top: int = 5) -> str:
+        lines = [
+            f"{self.name}: {self.query_count} statements, {self.db_seconds * 1000:.1f} ms; "
+            + "; ".join(self.violations or ["within budget"])
+        ]
+        for stats in self.ranked_statements()[:top]:
+            lines.append(f"  {stats.count:>5}x {stats.total_seconds * 1000:>9.2f} ms  {stats.fingerprint}")
+        return "\n".join(lines)
+
+
+class QueryAuditLog:
+    """Flagged units, the worst occurrence per unit name, ranked for reporting."""
+
+    def __init__(self):
+        self._worst: Dict[str, AuditUnit] = {}
+        self._occurrences: Dict[str, int] = {}
+        self.units_audited = 0
+        self._lock = threading.Lock()
+
+    def add(self, unit: AuditUnit, flagged: bool) -> None:
+        with self._lock:
+            self.units_audited += 1
+            if not flagged:
+                return
+            self._occurrences[unit.name] = self._occurrences.get(unit.name, 0) + 1
+            current = self._worst.get(unit.name)
+            if current is None or unit.db_seconds > current.db_seconds:
+                self._worst[unit.name] = unit
+
+    def ranked(self) -> List[Tuple[AuditUnit, int]]:
+        """(worst occurrence, times flagged) per unit name, most database time first."""
+        with self._lock:
+            entries = [(unit, self._occurrences[name]) for name, unit in self._worst.items()]
+        return sorted(entries, key=lambda entry: (entry[0].db_seconds, entry[0].query_count), reverse=True)
+
+    def format_report(self, limit: int = 20, top_statements: int = 5) -> str:
+        ranked = self.ranked()
+        lines = [f"Query audit: {len(ranked)} unit(s) flagged, {self.units_audited} audited"]
+        for position, (unit, occurrences) in enumerate(ranked[:limit], start=1):
+            lines.append("")
+            lines.append(f"{position}. [flagged {occurrences}x] {unit.describe(top_statements)}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as report:
+            report.write(self.format_report())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._worst.clear()
+            self._occurrences.clear()
+            self.units_audited = 0
+
+
+_audit_log: Optional[QueryAuditLog] = None
+
+
+def get_query_audit_log() -> QueryAuditLog:
+    """Get or create the process-wide audit log."""
+    global _audit_log
+    if _audit_log is None:
+        _audit_log = QueryAuditLog()
+    return _audit_log
+
+
+# Unit of the request, task or test being executed
+_current_unit: ContextVar[Optional[AuditUnit]] = ContextVar("query_audit_unit", default=None)
+_STARTED_KEY = "query_audit_started"
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_unit.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    unit = _current_unit.get()
+    started = conn.info.get(_STARTED_KEY)
+    if unit is not None and started:
+        unit.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(context):
+    started = context.connection.info.get(_STARTED_KEY) if context.connection is not None else None
+    unit = _current_unit.get()
+    if unit is not None and started:
+        unit.record(context.statement or "", time.perf_counter() - started.pop())
+
+
+def install() -> None:
+    """Hook statement execution on every engine (idempotent)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _installed = True
+
+
+def begin_unit(name: str, budget: Optional[QueryBudget] = None) -> Tuple[AuditUnit, Token]:
+    """Start auditing the statements of the current context."""
+    unit = AuditUnit(name, budget or QueryBudget.from_settings())
+    return unit, _current_unit.set(unit)
+
+
+def finish_unit(unit: AuditUnit, token: Token, log: Optional[QueryAuditLog] = None) -> List[str]:
+    """
+    Stop auditing, log the unit if it broke its budget, and record it.
+
+    Returns:
+        The budget violations (empty if none)
+    """
+    _current_unit.reset(token)
+    violations = unit.violations
+    if violations:
+        logger.warning("Query audit flagged %s", unit.describe())
+    (log or get_query_audit_log()).add(unit, flagged=bool(violations))
+    return violations
+
+
+@contextmanager
+def audit(name: str, budget: Optional[QueryBudget] = None, log: Optional[QueryAuditLog] = None) -> Iterator[AuditUnit]:
+    """
+    Audit the statements executed inside the block.
+
+    Example:
+        >>> with audit("delete_node", QueryBudget(max_repeats=5)) as unit:
+        >>>     node_service.delete_node(node_id)
+        >>> assert not unit.violations
+    """
+    install()
+    unit, token = begin_unit(name, budget)
+    try:
+        yield unit
+    finally:
+        finish_unit(unit, token, log)
+
+
+def install_celery_hooks(celery_app) -> None:
+    """Audit every task run by ``celery_app``'s workers."""
+    from celery import signals
+
+    install()
+    running: Dict[str, Tuple[AuditUnit, Token]] = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def _start_task(task_id=None, task=None, **kwargs):
+        if task is not None and task.app is celery_app:
+            running[task_id] = begin_unit(f"task {task.name}")
+
+    @signals.task_postrun.connect(weak=False)
+    def _finish_task(task_id=None, **kwargs):
+        started = running.pop(task_id, None)
+        if started is not None:
+            finish_unit(*started)
@@ -0,0 +1,247 @@
+"""
+Full-text search index DDL for node titles and markdown content.
+
+The index lives outside the ORM metadata because it is engine specific:
+
+- SQLite: an FTS5 virtual table (``node_search``) whose rowid points at a
+  ``node_search_documents`` row carrying the node's curriculum and type.
+- PostgreSQL: ``node_search_documents`` with a stored ``tsvector`` column and
+  a GIN index.
+
+On both engines database triggers on ``nodes`` and ``node_contents`` keep the
+index in sync, so ORM writes, bulk ``UPDATE`` statements (soft delete) and
+executemany imports are all covered without application hooks.
+
+The DDL is installed automatically after ``Base.metadata.create_all`` and is
+idempotent; ``install_search_index`` backfills an empty index from existing rows.
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from backend.app.models.base import Base
+
+SEARCH_TABLE = "node_search"
+DOCUMENTS_TABLE = "node_search_documents"
+
+# ---------------------------------------------------------------------------
+# SQLite (FTS5)
+# ---------------------------------------------------------------------------
+
+_SQLITE_REFRESH = """
+    DELETE FROM node_search WHERE rowid = (SELECT doc_id FROM node_search_documents WHERE node_id = {node_id});
+    DELETE FROM node_search_documents WHERE node_id = {node_id};
+    INSERT INTO node_search_documents (node_id, curriculum_id, node_type)
+        SELECT node_id, curriculum_id, node_type FROM nodes
+        WHERE node_id = {node_id} AND deleted_at IS NULL;
+    INSERT INTO node_search (rowid, title, content)
+        SELECT d.doc_id, n.title, c.markdown_content
+        FROM node_search_documents d
+        JOIN nodes n ON n.node_id = d.node_id
+        LEFT JOIN node_contents c ON c.node_id = n.node_id AND c.deleted_at IS NULL
+        WHERE d.node_id = {node_id};
+"""
+
+_SQLITE_REMOVE = """
+    DELETE FROM node_search WHERE rowid = (SELECT doc_id FROM node_search_documents WHERE node_id = {node_id});
+    DELETE FROM node_search_documents WHERE node_id = {node_id};
+"""
+
+_SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS node_search_documents (
+        doc_id INTEGER PRIMARY KEY,
+        node_id VARCHAR NOT NULL UNIQUE,
+        curriculum_id VARCHAR NOT NULL,
+        node_type VARCHAR(50) NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_node_search_documents_scope ON node_search_documents (curriculum_id, node_type)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS node_search USING fts5(
+        title, content, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_node_insert AFTER INSERT ON nodes
+    WHEN new.deleted_at IS NULL BEGIN {_SQLITE_REFRESH.format(node_id="new.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_node_update
+    AFTER UPDATE OF title, node_type, curriculum_id, deleted_at ON nodes
+    BEGIN {_SQLITE_REFRESH.format(node_id="new.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_node_delete AFTER DELETE ON nodes
+    BEGIN {_SQLITE_REMOVE.format(node_id="old.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_content_insert AFTER INSERT ON node_contents
+    BEGIN {_SQLITE_REFRESH.format(node_id="new.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_content_update
+    AFTER UPDATE OF markdown_content, deleted_at, node_id ON node_contents
+    BEGIN {_SQLITE_REFRESH.format(node_id="new.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_content_move AFTER UPDATE OF node_id ON node_contents
+    WHEN old.node_id <> new.node_id BEGIN {_SQLITE_REFRESH.format(node_id="old.node_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_node_search_content_delete AFTER DELETE ON node_contents
+    BEGIN {_SQLITE_REFRESH.format(node_id="old.node_id")} END
+    """,
+]
+
+_SQLITE_REBUILD = [
+    "DELETE FROM node_search",
+    "DELETE FROM node_search_documents",
+    """
+    INSERT INTO node_search_documents (node_id, curriculum_id, node_type)
+        SELECT node_id, curriculum_id, node_type FROM nodes WHERE deleted_at IS NULL
+    """,
+    """
+    INSERT INTO node_search (rowid, title, content)
+        SELECT d.doc_id, n.title, c.markdown_content
+        FROM node_search_documents d
+        JOIN nodes n ON n.node_id = d.node_id
+        LEFT JOIN node_contents c ON c.node_id = n.node_id AND c.deleted_at IS NULL
+    """,
+]
+
+_SQLITE_DROP = [
+    "DROP TABLE IF EXISTS node_search",
+    "DROP TABLE IF EXISTS node_search_documents",
+]
+
+# ---------------------------------------------------------------------------
+# PostgreSQL (tsvector + GIN)
+# ---------------------------------------------------------------------------
+
+_POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS node_search_documents (
+        node_id VARCHAR PRIMARY KEY,
+        curriculum_id VARCHAR NOT NULL,
+        node_type VARCHAR(50) NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        content TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_node_search_documents_document ON node_search_documents USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS idx_node_search_documents_scope ON node_search_documents (curriculum_id, node_type)",
+    """
+    CREATE OR REPLACE FUNCTION refresh_node_search(target_node_id VARCHAR) RETURNS VOID AS $$
+    BEGIN
+        DELETE FROM node_search_documents WHERE node_id = target_node_id;
+        INSERT INTO node_search_documents (node_id, curriculum_id, node_type, title, content)
+            SELECT n.node_id, n.curriculum_id, n.node_type, n.title, c.markdown_content
+            FROM nodes n
+            LEFT JOIN node_contents c ON c.node_id = n.node_id AND c.deleted_at IS NULL
+            WHERE n.node_id = target_node_id AND n.deleted_at IS NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION trg_node_search_refresh() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM refresh_node_search(OLD.node_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.node_id <> OLD.node_id) THEN
+            PERFORM refresh_node_search(NEW.node_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_node_search_nodes ON nodes",
+    """
+    CREATE TRIGGER trg_node_search_nodes
+    AFTER INSERT OR DELETE OR UPDATE OF title, node_type, curriculum_id, deleted_at ON nodes
+    FOR EACH ROW EXECUTE FUNCTION trg_node_search_refresh()
+    """,
+    "DROP TRIGGER IF EXISTS trg_node_search_node_contents ON node_contents",
+    """
+    CREATE TRIGGER trg_node_search_node_contents
+    AFTER INSERT OR DELETE OR UPDATE OF markdown_content, deleted_at, node_id ON node_contents
+    FOR EACH ROW EXECUTE FUNCTION trg_node_search_refresh()
+    """,
+]
+
+_POSTGRES_REBUILD = [
+    "TRUNCATE node_search_documents",
+    """
+    INSERT INTO node_search_documents (node_id, curriculum_id, node_type, title, content)
+        SELECT n.node_id, n.curriculum_id, n.node_type, n.title, c.markdown_content
+        FROM nodes n
+        LEFT JOIN node_contents c ON c.node_id = n.node_id AND c.deleted_at IS NULL
+        WHERE n.deleted_at IS NULL
+    """,
+]
+
+_POSTGRES_DROP = [
+    "DROP TRIGGER IF EXISTS trg_node_search_nodes ON nodes",
+    "DROP TRIGGER IF EXISTS trg_node_search_node_contents ON node_contents",
+    "DROP TABLE IF EXISTS node_search_documents",
+    "DROP FUNCTION IF EXISTS trg_node_search_refresh()",
+    "DROP FUNCTION IF EXISTS refresh_node_search(VARCHAR)",
+]
+
+_STATEMENTS = {
+    "sqlite": {"install": _SQLITE_DDL, "rebuild": _SQLITE_REBUILD, "drop": _SQLITE_DROP},
+    "postgresql": {"install": _POSTGRES_DDL, "rebuild": _POSTGRES_REBUILD, "drop": _POSTGRES_DROP},
+}
+
+
+def is_search_supported(dialect_name: str) -> bool:
+    """Whether the full-text index can be installed on this database engine."""
+    return dialect_name in _STATEMENTS
+
+
+def _run(connection: Connection, kind: str) -> bool:
+    statements = _STATEMENTS.get(connection.dialect.name, {}).get(kind)
+    if statements is None:
+        return False
+    for statement in statements:
+        connection.execute(text(statement))
+    return True
+
+
+def install_search_index(connection: Connection) -> None:
+    """
+    Create the search tables, indexes and sync triggers (idempotent).
+
+    Backfills from existing nodes when the index is empty, which covers
+    databases created before the index existed.
+    """
+    if not _run(connection, "install"):
+        return
+    indexed = connection.execute(text(f"SELECT count(*) FROM {DOCUMENTS_TABLE}")).scalar()
+    if not indexed:
+        rebuild_search_index(connection)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Repopulate the search index from all active nodes and their content."""
+    _run(connection, "rebuild")
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the search tables, triggers and functions."""
+    _run(connection, "drop")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_before_drop(target, connection, **kw):
+    drop_search_index(connection)
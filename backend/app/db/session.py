@@ -1,16 +1,26 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from backend.app.core.config import settings
+from backend.app.db.engine import create_configured_async_engine, create_configured_engine
 
 # Use the DATABASE_URL from settings, which will now point to PostgreSQL
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_configured_engine(SQLALCHEMY_DATABASE_URL)  # Pool and pragmas per backend
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Same database through aiosqlite/asyncpg, for handlers that await their queries.
+# Objects stay loaded after commit: an expired attribute cannot lazy-load outside the session's await.
+async_engine = create_configured_async_engine(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     yield db
-    db.close()
\ No newline at end of file
+    db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
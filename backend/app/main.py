@@ -1,23 +1,75 @@
+import os
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy.orm import sessionmaker
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.app.core.config import settings
 from backend.app.api.v1.api import api_router
 from backend.app.db.session import engine
 from backend.app.models.base import Base
-from backend.app.models import curriculum, node, zotero_item, youtube_video, user, user_session, sync_metadata
-from backend.app.middleware.error_logging import ErrorLoggingMiddleware
+from backend.app.models import curriculum, node, zotero_item, youtube_video, user, user_session, sync_metadata, sync_job
+from backend.app.db import search_index  # Installs the full-text index DDL on create_all
+from backend.app.db.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from backend.app.middleware.request_metrics import RequestMetricsMiddleware, metrics_endpoint
+from backend.app.middleware.query_audit import QueryAuditMiddleware
+from backend.app.middleware.compression import CompressionMiddleware
+from backend.app.db.query_audit import get_query_audit_log
+from backend.app.auth.password_handler import get_password_handler
+from backend.app.auth.oauth_handler import get_oauth_handler, close_oauth_handler
+from backend.app.services.session_sweeper import create_session_sweeper
+from backend.app.services.sync_scheduler import create_sync_scheduler
 
 def create_tables(engine_override=None):
     target_engine = engine_override if engine_override else engine
     Base.metadata.create_all(bind=target_engine)
 
+def warm_oauth_keys():
+    # Fetch Google's signing keys before the first sign-in needs them
+    if os.getenv("GOOGLE_OAUTH_CLIENT_ID"):
+        get_oauth_handler().key_set.refresh_in_background()
+
+def start_session_sweeper(engine_override=None):
+    # Deletes expired user sessions in the background
+    target_engine = engine_override if engine_override else engine
+    sweeper = create_session_sweeper(sessionmaker(autocommit=False, autoflush=False, bind=target_engine))
+    if sweeper:
+        sweeper.start()
+    return sweeper
+
+def start_sync_scheduler(engine_override=None):
+    # One scheduler per application; it opens its own sessions, never a request's.
+    # Started, it syncs edited curriculums once their edits settle and polls Drive.
+    target_engine = engine_override if engine_override else engine
+    scheduler = create_sync_scheduler(sessionmaker(autocommit=False, autoflush=False, bind=target_engine))
+    if settings.SYNC_SCHEDULER_ENABLED:
+        scheduler.start()
+    return scheduler
+
+def write_query_audit_report():
+    # Ranked N+1 / slow-request report of this process (development and staging)
+    if settings.QUERY_AUDIT_ENABLED and settings.QUERY_AUDIT_REPORT_PATH:
+        get_query_audit_log().write_report(settings.QUERY_AUDIT_REPORT_PATH)
+
+async def shutdown_workers(sweeper=None, sync_scheduler=None):
+    if sweeper:
+        sweeper.stop()
+    if sync_scheduler:
+        sync_scheduler.stop()
+    get_password_handler().shutdown()
+    await close_oauth_handler()
+    write_query_audit_report()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_tables()
     print("Database tables created/checked.")
+    warm_oauth_keys()
+    sweeper = start_session_sweeper()
+    app.state.sync_scheduler = start_sync_scheduler()
     yield
+    await shutdown_workers(sweeper, app.state.sync_scheduler)
 
 def get_application(db_engine=None, run_lifespan: bool = True):
     # Use the provided db_engine for create_tables if available, otherwise use the default
@@ -29,18 +81,20 @@ def get_application(db_engine=None, run_lifespan: bool = True):
         async def _lifespan(app: FastAPI):
             create_tables(current_engine) # Pass the current_engine to create_tables
             print("Database tables created/checked.")
+            warm_oauth_keys()
+            sweeper = start_session_sweeper(current_engine)
+            app.state.sync_scheduler = start_sync_scheduler(current_engine)
             yield
+            await shutdown_workers(sweeper, app.state.sync_scheduler)
         lifespan_context = _lifespan
 
     app = FastAPI(
         title=settings.PROJECT_NAME,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
-        lifespan=lifespan_context
+        lifespan=lifespan_context,
+        default_response_class=ORJSONResponse,  # orjson: several times faster than json.dumps
     )
 
-    # Error Logging Middleware (added first so it catches all errors)
-    app.add_middleware(ErrorLoggingMiddleware)
-
     # CORS Middleware
     app.add_middleware(
         CORSMiddleware,
@@ -48,8 +102,22 @@ def get_application(db_engine=None, run_lifespan: bool = True):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],  # Keyset pagination
     )
 
+    # Compression Middleware (Brotli or gzip; streamed responses pass through)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
+    # Query Audit Middleware (development and staging; flags N+1 and slow requests)
+    if settings.QUERY_AUDIT_ENABLED:
+        app.add_middleware(QueryAuditMiddleware)
+
+    # Request Metrics Middleware (added last so it times everything, served at /metrics)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(RequestMetricsMiddleware)
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
     app.include_router(api_router, prefix=settings.API_V1_STR)
     return app
 
@@ -0,0 +1,49 @@
+"""
+Query Audit Middleware for MATHESIS LAB
+
+A pure ASGI middleware that audits the database statements of every HTTP
+request (see db/query_audit.py): requests that repeat one statement or
+spend longer in the database than the budget allows are logged with their
+most repeated statements and collected into the query audit report.
+
+Units are named by method and route template (``DELETE
+/api/v1/nodes/{node_id}``), so the report ranks endpoints rather than
+individual URLs. Meant for development and staging (QUERY_AUDIT_ENABLED).
+"""
+
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.app.db.query_audit import (
+    QueryAuditLog,
+    QueryBudget,
+    begin_unit,
+    finish_unit,
+    install,
+)
+from backend.app.middleware.request_metrics import UNMATCHED_ROUTE
+
+
+class QueryAuditMiddleware:
+    """ASGI middleware auditing the statements of every HTTP request."""
+
+    def __init__(self, app: ASGIApp, budget: Optional[QueryBudget] = None, log: Optional[QueryAuditLog] = None):
+        self.app = app
+        self.budget = budget or QueryBudget.from_settings()
+        self.log = log
+        install()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        unit, token = begin_unit(scope["method"], self.budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            unit.name = f"{scope['method']} {route.path if route is not None else UNMATCHED_ROUTE}"
+            finish_unit(unit, token, self.log)
@@ -0,0 +1,253 @@
+"""
+Request Metrics Middleware for MATHESIS LAB
+
+A pure ASGI middleware (no BaseHTTPMiddleware: no extra task, no response
+re-wrapping) that records, per route template and method:
+
+- request duration (histogram, seconds)
+- response body size (histogram, bytes)
+- database statements executed while handling the request (histogram),
+  counted by a SQLAlchemy ``before_cursor_execute`` hook on every engine,
+  sync or async
+- responses per status code
+
+plus the number of requests in flight. ``GET /metrics`` serves everything in
+the Prometheus text format.
+
+Routes are labelled by their template (``/api/v1/nodes/{node_id}``), never
+the raw path, so the number of series stays bounded; this includes plain
+Starlette routes such as ``/metrics`` itself. Requests that match no route
+share the ``UNMATCHED`` label. Observations happen on the event loop
+thread, so the counters need no lock.
+"""
+
+import bisect
+import time
+from array import array
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.db.engine import LATENCY_BUCKETS
+
+# Label of requests that matched no route
+UNMATCHED_ROUTE = "UNMATCHED"
+
+# Upper bounds of the response size (bytes) and query count buckets
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_perf_counter = time.perf_counter
+
+# Statement counter of the request being handled (shared with threadpool workers)
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("request_query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class Histogram:
+    """Observation counts per bucket (the last one is +Inf), plus their sum."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, values: Sequence[float]) -> None:
+        """Add a batch of observations (one sort instead of a search per value)."""
+        ordered = sorted(values)
+        below = 0
+        for i, bound in enumerate(self.bounds):
+            at_or_below = bisect.bisect_right(ordered, bound)
+            self.counts[i] += at_or_below - below
+            below = at_or_below
+        self.counts[-1] += len(ordered) - below
+        self.sum += sum(ordered)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(``le`` label, observations at or below it) pairs, ending with +Inf."""
+        pairs, running = [], 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            running += count
+            pairs.append((str(bound), running))
+        return pairs
+
+
+class RouteStats:
+    """
+    What was observed for one (method, route) pair.
+
+    Requests append raw values to arrays; they are sorted into the histograms
+    in batches (on scrape, or once FOLD_SAMPLES are pending), which keeps the
+    per-request cost to a few appends.
+    """
+
+    __slots__ = ("duration", "response_size", "queries", "statuses", "_pending")
+
+    FOLD_SAMPLES = 4096
+
+    def __init__(self):
+        self.duration = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+        self._pending = (array("d"), array("d"), array("d"))
+
+    def fold(self) -> None:
+        """Move pending observations into the histograms."""
+        for histogram, values in zip((self.duration, self.response_size, self.queries), self._pending):
+            if values:
+                histogram.add(values)
+                del values[:]
+
+
+class RequestMetrics:
+    """Per-route request statistics and the in-flight gauge."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+
+    def observe(self, key: Tuple[str, str], status: int, seconds: float, size: int, queries: int) -> None:
+        """Record one finished request of route ``key`` (method, route template)."""
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        durations, sizes, query_counts = stats._pending
+        durations.append(seconds)
+        sizes.append(size)
+        query_counts.append(queries)
+        statuses = stats.statuses
+        statuses[status] = statuses.get(status, 0) + 1
+        if len(durations) >= RouteStats.FOLD_SAMPLES:
+            stats.fold()
+
+    def snapshot(self) -> Dict[Tuple[str, str], RouteStats]:
+        """Per-route statistics with every observation folded in."""
+        for stats in self.routes.values():
+            stats.fold()
+        return self.routes
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+_request_metrics: Optional[RequestMetrics] = None
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get or create the process-wide request metrics."""
+    global _request_metrics
+    if _request_metrics is None:
+        _request_metrics = RequestMetrics()
+    return _request_metrics
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording every HTTP request into RequestMetrics."""
+
+    def __init__(self, app: ASGIApp, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or get_request_metrics()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = [500, 0]  # Status (500 if the app raises before responding), body bytes
+
+        async def send_and_measure(message: Message) -> None:
+            kind = message["type"]
+            if kind == "http.response.body":
+                response[1] += len(message.get("body", b""))
+            elif kind == "http.response.start":
+                response[0] = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        queries = [0]
+        token = _query_counter.set(queries)
+        metrics.in_flight += 1
+        started = _perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            elapsed = _perf_counter() - started
+            metrics.in_flight -= 1
+            _query_counter.reset(token)
+            metrics.observe((scope["method"], _route_label(scope)), response[0], elapsed, response[1], queries[0])
+
+
+def _route_label(scope: Scope) -> str:
+    """Template of the route the router matched, or UNMATCHED_ROUTE."""
+    # FastAPI's APIRoutes store themselves in the scope
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Plain Starlette routes (``add_route``, e.g. /metrics) only store their endpoint
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        router = getattr(scope.get("app"), "router", None)
+        for candidate in getattr(router, "routes", ()):
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return candidate.path
+    return UNMATCHED_ROUTE
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{le}"}} {count}' for le, count in histogram.cumulative()]
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def render_prometheus(metrics: RequestMetrics) -> str:
+    """Metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_requests_in_flight Requests being handled",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {metrics.in_flight}",
+    ]
+    routes = sorted(metrics.snapshot().items())
+    families = (
+        ("http_request_duration_seconds", "Request duration in seconds", lambda stats: stats.duration),
+        ("http_response_size_bytes", "Response body size in bytes", lambda stats: stats.response_size),
+        ("http_request_db_queries", "Database statements executed per request", lambda stats: stats.queries),
+    )
+    for name, help_text, histogram_of in families:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), stats in routes:
+            lines += _histogram_lines(name, f'method="{method}",route="{_escape(route)}"', histogram_of(stats))
+    lines += ["# HELP http_responses_total Responses per status code", "# TYPE http_responses_total counter"]
+    for (method, route), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """GET /metrics: request metrics for Prometheus to scrape."""
+    return Response(render_prometheus(get_request_metrics()), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, UTC # 1. UTC 임포트
 from typing import Optional
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from backend.app.models.base import Base
@@ -27,5 +27,11 @@ class Curriculum(Base):
     nodes = relationship("Node", back_populates="curriculum", cascade="all, delete-orphan") # Add this line
     owner = relationship("User", back_populates="curriculums")
 
+    # Keyset pagination keys for the full and public listings
+    __table_args__ = (
+        Index("idx_curriculums_created", "created_at", "curriculum_id"),
+        Index("idx_curriculums_public_created", "is_public", "created_at", "curriculum_id"),
+    )
+
     def __repr__(self):
         return f"<Curriculum(curriculum_id='{self.curriculum_id}', title='{self.title}')>"
\ No newline at end of file
@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, Text, INT, TIMESTAMP
+from datetime import datetime, UTC
+from sqlalchemy import Column, String, Text, INT, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from backend.app.models.base import Base
@@ -15,5 +16,11 @@ class LiteratureItem(Base):
     item_type = Column(String(50), nullable=True)
     abstract = Column(Text, nullable=True)
     url = Column(Text, nullable=True)
-    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    # Client-side default keeps sub-second precision so the (created_at, id) listing order follows insertion order
+    created_at = Column(TIMESTAMP, default=lambda: datetime.now(UTC), server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Keyset pagination key for the literature listing
+    __table_args__ = (
+        Index("idx_literature_items_created", "created_at", "id"),
+    )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, UTC
 
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID # Import as PG_UUID to avoid name collision
 
@@ -37,6 +37,20 @@ class Node(Base):
     content = relationship("NodeContent", back_populates="node", uselist=False, cascade="all, delete-orphan")
     links = relationship("NodeLink", back_populates="node", cascade="all, delete-orphan", foreign_keys="NodeLink.node_id", primaryjoin="Node.node_id==NodeLink.node_id")
 
+    # Hot query paths: sibling lookups in create_node/reorder_nodes, ordered
+    # curriculum listings and descendant walks. Partial indexes cover active rows only.
+    __table_args__ = (
+        Index("idx_nodes_siblings", "curriculum_id", "parent_node_id", "deleted_at", "order_index"),
+        Index(
+            "idx_nodes_active_order", "curriculum_id", "order_index", "node_id",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_nodes_active_children", "parent_node_id",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
     def __repr__(self):
         return f"<Node(node_id='{self.node_id}', title='{self.title}', curriculum_id='{self.curriculum_id}')>"
 
@@ -89,5 +103,14 @@ class NodeLink(Base):
     youtube_video = relationship("YouTubeVideo") # Assuming YouTubeVideo model exists
     linked_node = relationship("Node", foreign_keys=[linked_node_id], primaryjoin="NodeLink.linked_node_id==Node.node_id")  # For node-to-node links
 
+    # get_node_links / get_node_to_node_links (outgoing) and incoming node-to-node lookups
+    __table_args__ = (
+        Index("idx_node_links_node", "node_id", "link_type"),
+        Index(
+            "idx_node_links_linked_node", "linked_node_id",
+            sqlite_where=text("linked_node_id IS NOT NULL"), postgresql_where=text("linked_node_id IS NOT NULL"),
+        ),
+    )
+
     def __repr__(self):
         return f"<NodeLink(link_id='{self.link_id}', node_id='{self.node_id}', type='{self.link_type}')>"
@@ -8,7 +8,7 @@ DB_SCHEMA.md는 참고용이며, 실제 스키마는 이 코드에서 관리됩
 from sqlalchemy import Column, String, Text, Integer, Float, JSON, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from backend.app.db.base_class import Base
+from backend.app.models.base import Base
 import uuid
 
 
@@ -59,7 +59,8 @@ class RAGChunk(Base):
     chunk_index = Column(Integer, nullable=False)
     
     # 메타데이터 (JSON) - 덜 중요한 필드만
-    metadata = Column(JSON, nullable=False)
+    # 'metadata'는 Declarative API 예약어이므로 속성명만 바꾸고 컬럼명은 유지
+    chunk_metadata = Column("metadata", JSON, nullable=False)
     
     # ⭐ 자주 쿼리되는 필드를 컬럼으로 승격 (ENTERPRISE_OPERATIONS.md 반영)
     policy_version = Column(String(20), nullable=False)
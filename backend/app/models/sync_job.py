@@ -0,0 +1,94 @@
+"""
+Sync Job Models for MATHESIS LAB
+
+Persistent state of the background sync scheduler, shared by all workers:
+the current job per curriculum, the history of finished syncs, and the
+lease that elects the one worker allowed to run scheduled syncs.
+"""
+
+import uuid
+from datetime import datetime, UTC
+
+from sqlalchemy import Column, String, DateTime, Integer, Float, Text, Index
+
+from backend.app.models.base import Base
+
+
+class SyncJob(Base):
+    """
+    Latest sync job of a curriculum (one row per curriculum).
+
+    ``status`` is pending (requested, not started), in_progress, completed,
+    failed or paused. Any worker may request a sync by writing a pending
+    row; the leader picks it up on its next round.
+    """
+    __tablename__ = "sync_jobs"
+
+    curriculum_id = Column(String, primary_key=True)
+    status = Column(String(20), nullable=False, default="pending")
+    attempt = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)  # worker that ran or requested the job
+
+    queued_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (
+        Index("idx_sync_jobs_status", "status"),
+    )
+
+    def __repr__(self):
+        return f"<SyncJob(curriculum_id='{self.curriculum_id}', status='{self.status}')>"
+
+
+class SyncHistory(Base):
+    """
+    One finished sync (or final failure) of a curriculum.
+
+    Read newest first per curriculum with keyset pagination over
+    (created_at, id), which the composite index serves directly.
+    """
+    __tablename__ = "sync_history"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    curriculum_id = Column(String, nullable=False)
+    status = Column(String(20), nullable=False)
+    worker_id = Column(String, nullable=True)
+
+    synced_count = Column(Integer, nullable=False, default=0)
+    updated_count = Column(Integer, nullable=False, default=0)
+    deleted_count = Column(Integer, nullable=False, default=0)
+    unchanged_count = Column(Integer, nullable=False, default=0)
+    conflict_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (
+        Index("idx_sync_history_curriculum_created", "curriculum_id", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<SyncHistory(curriculum_id='{self.curriculum_id}', status='{self.status}')>"
+
+
+class SchedulerLease(Base):
+    """
+    Time-limited lease naming the worker that runs scheduled work.
+
+    The holder renews it well before ``expires_at``; once it lapses any
+    worker may take it over.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<SchedulerLease(name='{self.name}', holder='{self.holder}')>"
@@ -36,6 +36,12 @@ class SyncMetadata(Base):
     last_drive_modified = Column(DateTime, nullable=True)
     last_sync_time = Column(DateTime, nullable=True)
 
+    # Content fingerprints at the last sync: SHA-256 of the node payload
+    # (without volatile timestamps) and MD5 of the file bytes on Drive, as
+    # reported by Drive's md5Checksum
+    content_hash = Column(String(64), nullable=True)
+    drive_md5 = Column(String(32), nullable=True)
+
     # Sync status tracking
     sync_status = Column(String(20), default="pending", nullable=False)  # pending, synced, conflict, failed
     is_synced = Column(Boolean, default=False, nullable=False)
@@ -69,6 +75,10 @@ class CurriculumDriveFolder(Base):
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC), nullable=False)
     last_sync_at = Column(DateTime, nullable=True)
 
+    # Drive changes feed cursor (changes.list start page token); None until
+    # the first full sync, after which syncs only read changes since this token
+    changes_page_token = Column(String, nullable=True)
+
     curriculum = relationship("Curriculum")
 
     def __repr__(self):
@@ -2,6 +2,11 @@
 User Session Model for MATHESIS LAB
 
 Tracks active user sessions with refresh token management.
+
+Each session holds one refresh token, stored as an HMAC-SHA256 digest (see
+auth/token_digest.py) in a unique, indexed column. Refreshing rotates the
+token: the old session is revoked and points at its successor, so a rotated
+token presented again is recognized as reuse.
 """
 
 import uuid
@@ -30,9 +35,13 @@ class UserSession(Base):
     # Foreign key to user
     user_id = Column(String(36), ForeignKey("users.user_id"), nullable=False, index=True)
 
-    # Refresh token hash (never store plain tokens)
+    # HMAC-SHA256 digest of the refresh token (never store plain tokens);
+    # unique, so lookups by token are a single index probe
     refresh_token_hash = Column(String(255), nullable=False, unique=True)
 
+    # Session that replaced this one when its token was rotated
+    replaced_by_session_id = Column(String(36), nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)  # When refresh token expires
@@ -30,3 +30,8 @@ class CurriculumResponse(CurriculumBase):
     updated_at: datetime = Field(..., description="마지막 정보 수정 시각")
     nodes: List['NodeResponse'] = []
     model_config = ConfigDict(from_attributes=True)
+
+class CurriculumImportResponse(BaseModel):
+    curriculum_id: str = Field(..., description="가져오기로 생성된 커리큘럼 맵 ID")
+    node_count: int = Field(..., ge=0, description="가져온 노드 수")
+    link_count: int = Field(..., ge=0, description="가져온 링크 수")
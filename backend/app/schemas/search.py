@@ -0,0 +1,20 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class NodeSearchHit(BaseModel):
+    node_id: str = Field(..., description="노드 고유 식별자")
+    curriculum_id: str = Field(..., description="노드가 속한 커리큘럼 맵 ID")
+    node_type: str = Field(..., description="노드 타입")
+    title_highlight: str = Field(..., description="HTML 이스케이프된 노드 제목 (검색어는 <mark>로 강조)")
+    snippet: Optional[str] = Field(None, description="HTML 이스케이프된 본문 발췌 (검색어는 <mark>로 강조)")
+    score: float = Field(..., description="관련도 점수 (높을수록 관련성 높음)")
+
+
+class NodeSearchResponse(BaseModel):
+    query: str = Field(..., description="검색어")
+    results: List[NodeSearchHit] = Field(default_factory=list, description="관련도 순 검색 결과")
+    limit: int = Field(..., description="페이지 크기")
+    offset: int = Field(..., description="건너뛴 결과 수")
+    has_more: bool = Field(..., description="다음 페이지 존재 여부")
@@ -31,6 +31,7 @@ class SyncStartResponse(BaseModel):
     synced_count: int = Field(0, description="Number of nodes synced")
     updated_count: int = Field(0, description="Number of nodes updated")
     deleted_count: int = Field(0, description="Number of nodes deleted")
+    unchanged_count: int = Field(0, description="Number of nodes whose upload was skipped (content unchanged)")
     conflict_count: int = Field(0, description="Number of conflicts encountered")
     direction: str = Field(..., description="Sync direction")
 
@@ -41,6 +42,7 @@ class SyncStartResponse(BaseModel):
             "synced_count": 5,
             "updated_count": 2,
             "deleted_count": 0,
+            "unchanged_count": 3,
             "conflict_count": 1,
             "direction": "bidirectional"
         }
@@ -66,14 +68,48 @@ class SyncStatusResponse(BaseModel):
         }
 
 
+class SyncPlanResponse(BaseModel):
+    """Dry-run result: what a sync would do, without doing it"""
+    curriculum_id: str = Field(..., description="UUID of curriculum")
+    direction: str = Field(..., description="Sync direction")
+    mode: str = Field(..., description="How Drive was read: 'full' listing, 'incremental' changes feed, or 'local'")
+    upload_creates: List[str] = Field([], description="Node IDs that would be created on Drive")
+    upload_updates: List[str] = Field([], description="Node IDs that would be updated on Drive")
+    remote_trashes: List[str] = Field([], description="Deleted node IDs whose Drive files would be trashed")
+    download_creates: List[str] = Field([], description="Drive file IDs that would become new local nodes")
+    download_updates: List[str] = Field([], description="Drive file IDs that would update local nodes")
+    local_deletes: List[str] = Field([], description="Node IDs that would be deleted locally")
+    conflicts: List[str] = Field([], description="Node IDs changed both locally and on Drive")
+    counts: Dict[str, int] = Field({}, description="Number of items per action")
+
+    class Config:
+        example = {
+            "curriculum_id": "550e8400-e29b-41d4-a716-446655440000",
+            "direction": "bidirectional",
+            "mode": "incremental",
+            "upload_creates": ["550e8400-e29b-41d4-a716-446655440001"],
+            "upload_updates": [],
+            "remote_trashes": [],
+            "download_creates": [],
+            "download_updates": ["1AbCdEf"],
+            "local_deletes": [],
+            "conflicts": [],
+            "counts": {"upload_creates": 1, "download_updates": 1}
+        }
+
+
 class SyncHistoryEntry(BaseModel):
     """Single sync history entry"""
     timestamp: str = Field(..., description="When the sync occurred")
     status: str = Field(..., description="Sync status (completed, failed)")
     synced_count: int = Field(0, description="Number of nodes synced")
     updated_count: int = Field(0, description="Number of nodes updated")
+    deleted_count: int = Field(0, description="Number of nodes deleted")
+    unchanged_count: int = Field(0, description="Number of nodes skipped as unchanged")
     conflict_count: int = Field(0, description="Number of conflicts")
     error_count: int = Field(0, description="Number of errors")
+    duration_seconds: Optional[float] = Field(None, description="How long the sync took")
+    error: Optional[str] = Field(None, description="Failure reason if the sync failed")
 
     class Config:
         example = {
@@ -81,8 +117,11 @@ class SyncHistoryEntry(BaseModel):
             "status": "completed",
             "synced_count": 5,
             "updated_count": 2,
+            "deleted_count": 0,
+            "unchanged_count": 40,
             "conflict_count": 0,
-            "error_count": 0
+            "error_count": 0,
+            "duration_seconds": 1.8
         }
 
 
@@ -90,7 +129,8 @@ class SyncHistoryResponse(BaseModel):
     """Response with synchronization history"""
     curriculum_id: str = Field(..., description="UUID of curriculum")
     entries: List[SyncHistoryEntry] = Field([], description="List of sync history entries")
-    total_entries: int = Field(0, description="Total number of history entries")
+    total_entries: int = Field(0, description="Number of history entries in this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next (older) page")
 
     class Config:
         example = {
@@ -105,7 +145,8 @@ class SyncHistoryResponse(BaseModel):
                     "error_count": 0
                 }
             ],
-            "total_entries": 1
+            "total_entries": 1,
+            "next_cursor": None
         }
 
 
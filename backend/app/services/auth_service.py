@@ -2,13 +2,19 @@
 Authentication Service for MATHESIS LAB
 
 Handles user authentication, registration, token management, and related business logic.
+
+Queries go through an AsyncSession (aiosqlite/asyncpg), so handlers never
+block the event loop on the database; methods that hash or verify with
+bcrypt run that work on the PasswordHandler's pool. Refresh tokens are looked up by
+their HMAC digest (auth/token_digest.py) and rotated on every refresh.
 """
 
 import logging
 from datetime import datetime, timedelta, UTC
 from typing import Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
@@ -17,6 +23,8 @@ from backend.app.models.user import User
 from backend.app.models.user_session import UserSession
 from backend.app.auth.jwt_handler import JWTHandler, JWTTokenError, TokenExpiredError, InvalidTokenFormatError
 from backend.app.auth.password_handler import PasswordHandler, WeakPasswordError
+from backend.app.auth.principal_cache import invalidate_on_commit
+from backend.app.auth.token_digest import refresh_token_digest
 from backend.app.schemas.auth import (
     LoginRequest,
     RegisterRequest,
@@ -44,6 +52,16 @@ class TokenRefreshError(AuthError):
     pass
 
 
+class TokenReuseError(TokenRefreshError):
+    """Raised when an already rotated refresh token is presented again"""
+    pass
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (as read back from SQLite) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
 class AuthService:
     """
     Authentication Service
@@ -57,12 +75,12 @@ class AuthService:
     - Session management
     """
 
-    def __init__(self, db: Session, jwt_handler: JWTHandler, password_handler: PasswordHandler):
+    def __init__(self, db: AsyncSession, jwt_handler: JWTHandler, password_handler: PasswordHandler):
         """
         Initialize authentication service.
 
         Args:
-            db: Database session
+            db: Async database session
             jwt_handler: JWT token handler
             password_handler: Password handler
         """
@@ -70,7 +88,7 @@ class AuthService:
         self.jwt_handler = jwt_handler
         self.password_handler = password_handler
 
-    def register(
+    async def register(
         self,
         email: str,
         name: str,
@@ -98,12 +116,12 @@ class AuthService:
             raise WeakPasswordError(error_msg)
 
         # Check if email already exists
-        existing_user = self.db.query(User).filter(User.email == email).first()
+        existing_user = await self.get_user_by_email(email)
         if existing_user:
             raise UserAlreadyExistsError(f"Email {email} is already registered")
 
         # Create new user
-        hashed_password = self.password_handler.hash_password(password)
+        hashed_password = await self.password_handler.hash_password_async(password)
         new_user = User(
             email=email,
             name=name,
@@ -114,26 +132,17 @@ class AuthService:
 
         # Save user to database
         self.db.add(new_user)
-        self.db.flush()  # Flush to ensure user_id is generated
+        await self.db.flush()  # Flush to ensure user_id is generated
 
-        # Create tokens
-        access_token = self.jwt_handler.create_access_token(
-            subject=new_user.user_id,
-            additional_claims={"email": new_user.email, "name": new_user.name}
-        )
-        refresh_token = self.jwt_handler.create_refresh_token(
-            subject=new_user.user_id
-        )
-
-        # Create session for refresh token
-        self._create_session(new_user.user_id, refresh_token)
+        # Create tokens and the refresh token's session
+        access_token, refresh_token = self._issue_tokens(new_user)
 
         # Commit transaction
-        self.db.commit()
+        await self.db.commit()
 
         return new_user, access_token, refresh_token
 
-    def login(
+    async def login(
         self,
         email: str,
         password: str
@@ -150,44 +159,79 @@ class AuthService:
 
         Raises:
             InvalidCredentialsError: If email/password is wrong
+            PasswordHashingBusyError: If the hashing pool is saturated
             AuthError: If login fails
         """
         # Find user by email
-        user = self.db.query(User).filter(User.email == email).first()
+        user = await self.get_user_by_email(email)
         if not user:
             raise InvalidCredentialsError("Invalid email or password")
 
         # Verify password
-        if not user.password_hash or not self.password_handler.verify_password(password, user.password_hash):
+        if not user.password_hash or not await self.password_handler.verify_password_async(password, user.password_hash):
             raise InvalidCredentialsError("Invalid email or password")
 
         # Check if user is active
         if not user.is_active:
             raise InvalidCredentialsError("Account is inactive")
 
-        # Create tokens
-        access_token = self.jwt_handler.create_access_token(
-            subject=user.user_id,
-            additional_claims={"email": user.email, "name": user.name}
-        )
-        refresh_token = self.jwt_handler.create_refresh_token(
-            subject=user.user_id
-        )
-
-        # Create session for refresh token
-        self._create_session(user.user_id, refresh_token)
+        # Create tokens and the refresh token's session
+        access_token, refresh_token = self._issue_tokens(user)
 
         # Update last login time
         user.last_login = datetime.now(UTC)
         self.db.add(user)
-        self.db.commit()
+        await self.db.commit()
+
+        return user, access_token, refresh_token
+
+    async def login_with_google(self, user_info: dict) -> Tuple[User, str, str]:
+        """
+        Sign in (or sign up) a user verified by a Google ID token.
+
+        Args:
+            user_info: Claims from OAuthHandler.extract_user_info
+                (email, name, profile_picture_url)
+
+        Returns:
+            Tuple of (user, access_token, refresh_token); the refresh token
+            has a session, like one issued by login()
+
+        Raises:
+            InvalidCredentialsError: If the account is inactive
+        """
+        user = await self.get_user_by_email(user_info["email"])
+        if user is None:
+            # OAuth users have no password
+            user = User(
+                email=user_info["email"],
+                name=user_info["name"],
+                profile_picture_url=user_info.get("profile_picture_url"),
+                password_hash=None,
+                role="user",
+                is_active=True
+            )
+            self.db.add(user)
+            await self.db.flush()  # Flush to ensure user_id is generated
+        elif not user.is_active:
+            raise InvalidCredentialsError("User account is inactive")
+        elif user_info.get("profile_picture_url"):
+            user.profile_picture_url = user_info["profile_picture_url"]
+
+        access_token, refresh_token = self._issue_tokens(user)
+        user.last_login = datetime.now(UTC)
+        await self.db.commit()
 
         return user, access_token, refresh_token
 
-    def refresh_token(self, refresh_token: str) -> Tuple[str, str]:
+    async def refresh_token(self, refresh_token: str) -> Tuple[str, str]:
         """
         Refresh access token using refresh token.
 
+        The token's session is found by digest and rotated: it is revoked and
+        linked to the new session. Presenting a rotated token again means it
+        was copied, so every session of the user is revoked.
+
         Args:
             refresh_token: Valid refresh token
 
@@ -195,15 +239,29 @@ class AuthService:
             Tuple of (new_access_token, new_refresh_token)
 
         Raises:
-            TokenRefreshError: If refresh fails
+            TokenRefreshError: If refresh fails (unknown, revoked or expired session)
+            TokenReuseError: If the token was already rotated
             TokenExpiredError: If refresh token is expired
         """
         # Verify refresh token
         claims = self.jwt_handler.verify_refresh_token(refresh_token)
         user_id = claims.get("sub")
 
+        session = await self._find_session(refresh_token)
+        if session is None or session.user_id != user_id:
+            raise TokenRefreshError("Unknown refresh token")
+        if session.replaced_by_session_id is not None:
+            await self._revoke_all_sessions(user_id)
+            await self.db.commit()
+            logger.warning(f"Refresh token reuse detected for user {user_id}; all sessions revoked")
+            raise TokenReuseError("Refresh token was already used")
+        if session.revoked_at is not None:
+            raise TokenRefreshError("Session has been revoked")
+        if _as_utc(session.expires_at) <= datetime.now(UTC):
+            raise TokenRefreshError("Session has expired")
+
         # Get user
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        user = await self.get_user_by_id(user_id)
         if not user:
             raise TokenRefreshError("User not found")
 
@@ -219,14 +277,26 @@ class AuthService:
             subject=user.user_id
         )
 
-        # Create new session
-        self._create_session(user.user_id, new_refresh_token)
-
-        self.db.commit()
+        # Rotate: the old session is retired only if no concurrent refresh got there first
+        new_session = self._create_session(user.user_id, new_refresh_token)
+        await self.db.flush()
+        rotated = (await self.db.execute(
+            update(UserSession)
+            .where(UserSession.session_id == session.session_id, UserSession.replaced_by_session_id.is_(None))
+            .values(revoked_at=datetime.now(UTC), replaced_by_session_id=new_session.session_id)
+            .execution_options(synchronize_session=False)
+        )).rowcount
+        if not rotated:
+            await self.db.delete(new_session)
+            await self._revoke_all_sessions(user_id)
+            await self.db.commit()
+            raise TokenReuseError("Refresh token was already used")
+
+        await self.db.commit()
 
         return new_access_token, new_refresh_token
 
-    def logout(self, user_id: str, refresh_token: Optional[str] = None) -> bool:
+    async def logout(self, user_id: str, refresh_token: Optional[str] = None) -> bool:
         """
         Log out user by revoking refresh token(s).
 
@@ -245,24 +315,14 @@ class AuthService:
             # Verify refresh token
             claims = self.jwt_handler.verify_refresh_token(refresh_token)
             # Revoke specific session
-            session = self.db.query(UserSession).filter(
-                UserSession.user_id == user_id,
-                UserSession.refresh_token_hash == refresh_token
-            ).first()
-            if session:
+            session = await self._find_session(refresh_token)
+            if session and session.user_id == user_id and session.revoked_at is None:
                 session.revoked_at = datetime.now(UTC)
                 self.db.add(session)
         else:
-            # Revoke all active sessions for user
-            sessions = self.db.query(UserSession).filter(
-                UserSession.user_id == user_id,
-                UserSession.revoked_at.is_(None)
-            ).all()
-            for session in sessions:
-                session.revoked_at = datetime.now(UTC)
-                self.db.add(session)
+            await self._revoke_all_sessions(user_id)
 
-        self.db.commit()
+        await self.db.commit()
         return True
 
     def verify_access_token(self, token: str) -> dict:
@@ -281,7 +341,7 @@ class AuthService:
         claims = self.jwt_handler.verify_access_token(token)
         return claims
 
-    def get_current_user(self, token: str) -> Optional[User]:
+    async def get_current_user(self, token: str) -> Optional[User]:
         """
         Get current user from access token.
 
@@ -296,10 +356,9 @@ class AuthService:
         """
         claims = self.verify_access_token(token)
         user_id = claims.get("sub")
-        user = self.db.query(User).filter(User.user_id == user_id).first()
-        return user
+        return await self.get_user_by_id(user_id)
 
-    def change_password(self, user_id: str, current_password: str, new_password: str) -> bool:
+    async def change_password(self, user_id: str, current_password: str, new_password: str) -> bool:
         """
         Change user password.
 
@@ -317,12 +376,12 @@ class AuthService:
             AuthError: If change fails
         """
         # Get user
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        user = await self.get_user_by_id(user_id)
         if not user:
             raise AuthError("User not found")
 
         # Verify current password
-        if not user.password_hash or not self.password_handler.verify_password(
+        if not user.password_hash or not await self.password_handler.verify_password_async(
             current_password, user.password_hash
         ):
             raise InvalidCredentialsError("Current password is incorrect")
@@ -333,14 +392,14 @@ class AuthService:
             raise WeakPasswordError(error_msg)
 
         # Update password
-        user.password_hash = self.password_handler.hash_password(new_password)
+        user.password_hash = await self.password_handler.hash_password_async(new_password)
         user.updated_at = datetime.now(UTC)
         self.db.add(user)
-        self.db.commit()
+        await self.db.commit()
 
         return True
 
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email address.
 
@@ -350,9 +409,9 @@ class AuthService:
         Returns:
             User object or None if not found
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return await self.db.scalar(select(User).where(User.email == email))
 
-    def get_user_by_id(self, user_id: str) -> Optional[User]:
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """
         Get user by ID.
 
@@ -362,7 +421,34 @@ class AuthService:
         Returns:
             User object or None if not found
         """
-        return self.db.query(User).filter(User.user_id == user_id).first()
+        return await self.db.get(User, user_id)
+
+    async def _find_session(self, refresh_token: str) -> Optional[UserSession]:
+        """Session holding a refresh token (one lookup on the unique digest index)."""
+        return await self.db.scalar(
+            select(UserSession).where(UserSession.refresh_token_hash == refresh_token_digest(refresh_token))
+        )
+
+    async def _revoke_all_sessions(self, user_id: str) -> None:
+        """Revoke every active session of a user (and their cached principal) in one UPDATE. Does not commit."""
+        await self.db.execute(
+            update(UserSession)
+            .where(UserSession.user_id == user_id, UserSession.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(UTC))
+        )
+        invalidate_on_commit(self.db.sync_session, user_id)
+
+    def _issue_tokens(self, user: User) -> Tuple[str, str]:
+        """Create an access and a refresh token, and the refresh token's session. Does not commit."""
+        access_token = self.jwt_handler.create_access_token(
+            subject=user.user_id,
+            additional_claims={"email": user.email, "name": user.name}
+        )
+        refresh_token = self.jwt_handler.create_refresh_token(
+            subject=user.user_id
+        )
+        self._create_session(user.user_id, refresh_token)
+        return access_token, refresh_token
 
     def _create_session(self, user_id: str, refresh_token: str) -> UserSession:
         """
@@ -377,8 +463,8 @@ class AuthService:
 
         Internal method - does not commit transaction.
         """
-        # Hash the refresh token before storing
-        token_hash = self.password_handler.hash_password(refresh_token)
+        # Store only the token's keyed digest
+        token_hash = refresh_token_digest(refresh_token)
 
         # Create session
         expires_at = datetime.now(UTC) + timedelta(days=7)
@@ -391,7 +477,7 @@ class AuthService:
         self.db.add(session)
         return session
 
-    def get_user_sessions(self, user_id: str) -> list:
+    async def get_user_sessions(self, user_id: str) -> list:
         """
         Get all valid sessions for a user.
 
@@ -401,12 +487,12 @@ class AuthService:
         Returns:
             List of valid UserSession objects
         """
-        sessions = self.db.query(UserSession).filter(
+        sessions = await self.db.scalars(select(UserSession).where(
             UserSession.user_id == user_id,
             UserSession.revoked_at.is_(None),
             UserSession.expires_at > datetime.now(UTC)
-        ).all()
-        return sessions
+        ))
+        return sessions.all()
 
     def get_password_requirements(self) -> dict:
         """
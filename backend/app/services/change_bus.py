@@ -0,0 +1,97 @@
+"""
+Change Bus for MATHESIS LAB
+
+A minimal in-process publish/subscribe channel for local curriculum edits.
+NodeService publishes after each committed write; subscribers such as the
+SyncScheduler react without NodeService knowing about them.
+
+Handlers run synchronously in the publishing thread (often a request worker
+thread), so they must be quick and thread-safe: record the event and hand
+any real work off to their own event loop or queue.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NodeChange:
+    """A committed local edit in a curriculum."""
+    curriculum_id: str
+    kind: str  # "node_created", "node_updated", "node_deleted", "node_restored", "nodes_reordered", "content_changed"
+    node_id: Optional[str] = None
+
+
+ChangeHandler = Callable[[NodeChange], None]
+
+
+class ChangeBus:
+    """
+    Thread-safe list of change handlers.
+    """
+
+    def __init__(self):
+        self._handlers: List[ChangeHandler] = []
+        self._lock = threading.Lock()
+
+    @property
+    def has_handlers(self) -> bool:
+        """Whether anyone is listening (lets publishers skip building costly events)."""
+        return bool(self._handlers)
+
+    def subscribe(self, handler: ChangeHandler) -> Callable[[], None]:
+        """
+        Register a handler for every published change.
+
+        Returns:
+            Function that unsubscribes the handler
+        """
+        with self._lock:
+            self._handlers.append(handler)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if handler in self._handlers:
+                    self._handlers.remove(handler)
+
+        return unsubscribe
+
+    def publish(self, change: NodeChange) -> None:
+        """Deliver a change to all handlers; a failing handler does not affect the others."""
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            try:
+                handler(change)
+            except Exception:
+                logger.exception(f"Change handler failed for {change}")
+
+
+# Singleton instance shared by publishers and subscribers in the process
+_change_bus_instance: Optional[ChangeBus] = None
+
+
+def get_change_bus() -> ChangeBus:
+    """
+    Get or create the process-wide change bus.
+
+    Returns:
+        ChangeBus instance
+    """
+    global _change_bus_instance
+    if _change_bus_instance is None:
+        _change_bus_instance = ChangeBus()
+    return _change_bus_instance
+
+
+def publish_node_change(curriculum_id, kind: str, node_id=None) -> None:
+    """Publish a committed edit of a curriculum on the process-wide bus."""
+    get_change_bus().publish(NodeChange(
+        curriculum_id=str(curriculum_id),
+        kind=kind,
+        node_id=str(node_id) if node_id is not None else None,
+    ))
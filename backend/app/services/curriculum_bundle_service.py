@@ -0,0 +1,511 @@
+"""
+Curriculum Bundle Service for MATHESIS LAB
+
+Exports a curriculum (node tree, node contents and link records) as a
+newline-delimited JSON bundle and imports such bundles back as a new curriculum.
+
+Both directions stream: export walks the tree with a server-side cursor and
+import writes fixed-size batches, so memory stays bounded regardless of how many
+nodes the curriculum has.
+
+Bundle layout (one JSON object per line):
+    {"type": "header", "format": "mathesis-curriculum-bundle", "version": 1, ...}
+    {"type": "curriculum", "title": ..., "description": ..., "is_public": ...}
+    {"type": "node", "node_id": ..., "parent_node_id": ..., "content": {...}}   (parents before children)
+    {"type": "link", "node_id": ..., "link_type": ..., ...}
+"""
+
+import gzip
+import io
+import json
+import uuid
+import zlib
+from datetime import datetime, UTC
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, insert, literal, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from backend.app.models.node import Node, NodeContent, NodeLink
+from backend.app.models.youtube_video import YouTubeVideo
+from backend.app.models.zotero_item import ZoteroItem
+from backend.app.schemas.curriculum import CurriculumCreate
+from backend.app.services.curriculum_service import CurriculumService
+from backend.app.services.dependency_graph import invalidate_dependency_graph
+
+BUNDLE_FORMAT = "mathesis-curriculum-bundle"
+BUNDLE_VERSION = 1
+
+# Rows fetched per cursor round-trip on export / rows per INSERT batch on import
+BUNDLE_BATCH_SIZE = 1000
+
+# Export output is flushed to the client in chunks of roughly this many bytes
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+SUPPORTED_COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_CONTENT_FIELDS = ("markdown_content", "ai_generated_summary", "ai_generated_extension", "manim_guidelines")
+_FILE_FIELDS = ("drive_file_id", "file_name", "file_size_bytes", "file_mime_type")
+
+
+def _load_zstandard():
+    """Import the optional zstandard package, raising ValueError if it is missing."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+class CurriculumBundleService:
+    """
+    Streams curriculums to and from the NDJSON bundle format.
+
+    Curriculum lookup and creation go through CurriculumService; nodes, contents
+    and links are read and written in bulk instead of one NodeService call per row.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.curriculum_service = CurriculumService(db)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def iter_export_records(self, curriculum_id: UUID) -> Iterator[Dict[str, Any]]:
+        """
+        Yield bundle records for a curriculum one at a time.
+
+        Nodes are produced by a recursive CTE ordered by depth, so every parent
+        precedes its children and import never needs a lookup table.
+
+        Raises:
+            ValueError: If the curriculum does not exist
+        """
+        curriculum = self.curriculum_service.get_curriculum(curriculum_id)
+        if curriculum is None:
+            raise ValueError(f"Curriculum with ID {curriculum_id} not found.")
+        str_curriculum_id = str(curriculum.curriculum_id)
+
+        yield {
+            "type": "header",
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "exported_at": datetime.now(UTC).isoformat(),
+        }
+        yield {
+            "type": "curriculum",
+            "curriculum_id": str_curriculum_id,
+            "title": curriculum.title,
+            "description": curriculum.description,
+            "is_public": curriculum.is_public,
+        }
+
+        yield from self._iter_node_records(str_curriculum_id)
+        yield from self._iter_link_records(str_curriculum_id)
+
+    @staticmethod
+    def _exported_tree(curriculum_id: str):
+        """Recursive CTE of (node_id, depth) for the nodes a bundle exports: live nodes under live ancestors."""
+        tree = (
+            select(Node.node_id, literal(0).label("depth"))
+            .where(
+                Node.curriculum_id == curriculum_id,
+                Node.parent_node_id.is_(None),
+                Node.deleted_at.is_(None),
+            )
+            .cte("tree", recursive=True)
+        )
+        child = aliased(Node)
+        tree = tree.union_all(
+            select(child.node_id, (tree.c.depth + 1).label("depth"))
+            .join(tree, child.parent_node_id == tree.c.node_id)
+            .where(child.deleted_at.is_(None))
+        )
+        return tree
+
+    def _iter_node_records(self, curriculum_id: str) -> Iterator[Dict[str, Any]]:
+        tree = self._exported_tree(curriculum_id)
+        stmt = (
+            select(
+                Node.node_id,
+                Node.parent_node_id,
+                Node.node_type,
+                Node.title,
+                Node.order_index,
+                NodeContent.content_id,
+                *[getattr(NodeContent, field) for field in _CONTENT_FIELDS],
+            )
+            .join(tree, tree.c.node_id == Node.node_id)
+            .outerjoin(
+                NodeContent,
+                and_(NodeContent.node_id == Node.node_id, NodeContent.deleted_at.is_(None)),
+            )
+            .order_by(tree.c.depth, Node.parent_node_id, Node.order_index)
+            .execution_options(yield_per=BUNDLE_BATCH_SIZE)
+        )
+
+        for row in self.db.execute(stmt).mappings():
+            content = None
+            if row["content_id"] is not None:
+                content = {field: row[field] for field in _CONTENT_FIELDS}
+            yield {
+                "type": "node",
+                "node_id": row["node_id"],
+                "parent_node_id": row["parent_node_id"],
+                "node_type": row["node_type"],
+                "title": row["title"],
+                "order_index": row["order_index"],
+                "content": content,
+            }
+
+    def _iter_link_records(self, curriculum_id: str) -> Iterator[Dict[str, Any]]:
+        # Only links between exported nodes: a node under a deleted ancestor
+        # is not in the bundle, so links to or from it could not be remapped
+        tree = self._exported_tree(curriculum_id)
+        stmt = (
+            select(
+                NodeLink.node_id,
+                NodeLink.link_type,
+                NodeLink.link_relationship,
+                NodeLink.linked_node_id,
+                *[getattr(NodeLink, field) for field in _FILE_FIELDS],
+                ZoteroItem.zotero_key,
+                ZoteroItem.title.label("zotero_title"),
+                ZoteroItem.authors.label("zotero_authors"),
+                ZoteroItem.publication_year.label("zotero_publication_year"),
+                ZoteroItem.tags.label("zotero_tags"),
+                ZoteroItem.item_type.label("zotero_item_type"),
+                ZoteroItem.abstract.label("zotero_abstract"),
+                ZoteroItem.url.label("zotero_url"),
+                YouTubeVideo.video_id.label("youtube_video_key"),
+                YouTubeVideo.title.label("youtube_title"),
+                YouTubeVideo.channel_title.label("youtube_channel_title"),
+                YouTubeVideo.thumbnail_url.label("youtube_thumbnail_url"),
+                YouTubeVideo.duration_seconds.label("youtube_duration_seconds"),
+            )
+            .join(tree, tree.c.node_id == NodeLink.node_id)
+            .outerjoin(ZoteroItem, ZoteroItem.zotero_item_id == NodeLink.zotero_item_id)
+            .outerjoin(YouTubeVideo, YouTubeVideo.youtube_video_id == NodeLink.youtube_video_id)
+            .where(
+                NodeLink.deleted_at.is_(None),
+                or_(NodeLink.linked_node_id.is_(None), NodeLink.linked_node_id.in_(select(tree.c.node_id))),
+            )
+            .order_by(NodeLink.node_id, NodeLink.created_at)
+            .execution_options(yield_per=BUNDLE_BATCH_SIZE)
+        )
+
+        for row in self.db.execute(stmt).mappings():
+            record = {
+                "type": "link",
+                "node_id": row["node_id"],
+                "link_type": row["link_type"],
+                "link_relationship": row["link_relationship"],
+                "linked_node_id": row["linked_node_id"],
+            }
+            record.update({field: row[field] for field in _FILE_FIELDS})
+            if row["zotero_key"] is not None:
+                record["zotero"] = {
+                    "zotero_key": row["zotero_key"],
+                    "title": row["zotero_title"],
+                    "authors": row["zotero_authors"],
+                    "publication_year": row["zotero_publication_year"],
+                    "tags": row["zotero_tags"],
+                    "item_type": row["zotero_item_type"],
+                    "abstract": row["zotero_abstract"],
+                    "url": row["zotero_url"],
+                }
+            if row["youtube_video_key"] is not None:
+                record["youtube"] = {
+                    "video_id": row["youtube_video_key"],
+                    "title": row["youtube_title"],
+                    "channel_title": row["youtube_channel_title"],
+                    "thumbnail_url": row["youtube_thumbnail_url"],
+                    "duration_seconds": row["youtube_duration_seconds"],
+                }
+            yield record
+
+    def export_curriculum(self, curriculum_id: UUID, compression: str = COMPRESSION_NONE) -> Iterator[bytes]:
+        """
+        Stream a curriculum bundle as (optionally compressed) bytes.
+
+        The curriculum is looked up eagerly so a missing ID fails before any
+        bytes are produced.
+
+        Args:
+            curriculum_id: Curriculum to export
+            compression: "none", "gzip" or "zstd"
+
+        Returns:
+            Iterator of byte chunks suitable for a StreamingResponse
+
+        Raises:
+            ValueError: If the curriculum does not exist or compression is unsupported
+        """
+        if compression not in SUPPORTED_COMPRESSIONS:
+            raise ValueError(f"Unsupported compression '{compression}'. Use one of {SUPPORTED_COMPRESSIONS}.")
+        if compression == COMPRESSION_ZSTD:
+            compressor = _load_zstandard().ZstdCompressor().compressobj()
+        elif compression == COMPRESSION_GZIP:
+            compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        else:
+            compressor = None
+
+        records = self.iter_export_records(curriculum_id)
+        first = next(records)  # Raises ValueError for unknown curriculum
+        return self._encode(first, records, compressor)
+
+    @staticmethod
+    def _encode(first: Dict[str, Any], records: Iterator[Dict[str, Any]], compressor) -> Iterator[bytes]:
+        buffer = bytearray(json.dumps(first, ensure_ascii=False).encode("utf-8") + b"\n")
+        for record in records:
+            buffer += json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+            buffer += b"\n"
+            if len(buffer) >= _EXPORT_CHUNK_BYTES:
+                chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+                buffer.clear()
+                if chunk:
+                    yield chunk
+
+        tail = compressor.compress(bytes(buffer)) + compressor.flush() if compressor else bytes(buffer)
+        if tail:
+            yield tail
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def open_bundle(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+        """
+        Decode a bundle stream into records, detecting gzip/zstd by magic bytes.
+
+        Args:
+            stream: Binary file object positioned at the start of the bundle
+
+        Raises:
+            ValueError: If a line is not valid JSON
+        """
+        if stream.seekable():
+            magic = stream.read(4)
+            stream.seek(0)
+        else:
+            stream = io.BufferedReader(stream)
+            magic = stream.peek(4)[:4]
+
+        if magic.startswith(_GZIP_MAGIC):
+            raw = gzip.GzipFile(fileobj=stream, mode="rb")
+        elif magic == _ZSTD_MAGIC:
+            raw = _load_zstandard().ZstdDecompressor().stream_reader(stream)
+        else:
+            raw = stream
+
+        for line_number, line in enumerate(io.TextIOWrapper(raw, encoding="utf-8"), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid bundle record on line {line_number}: {e}")
+
+    def import_curriculum(self, stream: BinaryIO, owner_user=None, title: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Import a bundle as a brand-new curriculum.
+
+        Node IDs are remapped deterministically with uuid5(new_curriculum_id, old_id),
+        so parent and link references can be rewritten without holding an ID map.
+
+        Args:
+            stream: Binary bundle stream (plain, gzip or zstd)
+            owner_user: User creating the curriculum (for GDrive folder creation)
+            title: Optional title override for the imported curriculum
+
+        Returns:
+            Summary with the new curriculum_id and imported node/link counts
+
+        Raises:
+            ValueError: If the bundle is malformed
+        """
+        records = self.open_bundle(stream)
+
+        header = next(records, None)
+        if not header or header.get("type") != "header" or header.get("format") != BUNDLE_FORMAT:
+            raise ValueError("Not a curriculum bundle: missing header record.")
+        if header.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported bundle version {header.get('version')}.")
+
+        curriculum_record = next(records, None)
+        if not curriculum_record or curriculum_record.get("type") != "curriculum":
+            raise ValueError("Bundle is missing the curriculum record.")
+
+        curriculum = self.curriculum_service.create_curriculum(
+            CurriculumCreate(
+                title=title or curriculum_record["title"],
+                description=curriculum_record.get("description"),
+                is_public=curriculum_record.get("is_public", False),
+            ),
+            owner_user=owner_user,
+        )
+        new_curriculum_id = curriculum.curriculum_id
+
+        try:
+            counts = _BundleWriter(self.db, new_curriculum_id).write(records)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.curriculum_service.delete_curriculum(new_curriculum_id)
+            raise
+        invalidate_dependency_graph(new_curriculum_id)
+
+        return {"curriculum_id": new_curriculum_id, **counts}
+
+
+class _BundleWriter:
+    """Buffers imported records and flushes them with executemany INSERTs."""
+
+    def __init__(self, db: Session, curriculum_id: str):
+        self.db = db
+        self.curriculum_id = curriculum_id
+        self.namespace = UUID(curriculum_id)
+        self.nodes: List[Dict[str, Any]] = []
+        self.contents: List[Dict[str, Any]] = []
+        self.links: List[Dict[str, Any]] = []
+        self.node_count = 0
+        self.link_count = 0
+
+    def _remap(self, node_id: Optional[str]) -> Optional[str]:
+        return str(uuid.uuid5(self.namespace, node_id)) if node_id else None
+
+    def write(self, records: Iterator[Dict[str, Any]]) -> Dict[str, int]:
+        for record in records:
+            record_type = record.get("type")
+            if record_type == "node":
+                if self.links:
+                    raise ValueError("Bundle node records must precede link records.")
+                self._add_node(record)
+            elif record_type == "link":
+                self._flush_nodes()
+                self._add_link(record)
+            else:
+                raise ValueError(f"Unexpected bundle record type '{record_type}'.")
+
+        self._flush_nodes()
+        self._flush_links()
+        return {"node_count": self.node_count, "link_count": self.link_count}
+
+    def _add_node(self, record: Dict[str, Any]) -> None:
+        node_id = self._remap(record["node_id"])
+        self.nodes.append({
+            "node_id": node_id,
+            "curriculum_id": self.curriculum_id,
+            "parent_node_id": self._remap(record.get("parent_node_id")),
+            "node_type": record.get("node_type") or "CONTENT",
+            "title": record["title"],
+            "order_index": record.get("order_index", 0),
+        })
+        content = record.get("content")
+        if content is not None:
+            self.contents.append({"node_id": node_id, **{f: content.get(f) for f in _CONTENT_FIELDS}})
+        if len(self.nodes) >= BUNDLE_BATCH_SIZE:
+            self._flush_nodes()
+
+    def _flush_nodes(self) -> None:
+        if self.nodes:
+            self.db.execute(insert(Node), self.nodes)
+            self.node_count += len(self.nodes)
+            self.nodes = []
+        if self.contents:
+            self.db.execute(insert(NodeContent), self.contents)
+            self.contents = []
+
+    def _add_link(self, record: Dict[str, Any]) -> None:
+        self.links.append(record)
+        if len(self.links) >= BUNDLE_BATCH_SIZE:
+            self._flush_links()
+
+    def _flush_links(self) -> None:
+        if not self.links:
+            return
+
+        zotero_ids = self._resolve_zotero_items([r["zotero"] for r in self.links if r.get("zotero")])
+        youtube_ids = self._resolve_youtube_videos([r["youtube"] for r in self.links if r.get("youtube")])
+
+        endpoints = {
+            self._remap(node_id)
+            for record in self.links
+            for node_id in (record["node_id"], record.get("linked_node_id"))
+            if node_id
+        }
+        imported = set(
+            self.db.scalars(
+                select(Node.node_id).where(Node.curriculum_id == self.curriculum_id, Node.node_id.in_(endpoints))
+            )
+        )
+        for record in self.links:
+            for node_id in (record["node_id"], record.get("linked_node_id")):
+                if node_id and self._remap(node_id) not in imported:
+                    raise ValueError(f"Bundle link references node '{node_id}', which is not in the bundle.")
+
+        rows = []
+        for record in self.links:
+            row = {
+                "node_id": self._remap(record["node_id"]),
+                "link_type": record["link_type"],
+                "link_relationship": record.get("link_relationship"),
+                "linked_node_id": self._remap(record.get("linked_node_id")),
+                "zotero_item_id": zotero_ids.get(record["zotero"]["zotero_key"]) if record.get("zotero") else None,
+                "youtube_video_id": youtube_ids.get(record["youtube"]["video_id"]) if record.get("youtube") else None,
+            }
+            row.update({field: record.get(field) for field in _FILE_FIELDS})
+            rows.append(row)
+
+        self.db.execute(insert(NodeLink), rows)
+        self.link_count += len(rows)
+        self.links = []
+
+    def _resolve_zotero_items(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Get-or-create ZoteroItems by their external key, one query per batch."""
+        wanted = {item["zotero_key"]: item for item in items}
+        if not wanted:
+            return {}
+        existing = dict(
+            self.db.execute(
+                select(ZoteroItem.zotero_key, ZoteroItem.zotero_item_id).where(ZoteroItem.zotero_key.in_(wanted))
+            ).all()
+        )
+        missing = [
+            {"zotero_item_id": str(uuid.uuid4()), **item}
+            for key, item in wanted.items() if key not in existing
+        ]
+        if missing:
+            self.db.execute(insert(ZoteroItem), missing)
+            existing.update({row["zotero_key"]: row["zotero_item_id"] for row in missing})
+        return existing
+
+    def _resolve_youtube_videos(self, videos: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Get-or-create YouTubeVideos by their YouTube video ID, one query per batch."""
+        wanted = {video["video_id"]: video for video in videos}
+        if not wanted:
+            return {}
+        existing = dict(
+            self.db.execute(
+                select(YouTubeVideo.video_id, YouTubeVideo.youtube_video_id).where(YouTubeVideo.video_id.in_(wanted))
+            ).all()
+        )
+        missing = [
+            {"youtube_video_id": str(uuid.uuid4()), **video}
+            for key, video in wanted.items() if key not in existing
+        ]
+        if missing:
+            self.db.execute(insert(YouTubeVideo), missing)
+            existing.update({row["video_id"]: row["youtube_video_id"] for row in missing})
+        return existing
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from backend.app.db.pagination import DEFAULT_PAGE_SIZE, paginate_keyset
 from backend.app.models.curriculum import Curriculum
 from backend.app.schemas.curriculum import CurriculumCreate, CurriculumUpdate
 
@@ -9,8 +10,32 @@ class CurriculumService:
     def __init__(self, db: Session):
         self.db = db
 
+    # Listing order; backed by idx_curriculums_created and idx_curriculums_public_created
+    _LISTING_KEYS = (Curriculum.created_at, Curriculum.curriculum_id)
+
     def get_all_curriculums(self) -> list[Curriculum]:
-        return self.db.query(Curriculum).all()
+        return self.db.query(Curriculum).order_by(*self._LISTING_KEYS).all()
+
+    def get_curriculums_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        public_only: bool = False,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated curriculum listing ordered by (created_at, curriculum_id).
+
+        Returns:
+            Dict with "items", "next_cursor" and "total_estimate" (see paginate_keyset)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = self.db.query(Curriculum)
+        if public_only:
+            query = query.filter(Curriculum.is_public == True)
+        return paginate_keyset(query, self._LISTING_KEYS, limit=limit, cursor=cursor, include_total=include_total)
 
     def create_curriculum(self, curriculum_in: CurriculumCreate, owner_user=None) -> Curriculum:
         db_curriculum = Curriculum(
@@ -42,7 +67,15 @@ class CurriculumService:
         return self.db.query(Curriculum).filter(Curriculum.curriculum_id == str(curriculum_id)).first()
 
     def get_public_curriculums(self, skip: int = 0, limit: int = 100) -> list[Curriculum]:
-        return self.db.query(Curriculum).filter(Curriculum.is_public == True).offset(skip).limit(limit).all()
+        """Offset-paginated public listing, kept for clients that still send ``skip``."""
+        return (
+            self.db.query(Curriculum)
+            .filter(Curriculum.is_public == True)
+            .order_by(*self._LISTING_KEYS)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
     def update_curriculum(self, curriculum_id: UUID, curriculum_in: CurriculumUpdate) -> Optional[Curriculum]:
         db_curriculum = self.get_curriculum(curriculum_id)
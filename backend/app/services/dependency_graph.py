@@ -0,0 +1,350 @@
+"""
+Node Dependency Graph for MATHESIS LAB
+
+Prerequisite analysis over node-to-node links. A link ``A -[DEPENDS_ON]-> B``
+(or ``EXTENDS``) means B must be learned before A.
+
+Each curriculum's graph is loaded from ``node_links`` in a single query and
+stored as compact integer-indexed adjacency arrays (CSR: one offsets array and
+one targets array per direction), so traversals touch only ``array('i')``
+buffers instead of ORM objects. Graphs are cached per process until a write
+in this process (``NodeService``, Drive sync, bundle import) invalidates them,
+or at most ``DEPENDENCY_GRAPH_CACHE_TTL_SECONDS`` so that writes made by other
+workers are picked up too.
+"""
+
+import heapq
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, aliased
+
+from backend.app.core.config import settings
+from backend.app.models.node import Node, NodeLink
+
+# Relationships that impose a learning order (source requires target first)
+PREREQUISITE_RELATIONSHIPS = ("DEPENDS_ON", "EXTENDS")
+
+
+def _build_csr(node_count: int, edges: Sequence[Tuple[int, int]]) -> Tuple[array, array]:
+    """Build (offsets, targets) so that targets[offsets[u]:offsets[u + 1]] are u's neighbours."""
+    offsets = array("i", bytes(4 * (node_count + 1)))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    targets = array("i", bytes(4 * len(edges)))
+    cursor = array("i", offsets[:node_count])
+    for source, target in edges:
+        targets[cursor[source]] = target
+        cursor[source] += 1
+    return offsets, targets
+
+
+class DependencyCycleError(ValueError):
+    """Raised when prerequisite links form (or would form) a cycle."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Dependency cycle detected: " + " -> ".join(cycle))
+
+
+class DependencyGraph:
+    """
+    Immutable prerequisite graph of one curriculum.
+
+    Nodes are numbered 0..n-1 in curriculum outline order (depth-first by
+    order_index); that order is also the tie-break for the learning order.
+    """
+
+    def __init__(self, node_ids: Sequence[str], edges: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            node_ids: Active node IDs in outline order
+            edges: (node_id, prerequisite_node_id) pairs
+        """
+        self.node_ids: List[str] = list(node_ids)
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+        pairs = []
+        seen = set()
+        for node_id, prerequisite_id in edges:
+            u, v = self.index.get(node_id), self.index.get(prerequisite_id)
+            if u is None or v is None or (u, v) in seen:
+                continue
+            seen.add((u, v))
+            pairs.append((u, v))
+
+        n = len(self.node_ids)
+        self.edge_count = len(pairs)
+        # node -> its direct prerequisites, and prerequisite -> its direct dependents
+        self._prereq_offsets, self._prereq_targets = _build_csr(n, pairs)
+        self._dep_offsets, self._dep_targets = _build_csr(n, [(v, u) for u, v in pairs])
+        self._topological_rank: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def _require(self, node_id: str) -> int:
+        try:
+            return self.index[str(node_id)]
+        except KeyError:
+            raise ValueError(f"Node {node_id} is not an active node of this curriculum")
+
+    def _bfs(self, start: int, offsets: array, targets: array, goal: int = -1) -> Tuple[List[int], array]:
+        """Breadth-first walk from ``start``; returns (visit order, parent array)."""
+        parent = array("i", [-1]) * len(self.node_ids)
+        parent[start] = start
+        order = []
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if parent[v] == -1:
+                    parent[v] = u
+                    if v == goal:
+                        return order + [v], parent
+                    order.append(v)
+                    queue.append(v)
+        return order, parent
+
+    def _find_cycle(self) -> List[int]:
+        """Return one prerequisite cycle as node indexes (first == last), or []."""
+        n = len(self.node_ids)
+        state = bytearray(n)  # 0 = unvisited, 1 = on stack, 2 = done
+        offsets, targets = self._prereq_offsets, self._prereq_targets
+        for root in range(n):
+            if state[root]:
+                continue
+            stack = [(root, offsets[root])]
+            path = [root]
+            state[root] = 1
+            while stack:
+                u, k = stack[-1]
+                if k == offsets[u + 1]:
+                    stack.pop()
+                    path.pop()
+                    state[u] = 2
+                    continue
+                stack[-1] = (u, k + 1)
+                v = targets[k]
+                if state[v] == 1:
+                    return path[path.index(v):] + [v]
+                if state[v] == 0:
+                    state[v] = 1
+                    stack.append((v, offsets[v]))
+                    path.append(v)
+        return []
+
+    def topological_order(self) -> List[str]:
+        """
+        Learning order: every node appears after all of its prerequisites.
+        Independent nodes keep curriculum outline order.
+
+        Raises:
+            DependencyCycleError: If the prerequisite links contain a cycle
+        """
+        n = len(self.node_ids)
+        offsets = self._prereq_offsets
+        remaining = array("i", (offsets[u + 1] - offsets[u] for u in range(n)))
+        ready = [u for u in range(n) if remaining[u] == 0]
+        heapq.heapify(ready)
+
+        order = []
+        while ready:
+            v = heapq.heappop(ready)
+            order.append(v)
+            for k in range(self._dep_offsets[v], self._dep_offsets[v + 1]):
+                u = self._dep_targets[k]
+                remaining[u] -= 1
+                if remaining[u] == 0:
+                    heapq.heappush(ready, u)
+
+        if len(order) < n:
+            raise DependencyCycleError([self.node_ids[i] for i in self._find_cycle()])
+
+        rank = array("i", bytes(4 * n))
+        for position, u in enumerate(order):
+            rank[u] = position
+        self._topological_rank = rank
+        return [self.node_ids[u] for u in order]
+
+    def _in_learning_order(self, indexes: List[int]) -> List[str]:
+        if self._topological_rank is None:
+            try:
+                self.topological_order()
+            except DependencyCycleError:
+                # Keep BFS (nearest first) order when no consistent order exists
+                return [self.node_ids[i] for i in indexes]
+        rank = self._topological_rank
+        return [self.node_ids[i] for i in sorted(indexes, key=rank.__getitem__)]
+
+    def prerequisites(self, node_id: str, transitive: bool = True) -> List[str]:
+        """Prerequisites of ``node_id`` (direct or transitive), in learning order."""
+        u = self._require(node_id)
+        if not transitive:
+            found = list(self._prereq_targets[self._prereq_offsets[u]:self._prereq_offsets[u + 1]])
+        else:
+            found, _ = self._bfs(u, self._prereq_offsets, self._prereq_targets)
+        return self._in_learning_order([i for i in found if i != u])
+
+    def dependents(self, node_id: str, transitive: bool = True) -> List[str]:
+        """Nodes that require ``node_id`` (directly or transitively), in learning order."""
+        v = self._require(node_id)
+        if not transitive:
+            found = list(self._dep_targets[self._dep_offsets[v]:self._dep_offsets[v + 1]])
+        else:
+            found, _ = self._bfs(v, self._dep_offsets, self._dep_targets)
+        return self._in_learning_order([i for i in found if i != v])
+
+    def shortest_prerequisite_path(self, prerequisite_id: str, node_id: str) -> Optional[List[str]]:
+        """
+        Shortest chain of prerequisite links leading from ``prerequisite_id`` to
+        ``node_id``, in learning order (``[prerequisite_id, ..., node_id]``).
+
+        Returns None if ``prerequisite_id`` is not a (transitive) prerequisite.
+        """
+        start, goal = self._require(prerequisite_id), self._require(node_id)
+        if start == goal:
+            return [self.node_ids[start]]
+        _, parent = self._bfs(start, self._dep_offsets, self._dep_targets, goal=goal)
+        if parent[goal] == -1:
+            return None
+        path = [goal]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        return [self.node_ids[i] for i in reversed(path)]
+
+    def cycle_if_linked(self, node_id: str, prerequisite_id: str) -> Optional[List[str]]:
+        """
+        The cycle that adding ``node_id -> prerequisite_id`` would close, or None.
+
+        A cycle appears exactly when ``node_id`` is already a (transitive)
+        prerequisite of ``prerequisite_id``.
+        """
+        u, v = self.index.get(str(node_id)), self.index.get(str(prerequisite_id))
+        if u is None or v is None:
+            return None
+        if u == v:
+            return [self.node_ids[u], self.node_ids[u]]
+        path = self.shortest_prerequisite_path(self.node_ids[u], self.node_ids[v])
+        return None if path is None else path + [self.node_ids[u]]
+
+
+# ---------------------------------------------------------------------------
+# Per-process cache
+# ---------------------------------------------------------------------------
+
+# curriculum_id -> (expires_at, graph), expiry on the _clock() scale
+_graph_cache: Dict[str, Tuple[float, DependencyGraph]] = {}
+_graph_cache_lock = threading.Lock()
+_clock = time.monotonic
+# Invalidation counter: a graph whose load raced with an invalidation may be
+# stale and is not cached (see DependencyGraphService.load_graph)
+_graph_cache_generation = 0
+
+
+def invalidate_dependency_graph(curriculum_id: Optional[str] = None) -> None:
+    """Drop the cached graph of one curriculum (or of all curriculums)."""
+    global _graph_cache_generation
+    with _graph_cache_lock:
+        _graph_cache_generation += 1
+        if curriculum_id is None:
+            _graph_cache.clear()
+        else:
+            _graph_cache.pop(str(curriculum_id), None)
+
+
+class DependencyGraphService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _load(self, curriculum_id: str) -> DependencyGraph:
+        """Load active nodes and their in-curriculum prerequisite links in one query."""
+        target = aliased(Node)
+        prerequisite_links = (
+            select(NodeLink.node_id.label("node_id"), NodeLink.linked_node_id.label("prerequisite_id"))
+            .join(target, target.node_id == NodeLink.linked_node_id)
+            .where(
+                NodeLink.link_type == "NODE",
+                NodeLink.link_relationship.in_(PREREQUISITE_RELATIONSHIPS),
+                NodeLink.deleted_at.is_(None),
+                target.curriculum_id == curriculum_id,
+                target.deleted_at.is_(None),
+            )
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(Node.node_id, Node.parent_node_id, Node.order_index, prerequisite_links.c.prerequisite_id)
+            .outerjoin(prerequisite_links, prerequisite_links.c.node_id == Node.node_id)
+            .where(and_(Node.curriculum_id == curriculum_id, Node.deleted_at.is_(None)))
+        ).all()
+
+        children: Dict[Optional[str], List[Tuple[int, str]]] = {}
+        edges = []
+        seen = set()
+        for node_id, parent_id, order_index, prerequisite_id in rows:
+            if node_id not in seen:
+                seen.add(node_id)
+                children.setdefault(parent_id, []).append((order_index, node_id))
+            if prerequisite_id is not None:
+                edges.append((node_id, prerequisite_id))
+
+        # Outline order: depth-first by order_index; orphans (deleted parent) go last
+        outline = []
+        stack = sorted(children.pop(None, []), reverse=True)
+        while stack:
+            _, node_id = stack.pop()
+            outline.append(node_id)
+            stack.extend(sorted(children.pop(node_id, []), reverse=True))
+        for orphans in children.values():
+            outline.extend(node_id for _, node_id in sorted(orphans))
+
+        return DependencyGraph(outline, edges)
+
+    def get_graph(self, curriculum_id) -> DependencyGraph:
+        """Cached dependency graph of a curriculum (built on first use, reloaded once expired)."""
+        with _graph_cache_lock:
+            entry = _graph_cache.get(str(curriculum_id))
+        if entry is not None and entry[0] > _clock():
+            return entry[1]
+        return self.load_graph(curriculum_id)
+
+    def load_graph(self, curriculum_id) -> DependencyGraph:
+        """
+        Dependency graph of a curriculum read from the database, bypassing the cache.
+
+        Write paths validate against this: the cache only follows this
+        process's invalidations (and its TTL). The graph replaces the cached
+        one unless an invalidation happened during the load.
+        """
+        key = str(curriculum_id)
+        with _graph_cache_lock:
+            generation = _graph_cache_generation
+        graph = self._load(key)
+        ttl = settings.DEPENDENCY_GRAPH_CACHE_TTL_SECONDS
+        with _graph_cache_lock:
+            if ttl > 0 and generation == _graph_cache_generation:
+                _graph_cache[key] = (_clock() + ttl, graph)
+        return graph
+
+    def learning_order(self, curriculum_id) -> List[str]:
+        """
+        Raises:
+            DependencyCycleError: If the curriculum's prerequisite links contain a cycle
+        """
+        return self.get_graph(curriculum_id).topological_order()
+
+    def prerequisites(self, curriculum_id, node_id, transitive: bool = True) -> List[str]:
+        return self.get_graph(curriculum_id).prerequisites(str(node_id), transitive=transitive)
+
+    def dependents(self, curriculum_id, node_id, transitive: bool = True) -> List[str]:
+        return self.get_graph(curriculum_id).dependents(str(node_id), transitive=transitive)
+
+    def shortest_prerequisite_path(self, curriculum_id, prerequisite_id, node_id) -> Optional[List[str]]:
+        return self.get_graph(curriculum_id).shortest_prerequisite_path(str(prerequisite_id), str(node_id))
@@ -0,0 +1,199 @@
+"""
+Drive Executor for MATHESIS LAB
+
+Runs blocking ``googleapiclient`` requests off the event loop:
+
+- a bounded thread pool, so a sync can keep several Drive requests in flight
+  while ``await``-ing callers never block the loop
+- a token-bucket rate limiter shared by all workers, keeping request rates
+  within Drive's per-user quota
+- exponential backoff with jitter on rate-limit (403/429) and server (5xx) errors
+
+``httplib2`` connections are not thread-safe, so callers pass an ``http_factory``
+that returns a per-thread authorized connection.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from googleapiclient.errors import HttpError
+
+from backend.app.core.config import settings
+
+# 403 reasons that mean "slow down" rather than "forbidden"
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, bursts of up to ``capacity``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` (possibly going negative); return how long to wait for them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block the calling thread until ``tokens`` are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+def _error_reason(error: HttpError) -> str:
+    try:
+        return json.loads(error.content)["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed Drive request should be retried after backing off."""
+    if isinstance(error, HttpError):
+        status = int(error.resp.status)
+        if status == 429 or status >= 500:
+            return True
+        return status == 403 and _error_reason(error) in RATE_LIMIT_REASONS
+    return isinstance(error, (ConnectionError, TimeoutError, socket.timeout))
+
+
+class DriveExecutor:
+    """
+    Bounded, rate-limited worker pool for Drive API requests.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        requests_per_second: float = 10.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            max_workers: Maximum number of concurrent Drive requests
+            requests_per_second: Sustained request rate across all workers
+            burst: Token bucket capacity (defaults to one second's worth of requests)
+            max_retries: Retries after the first attempt for retryable errors
+            backoff_base: First backoff delay in seconds (doubles per retry)
+            backoff_max: Upper bound for a single backoff delay
+            sleep: Blocking sleep used for backoff (injectable for tests)
+        """
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self.rate_limiter = TokenBucket(requests_per_second, burst, sleep=sleep)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="drive")
+
+        # Counters for monitoring (approximate under concurrency)
+        self.requests = 0
+        self.retries = 0
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number ``attempt + 1`` (honours Retry-After)."""
+        retry_after = None
+        if isinstance(error, HttpError):
+            retry_after = error.resp.get("retry-after")
+        if retry_after and str(retry_after).isdigit():
+            return min(self.backoff_max, float(retry_after))
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay + random.uniform(0, self.backoff_base)
+
+    def call(self, request: Any, http_factory: Optional[Callable[[], Any]] = None, cost: int = 1) -> Any:
+        """
+        Execute a prepared googleapiclient request in the calling thread.
+
+        Args:
+            request: Object with ``execute(http=...)`` (e.g. ``service.files().get(...)``)
+            http_factory: Returns the HTTP connection to use in this thread, or None
+            cost: Quota units the request consumes (sub-requests of a batch each count)
+
+        Raises:
+            HttpError: If the request fails with a non-retryable error or retries run out
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(cost)
+            self.requests += 1
+            try:
+                http = http_factory() if http_factory else None
+                return request.execute(http=http) if http is not None else request.execute()
+            except Exception as error:
+                if attempt >= self.max_retries or not is_retryable(error):
+                    raise
+                self.retries += 1
+                self._sleep(self.backoff_delay(attempt, error))
+                attempt += 1
+
+    async def execute(
+        self,
+        request: Any,
+        http_factory: Optional[Callable[[], Any]] = None,
+        cost: int = 1,
+    ) -> Any:
+        """Run ``call`` on the worker pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.call, request, http_factory, cost)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+# Singleton instance shared by all Drive services in the process
+_drive_executor_instance: Optional[DriveExecutor] = None
+
+
+def get_drive_executor() -> DriveExecutor:
+    """
+    Get or create the process-wide Drive executor.
+
+    Returns:
+        DriveExecutor configured from settings
+    """
+    global _drive_executor_instance
+    if _drive_executor_instance is None:
+        _drive_executor_instance = DriveExecutor(
+            max_workers=settings.DRIVE_MAX_WORKERS,
+            requests_per_second=settings.DRIVE_REQUESTS_PER_SECOND,
+            max_retries=settings.DRIVE_MAX_RETRIES,
+        )
+    return _drive_executor_instance
@@ -9,21 +9,28 @@ Provides methods for:
 - File metadata tracking
 """
 
+import asyncio
 import json
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from uuid import UUID
 from datetime import datetime, UTC
 from io import BytesIO
 from pathlib import Path
 import pickle
+import threading
+
+import httplib2
 
 from backend.app.core.config import settings
+from backend.app.services.drive_executor import DriveExecutor, get_drive_executor, is_retryable
 
 # Google API imports
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google_auth_oauthlib.flow import Flow
@@ -40,6 +47,10 @@ class GoogleDriveAuthException(GoogleDriveServiceException):
     pass
 
 
+def _is_not_found(error: Exception) -> bool:
+    return isinstance(error, HttpError) and int(error.resp.status) == 404
+
+
 class GoogleDriveService:
     """
     Service for managing Google Drive integration.
@@ -52,19 +63,37 @@ class GoogleDriveService:
     FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
     JSON_MIME_TYPE = "application/json"
 
+    # Fields requested from changes.list: enough to place a change in a
+    # curriculum folder and decide whether it needs downloading
+    CHANGE_FIELDS = (
+        "nextPageToken, newStartPageToken, "
+        "changes(fileId, removed, file(id, name, parents, mimeType, modifiedTime, md5Checksum, trashed))"
+    )
+    CHANGES_PAGE_SIZE = 1000
+
+    # files.list pages: Drive's maximum page size, and only the fields sync
+    # planning reads from each node file
+    LIST_PAGE_SIZE = 1000
+    LIST_FIELDS = "nextPageToken, files(id, name, modifiedTime, md5Checksum)"
+
+    # Drive accepts at most 100 sub-requests per HTTP batch request. Media
+    # uploads and downloads cannot be batched.
+    BATCH_LIMIT = 100
+
     # Scopes needed for Drive API
     SCOPES = [
         'https://www.googleapis.com/auth/drive.file',
         'https://www.googleapis.com/auth/drive.readonly'
     ]
 
-    def __init__(self, use_service_account: bool = True):
+    def __init__(self, use_service_account: bool = True, executor: Optional[DriveExecutor] = None):
         """
         Initialize Google Drive Service.
 
         Args:
             use_service_account: If True, use Service Account credentials for server-to-server auth.
                                 If False, use OAuth 2.0 for user authentication.
+            executor: Worker pool that runs Drive requests (defaults to the shared one)
         """
         self.client_id = settings.GOOGLE_OAUTH_CLIENT_ID
         self.client_secret = settings.GOOGLE_OAUTH_CLIENT_SECRET
@@ -74,6 +103,8 @@ class GoogleDriveService:
         self.service = None
         self.credentials = None
         self.use_service_account = use_service_account
+        self.executor = executor or get_drive_executor()
+        self._local = threading.local()
 
         # Initialize with Service Account if available
         if use_service_account:
@@ -217,6 +248,25 @@ class GoogleDriveService:
         """
         self.credentials = credentials
         self.service = build('drive', 'v3', credentials=credentials)
+        self._local = threading.local()
+
+    def _thread_http(self) -> Optional[Any]:
+        """
+        Authorized HTTP connection for the current worker thread.
+
+        httplib2 connections are not thread-safe, so each executor thread gets
+        its own; without credentials (e.g. a test double) the request's default is used.
+        """
+        if self.credentials is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return http
+
+    async def _execute(self, request: Any) -> Any:
+        """Execute a prepared Drive request on the executor (rate limited, retried)."""
+        return await self.executor.execute(request, self._thread_http)
 
     def _get_service(self) -> Any:
         """
@@ -259,18 +309,39 @@ class GoogleDriveService:
             'parents': [parent_folder_id]
         }
 
-        folder = service.files().create(
+        folder = await self._execute(service.files().create(
             body=file_metadata,
             fields='id'
-        ).execute()
+        ))
 
         return folder.get('id')
 
+    @staticmethod
+    def node_file_name(node_id: Any) -> str:
+        """Name of a node's JSON file in its curriculum folder."""
+        return f"node_{str(node_id)}.json"
+
+    @staticmethod
+    def encode_node(node_data: Dict[str, Any]) -> bytes:
+        """
+        Canonical serialization of a node file: sorted keys, no whitespace.
+
+        The same data always yields the same bytes, so the MD5 of this value
+        matches the md5Checksum Drive reports for the uploaded file.
+        """
+        return json.dumps(
+            node_data, default=str, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+        ).encode('utf-8')
+
+    def _json_media(self, node_data: Dict[str, Any]) -> MediaIoBaseUpload:
+        return MediaIoBaseUpload(BytesIO(self.encode_node(node_data)), mimetype=self.JSON_MIME_TYPE)
+
     async def save_node_to_drive(
         self,
         node_id: UUID,
         node_data: Dict[str, Any],
-        curriculum_folder_id: str
+        curriculum_folder_id: str,
+        probe: bool = True,
     ) -> str:
         """
         Save node as JSON file to Google Drive.
@@ -279,6 +350,8 @@ class GoogleDriveService:
             node_id: UUID of the node
             node_data: Node data as dictionary (includes title, content, children, etc.)
             curriculum_folder_id: Curriculum folder ID on Drive
+            probe: Look for an existing file first; pass False when the caller
+                already knows the node has no file (saves one request)
 
         Returns:
             Google Drive file ID of created/updated node file
@@ -289,31 +362,28 @@ class GoogleDriveService:
         service = self._get_service()
 
         # Prepare file metadata
-        file_name = f"node_{str(node_id)}.json"
-
-        # Check if file already exists
-        existing_files = service.files().list(
-            q=f"name='{file_name}' and '{curriculum_folder_id}' in parents and trashed=false",
-            spaces='drive',
-            fields='files(id)',
-            pageSize=1
-        ).execute()
+        file_name = self.node_file_name(node_id)
 
         file_id = None
-        if existing_files.get('files'):
-            file_id = existing_files['files'][0]['id']
-
-        # Prepare JSON content
-        json_content = json.dumps(node_data, default=str, indent=2)
+        if probe:
+            # Check if file already exists
+            existing_files = await self._execute(service.files().list(
+                q=f"name='{file_name}' and '{curriculum_folder_id}' in parents and trashed=false",
+                spaces='drive',
+                fields='files(id)',
+                pageSize=1
+            ))
+            if existing_files.get('files'):
+                file_id = existing_files['files'][0]['id']
 
         if file_id:
             # Update existing file
-            service.files().update(
+            await self._execute(service.files().update(
                 fileId=file_id,
                 body={'mimeType': self.JSON_MIME_TYPE},
-                media_body=BytesIO(json_content.encode('utf-8')),
+                media_body=self._json_media(node_data),
                 fields='id'
-            ).execute()
+            ))
             return file_id
         else:
             # Create new file
@@ -323,11 +393,11 @@ class GoogleDriveService:
                 'mimeType': self.JSON_MIME_TYPE
             }
 
-            file_obj = service.files().create(
+            file_obj = await self._execute(service.files().create(
                 body=file_metadata,
-                media_body=BytesIO(json_content.encode('utf-8')),
+                media_body=self._json_media(node_data),
                 fields='id'
-            ).execute()
+            ))
 
             return file_obj.get('id')
 
@@ -346,7 +416,7 @@ class GoogleDriveService:
         """
         service = self._get_service()
 
-        content = service.files().get_media(fileId=file_id).execute()
+        content = await self._execute(service.files().get_media(fileId=file_id))
         node_data = json.loads(content.decode('utf-8'))
         return node_data
 
@@ -363,13 +433,11 @@ class GoogleDriveService:
         """
         service = self._get_service()
 
-        json_content = json.dumps(node_data, default=str, indent=2)
-
-        service.files().update(
+        await self._execute(service.files().update(
             fileId=file_id,
-            media_body=BytesIO(json_content.encode('utf-8')),
+            media_body=self._json_media(node_data),
             fields='id'
-        ).execute()
+        ))
 
     async def delete_node_from_drive(self, file_id: str) -> None:
         """
@@ -382,7 +450,45 @@ class GoogleDriveService:
             GoogleDriveServiceException: If file deletion fails
         """
         service = self._get_service()
-        service.files().delete(fileId=file_id).execute()
+        await self._execute(service.files().delete(fileId=file_id))
+
+    async def iter_nodes_on_drive(self, curriculum_folder_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every node file in a curriculum folder on Drive, page by page.
+
+        Follows nextPageToken with the maximum page size, so the listing is
+        complete however large the folder is, while only one page is held
+        at a time.
+
+        Args:
+            curriculum_folder_id: Curriculum folder ID on Drive
+
+        Yields:
+            File metadata dictionaries with id, name, modifiedTime, md5Checksum
+
+        Raises:
+            GoogleDriveServiceException: If listing fails
+        """
+        service = self._get_service()
+
+        page_token = None
+        while True:
+            try:
+                response = await self._execute(service.files().list(
+                    q=f"'{curriculum_folder_id}' in parents and mimeType='{self.JSON_MIME_TYPE}' and trashed=false",
+                    spaces='drive',
+                    fields=self.LIST_FIELDS,
+                    pageSize=self.LIST_PAGE_SIZE,
+                    pageToken=page_token
+                ))
+            except HttpError as e:
+                raise GoogleDriveServiceException(f"Failed to list nodes: {str(e)}")
+
+            for drive_file in response.get('files', []):
+                yield drive_file
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
 
     async def list_nodes_on_drive(self, curriculum_folder_id: str) -> List[Dict[str, Any]]:
         """
@@ -397,19 +503,7 @@ class GoogleDriveService:
         Raises:
             GoogleDriveServiceException: If listing fails
         """
-        service = self._get_service()
-
-        try:
-            files = service.files().list(
-                q=f"'{curriculum_folder_id}' in parents and mimeType='{self.JSON_MIME_TYPE}' and trashed=false",
-                spaces='drive',
-                fields='files(id, name, modifiedTime)',
-                pageSize=100
-            ).execute()
-
-            return files.get('files', [])
-        except HttpError as e:
-            raise GoogleDriveServiceException(f"Failed to list nodes: {str(e)}")
+        return [drive_file async for drive_file in self.iter_nodes_on_drive(curriculum_folder_id)]
 
     async def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
         """
@@ -426,13 +520,164 @@ class GoogleDriveService:
         """
         service = self._get_service()
 
-        metadata = service.files().get(
+        metadata = await self._execute(service.files().get(
             fileId=file_id,
-            fields='id, name, modifiedTime, size, mimeType'
-        ).execute()
+            fields='id, name, modifiedTime, size, mimeType, md5Checksum'
+        ))
 
         return metadata
 
+    async def get_changes_start_token(self) -> str:
+        """
+        Get the current position of the Drive changes feed.
+
+        Returns:
+            Start page token; changes.list from this token returns only later changes
+
+        Raises:
+            GoogleDriveServiceException: If the request fails
+        """
+        service = self._get_service()
+
+        try:
+            response = await self._execute(service.changes().getStartPageToken())
+            return response['startPageToken']
+        except HttpError as e:
+            raise GoogleDriveServiceException(f"Failed to get changes start token: {str(e)}")
+
+    async def list_changes(self, page_token: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        List all changes since a start page token (follows nextPageToken).
+
+        When nothing changed this is a single API call.
+
+        Args:
+            page_token: Token from get_changes_start_token or a previous list_changes
+
+        Returns:
+            (changes, new start page token) where each change has fileId,
+            removed and file (id, name, parents, mimeType, modifiedTime, trashed)
+
+        Raises:
+            GoogleDriveServiceException: If listing fails (e.g. expired token)
+        """
+        service = self._get_service()
+
+        changes = []
+        try:
+            while True:
+                response = await self._execute(service.changes().list(
+                    pageToken=page_token,
+                    spaces='drive',
+                    includeRemoved=True,
+                    pageSize=self.CHANGES_PAGE_SIZE,
+                    fields=self.CHANGE_FIELDS
+                ))
+                changes.extend(response.get('changes', []))
+                if 'newStartPageToken' in response:
+                    return changes, response['newStartPageToken']
+                page_token = response['nextPageToken']
+        except HttpError as e:
+            raise GoogleDriveServiceException(f"Failed to list changes: {str(e)}")
+
+    async def execute_batch(self, requests: List[Any]) -> List[Any]:
+        """
+        Execute metadata requests as Drive HTTP batch requests.
+
+        Requests are sent in batches of up to BATCH_LIMIT. Sub-requests that
+        fail with a retryable error (rate limit, 5xx) are retried in a later
+        batch after backing off.
+
+        Args:
+            requests: Prepared non-media requests (e.g. ``service.files().get(...)``)
+
+        Returns:
+            One entry per request, in order: the response, or the HttpError it failed with
+        """
+        service = self._get_service()
+        results: List[Any] = [None] * len(requests)
+        pending = list(range(len(requests)))
+
+        attempt = 0
+        while pending:
+            for start in range(0, len(pending), self.BATCH_LIMIT):
+                chunk = pending[start:start + self.BATCH_LIMIT]
+
+                def callback(request_id, response, exception):
+                    results[int(request_id)] = exception if exception is not None else response
+
+                batch = service.new_batch_http_request(callback=callback)
+                for index in chunk:
+                    batch.add(requests[index], request_id=str(index))
+                await self.executor.execute(batch, self._thread_http, cost=len(chunk))
+
+            retry = [i for i in pending if isinstance(results[i], Exception) and is_retryable(results[i])]
+            if not retry or attempt >= self.executor.max_retries:
+                break
+            await asyncio.sleep(self.executor.backoff_delay(attempt, results[retry[0]]))
+            pending = retry
+            attempt += 1
+
+        return results
+
+    async def find_node_files(self, node_ids: List[Any], curriculum_folder_id: str) -> Dict[str, str]:
+        """
+        Look up existing node files by name, batched.
+
+        Args:
+            node_ids: Node IDs whose files to look for
+            curriculum_folder_id: Curriculum folder ID on Drive
+
+        Returns:
+            Node ID -> Drive file ID for the nodes that already have a file
+
+        Raises:
+            GoogleDriveServiceException: If a lookup fails
+        """
+        service = self._get_service()
+        node_ids = [str(node_id) for node_id in node_ids]
+
+        responses = await self.execute_batch([
+            service.files().list(
+                q=f"name='{self.node_file_name(node_id)}' and '{curriculum_folder_id}' in parents and trashed=false",
+                spaces='drive',
+                fields='files(id)',
+                pageSize=1
+            )
+            for node_id in node_ids
+        ])
+
+        found = {}
+        for node_id, response in zip(node_ids, responses):
+            if isinstance(response, Exception):
+                raise GoogleDriveServiceException(f"Failed to look up node file: {str(response)}")
+            if response.get('files'):
+                found[node_id] = response['files'][0]['id']
+        return found
+
+    async def trash_files(self, file_ids: List[str]) -> Dict[str, Optional[Exception]]:
+        """
+        Move files to trash, batched.
+
+        Args:
+            file_ids: Google Drive file IDs
+
+        Returns:
+            File ID -> None on success (or if the file is already gone), else the error for that file
+        """
+        if not file_ids:
+            return {}
+        service = self._get_service()
+
+        responses = await self.execute_batch([
+            service.files().update(fileId=file_id, body={'trashed': True}, fields='id')
+            for file_id in file_ids
+        ])
+        return {
+            file_id: None if not isinstance(response, Exception) or _is_not_found(response) else response
+            for file_id, response in zip(file_ids, responses)
+        }
+
     async def move_file_to_trash(self, file_id: str) -> None:
         """
         Move file to trash instead of permanent deletion.
@@ -445,10 +690,10 @@ class GoogleDriveService:
         """
         service = self._get_service()
 
-        service.files().update(
+        await self._execute(service.files().update(
             fileId=file_id,
             body={'trashed': True}
-        ).execute()
+        ))
 
 
 # Singleton instance for application-wide use
@@ -1,11 +1,15 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
+from backend.app.db.pagination import DEFAULT_PAGE_SIZE, paginate_keyset
 from backend.app.models.literature_item import LiteratureItem
 from backend.app.schemas.literature_item import LiteratureItemCreate, LiteratureItemUpdate
 import uuid
 
 class LiteratureService:
+    # Listing order; backed by idx_literature_items_created
+    _LISTING_KEYS = (LiteratureItem.created_at, LiteratureItem.id)
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -13,7 +17,38 @@ class LiteratureService:
         return self.db.query(LiteratureItem).filter(LiteratureItem.id == str(item_id)).first()
 
     def get_multi(self, skip: int = 0, limit: int = 100) -> List[LiteratureItem]:
-        return self.db.query(LiteratureItem).offset(skip).limit(limit).all()
+        return self.db.query(LiteratureItem).order_by(*self._LISTING_KEYS).offset(skip).limit(limit).all()
+
+    def get_page(
+        self,
+        tags: Optional[List[str]] = None,
+        match: str = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated listing ordered by (created_at, id), optionally filtered by tags.
+
+        Returns:
+            Dict with "items", "next_cursor" and "total_estimate" (see paginate_keyset)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = self._filter_by_tags(self.db.query(LiteratureItem), tags or [], match)
+        return paginate_keyset(query, self._LISTING_KEYS, limit=limit, cursor=cursor, include_total=include_total)
+
+    @staticmethod
+    def _filter_by_tags(query, tags: List[str], match: str):
+        if not tags:
+            return query
+        conditions = [LiteratureItem.tags.contains(tag) for tag in tags]
+        if match == "any":
+            # OR logic: find items containing any of the tags
+            return query.filter(or_(*conditions))
+        # AND logic (default): find items containing all of the tags
+        return query.filter(and_(*conditions))
 
     def get_multi_by_tags(
         self, tags: List[str], match: str = "all", skip: int = 0, limit: int = 100
@@ -21,18 +56,8 @@ class LiteratureService:
         if not tags:
             return self.get_multi(skip=skip, limit=limit)
 
-        query = self.db.query(LiteratureItem)
-
-        if match == "any":
-            # OR logic: find items containing any of the tags
-            conditions = [LiteratureItem.tags.contains(tag) for tag in tags]
-            query = query.filter(or_(*conditions))
-        else:
-            # AND logic (default): find items containing all of the tags
-            conditions = [LiteratureItem.tags.contains(tag) for tag in tags]
-            query = query.filter(and_(*conditions))
-
-        return query.offset(skip).limit(limit).all()
+        query = self._filter_by_tags(self.db.query(LiteratureItem), tags, match)
+        return query.order_by(*self._LISTING_KEYS).offset(skip).limit(limit).all()
 
     def create(self, item_in: LiteratureItemCreate) -> LiteratureItem:
         db_item = LiteratureItem(**item_in.model_dump())
@@ -1,16 +1,24 @@
-from typing import List, Optional, BinaryIO
+from typing import Any, Dict, List, Optional, BinaryIO
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_
 from datetime import datetime, UTC
 import re
 
+from backend.app.db.pagination import DEFAULT_PAGE_SIZE, paginate_keyset
 from backend.app.models.curriculum import Curriculum
 from backend.app.models.node import Node, NodeContent, NodeLink
 from backend.app.models.zotero_item import ZoteroItem
 from backend.app.models.youtube_video import YouTubeVideo
 from backend.app.schemas.node import NodeCreate, NodeUpdate, NodeContentCreate, NodeContentUpdate
 from backend.app.core.ai import ai_client # Import the ai_client
+from backend.app.services.dependency_graph import (
+    PREREQUISITE_RELATIONSHIPS,
+    DependencyCycleError,
+    DependencyGraphService,
+    invalidate_dependency_graph,
+)
+from backend.app.services.change_bus import get_change_bus, publish_node_change
 from backend.app.services.zotero_service import zotero_service # Import zotero_service
 
 def _extract_youtube_video_id(url: str) -> Optional[str]:
@@ -126,6 +134,8 @@ class NodeService:
         self.db.add(db_node)
         self.db.commit()
         self.db.refresh(db_node)
+        invalidate_dependency_graph(str_curriculum_id)
+        publish_node_change(str_curriculum_id, "node_created", db_node.node_id)
 
         # [NEW] Sync to Google Drive using user's credentials
         if owner_user:
@@ -179,6 +189,32 @@ class NodeService:
             )
         ).order_by(Node.order_index).all()
 
+    def get_nodes_page(
+        self,
+        curriculum_id: UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated active nodes of a curriculum ordered by (order_index, node_id).
+
+        Returns:
+            Dict with "items", "next_cursor" and "total_estimate" (see paginate_keyset)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = self.db.query(Node).filter(
+            and_(
+                Node.curriculum_id == str(curriculum_id),
+                Node.deleted_at.is_(None)
+            )
+        )
+        return paginate_keyset(
+            query, (Node.order_index, Node.node_id), limit=limit, cursor=cursor, include_total=include_total
+        )
+
     def get_nodes_by_type(self, curriculum_id: UUID, node_type: str) -> List[Node]:
         """[REVISED] Query nodes by explicit type"""
         return self.db.query(Node).filter(
@@ -231,8 +267,15 @@ class NodeService:
         self.db.add(db_content)
         self.db.commit()
         self.db.refresh(db_content)
+        self._publish_content_change(db_content)
         return db_content
 
+    @staticmethod
+    def _publish_content_change(db_content: NodeContent) -> None:
+        # Resolving the curriculum costs a query; skip it when nobody listens
+        if get_change_bus().has_handlers:
+            publish_node_change(db_content.node.curriculum_id, "content_changed", db_content.node_id)
+
     def get_node_content(self, node_id: UUID) -> Optional[NodeContent]:
         return self.db.query(NodeContent).filter(NodeContent.node_id == str(node_id)).first()
 
@@ -257,6 +300,7 @@ class NodeService:
         self.db.add(db_content)
         self.db.commit()
         self.db.refresh(db_content)
+        self._publish_content_change(db_content)
         return db_content
 
     def delete_node_content(self, node_id: UUID) -> bool:
@@ -273,8 +317,12 @@ class NodeService:
         if not db_content:
             return False
 
+        # Resolve the curriculum before the row is gone (only if anyone listens)
+        curriculum_id = db_content.node.curriculum_id if get_change_bus().has_handlers else None
         self.db.delete(db_content)
         self.db.commit()
+        if curriculum_id:
+            publish_node_change(curriculum_id, "content_changed", node_id)
         return True
 
     def update_node(self, node_id: UUID, node_update: NodeUpdate) -> Optional[Node]:
@@ -298,6 +346,7 @@ class NodeService:
         self.db.add(db_node)
         self.db.commit()
         self.db.refresh(db_node)
+        publish_node_change(db_node.curriculum_id, "node_updated", db_node.node_id)
         return db_node
 
     def delete_node(self, node_id: UUID) -> bool:
@@ -349,6 +398,8 @@ class NodeService:
         ).update({NodeLink.deleted_at: now})
 
         self.db.commit()
+        invalidate_dependency_graph(db_node.curriculum_id)
+        publish_node_change(db_node.curriculum_id, "node_deleted", node_id)
         return True
 
     def restore_node(self, node_id: UUID) -> Optional[Node]:
@@ -362,6 +413,8 @@ class NodeService:
 
         node.deleted_at = None
         self.db.commit()
+        invalidate_dependency_graph(node.curriculum_id)
+        publish_node_change(node.curriculum_id, "node_restored", node.node_id)
         return node
 
     def get_deleted_nodes(self, curriculum_id: UUID) -> List[Node]:
@@ -439,8 +492,10 @@ class NodeService:
         db_link = self.db.query(NodeLink).filter(NodeLink.link_id == str(link_id)).first()
         if not db_link:
             return False
+        curriculum_id = db_link.node.curriculum_id if db_link.node else None
         self.db.delete(db_link)
         self.db.commit()
+        invalidate_dependency_graph(curriculum_id)
         return True
 
     # [NEW] PDF File Link Methods
@@ -523,20 +578,31 @@ class NodeService:
 
         Raises:
             ValueError: If nodes not found or if trying to link a node to itself
+            DependencyCycleError: If a prerequisite link (DEPENDS_ON, EXTENDS) would
+                                  close a cycle within the curriculum
         """
         str_source_id = str(source_node_id)
         str_target_id = str(target_node_id)
 
         # Validate nodes exist
-        if not self.get_node(str_source_id):
+        source_node = self.get_node(str_source_id)
+        if not source_node:
             raise ValueError(f"Source node not found: {source_node_id}")
-        if not self.get_node(str_target_id):
+        target_node = self.get_node(str_target_id)
+        if not target_node:
             raise ValueError(f"Target node not found: {target_node_id}")
 
         # Prevent self-linking
         if str_source_id == str_target_id:
             raise ValueError("Cannot link a node to itself")
 
+        # Prevent prerequisite cycles (the target must be learnable before the source)
+        if link_relationship in PREREQUISITE_RELATIONSHIPS and source_node.curriculum_id == target_node.curriculum_id:
+            graph = DependencyGraphService(self.db).load_graph(source_node.curriculum_id)
+            cycle = graph.cycle_if_linked(str_source_id, str_target_id)
+            if cycle:
+                raise DependencyCycleError(cycle)
+
         db_link = NodeLink(
             node_id=str_source_id,
             link_type="NODE",
@@ -546,6 +612,7 @@ class NodeService:
         self.db.add(db_link)
         self.db.commit()
         self.db.refresh(db_link)
+        invalidate_dependency_graph(source_node.curriculum_id)
         return db_link
 
     def get_node_to_node_links(self, node_id: UUID) -> List[NodeLink]:
@@ -672,5 +739,7 @@ class NodeService:
         # Refresh all affected nodes to get their latest state
         for node in affected_nodes:
             self.db.refresh(node)
+        invalidate_dependency_graph(str_curriculum_id)
+        publish_node_change(str_curriculum_id, "nodes_reordered", str_node_id)
 
         return new_siblings_list
\ No newline at end of file
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 import time
 import uuid
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.services.rag.vector_store import VectorStore, SearchResult
 from backend.app.services.rag.embedding_service import EmbeddingService
@@ -35,13 +35,13 @@ class RAGService:
         self,
         vector_store: VectorStore,
         embedding_service: EmbeddingService,
-        db: Session
+        db: AsyncSession
     ):
         """
         Args:
             vector_store: 벡터 저장소
             embedding_service: 임베딩 서비스
-            db: 데이터베이스 세션
+            db: 비동기 데이터베이스 세션 (로그 저장이 이벤트 루프를 막지 않음)
         """
         self.vector_store = vector_store
         self.embedding_service = embedding_service
@@ -312,13 +312,13 @@ class RAGService:
             )
             
             self.db.add(log)
-            self.db.commit()
+            await self.db.commit()
             
             logger.info(f"Query logged: {query_id}")
             
         except Exception as e:
             logger.error(f"Failed to log query: {e}")
-            self.db.rollback()
+            await self.db.rollback()
     
     async def _log_error(
         self,
@@ -340,8 +340,8 @@ class RAGService:
             )
             
             self.db.add(log)
-            self.db.commit()
+            await self.db.commit()
             
         except Exception as e:
             logger.error(f"Failed to log error: {e}")
-            self.db.rollback()
+            await self.db.rollback()
@@ -0,0 +1,157 @@
+"""
+Search Service for MATHESIS LAB
+
+Ranked full-text search over node titles and markdown content, backed by the
+engine-specific index in ``backend.app.db.search_index`` (FTS5 on SQLite,
+tsvector + GIN on PostgreSQL).
+"""
+
+import html
+import re
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.db.search_index import is_search_supported
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# The database delimits matches with these control characters; the text is
+# HTML-escaped before they become HIGHLIGHT_START/END, so node titles and
+# content can never inject markup into the highlights
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# Title matches weigh more than body matches when ranking
+_TITLE_WEIGHT = 10.0
+_CONTENT_WEIGHT = 1.0
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_SEARCH = """
+    SELECT d.node_id, d.curriculum_id, d.node_type,
+           highlight(node_search, 0, :hl_start, :hl_end) AS title_highlight,
+           snippet(node_search, 1, :hl_start, :hl_end, '…', 16) AS snippet,
+           bm25(node_search, {title_weight}, {content_weight}) AS rank
+    FROM node_search
+    JOIN node_search_documents d ON d.doc_id = node_search.rowid
+    WHERE node_search MATCH :query {scope}
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+"""
+
+_POSTGRES_SEARCH = """
+    SELECT d.node_id, d.curriculum_id, d.node_type,
+           ts_headline('simple', d.title, q.query, :title_options) AS title_highlight,
+           ts_headline('simple', coalesce(d.content, ''), q.query, :snippet_options) AS snippet,
+           -ts_rank_cd(d.document, q.query) AS rank
+    FROM node_search_documents d, to_tsquery('simple', :query) AS q(query)
+    WHERE d.document @@ q.query {scope}
+    ORDER BY rank, d.node_id
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def highlight_html(marked: Optional[str]) -> str:
+    """
+    HTML of database-highlighted text: escaped, with the matches in <mark>.
+
+    >>> highlight_html("\x02<b>\x03 & more")
+    '<mark>&lt;b&gt;</mark> &amp; more'
+    """
+    if not marked:
+        return ""
+    return html.escape(marked).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+class SearchUnavailableError(RuntimeError):
+    """The database engine has no full-text index to search."""
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        return _TERM_PATTERN.findall(query or "")
+
+    def search_nodes(
+        self,
+        query: str,
+        curriculum_id: Optional[UUID] = None,
+        node_type: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Search active nodes by title and markdown content.
+
+        Every query term must match (as a prefix, so Korean particles and word
+        endings still hit). Results are ordered by relevance with title matches
+        weighted above content matches.
+
+        Args:
+            query: Free-text query
+            curriculum_id: Restrict results to one curriculum
+            node_type: Restrict results to one node type
+            limit: Page size
+            offset: Number of ranked hits to skip
+
+        Returns:
+            Dict with "results" (hits with highlighted title and snippet) and "has_more"
+
+        Raises:
+            ValueError: If the query contains no searchable terms
+            SearchUnavailableError: If the database engine has no full-text index
+        """
+        terms = self._terms(query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word.")
+
+        dialect = self.db.get_bind().dialect.name
+        if not is_search_supported(dialect):
+            raise SearchUnavailableError(f"Full-text search is not supported on '{dialect}' databases.")
+
+        params: Dict[str, Any] = {"limit": limit + 1, "offset": offset}
+        scope = ""
+        if curriculum_id is not None:
+            scope += " AND d.curriculum_id = :curriculum_id"
+            params["curriculum_id"] = str(curriculum_id)
+        if node_type is not None:
+            scope += " AND d.node_type = :node_type"
+            params["node_type"] = node_type
+
+        if dialect == "sqlite":
+            sql = _SQLITE_SEARCH.format(scope=scope, title_weight=_TITLE_WEIGHT, content_weight=_CONTENT_WEIGHT)
+            params.update(
+                query=" ".join(f'"{term}"*' for term in terms),
+                hl_start=_MATCH_START,
+                hl_end=_MATCH_END,
+            )
+        else:
+            sql = _POSTGRES_SEARCH.format(scope=scope)
+            marks = f"StartSel={_MATCH_START}, StopSel={_MATCH_END}"
+            params.update(
+                query=" & ".join(f"{term}:*" for term in terms),
+                title_options=f"{marks}, HighlightAll=true",
+                snippet_options=f"{marks}, MaxWords=20, MinWords=5, MaxFragments=1",
+            )
+
+        rows = self.db.execute(text(sql), params).mappings().all()
+        has_more = len(rows) > limit
+        results = [
+            {
+                "node_id": row["node_id"],
+                "curriculum_id": row["curriculum_id"],
+                "node_type": row["node_type"],
+                "title_highlight": highlight_html(row["title_highlight"]),
+                "snippet": highlight_html(row["snippet"]) or None,
+                "score": -float(row["rank"]),
+            }
+            for row in rows[:limit]
+        ]
+        return {"results": results, "has_more": has_more}
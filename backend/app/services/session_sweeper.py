@@ -0,0 +1,128 @@
+"""
+Session Sweeper for MATHESIS LAB
+
+Every login and refresh inserts a ``user_sessions`` row, so without cleanup
+the table (and each user's slice of it) grows forever. The sweeper deletes
+expired sessions in bounded batches, walking ``idx_user_session_expires_at``.
+
+Revoked sessions are deleted once they expire, not when they are revoked: a
+rotated session must stay around while its refresh token could still be
+replayed, so that reuse is detected (see AuthService.refresh_token). Since
+every session expires within JWT_REFRESH_TOKEN_EXPIRE_DAYS, the table holds
+at most that many days of logins and refreshes.
+
+Each batch is its own short transaction, and a run stops after
+``max_batches``, so a large backlog never holds locks for long. Running the
+sweeper in several workers is harmless: deletes of the same rows simply
+find nothing.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, UTC
+from typing import Callable, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.user_session import UserSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """
+    Deletes expired user sessions in batches, on demand or on a schedule.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 1000,
+        max_batches: int = 100,
+        interval_minutes: float = 15,
+    ):
+        """
+        Args:
+            session_factory: Creates the session each batch runs in
+            batch_size: Sessions deleted per transaction
+            max_batches: Batches per run (the rest waits for the next run)
+            interval_minutes: Time between scheduled runs
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.interval_minutes = interval_minutes
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.configure(job_defaults={'coalesce': True, 'max_instances': 1})
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete sessions that expired before ``now``.
+
+        Returns:
+            Number of sessions deleted
+        """
+        now = now or datetime.now(UTC)
+        expired = (
+            select(UserSession.session_id)
+            .where(UserSession.expires_at < now)
+            .order_by(UserSession.expires_at)
+            .limit(self.batch_size)
+        )
+        deleted = 0
+        for _ in range(self.max_batches):
+            db = self.session_factory()
+            try:
+                count = db.execute(
+                    delete(UserSession)
+                    .where(UserSession.session_id.in_(expired))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+            finally:
+                db.close()
+            deleted += count
+            if count < self.batch_size:
+                break
+        if deleted:
+            logger.info(f"Deleted {deleted} expired user sessions")
+        return deleted
+
+    async def _scheduled_sweep(self) -> None:
+        try:
+            await asyncio.to_thread(self.sweep)
+        except Exception:
+            logger.exception("Session sweep failed")
+
+    def start(self) -> None:
+        """Start sweeping every ``interval_minutes`` (needs a running event loop)."""
+        if not self.scheduler.running:
+            self.scheduler.add_job(
+                self._scheduled_sweep,
+                IntervalTrigger(minutes=self.interval_minutes),
+                id='session_sweep',
+                replace_existing=True,
+            )
+            self.scheduler.start()
+            logger.info("Session sweeper started")
+
+    def stop(self) -> None:
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+            logger.info("Session sweeper stopped")
+
+
+def create_session_sweeper(session_factory: Callable[[], Session]) -> Optional[SessionSweeper]:
+    """Sweeper configured from settings, or None if sweeping is disabled."""
+    if settings.SESSION_SWEEP_INTERVAL_MINUTES <= 0:
+        return None
+    return SessionSweeper(
+        session_factory,
+        batch_size=settings.SESSION_SWEEP_BATCH_SIZE,
+        max_batches=settings.SESSION_SWEEP_MAX_BATCHES,
+        interval_minutes=settings.SESSION_SWEEP_INTERVAL_MINUTES,
+    )
@@ -0,0 +1,262 @@
+"""
+Sync Job Store for MATHESIS LAB
+
+Database-backed state for the SyncScheduler, shared by all workers.
+
+- Job state and history entries are buffered in memory and written in one
+  transaction per ``flush`` (a bulk INSERT for history, one UPDATE batch and
+  one INSERT batch for jobs), instead of a commit per state change.
+- History is read newest first with keyset pagination over
+  ``(created_at, id)``, served by ``idx_sync_history_curriculum_created``.
+- A lease row elects the single worker that runs scheduled syncs.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, UTC, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.db.pagination import paginate_keyset
+from backend.app.models.sync_job import SchedulerLease, SyncHistory, SyncJob
+
+logger = logging.getLogger(__name__)
+
+_HISTORY_COUNTS = (
+    "synced_count", "updated_count", "deleted_count", "unchanged_count", "conflict_count", "error_count",
+)
+
+
+def default_worker_id() -> str:
+    """Identifier unique to this process: host, PID and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return (value if value.tzinfo else value.replace(tzinfo=UTC)).isoformat()
+
+
+class SyncJobStore:
+    """
+    Buffered writer and reader for sync jobs, history and the scheduler lease.
+    """
+
+    JOB_FIELDS = ("status", "attempt", "worker_id", "queued_at", "started_at", "completed_at", "error")
+
+    def __init__(self, session_factory: Callable[[], Session], worker_id: Optional[str] = None):
+        """
+        Args:
+            session_factory: Creates the session each flush or read runs in
+            worker_id: This worker's identity (generated if omitted)
+        """
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._history: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    # --- buffered writes ---
+
+    def record_job(self, curriculum_id: str, **fields) -> None:
+        """Buffer a change to a curriculum's job; later changes overwrite earlier ones."""
+        unknown = set(fields) - set(self.JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown sync job fields: {sorted(unknown)}")
+        with self._lock:
+            self._jobs.setdefault(curriculum_id, {}).update(fields)
+
+    def request_sync(self, curriculum_id: str) -> None:
+        """Ask the leader to sync a curriculum on its next round."""
+        self.record_job(
+            curriculum_id,
+            status="pending",
+            worker_id=self.worker_id,
+            queued_at=datetime.now(UTC),
+            error=None,
+        )
+
+    def record_history(self, curriculum_id: str, result: Dict[str, Any]) -> None:
+        """Buffer a history entry for a finished sync result (or a failure with ``error``)."""
+        entry = {
+            "id": str(uuid.uuid4()),
+            "curriculum_id": curriculum_id,
+            "status": result.get("status") or "completed",
+            "worker_id": self.worker_id,
+            "duration_seconds": result.get("duration_seconds"),
+            "error": result.get("error"),
+            "created_at": datetime.now(UTC),
+        }
+        for count in _HISTORY_COUNTS:
+            entry[count] = result.get(count) or 0
+        if not entry["error_count"] and result.get("errors"):
+            entry["error_count"] = len(result["errors"])
+        with self._lock:
+            self._history.append(entry)
+
+    @property
+    def pending_writes(self) -> int:
+        with self._lock:
+            return len(self._jobs) + len(self._history)
+
+    def flush(self) -> int:
+        """
+        Write all buffered job changes and history entries in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+            history, self._history = self._history, []
+        if not jobs and not history:
+            return 0
+
+        db = self.session_factory()
+        try:
+            for attempt in range(2):
+                try:
+                    self._write(db, jobs, history)
+                    db.commit()
+                    break
+                except IntegrityError:
+                    # Another worker inserted one of these job rows first
+                    db.rollback()
+                    if attempt:
+                        raise
+        except Exception:
+            # Keep the entries for the next flush (newer buffered state wins)
+            with self._lock:
+                for curriculum_id, fields in jobs.items():
+                    self._jobs[curriculum_id] = {**fields, **self._jobs.get(curriculum_id, {})}
+                self._history[:0] = history
+            logger.exception("Failed to write sync job state")
+            raise
+        finally:
+            db.close()
+        return len(jobs) + len(history)
+
+    @staticmethod
+    def _write(db: Session, jobs: Dict[str, Dict[str, Any]], history: List[Dict[str, Any]]) -> None:
+        if history:
+            db.execute(insert(SyncHistory), history)
+        if jobs:
+            now = datetime.now(UTC)
+            existing = {
+                curriculum_id for (curriculum_id,) in
+                db.query(SyncJob.curriculum_id).filter(SyncJob.curriculum_id.in_(list(jobs)))
+            }
+            rows = [{"curriculum_id": cid, "updated_at": now, **fields} for cid, fields in jobs.items()]
+            updates = [row for row in rows if row["curriculum_id"] in existing]
+            inserts = [row for row in rows if row["curriculum_id"] not in existing]
+            if updates:
+                db.bulk_update_mappings(SyncJob, updates)
+            if inserts:
+                db.bulk_insert_mappings(SyncJob, inserts)
+
+    # --- reads ---
+
+    def get_job(self, curriculum_id: str) -> Optional[Dict[str, Any]]:
+        """Current job of a curriculum as a dict, or None if it never had one."""
+        self.flush()
+        db = self.session_factory()
+        try:
+            job = db.get(SyncJob, curriculum_id)
+            if job is None:
+                return None
+            return {
+                "status": job.status,
+                "attempt": job.attempt,
+                "worker_id": job.worker_id,
+                "queued_at": _isoformat(job.queued_at),
+                "started_at": _isoformat(job.started_at),
+                "completed_at": _isoformat(job.completed_at),
+                "error": job.error,
+            }
+        finally:
+            db.close()
+
+    def history_page(self, curriculum_id: str, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of a curriculum's sync history, newest first.
+
+        Returns:
+            Dict with "items" (history entry dicts) and "next_cursor"
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        self.flush()
+        db = self.session_factory()
+        try:
+            page = paginate_keyset(
+                db.query(SyncHistory).filter(SyncHistory.curriculum_id == curriculum_id),
+                (SyncHistory.created_at, SyncHistory.id),
+                limit=limit,
+                cursor=cursor,
+                descending=True,
+            )
+            items = []
+            for row in page["items"]:
+                entry = {"timestamp": _isoformat(row.created_at), "status": row.status}
+                entry.update({count: getattr(row, count) for count in _HISTORY_COUNTS})
+                entry["duration_seconds"] = row.duration_seconds
+                if row.error:
+                    entry["error"] = row.error
+                items.append(entry)
+            return {"items": items, "next_cursor": page["next_cursor"]}
+        finally:
+            db.close()
+
+    # --- leader election ---
+
+    def acquire_lease(self, name: str, ttl_seconds: float) -> bool:
+        """
+        Take or renew the named lease for ``ttl_seconds``.
+
+        A single conditional UPDATE succeeds only if this worker already holds
+        the lease or it has expired; the first worker ever creates the row.
+
+        Returns:
+            True if this worker holds the lease
+        """
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        db = self.session_factory()
+        try:
+            taken = db.query(SchedulerLease).filter(
+                SchedulerLease.name == name,
+                or_(SchedulerLease.holder == self.worker_id, SchedulerLease.expires_at < now),
+            ).update(
+                {SchedulerLease.holder: self.worker_id, SchedulerLease.expires_at: expires_at},
+                synchronize_session=False,
+            )
+            if not taken:
+                if db.get(SchedulerLease, name) is not None:
+                    return False  # Held by another worker; nothing was written
+                db.add(SchedulerLease(name=name, holder=self.worker_id, expires_at=expires_at))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()  # Another worker created the lease first
+            return False
+        finally:
+            db.close()
+
+    def release_lease(self, name: str) -> None:
+        """Give up the lease (if held) so another worker can take over immediately."""
+        db = self.session_factory()
+        try:
+            db.query(SchedulerLease).filter(
+                SchedulerLease.name == name, SchedulerLease.holder == self.worker_id
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
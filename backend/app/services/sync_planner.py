@@ -0,0 +1,234 @@
+"""
+Sync Planner for MATHESIS LAB
+
+Computes what a Drive sync of one curriculum has to do before any of it is
+done. Local state is read with two queries (nodes with their content
+timestamps, and all SyncMetadata rows of the curriculum); remote state is a
+Drive listing or changes-feed result supplied by the caller. The plan is then
+a handful of set operations over node IDs and Drive file IDs.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.node import Node, NodeContent
+from backend.app.models.sync_metadata import SyncMetadata
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (as read back from SQLite) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+_NODE_FILE_NAME = re.compile(r"^node_(.+)\.json$")
+
+
+def _parse_drive_time(value: str) -> datetime:
+    """Parse an RFC 3339 Drive timestamp such as 2025-01-01T12:00:00.000Z."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass
+class SyncPlan:
+    """
+    Actions of one sync, in the order they are applied.
+
+    Node-side lists hold node IDs, Drive-side lists hold Drive file IDs.
+    """
+    curriculum_id: str
+    direction: str
+    mode: str  # "full" (folder listing), "incremental" (changes feed) or "local" (no Drive read)
+    upload_creates: List[str] = field(default_factory=list)    # local nodes without a Drive file
+    upload_updates: List[str] = field(default_factory=list)    # changed locally only
+    remote_trashes: List[str] = field(default_factory=list)    # deleted locally, still on Drive
+    download_creates: List[str] = field(default_factory=list)  # Drive files not known locally
+    download_updates: List[str] = field(default_factory=list)  # changed on Drive only
+    local_deletes: List[str] = field(default_factory=list)     # Drive file is gone
+    conflicts: List[str] = field(default_factory=list)         # changed on both sides
+
+    # Working state for executing the plan (not part of the summary)
+    page_token: Optional[str] = None
+    remote_files: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    metadata_by_node: Dict[str, SyncMetadata] = field(default_factory=dict, repr=False)
+    metadata_by_file: Dict[str, SyncMetadata] = field(default_factory=dict, repr=False)
+    local_modified: Dict[str, datetime] = field(default_factory=dict, repr=False)
+    children: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+    # Creates whose node file already exists on Drive (seen in the listing or
+    # changes feed); they are written to that file instead of a new one
+    existing_files: Dict[str, str] = field(default_factory=dict, repr=False)
+    # Untracked Drive files named after a node that already has its file
+    # (file ID -> node ID); left alone instead of being downloaded
+    duplicate_files: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    ACTIONS = (
+        "upload_creates", "upload_updates", "remote_trashes",
+        "download_creates", "download_updates", "local_deletes", "conflicts",
+    )
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(getattr(self, action) for action in self.ACTIONS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for the dry-run API: the action lists and their sizes."""
+        summary = {"curriculum_id": self.curriculum_id, "direction": self.direction, "mode": self.mode}
+        for action in self.ACTIONS:
+            summary[action] = list(getattr(self, action))
+        summary["counts"] = {action: len(getattr(self, action)) for action in self.ACTIONS}
+        return summary
+
+
+class SyncPlanner:
+    """
+    Loads a curriculum's local sync state once and plans syncs against it.
+    """
+
+    def __init__(self, db: Session, curriculum_id: str):
+        self.curriculum_id = str(curriculum_id)
+
+        metadata = db.query(SyncMetadata).filter(SyncMetadata.curriculum_id == self.curriculum_id).all()
+        self.metadata_by_node: Dict[str, SyncMetadata] = {m.node_id: m for m in metadata}
+        self.metadata_by_file: Dict[str, SyncMetadata] = {
+            m.google_drive_file_id: m for m in metadata if m.google_drive_file_id
+        }
+
+        rows = (
+            db.query(Node.node_id, Node.parent_node_id, Node.deleted_at, Node.updated_at, NodeContent.updated_at)
+            .outerjoin(NodeContent, NodeContent.node_id == Node.node_id)
+            .filter(Node.curriculum_id == self.curriculum_id)
+            .order_by(Node.order_index, Node.node_id)
+            .all()
+        )
+        self.active: List[str] = []
+        self.deleted: Set[str] = set()
+        self.local_modified: Dict[str, datetime] = {}
+        self.children: Dict[str, List[str]] = {}
+        for node_id, parent_id, deleted_at, node_updated, content_updated in rows:
+            if deleted_at is not None:
+                self.deleted.add(node_id)
+                continue
+            self.active.append(node_id)
+            stamps = [_as_utc(t) for t in (node_updated, content_updated) if t is not None]
+            self.local_modified[node_id] = max(stamps)
+            if parent_id:
+                self.children.setdefault(parent_id, []).append(node_id)
+
+    def _locally_dirty(self, node_id: str) -> bool:
+        meta = self.metadata_by_node[node_id]
+        return (
+            not meta.is_synced
+            or meta.last_local_modified is None
+            or self.local_modified[node_id] > _as_utc(meta.last_local_modified)
+        )
+
+    @staticmethod
+    def _remotely_changed(meta: SyncMetadata, drive_file: Dict[str, Any]) -> bool:
+        # Same bytes as last synced: a metadata-only change (or our own write)
+        md5 = drive_file.get("md5Checksum")
+        if md5 and meta.drive_md5:
+            return md5 != meta.drive_md5
+        return bool(
+            meta.last_drive_modified
+            and _parse_drive_time(drive_file["modifiedTime"]) > _as_utc(meta.last_drive_modified)
+        )
+
+    def plan(
+        self,
+        direction: str = "bidirectional",
+        remote_files: Optional[Dict[str, Dict[str, Any]]] = None,
+        removed_file_ids: Iterable[str] = (),
+        complete_listing: bool = True,
+        page_token: Optional[str] = None,
+    ) -> SyncPlan:
+        """
+        Compute the sync plan.
+
+        Args:
+            direction: "up", "down" or "bidirectional"
+            remote_files: Drive files currently in the curriculum folder (file ID ->
+                entry with id and modifiedTime), or None if Drive was not read
+            removed_file_ids: Files known to have left the folder (changes feed)
+            complete_listing: Whether ``remote_files`` is the whole folder, so any
+                known file missing from it was deleted on Drive
+            page_token: Changes-feed token to store once the plan is applied
+        """
+        mode = "local" if remote_files is None else ("full" if complete_listing else "incremental")
+        plan = SyncPlan(
+            curriculum_id=self.curriculum_id,
+            direction=direction,
+            mode=mode,
+            page_token=page_token,
+            remote_files=remote_files or {},
+            metadata_by_node=self.metadata_by_node,
+            metadata_by_file=self.metadata_by_file,
+            local_modified=self.local_modified,
+            children=self.children,
+        )
+
+        tracked_nodes = set(self.metadata_by_node)
+        tracked_files = set(self.metadata_by_file)
+        active = set(self.active)
+
+        locally_dirty = {n for n in active & tracked_nodes if self._locally_dirty(n)}
+
+        remote = set(plan.remote_files)
+        gone_files = set(removed_file_ids) & tracked_files
+        if remote_files is not None and complete_listing:
+            gone_files |= tracked_files - remote
+        gone_files -= remote
+        changed_files = {
+            f for f in remote & tracked_files
+            if self._remotely_changed(self.metadata_by_file[f], plan.remote_files[f])
+        }
+        node_of = {f: self.metadata_by_file[f].node_id for f in tracked_files}
+        remotely_changed = {node_of[f] for f in changed_files}
+        remotely_gone = {node_of[f] for f in gone_files}
+
+        conflicts = locally_dirty & remotely_changed
+        # A locally edited node whose file was deleted on Drive is uploaded again
+        recreate = locally_dirty & remotely_gone
+
+        # Untracked Drive files named after a node: an untracked local node
+        # adopts its file, a second file of a tracked node is skipped, and the
+        # file of a deleted node is downloaded, which restores the node
+        untracked_active = active - tracked_nodes
+        for file_id, drive_file in plan.remote_files.items():
+            match = _NODE_FILE_NAME.match(drive_file.get("name") or "")
+            if file_id in tracked_files or not match:
+                continue
+            if match.group(1) in untracked_active:
+                plan.existing_files[match.group(1)] = file_id
+            elif match.group(1) in tracked_nodes:
+                plan.duplicate_files[file_id] = match.group(1)
+        skipped_files = set(plan.existing_files.values()) | set(plan.duplicate_files)
+
+        order = {node_id: i for i, node_id in enumerate(self.active)}
+        by_outline = lambda ids: sorted(ids, key=lambda n: order.get(n, len(order)))
+
+        if direction in ("up", "bidirectional"):
+            plan.upload_creates = by_outline((active - tracked_nodes) | recreate)
+            plan.upload_updates = by_outline(locally_dirty - conflicts - recreate)
+            plan.remote_trashes = sorted(
+                n for n in self.deleted & tracked_nodes
+                if self.metadata_by_node[n].google_drive_file_id not in gone_files
+                and self.metadata_by_node[n].google_drive_file_id
+            )
+
+        if direction in ("down", "bidirectional") and remote_files is not None:
+            plan.download_creates = [
+                f for f in plan.remote_files if f not in tracked_files and f not in skipped_files
+            ]
+            plan.download_updates = [
+                f for f in plan.remote_files
+                if f in changed_files and node_of[f] not in conflicts and node_of[f] in active
+            ]
+            plan.local_deletes = by_outline((remotely_gone & active) - recreate) + sorted(
+                remotely_gone & self.deleted
+            )
+            plan.conflicts = by_outline(conflicts)
+
+        return plan
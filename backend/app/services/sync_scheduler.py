@@ -3,26 +3,89 @@ Background Sync Scheduler using APScheduler.
 
 Manages automatic periodic synchronization of curriculums between local DB and Google Drive.
 Handles scheduling, execution, and error recovery.
+
+Local edits arrive as events on the change bus (published by NodeService).
+Each event marks its curriculum dirty and (re)starts a short per-curriculum
+debounce timer; once edits have settled, that curriculum alone is synced.
+The periodic round then only has to pick up dirty curriculums and poll
+Drive for curriculums not synced within ``remote_poll_minutes``.
+
+Each round orders the due curriculums by priority (pending local changes
+first, then least recently synced) and starts their syncs as tasks. At most
+``max_concurrent_syncs`` run at once, each with its own database session, so
+one slow curriculum never holds up the others. Curriculums whose previous
+sync is still queued or running are skipped.
+
+Job state and history live in the database (see sync_job_store.py) so they
+survive restarts and are shared by all workers. Only the worker holding the
+scheduler lease runs scheduled and debounced syncs; other workers record
+their debounced edits as pending jobs for the leader's next round.
 """
 
+from dataclasses import dataclass
 from datetime import datetime, UTC, timedelta
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List, Set
 import asyncio
 import logging
+import random
+import time
+from sqlalchemy import exists, or_
 from sqlalchemy.orm import Session
 
-from backend.app.services.sync_service import SyncService, SyncStatus
+from backend.app.services.change_bus import ChangeBus, NodeChange, get_change_bus
+from backend.app.services.sync_job_store import SyncJobStore
+from backend.app.services.google_drive_service import get_google_drive_service
+from backend.app.services.sync_service import SyncService, SyncStatus, SyncException, get_sync_service
 from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node, NodeContent
+from backend.app.models.sync_metadata import CurriculumDriveFolder
+from backend.app.models.sync_job import SyncJob
+from backend.app.db.session import SessionLocal
 from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 # APScheduler imports
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.job import Job
 APSCHEDULER_AVAILABLE = True
 
+# Name of the lease row whose holder runs scheduled syncs
+LEASE_NAME = "sync_scheduler"
+
+
+@dataclass
+class SyncDurationStats:
+    """Running duration statistics for one curriculum's syncs."""
+    count: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    min_seconds: Optional[float] = None
+    max_seconds: Optional[float] = None
+    last_seconds: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        self.min_seconds = seconds if self.min_seconds is None else min(self.min_seconds, seconds)
+        self.max_seconds = seconds if self.max_seconds is None else max(self.max_seconds, seconds)
+
+    @property
+    def mean_seconds(self) -> Optional[float]:
+        return self.total_seconds / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean_seconds": self.mean_seconds,
+            "min_seconds": self.min_seconds,
+            "max_seconds": self.max_seconds,
+            "last_seconds": self.last_seconds,
+        }
+
 
 class SyncScheduler:
     """
@@ -34,46 +97,125 @@ class SyncScheduler:
 
     def __init__(
         self,
-        db: Session,
-        sync_service: SyncService,
         sync_interval_minutes: int = 5,
+        max_concurrent_syncs: int = 4,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 5.0,
+        session_factory: Callable[[], Session] = SessionLocal,
+        sync_service_factory: Optional[Callable[[Session], SyncService]] = None,
+        debounce_seconds: float = 2.0,
+        max_debounce_seconds: float = 30.0,
+        remote_poll_minutes: int = 30,
+        change_bus: Optional[ChangeBus] = None,
+        job_store: Optional[SyncJobStore] = None,
+        lease_seconds: float = 60.0,
+        flush_seconds: float = 1.0,
     ):
         """
         Initialize Sync Scheduler.
 
+        The scheduler outlives any request, so it holds no session of its
+        own: every query and sync opens one from ``session_factory``.
+
         Args:
-            db: SQLAlchemy database session
-            sync_service: SyncService instance
             sync_interval_minutes: How often to sync (default: 5 minutes)
+            max_concurrent_syncs: Maximum number of curriculum syncs running at once
+            max_retries: Retries after a failed sync attempt
+            retry_delay_seconds: Base retry delay (doubles per retry, plus jitter)
+            session_factory: Creates the session each background sync runs in
+            sync_service_factory: Builds the SyncService for a session (defaults
+                to get_sync_service with the shared Google Drive service)
+            debounce_seconds: Quiet period after the last edit before syncing
+            max_debounce_seconds: Longest a burst of edits can postpone its sync
+            remote_poll_minutes: How often curriculums without local changes
+                are synced to pick up edits made on Drive
+            change_bus: Bus to receive NodeService edits from (process-wide by default)
+            job_store: Persistent job/history store (one on ``session_factory`` by default)
+            lease_seconds: Lifetime of the scheduler lease; renewed every third of it
+            flush_seconds: How long job and history writes are buffered before a bulk write
         """
-        self.db = db
-        self.sync_service = sync_service
         self.sync_interval_minutes = sync_interval_minutes
-
-        # Initialize APScheduler
-        self.scheduler = BackgroundScheduler()
+        self.max_concurrent_syncs = max_concurrent_syncs
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+        self.session_factory = session_factory
+        self.sync_service_factory = sync_service_factory or (
+            lambda session: get_sync_service(session, get_google_drive_service())
+        )
+        self.debounce_seconds = debounce_seconds
+        self.max_debounce_seconds = max_debounce_seconds
+        self.remote_poll_minutes = remote_poll_minutes
+        self.change_bus = change_bus or get_change_bus()
+        self.job_store = job_store or SyncJobStore(session_factory)
+        self.lease_seconds = lease_seconds
+        self.flush_seconds = flush_seconds
+        self.is_leader = False
+
+        # Initialize APScheduler (jobs are coroutines run on the event loop)
+        self.scheduler = AsyncIOScheduler()
         self.scheduler.configure(
             job_defaults={
-                'coalesce': False,
+                'coalesce': True,
                 'max_instances': 1,
             }
         )
 
-        # Track active sync jobs
+        # This worker's view of its jobs (persisted through job_store)
         self.active_syncs: Dict[str, Dict[str, Any]] = {}
-        self.sync_history: Dict[str, list] = {}
+        self.duration_stats: Dict[str, SyncDurationStats] = {}
+
+        # Curriculums with local changes not yet synced, queued or running
+        # syncs, and paused curriculums
+        self.dirty: Set[str] = set()
+        self.in_flight: Set[str] = set()
+        self.paused: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Debounce state: pending timer and time of the first unsynced edit
+        # per curriculum, and curriculums edited while their sync was running
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._debounce_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._first_change: Dict[str, float] = {}
+        self._rerun: Set[str] = set()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
 
     def start(self) -> None:
-        """Start the background scheduler."""
+        """Start the background scheduler and listen for local edits."""
         if not self.scheduler.running:
+            self._loop = asyncio.get_running_loop()
+            self._unsubscribe = self.change_bus.subscribe(self._on_change)
+            self._renew_lease()
             self.scheduler.start()
             logger.info("Sync scheduler started")
 
-            # Schedule global sync job
+            # Schedule global sync job and lease renewal
             self._schedule_global_sync()
+            self.scheduler.add_job(
+                self._renew_lease,
+                IntervalTrigger(seconds=self.lease_seconds / 3),
+                id='sync_lease',
+                name='Sync Scheduler Lease Renewal',
+                replace_existing=True,
+            )
 
     def stop(self) -> None:
         """Stop the background scheduler."""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for timer in self._debounce_timers.values():
+            timer.cancel()
+        self._debounce_timers.clear()
+        self._flush()
+        if self.is_leader:
+            try:
+                self.job_store.release_lease(LEASE_NAME)
+            except Exception as error:
+                # Lapses after lease_seconds instead; another worker takes over then
+                logger.warning(f"Could not release sync scheduler lease: {error}")
+            self.is_leader = False
         if self.scheduler.running:
             self.scheduler.shutdown()
             logger.info("Sync scheduler stopped")
@@ -88,19 +230,219 @@ class SyncScheduler:
             replace_existing=True,
         )
 
-    async def _sync_all_curriculums(self) -> None:
-        """Sync all curriculums in the database."""
-        curriculums = self.db.query(Curriculum).all()
-        logger.info(f"Starting global sync for {len(curriculums)} curriculums")
+    def _renew_lease(self) -> bool:
+        """Take or renew the scheduler lease; returns whether this worker is the leader."""
+        try:
+            leader = self.job_store.acquire_lease(LEASE_NAME, self.lease_seconds)
+        except Exception as error:
+            logger.warning(f"Could not renew sync scheduler lease: {error}")
+            leader = False
+        if leader != self.is_leader:
+            logger.info(f"Worker {self.job_store.worker_id} {'is now' if leader else 'is no longer'} the sync leader")
+        self.is_leader = leader
+        return leader
+
+    def _set_job(self, curriculum_id: str, **fields) -> None:
+        """Update this worker's view of a job and queue the change for the job store."""
+        self.active_syncs.setdefault(curriculum_id, {}).update(fields)
+        self.job_store.record_job(
+            curriculum_id, **{key: value for key, value in fields.items() if key in SyncJobStore.JOB_FIELDS}
+        )
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Write buffered job state soon, coalescing the writes of the next flush_seconds."""
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()
+            return
+        self._flush_handle = loop.call_later(self.flush_seconds, self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        try:
+            self.job_store.flush()
+        except Exception:
+            pass  # Logged by the store; the entries are kept for the next flush
+
+    def mark_dirty(self, curriculum_id: str) -> None:
+        """Record that a curriculum has local changes, so the next round syncs it first."""
+        self.dirty.add(str(curriculum_id))
+
+    def _on_change(self, change: NodeChange) -> None:
+        """Change bus handler; may run in any thread."""
+        self.dirty.add(change.curriculum_id)
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._debounce, change.curriculum_id)
+
+    def _debounce(self, curriculum_id: str) -> None:
+        """(Re)start the curriculum's debounce timer, capped at max_debounce_seconds since the first edit."""
+        now = self._loop.time()
+        first = self._first_change.setdefault(curriculum_id, now)
+        timer = self._debounce_timers.pop(curriculum_id, None)
+        if timer:
+            timer.cancel()
+        delay = max(0.0, min(self.debounce_seconds, first + self.max_debounce_seconds - now))
+        self._debounce_timers[curriculum_id] = self._loop.call_later(
+            delay, self._debounce_elapsed, curriculum_id
+        )
 
-        for curriculum in curriculums:
-            await self._sync_curriculum_with_retry(curriculum.curriculum_id)
+    def _debounce_elapsed(self, curriculum_id: str) -> None:
+        self._debounce_timers.pop(curriculum_id, None)
+        self._first_change.pop(curriculum_id, None)
+        if curriculum_id in self.paused:
+            return  # Stays dirty; synced once resumed
+        if curriculum_id in self.in_flight:
+            self._rerun.add(curriculum_id)
+            return
+        if not self.is_leader:
+            # The leader cannot see this worker's edits; leave it a pending job
+            # (written now: the debounce already coalesced the edits)
+            self.job_store.request_sync(curriculum_id)
+            self._flush()
+            return
+        if self._has_drive_folder(curriculum_id):
+            self._start_sync(curriculum_id)
+
+    def _has_drive_folder(self, curriculum_id: str) -> bool:
+        db = self.session_factory()
+        try:
+            return db.query(exists().where(CurriculumDriveFolder.curriculum_id == curriculum_id)).scalar()
+        finally:
+            db.close()
+
+    def _due_curriculums(self, db: Session) -> List[str]:
+        """
+        Curriculums to sync this round, highest priority first.
+
+        One query reads every Drive folder mapping together with whether the
+        curriculum has nodes changed since its last sync and its job status.
+        Curriculums with pending local changes (found by that query, marked
+        dirty, or requested by another worker) come first; within each group
+        the least recently synced go first. Clean curriculums synced within
+        ``remote_poll_minutes`` are not due, and paused ones never are.
+        """
+        folder = CurriculumDriveFolder
+        node_changed = exists().where(
+            Node.curriculum_id == folder.curriculum_id,
+            Node.updated_at > folder.last_sync_at,
+        )
+        content_changed = exists().where(
+            Node.curriculum_id == folder.curriculum_id,
+            NodeContent.node_id == Node.node_id,
+            NodeContent.updated_at > folder.last_sync_at,
+        )
+        rows = (
+            db.query(
+                folder.curriculum_id,
+                folder.last_sync_at,
+                or_(folder.last_sync_at.is_(None), node_changed, content_changed),
+                SyncJob.status,
+            )
+            .outerjoin(SyncJob, SyncJob.curriculum_id == folder.curriculum_id)
+            .all()
+        )
+
+        epoch = datetime.min
+        poll_before = datetime.now(UTC).replace(tzinfo=None) - timedelta(minutes=self.remote_poll_minutes)
+        due = []
+        for curriculum_id, last_sync_at, changed, job_status in rows:
+            if job_status == SyncStatus.PAUSED.value:
+                self.paused.add(curriculum_id)
+                continue
+            last_sync = last_sync_at.replace(tzinfo=None) if last_sync_at else epoch
+            dirty = bool(changed) or curriculum_id in self.dirty or job_status == SyncStatus.PENDING.value
+            if dirty or last_sync <= poll_before:
+                due.append((not dirty, last_sync, curriculum_id))
+        return [curriculum_id for _, _, curriculum_id in sorted(due)]
+
+    async def _sync_all_curriculums(self) -> List[str]:
+        """
+        Start syncs for all due curriculums without waiting for them.
+
+        Returns:
+            IDs of the curriculums whose syncs were started, in priority order
+            (empty on workers that do not hold the scheduler lease)
+        """
+        if not self._renew_lease():
+            return []
+
+        db = self.session_factory()
+        try:
+            due = self._due_curriculums(db)
+        finally:
+            db.close()
+
+        started = []
+        for curriculum_id in due:
+            if curriculum_id in self.in_flight or curriculum_id in self.paused:
+                continue
+            self._start_sync(curriculum_id)
+            started.append(curriculum_id)
+
+        logger.info(
+            f"Sync round: {len(started)} of {len(due)} curriculums started "
+            f"({len(self.in_flight)} queued or running)"
+        )
+        return started
+
+    def _start_sync(self, curriculum_id: str) -> asyncio.Task:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_syncs)
+        self.in_flight.add(curriculum_id)
+        self.active_syncs[curriculum_id] = {}
+        self._set_job(
+            curriculum_id,
+            status=SyncStatus.PENDING.value,
+            queued_at=datetime.now(UTC),
+            worker_id=self.job_store.worker_id,
+            attempt=0,
+            started_at=None,
+            completed_at=None,
+            error=None,
+        )
+        task = asyncio.create_task(self._run_sync(curriculum_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run_sync(self, curriculum_id: str) -> None:
+        try:
+            async with self._semaphore:
+                await self._sync_curriculum_with_retry(curriculum_id, self.max_retries, self.retry_delay_seconds)
+        except Exception:
+            pass  # Already logged and recorded
+        finally:
+            self._sync_finished(curriculum_id)
+
+    def _sync_finished(self, curriculum_id: str) -> None:
+        self.in_flight.discard(curriculum_id)
+        # Edited again while this sync ran: sync once more
+        if curriculum_id in self._rerun:
+            self._rerun.discard(curriculum_id)
+            if curriculum_id in self.dirty and curriculum_id not in self.paused:
+                self._start_sync(curriculum_id)
+
+    async def wait_idle(self) -> None:
+        """Wait until all queued and running syncs have finished."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _retry_delay(self, attempt: int, retry_delay_seconds: float) -> float:
+        """Exponential backoff with full jitter on top."""
+        return retry_delay_seconds * (2 ** attempt) + random.uniform(0, retry_delay_seconds)
 
     async def _sync_curriculum_with_retry(
         self,
         curriculum_id: str,
         max_retries: int = 3,
-        retry_delay_seconds: int = 5,
+        retry_delay_seconds: float = 5,
+        direction: str = "bidirectional",
     ) -> Dict[str, Any]:
         """
         Sync a curriculum with automatic retry on failure.
@@ -108,32 +450,78 @@ class SyncScheduler:
         Args:
             curriculum_id: UUID of curriculum
             max_retries: Number of retries on failure
-            retry_delay_seconds: Delay between retries
+            retry_delay_seconds: Base delay between retries
+            direction: "up", "down" or "bidirectional"
 
         Returns:
             Sync result
+
+        Raises:
+            Exception: The last error, once retries are exhausted (SyncException
+                is not retried: the curriculum or its folder mapping is missing)
         """
-        for attempt in range(max_retries):
+        stats = self.duration_stats.setdefault(curriculum_id, SyncDurationStats())
+        # Cleared up front so changes made while syncing mark it dirty again
+        self.dirty.discard(curriculum_id)
+
+        attempt = 0
+        while True:
             # Mark as in progress
-            self.active_syncs[curriculum_id] = {
-                "status": SyncStatus.IN_PROGRESS.value,
-                "started_at": datetime.now(UTC),
-                "attempt": attempt + 1,
-            }
+            self._set_job(
+                curriculum_id,
+                status=SyncStatus.IN_PROGRESS.value,
+                started_at=datetime.now(UTC),
+                attempt=attempt + 1,
+            )
 
-            # Run sync
-            result = await self.sync_service.sync_curriculum(curriculum_id)
+            started = time.monotonic()
+            db = self.session_factory()
+            try:
+                result = await self.sync_service_factory(db).sync_curriculum(curriculum_id, direction=direction)
+            except Exception as error:
+                stats.failures += 1
+                if isinstance(error, SyncException) or attempt >= max_retries:
+                    self._set_job(
+                        curriculum_id,
+                        status=SyncStatus.FAILED.value,
+                        completed_at=datetime.now(UTC),
+                        error=str(error),
+                    )
+                    self.dirty.add(curriculum_id)
+                    self._add_to_sync_history(curriculum_id, {"status": SyncStatus.FAILED.value, "error": str(error)})
+                    logger.error(f"Sync failed for curriculum {curriculum_id} after {attempt + 1} attempt(s): {error}")
+                    raise
+                delay = self._retry_delay(attempt, retry_delay_seconds)
+                logger.warning(
+                    f"Sync attempt {attempt + 1} failed for curriculum {curriculum_id}: {error}; "
+                    f"retrying in {delay:.1f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                db.close()
+
+            duration = time.monotonic() - started
+            stats.record(duration)
+            result["duration_seconds"] = duration
+            if result.get("errors"):
+                # Failed nodes stay unsynced; try them again next round
+                self.dirty.add(curriculum_id)
 
             # Mark as completed
-            self.active_syncs[curriculum_id]["status"] = SyncStatus.COMPLETED.value
-            self.active_syncs[curriculum_id]["completed_at"] = datetime.now(UTC)
-            self.active_syncs[curriculum_id]["result"] = result
+            self._set_job(
+                curriculum_id,
+                status=SyncStatus.COMPLETED.value,
+                completed_at=datetime.now(UTC),
+                result=result,
+            )
 
             # Track in history
             self._add_to_sync_history(curriculum_id, result)
 
             logger.info(
-                f"Sync completed for curriculum {curriculum_id}: "
+                f"Sync completed for curriculum {curriculum_id} in {duration:.2f}s: "
                 f"{result.get('synced_count', 0)} synced, "
                 f"{result.get('conflict_count', 0)} conflicts"
             )
@@ -150,33 +538,74 @@ class SyncScheduler:
         Returns:
             Sync result
         """
-        # Run in background
-        job = self.scheduler.add_job(
-            self._sync_curriculum_with_retry,
-            args=[curriculum_id],
-            id=f'sync_{curriculum_id}',
-            name=f'Immediate Sync - {curriculum_id}',
-        )
+        if curriculum_id in self.in_flight:
+            return {
+                "curriculum_id": curriculum_id,
+                "status": "already_running",
+                "scheduled_at": self.active_syncs.get(curriculum_id, {}).get("queued_at"),
+            }
+
+        self.mark_dirty(curriculum_id)
+        task = self._start_sync(curriculum_id)
 
         return {
             "curriculum_id": curriculum_id,
-            "job_id": job.id,
+            "job_id": task.get_name(),
             "status": "scheduled",
             "scheduled_at": datetime.now(UTC),
         }
 
+    async def run_manual_sync(self, curriculum_id: str, direction: str = "bidirectional") -> Dict[str, Any]:
+        """
+        Run a sync requested through the API and wait for its result.
+
+        It takes the same per-curriculum slot as scheduled and debounced
+        syncs, so two syncs of one curriculum never plan the same uploads
+        side by side. While another worker holds the scheduler lease, the
+        sync is left to it as a pending job, like a follower's edits.
+
+        Args:
+            curriculum_id: UUID of curriculum
+            direction: "up", "down" or "bidirectional"
+
+        Returns:
+            Sync result, or a dict whose status is "already_running" (a sync of
+            the curriculum is queued or running here) or "pending" (queued
+            for the leader)
+
+        Raises:
+            Exception: The sync's error (recorded in the job and history)
+        """
+        curriculum_id = str(curriculum_id)
+        if curriculum_id in self.in_flight:
+            return {"curriculum_id": curriculum_id, "status": "already_running"}
+        if self.scheduler.running and not self.is_leader:
+            self.job_store.request_sync(curriculum_id)
+            self._flush()
+            return {"curriculum_id": curriculum_id, "status": SyncStatus.PENDING.value}
+
+        self.in_flight.add(curriculum_id)
+        self.active_syncs[curriculum_id] = {}
+        self._set_job(curriculum_id, queued_at=datetime.now(UTC), worker_id=self.job_store.worker_id)
+        try:
+            return await self._sync_curriculum_with_retry(curriculum_id, max_retries=0, direction=direction)
+        finally:
+            self._sync_finished(curriculum_id)
+
     def pause_sync(self, curriculum_id: str) -> None:
         """Pause sync for a curriculum."""
-        if curriculum_id in self.active_syncs:
-            self.active_syncs[curriculum_id]["status"] = SyncStatus.PAUSED.value
-            logger.info(f"Sync paused for curriculum {curriculum_id}")
+        self.paused.add(curriculum_id)
+        self._set_job(curriculum_id, status=SyncStatus.PAUSED.value)
+        logger.info(f"Sync paused for curriculum {curriculum_id}")
 
     def resume_sync(self, curriculum_id: str) -> None:
         """Resume sync for a curriculum."""
-        if curriculum_id in self.active_syncs:
-            if self.active_syncs[curriculum_id]["status"] == SyncStatus.PAUSED.value:
-                self.active_syncs[curriculum_id]["status"] = SyncStatus.PENDING.value
-                logger.info(f"Sync resumed for curriculum {curriculum_id}")
+        self.paused.discard(curriculum_id)
+        job = self.active_syncs.get(curriculum_id) or self.job_store.get_job(curriculum_id) or {}
+        if job.get("status") == SyncStatus.PAUSED.value:
+            # Pending: the next round syncs whatever accumulated meanwhile
+            self._set_job(curriculum_id, status=SyncStatus.PENDING.value, queued_at=datetime.now(UTC))
+            logger.info(f"Sync resumed for curriculum {curriculum_id}")
 
     def get_sync_status(self, curriculum_id: str) -> Dict[str, Any]:
         """
@@ -188,57 +617,61 @@ class SyncScheduler:
         if curriculum_id in self.active_syncs:
             return self.active_syncs[curriculum_id]
 
+        # Job run by another worker (or before a restart)
+        job = self.job_store.get_job(curriculum_id)
+        if job is not None:
+            return job
+
         # Get from sync service
-        return self.sync_service.get_sync_status(curriculum_id)
+        db = self.session_factory()
+        try:
+            return self.sync_service_factory(db).get_sync_status(curriculum_id)
+        finally:
+            db.close()
 
-    def get_sync_history(self, curriculum_id: str, limit: int = 10) -> list:
+    def get_duration_stats(self, curriculum_id: str) -> Dict[str, Any]:
+        """Sync duration statistics for a curriculum (empty if never synced)."""
+        return self.duration_stats.get(curriculum_id, SyncDurationStats()).to_dict()
+
+    def get_sync_history(self, curriculum_id: str, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get sync history for a curriculum.
+        Get sync history for a curriculum, newest first.
 
         Args:
             curriculum_id: UUID of curriculum
             limit: Maximum number of history entries to return
+            cursor: ``next_cursor`` of the previous page
 
         Returns:
-            List of sync history entries
+            Dict with "items" (history entries) and "next_cursor" (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
         """
-        history = self.sync_history.get(curriculum_id, [])
-        return history[-limit:]
+        return self.job_store.history_page(curriculum_id, limit, cursor)
 
     def _add_to_sync_history(self, curriculum_id: str, result: Dict[str, Any]) -> None:
-        """Add sync result to history."""
-        if curriculum_id not in self.sync_history:
-            self.sync_history[curriculum_id] = []
-
-        history_entry = {
-            "timestamp": datetime.now(UTC).isoformat(),
-            "status": result.get("status"),
-            "synced_count": result.get("synced_count", 0),
-            "updated_count": result.get("updated_count", 0),
-            "conflict_count": result.get("conflict_count", 0),
-            "error_count": len(result.get("errors", [])),
-        }
-
-        self.sync_history[curriculum_id].append(history_entry)
-
-        # Keep only last 100 entries
-        if len(self.sync_history[curriculum_id]) > 100:
-            self.sync_history[curriculum_id] = self.sync_history[curriculum_id][-100:]
+        """Queue a sync result for the next bulk history write."""
+        self.job_store.record_history(curriculum_id, result)
+        self._schedule_flush()
 
     def get_all_sync_status(self) -> Dict[str, Any]:
         """Get sync status for all curriculums."""
-        curriculums = self.db.query(Curriculum).all()
+        db = self.session_factory()
+        try:
+            curriculum_ids = [row.curriculum_id for row in db.query(Curriculum.curriculum_id)]
+        finally:
+            db.close()
 
         all_status = {
-            "total_curriculums": len(curriculums),
-            "active_syncs": len(self.active_syncs),
+            "total_curriculums": len(curriculum_ids),
+            "active_syncs": len(self.in_flight),
+            "dirty_curriculums": len(self.dirty),
             "curriculums": {},
         }
 
-        for curriculum in curriculums:
-            all_status["curriculums"][curriculum.curriculum_id] = self.get_sync_status(
-                curriculum.curriculum_id
-            )
+        for curriculum_id in curriculum_ids:
+            all_status["curriculums"][curriculum_id] = self.get_sync_status(curriculum_id)
 
         return all_status
 
@@ -247,16 +680,35 @@ class SyncScheduler:
 _scheduler_instance: Optional[SyncScheduler] = None
 
 
-def get_sync_scheduler(
-    db: Session,
-    sync_service: SyncService,
-) -> SyncScheduler:
+def create_sync_scheduler(session_factory: Callable[[], Session] = SessionLocal) -> SyncScheduler:
     """
-    Get or create Sync Scheduler instance.
+    Sync Scheduler configured from settings.
 
     Args:
-        db: SQLAlchemy database session
-        sync_service: SyncService instance
+        session_factory: Creates the sessions its queries and syncs run in
+
+    Returns:
+        SyncScheduler instance (not started)
+    """
+    return SyncScheduler(
+        settings.SYNC_INTERVAL_MINUTES,
+        max_concurrent_syncs=settings.SYNC_MAX_CONCURRENT,
+        max_retries=settings.MAX_SYNC_RETRIES,
+        retry_delay_seconds=settings.SYNC_RETRY_DELAY_SECONDS,
+        session_factory=session_factory,
+        debounce_seconds=settings.SYNC_DEBOUNCE_SECONDS,
+        max_debounce_seconds=settings.SYNC_MAX_DEBOUNCE_SECONDS,
+        remote_poll_minutes=settings.SYNC_REMOTE_POLL_MINUTES,
+        lease_seconds=settings.SYNC_LEASE_SECONDS,
+    )
+
+
+def get_sync_scheduler() -> SyncScheduler:
+    """
+    Get or create the process-wide Sync Scheduler (on SessionLocal).
+
+    The application builds its scheduler at startup (see main.py); this one
+    serves code running without the application lifespan.
 
     Returns:
         SyncScheduler instance
@@ -264,7 +716,6 @@ def get_sync_scheduler(
     global _scheduler_instance
 
     if _scheduler_instance is None:
-        sync_interval = getattr(settings, 'SYNC_INTERVAL_MINUTES', 5)
-        _scheduler_instance = SyncScheduler(db, sync_service, sync_interval)
+        _scheduler_instance = create_sync_scheduler()
 
     return _scheduler_instance
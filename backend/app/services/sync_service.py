@@ -6,22 +6,70 @@ Handles conflict detection and resolution based on configurable strategies.
 """
 
 from datetime import datetime, UTC, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Iterable, Set, Tuple
 from enum import Enum
 from uuid import UUID
+import asyncio
+import hashlib
 import json
 
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
 
 from backend.app.models.curriculum import Curriculum, Node
+from backend.app.models.node import NodeContent
 from backend.app.models.sync_metadata import SyncMetadata, CurriculumDriveFolder
+from backend.app.services.dependency_graph import invalidate_dependency_graph
 from backend.app.services.google_drive_service import (
     GoogleDriveService,
     GoogleDriveServiceException,
 )
+from backend.app.services.sync_planner import SyncPlan, SyncPlanner, _as_utc, _parse_drive_time
 from backend.app.core.config import settings
 
 
+# Maximum number of IDs per IN (...) list when loading nodes
+_IN_CHUNK = 500
+
+
+def _local_modified(node: Node) -> datetime:
+    """Latest local modification of a node (its own row or its content)."""
+    stamps = [node.updated_at]
+    if node.content is not None and node.content.updated_at is not None:
+        stamps.append(node.content.updated_at)
+    return max(_as_utc(stamp) for stamp in stamps)
+
+
+def _content_hash(payload: Dict[str, Any]) -> str:
+    """SHA-256 of a node payload, ignoring its modification timestamp."""
+    stable = {key: value for key, value in payload.items() if key != "modified_at"}
+    return hashlib.sha256(GoogleDriveService.encode_node(stable)).hexdigest()
+
+
+def _file_md5(payload: Dict[str, Any]) -> str:
+    """MD5 of the uploaded node file; equals Drive's md5Checksum for it."""
+    return hashlib.md5(GoogleDriveService.encode_node(payload)).hexdigest()
+
+
+def _duplicate_file(node_id: str, file_id: str) -> Dict[str, Any]:
+    """Conflict entry for a Drive file of a node that already has its file (a copy)."""
+    return {"node_id": node_id, "file_id": file_id, "resolution": "duplicate_file_skipped"}
+
+
+async def _gather_ordered(coroutines: Iterable[Awaitable[Any]]) -> List[Any]:
+    """
+    Run coroutines concurrently and return their results in submission order.
+
+    Failures are returned in place (as exception instances) so one failed
+    Drive request does not abort the others.
+    """
+    outcomes = await asyncio.gather(*coroutines, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+    return outcomes
+
+
 def get_drive_service() -> GoogleDriveService:
     """Get or create Google Drive service instance (singleton pattern)."""
     if not hasattr(get_drive_service, '_instance'):
@@ -123,262 +171,417 @@ class SyncService:
             "synced_nodes": [],
             "updated_nodes": [],
             "deleted_nodes": [],
+            "unchanged_nodes": [],
             "conflicts": [],
             "errors": [],
             "direction": direction,
             "timestamp": datetime.now(UTC),
         }
 
-        if direction in ("up", "bidirectional"):
-            await self._sync_up(curriculum_id, drive_folder.drive_folder_id, result)
+        plan = await self.plan_sync(curriculum_id, direction, drive_folder)
+        result["mode"] = plan.mode
 
-        if direction in ("down", "bidirectional"):
-            await self._sync_down(curriculum_id, drive_folder.drive_folder_id, result)
+        await self._apply_downloads(plan, result)
+        downloads_failed = bool(result["errors"])
+        await self._apply_uploads(plan, drive_folder.google_drive_folder_id, result)
+
+        # A file that failed to download is only seen again if the token
+        # stays put: the next run re-reads these changes (or relists the
+        # folder) and skips the files already applied by their md5
+        if plan.page_token and not downloads_failed:
+            drive_folder.changes_page_token = plan.page_token
+        drive_folder.last_sync_at = datetime.now(UTC)
+        self.db.commit()
 
         # Mark sync as completed
         result["status"] = "completed"
         result["synced_count"] = len(result["synced_nodes"])
         result["updated_count"] = len(result["updated_nodes"])
         result["deleted_count"] = len(result["deleted_nodes"])
+        result["unchanged_count"] = len(result["unchanged_nodes"])
         result["conflict_count"] = len(result["conflicts"])
+        result["error_count"] = len(result["errors"])
 
         return result
 
-    async def _sync_up(
+    async def plan_sync(
         self,
         curriculum_id: str,
-        drive_folder_id: str,
-        result: Dict[str, Any],
-    ) -> None:
+        direction: str = "bidirectional",
+        drive_folder: Optional[CurriculumDriveFolder] = None,
+    ) -> SyncPlan:
         """
-        Sync local changes up to Google Drive (local → Drive).
+        Work out what a sync would do without changing anything.
+
+        Reads Drive (the changes feed when the folder has a token, else the
+        full folder listing) but performs no writes on either side, so it
+        doubles as a dry run.
 
         Args:
             curriculum_id: UUID of curriculum
-            drive_folder_id: Google Drive folder ID
-            result: Result dictionary to populate
-        """
-        # Get all nodes in curriculum
-        nodes = self.db.query(Node).filter(
-            Node.curriculum_id == curriculum_id
-        ).all()
+            direction: "up", "down" or "bidirectional"
+            drive_folder: The curriculum's Drive folder mapping (looked up if omitted)
 
-        for node in nodes:
-            sync_meta = self.db.query(SyncMetadata).filter(
-                SyncMetadata.node_id == node.node_id
+        Returns:
+            SyncPlan
+
+        Raises:
+            SyncException: If the curriculum has no Drive folder mapping
+        """
+        if drive_folder is None:
+            drive_folder = self.db.query(CurriculumDriveFolder).filter(
+                CurriculumDriveFolder.curriculum_id == curriculum_id
             ).first()
+            if not drive_folder:
+                raise SyncException(f"No Drive folder mapping for curriculum {curriculum_id}")
+
+        planner = SyncPlanner(self.db, curriculum_id)
+        if direction not in ("down", "bidirectional"):
+            return planner.plan(direction)
+
+        folder_id = drive_folder.google_drive_folder_id
+        if drive_folder.changes_page_token:
+            try:
+                changes, new_token = await self.drive_service.list_changes(drive_folder.changes_page_token)
+            except GoogleDriveServiceException:
+                pass  # Token expired or rejected: fall back to a full listing
+            else:
+                remote_files, removed = self._changed_files(changes, folder_id)
+                return planner.plan(direction, remote_files, removed, complete_listing=False, page_token=new_token)
+
+        # Take the token before listing so changes made during the listing
+        # are picked up by the next incremental run
+        start_token = await self.drive_service.get_changes_start_token()
+        remote_files = {
+            drive_file["id"]: drive_file
+            async for drive_file in self.drive_service.iter_nodes_on_drive(folder_id)
+        }
+        return planner.plan(direction, remote_files, page_token=start_token)
 
-            if not sync_meta:
-                # New node - create Drive file
-                await self._create_node_on_drive(node, drive_folder_id, result)
-            elif not sync_meta.is_synced:
-                # Modified node - update Drive file
-                await self._update_node_on_drive(node, sync_meta, result)
+    @staticmethod
+    def _changed_files(
+        changes: List[Dict[str, Any]],
+        folder_id: str,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+        """
+        Split a changes-feed result into node files now in the folder and files that left it.
 
-    async def _sync_down(
+        Returns:
+            (file ID -> file entry for node files in the folder, IDs of files
+            that were deleted, trashed or moved out of the folder)
+        """
+        # The feed can report a file several times; its latest entry wins
+        latest = {}
+        for change in changes:
+            if change.get("fileId"):
+                latest[change["fileId"]] = change
+
+        present, removed = {}, set()
+        for file_id, change in latest.items():
+            drive_file = change.get("file") or {}
+            if (
+                change.get("removed")
+                or drive_file.get("trashed")
+                or folder_id not in drive_file.get("parents", [])
+            ):
+                removed.add(file_id)
+            elif drive_file.get("mimeType") == GoogleDriveService.JSON_MIME_TYPE:
+                present[file_id] = drive_file
+        return present, removed
+
+    @staticmethod
+    def _node_payload(node: Node, children: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Serialize a node into the JSON document stored on Drive."""
+        if children is None:
+            children = [str(child.node_id) for child in node.child_nodes]
+        return {
+            "id": str(node.node_id),
+            "title": node.title,
+            "content": node.content.markdown_content if node.content else "",
+            "children": children,
+            "created_at": node.created_at.isoformat() if node.created_at else None,
+            "modified_at": node.updated_at.isoformat() if node.updated_at else None,
+        }
+
+    async def _apply_uploads(
         self,
-        curriculum_id: str,
+        plan: SyncPlan,
         drive_folder_id: str,
         result: Dict[str, Any],
     ) -> None:
         """
-        Sync changes down from Google Drive (Drive → local).
+        Push local creates, updates and deletions to Drive (local → Drive).
+
+        Drive requests run concurrently on the Drive executor; their results
+        are recorded in plan order once all of them have finished. Nodes whose
+        content hash matches the last synced one are not uploaded again.
 
         Args:
-            curriculum_id: UUID of curriculum
+            plan: Sync plan
             drive_folder_id: Google Drive folder ID
             result: Result dictionary to populate
         """
-        # Get all files in Drive folder
-        drive_files = await self.drive_service.list_nodes_on_drive(drive_folder_id)
-
-        local_files = set(
-            self.db.query(SyncMetadata.google_drive_file_id)
-            .filter(SyncMetadata.google_drive_file_id.isnot(None))
-            .all()
+        node_ids = plan.upload_creates + plan.upload_updates
+        if not node_ids and not plan.remote_trashes:
+            return
+
+        nodes = {}
+        for start in range(0, len(node_ids), _IN_CHUNK):
+            chunk = node_ids[start:start + _IN_CHUNK]
+            for node in self.db.query(Node).options(selectinload(Node.content)).filter(Node.node_id.in_(chunk)):
+                nodes[node.node_id] = node
+
+        creates = set(plan.upload_creates)
+        file_ids = dict(plan.existing_files)
+        # A full listing shows every existing node file; otherwise look the
+        # remaining creates up in batches instead of probing one by one
+        probe = False
+        unknown = [node_id for node_id in plan.upload_creates if node_id not in file_ids]
+        if plan.mode != "full" and unknown:
+            try:
+                file_ids.update(await self.drive_service.find_node_files(unknown, drive_folder_id))
+            except GoogleDriveServiceException:
+                probe = True  # fall back to a lookup per node
+
+        # A conflict resolved in favour of the local version must overwrite Drive
+        conflicts = set(plan.conflicts)
+        uploads = []
+        for node_id in node_ids:
+            node = nodes[node_id]
+            payload = self._node_payload(node, plan.children.get(node_id, []))
+            if node_id in creates:
+                file_id = file_ids.get(node_id)
+            else:
+                sync_meta = plan.metadata_by_node[node_id]
+                file_id = sync_meta.google_drive_file_id
+                if node_id not in conflicts and sync_meta.content_hash == _content_hash(payload):
+                    self._record_unchanged(plan, node, result)
+                    continue
+            uploads.append((node, file_id, payload))
+        trashes = [plan.metadata_by_node[node_id] for node_id in plan.remote_trashes]
+
+        # Content uploads cannot be batched; trashes go out as batch requests
+        outcomes = await _gather_ordered(
+            [self._upload_node(node, file_id, payload, drive_folder_id, probe) for node, file_id, payload in uploads]
+            + [self.drive_service.trash_files([meta.google_drive_file_id for meta in trashes])]
         )
 
-        for drive_file in drive_files:
-            file_id = drive_file["id"]
-
-            sync_meta = self.db.query(SyncMetadata).filter(
-                SyncMetadata.google_drive_file_id == file_id
-            ).first()
-
-            if not sync_meta:
-                # New file on Drive - create local node
-                await self._create_node_locally(file_id, curriculum_id, result)
+        for (node, _, payload), outcome in zip(uploads, outcomes):
+            if isinstance(outcome, Exception):
+                result["errors"].append({"node_id": node.node_id, "error": str(outcome)})
+            else:
+                self._record_upload(plan, node, outcome, payload, node.node_id in creates, result)
+        trash_errors = outcomes[-1]
+        for meta in trashes:
+            error = trash_errors if isinstance(trash_errors, Exception) else trash_errors[meta.google_drive_file_id]
+            if error is not None:
+                result["errors"].append({"node_id": meta.node_id, "error": str(error)})
             else:
-                # Existing file - check for updates
-                await self._check_drive_updates(sync_meta, file_id, result)
-
-        # Check for deleted files (in local but not on Drive)
-        for file_id_tuple in local_files:
-            file_id = file_id_tuple[0]
-            if not any(f["id"] == file_id for f in drive_files):
-                sync_meta = self.db.query(SyncMetadata).filter(
-                    SyncMetadata.google_drive_file_id == file_id
-                ).first()
-                if sync_meta and sync_meta.node_id:
-                    result["deleted_nodes"].append(sync_meta.node_id)
-                    # Mark node as deleted locally
-                    node = self.db.query(Node).filter(
-                        Node.node_id == sync_meta.node_id
-                    ).first()
-                    if node:
-                        self.db.delete(node)
-
-    async def _create_node_on_drive(
+                self.db.delete(meta)
+        self.db.commit()
+
+    async def _upload_node(
         self,
         node: Node,
+        file_id: Optional[str],
+        payload: Dict[str, Any],
         drive_folder_id: str,
-        result: Dict[str, Any],
-    ) -> None:
-        """Create a new node on Google Drive."""
-        node_data = {
-            "id": str(node.node_id),
-            "title": node.title,
-            "content": node.node_content.markdown_content if node.node_content else "",
-            "children": [str(child.node_id) for child in node.children],
-            "created_at": node.created_at.isoformat() if node.created_at else None,
-            "modified_at": node.updated_at.isoformat() if node.updated_at else None,
-        }
-
-        file_id = await self.drive_service.save_node_to_drive(
-            UUID(node.node_id),
-            node_data,
-            drive_folder_id,
-        )
-
-        # Create sync metadata
-        sync_meta = SyncMetadata(
-            curriculum_id=node.curriculum_id,
-            node_id=node.node_id,
-            google_drive_file_id=file_id,
-            last_local_modified=node.updated_at,
-            last_drive_modified=datetime.now(UTC),
-            last_sync_time=datetime.now(UTC),
-            is_synced=True,
-        )
-        self.db.add(sync_meta)
-        self.db.commit()
-
-        result["synced_nodes"].append(node.node_id)
+        probe: bool = False,
+    ) -> str:
+        """Write one node's payload to Drive (no DB access); returns the Drive file ID."""
+        if not file_id:
+            return await self.drive_service.save_node_to_drive(
+                UUID(node.node_id),
+                payload,
+                drive_folder_id,
+                probe=probe,
+            )
+        await self.drive_service.update_node_on_drive(file_id, payload)
+        return file_id
 
-    async def _update_node_on_drive(
+    def _record_upload(
         self,
+        plan: SyncPlan,
         node: Node,
-        sync_meta: SyncMetadata,
+        file_id: str,
+        payload: Dict[str, Any],
+        created: bool,
         result: Dict[str, Any],
     ) -> None:
-        """Update an existing node on Google Drive."""
-        node_data = {
-            "id": str(node.node_id),
-            "title": node.title,
-            "content": node.node_content.markdown_content if node.node_content else "",
-            "children": [str(child.node_id) for child in node.children],
-            "created_at": node.created_at.isoformat() if node.created_at else None,
-            "modified_at": node.updated_at.isoformat() if node.updated_at else None,
-        }
-
-        await self.drive_service.update_node_on_drive(
-            sync_meta.google_drive_file_id,
-            node_data,
-        )
+        """Record a finished upload in the node's sync metadata."""
+        now = datetime.now(UTC)
+        sync_meta = plan.metadata_by_node.get(node.node_id)
+        if sync_meta is None:
+            sync_meta = SyncMetadata(curriculum_id=node.curriculum_id, node_id=node.node_id)
+            self.db.add(sync_meta)
+            plan.metadata_by_node[node.node_id] = sync_meta
+        sync_meta.google_drive_file_id = file_id
+        sync_meta.content_hash = _content_hash(payload)
+        sync_meta.drive_md5 = _file_md5(payload)
+        sync_meta.last_local_modified = plan.local_modified.get(node.node_id, node.updated_at)
+        sync_meta.last_drive_modified = now
+        sync_meta.last_sync_time = now
+        sync_meta.is_synced = True
+        result["synced_nodes" if created else "updated_nodes"].append(node.node_id)
 
-        # Update sync metadata
-        sync_meta.last_local_modified = node.updated_at
-        sync_meta.last_drive_modified = datetime.now(UTC)
+    @staticmethod
+    def _record_unchanged(plan: SyncPlan, node: Node, result: Dict[str, Any]) -> None:
+        """Mark a node whose payload matches Drive as synced without uploading it."""
+        sync_meta = plan.metadata_by_node[node.node_id]
+        sync_meta.last_local_modified = plan.local_modified.get(node.node_id, node.updated_at)
         sync_meta.last_sync_time = datetime.now(UTC)
         sync_meta.is_synced = True
-        self.db.commit()
+        result["unchanged_nodes"].append(node.node_id)
 
-        result["updated_nodes"].append(node.node_id)
+    async def _apply_downloads(self, plan: SyncPlan, result: Dict[str, Any]) -> None:
+        """
+        Apply Drive creates, updates, deletions and conflicts locally (Drive → local).
 
-    async def _create_node_locally(
+        Changed files are downloaded concurrently, then applied in plan order.
+        A conflict whose resolution keeps the local version is queued for upload.
+
+        Args:
+            plan: Sync plan
+            result: Result dictionary to populate
+        """
+        for file_id, node_id in plan.duplicate_files.items():
+            result["conflicts"].append(_duplicate_file(node_id, file_id))
+
+        conflict_files = [plan.metadata_by_node[node_id].google_drive_file_id for node_id in plan.conflicts]
+        file_ids = plan.download_creates + plan.download_updates + conflict_files
+
+        downloads = await _gather_ordered(
+            self.drive_service.load_node_from_drive(file_id) for file_id in file_ids
+        )
+        node_data_by_file = {}
+        for file_id, node_data in zip(file_ids, downloads):
+            if isinstance(node_data, Exception):
+                result["errors"].append({"file_id": file_id, "error": str(node_data)})
+            else:
+                node_data_by_file[file_id] = node_data
+
+        for file_id in plan.download_creates:
+            if file_id not in node_data_by_file:
+                continue
+            # One bad file must not stop the sync (and its uploads) for good
+            try:
+                with self.db.begin_nested():
+                    self._create_node_locally(plan, file_id, node_data_by_file[file_id], result)
+            except SQLAlchemyError as error:
+                result["errors"].append({"file_id": file_id, "error": str(error)})
+
+        applied = []
+        for file_id in plan.download_updates + conflict_files:
+            if file_id not in node_data_by_file:
+                continue
+            sync_meta = plan.metadata_by_file[file_id]
+            node = self.db.get(Node, sync_meta.node_id)
+            if node is None:
+                continue
+            if sync_meta.node_id in plan.conflicts:
+                conflict = await self._resolve_conflict(node, node_data_by_file[file_id], sync_meta)
+                result["conflicts"].append(conflict)
+                if conflict["resolution"] == "local_version_kept" and plan.direction != "down":
+                    plan.upload_updates.append(node.node_id)
+                    continue
+            else:
+                self._apply_node_data(node, node_data_by_file[file_id])
+                result["updated_nodes"].append(node.node_id)
+            sync_meta.last_drive_modified = _parse_drive_time(plan.remote_files[file_id]["modifiedTime"])
+            sync_meta.drive_md5 = plan.remote_files[file_id].get("md5Checksum")
+            sync_meta.last_sync_time = datetime.now(UTC)
+            sync_meta.is_synced = True
+            applied.append((node, sync_meta))
+
+        for node_id in plan.local_deletes:
+            self._delete_node_locally(plan.metadata_by_node[node_id], result)
+
+        # Applying Drive data bumps the nodes' updated_at; record it so the
+        # next sync does not see these nodes as locally modified
+        self.db.flush()
+        for node, sync_meta in applied:
+            sync_meta.last_local_modified = _local_modified(node)
+            sync_meta.content_hash = _content_hash(self._node_payload(node, plan.children.get(node.node_id, [])))
+        self.db.commit()
+        # Created, restored, moved and deleted nodes change the curriculum's outline
+        invalidate_dependency_graph(plan.curriculum_id)
+
+    @staticmethod
+    def _apply_node_data(node: Node, node_data: Dict[str, Any]) -> None:
+        node.title = node_data.get("title", node.title)
+        content = node_data.get("content")
+        if node.content:
+            node.content.markdown_content = content or ""
+        elif content:
+            node.content = NodeContent(markdown_content=content)
+
+    def _create_node_locally(
         self,
+        plan: SyncPlan,
         file_id: str,
-        curriculum_id: str,
+        node_data: Dict[str, Any],
         result: Dict[str, Any],
     ) -> None:
-        """Create a new node locally from Drive file."""
-        node_data = await self.drive_service.load_node_from_drive(file_id)
-
-        # Create node
-        node = Node(
-            node_id=node_data.get("id"),
-            curriculum_id=curriculum_id,
-            title=node_data.get("title", "Untitled"),
-            order_index=0,
-        )
-        self.db.add(node)
+        """
+        Create a new node locally from a downloaded Drive file.
+
+        A file of a node deleted in this curriculum (trashed on Drive, then
+        restored) restores that node. A file of any other existing node is
+        a copy: it is reported as a conflict and left alone.
+
+        Args:
+            plan: Sync plan
+            file_id: Google Drive file ID
+            node_data: Downloaded node JSON
+            result: Result dictionary to populate
+        """
+        node_id = node_data.get("id")
+        node = self.db.get(Node, node_id) if node_id else None
+        if node is None:
+            node = Node(
+                node_id=node_id,
+                curriculum_id=plan.curriculum_id,
+                title=node_data.get("title", "Untitled"),
+                order_index=0,
+            )
+            self.db.add(node)
+        elif (
+            node.deleted_at is None
+            or node.curriculum_id != plan.curriculum_id
+            or node.node_id in plan.metadata_by_node
+        ):
+            result["conflicts"].append(_duplicate_file(node.node_id, file_id))
+            return
+        else:
+            node.deleted_at = None
+        self._apply_node_data(node, node_data)
         self.db.flush()
 
         # Create sync metadata
+        now = datetime.now(UTC)
         sync_meta = SyncMetadata(
-            curriculum_id=curriculum_id,
+            curriculum_id=plan.curriculum_id,
             node_id=node.node_id,
             google_drive_file_id=file_id,
-            last_local_modified=datetime.now(UTC),
-            last_drive_modified=datetime.fromisoformat(
-                node_data.get("modified_at", datetime.now(UTC).isoformat())
-            ),
-            last_sync_time=datetime.now(UTC),
+            last_local_modified=_local_modified(node),
+            last_drive_modified=_parse_drive_time(plan.remote_files[file_id]["modifiedTime"]),
+            drive_md5=plan.remote_files[file_id].get("md5Checksum"),
+            content_hash=_content_hash(self._node_payload(node, [])),
+            last_sync_time=now,
             is_synced=True,
         )
         self.db.add(sync_meta)
-        self.db.commit()
+        plan.metadata_by_node[node.node_id] = sync_meta
 
         result["synced_nodes"].append(node.node_id)
 
-    async def _check_drive_updates(
-        self,
-        sync_meta: SyncMetadata,
-        file_id: str,
-        result: Dict[str, Any],
-    ) -> None:
-        """Check if Drive file has been updated and sync down if necessary."""
-        # Get file metadata from Drive
-        metadata = await self.drive_service.get_file_metadata(file_id)
-        drive_modified = datetime.fromisoformat(metadata["modifiedTime"].replace("Z", "+00:00"))
-
-        # Check if Drive version is newer
-        if sync_meta.last_drive_modified and drive_modified > sync_meta.last_drive_modified:
-            # Load updated data from Drive
-            node_data = await self.drive_service.load_node_from_drive(file_id)
-
-            # Get local node
-            node = self.db.query(Node).filter(
-                Node.node_id == sync_meta.node_id
-            ).first()
-
-            if node:
-                # Resolve conflict if both have been modified since last sync
-                local_newer = (
-                    sync_meta.last_local_modified and
-                    sync_meta.last_local_modified > sync_meta.last_sync_time
-                )
-
-                if local_newer:
-                    # Conflict detected
-                    conflict = await self._resolve_conflict(
-                        node,
-                        node_data,
-                        sync_meta,
-                    )
-                    result["conflicts"].append(conflict)
-                else:
-                    # Update local node from Drive
-                    node.title = node_data.get("title", node.title)
-                    if node.node_content:
-                        node.node_content.markdown_content = node_data.get("content", "")
-
-                    sync_meta.last_drive_modified = drive_modified
-                    sync_meta.last_sync_time = datetime.now(UTC)
-                    sync_meta.is_synced = True
-                    self.db.commit()
-
-                    result["updated_nodes"].append(node.node_id)
+    def _delete_node_locally(self, sync_meta: SyncMetadata, result: Dict[str, Any]) -> None:
+        """Soft-delete the node of a file that is gone from Drive and drop its sync record."""
+        node = self.db.get(Node, sync_meta.node_id)
+        if node and node.deleted_at is None:
+            node.deleted_at = datetime.now(UTC)
+            result["deleted_nodes"].append(sync_meta.node_id)
+        self.db.delete(sync_meta)
 
     async def _resolve_conflict(
         self,
@@ -406,10 +609,10 @@ class SyncService:
 
         if self.conflict_strategy == ConflictResolutionStrategy.LAST_WRITE_WINS:
             # Compare modification times
-            local_mod = local_node.updated_at or datetime.now(UTC)
-            drive_mod = datetime.fromisoformat(
-                drive_data.get("modified_at", datetime.now(UTC).isoformat())
-            )
+            local_mod = _as_utc(local_node.updated_at or datetime.now(UTC))
+            drive_mod = _as_utc(datetime.fromisoformat(
+                drive_data.get("modified_at") or datetime.now(UTC).isoformat()
+            ))
 
             if drive_mod > local_mod:
                 # Drive is newer - update local
@@ -456,8 +659,13 @@ class SyncService:
         }
 
 
-# Singleton instance
-_sync_service_instance: Optional[SyncService] = None
+# CONFLICT_RESOLUTION_MODE values (see core/config.py) and their strategies;
+# "manual" has no automatic resolution yet and keeps the default
+_CONFLICT_MODES = {
+    "auto_latest": ConflictResolutionStrategy.LAST_WRITE_WINS,
+    "auto_local": ConflictResolutionStrategy.LOCAL_WINS,
+    "manual": ConflictResolutionStrategy.LAST_WRITE_WINS,
+}
 
 
 def get_sync_service(
@@ -465,7 +673,10 @@ def get_sync_service(
     drive_service: GoogleDriveService,
 ) -> SyncService:
     """
-    Get or create Sync Service instance.
+    Create a Sync Service bound to a database session.
+
+    A new instance is returned per call: the service holds the (request
+    scoped) session, so it must not outlive it.
 
     Args:
         db: SQLAlchemy database session
@@ -474,14 +685,8 @@ def get_sync_service(
     Returns:
         SyncService instance
     """
-    global _sync_service_instance
-
     # Get conflict strategy from settings
-    conflict_strategy = ConflictResolutionStrategy(
-        getattr(settings, 'CONFLICT_RESOLUTION_MODE', 'last_write_wins')
-    )
-
-    if _sync_service_instance is None:
-        _sync_service_instance = SyncService(db, drive_service, conflict_strategy)
+    mode = getattr(settings, 'CONFLICT_RESOLUTION_MODE', 'last_write_wins')
+    conflict_strategy = _CONFLICT_MODES.get(mode) or ConflictResolutionStrategy(mode)
 
-    return _sync_service_instance
+    return SyncService(db, drive_service, conflict_strategy)
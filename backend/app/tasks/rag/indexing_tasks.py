@@ -154,7 +154,7 @@ def index_document_task(
                 content=chunk.content,
                 content_hash=content_hash,
                 chunk_index=chunk.chunk_index,
-                metadata=chunk.metadata,
+                chunk_metadata=chunk.metadata,
                 # 자주 쿼리되는 필드 승격
                 policy_version=chunk.metadata.get("policy_version"),
                 scope_type=chunk.metadata.get("scope_type"),
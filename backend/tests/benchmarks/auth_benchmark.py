@@ -0,0 +1,192 @@
+"""
+Login burst benchmark: latency of concurrent requests while passwords hash.
+
+Drives the real FastAPI app in-process (httpx ASGI transport, temporary
+SQLite database). A burst of logins runs alongside a steady stream of cheap
+authenticated requests (GET /auth/me); the report shows how long those
+probes take while bcrypt is busy, for each password hashing pool:
+
+- inline: bcrypt on the event loop (the old behaviour)
+- thread: a thread pool (only helps if the bcrypt backend releases the GIL)
+- process: a process pool (the default)
+
+Logins turned away by admission control (503) are counted separately.
+
+Usage:
+    python -m backend.tests.benchmarks.auth_benchmark
+    python -m backend.tests.benchmarks.auth_benchmark --logins 64 --pools inline process --max-pending 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api.v1.endpoints.auth import get_auth_service
+from backend.app.auth.jwt_handler import get_jwt_handler
+from backend.app.auth.password_handler import PasswordHandler, POOL_KINDS
+from backend.app.db.session import get_async_db, get_db
+from backend.app.main import get_application
+from backend.app.models.base import Base
+from backend.app.services.auth_service import AuthService
+
+EMAIL = "bench@example.com"
+PASSWORD = "Benchmark-Passw0rd!"
+
+
+@dataclass
+class BurstResult:
+    """Latencies (milliseconds) of one login burst."""
+    pool: str
+    logins: int
+    succeeded: int
+    rejected: int
+    burst_seconds: float
+    login_p50_ms: float
+    probe_count: int
+    probe_p50_ms: float
+    probe_p95_ms: float
+    probe_max_ms: float
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _timed(client: httpx.AsyncClient, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return response, (time.perf_counter() - started) * 1000
+
+
+async def run_burst(
+    pool: str,
+    logins: int = 32,
+    rounds: int = 12,
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    probe_interval: float = 0.005,
+) -> BurstResult:
+    """Register one user, then fire ``logins`` concurrent logins while probing /auth/me."""
+    handler = PasswordHandler(rounds=rounds, pool=pool, max_workers=max_workers, max_pending=max_pending)
+    directory = tempfile.mkdtemp(prefix="auth-bench-")
+    path = os.path.join(directory, 'bench.db')
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    def override_auth_service(db: AsyncSession = Depends(get_async_db)) -> AuthService:
+        return AuthService(db, get_jwt_handler(), handler)
+
+    app = get_application(engine, run_lifespan=False)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_auth_service] = override_auth_service
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+            registered = await client.post("/auth/register", json={"email": EMAIL, "name": "Bench", "password": PASSWORD})
+            registered.raise_for_status()
+            headers = {"Authorization": f"Bearer {registered.json()['access_token']}"}
+            # Start the workers before measuring
+            await handler.verify_password_async(PASSWORD, await handler.hash_password_async(PASSWORD))
+
+            burst_done = asyncio.Event()
+            probes: List[float] = []
+
+            async def probe():
+                while not burst_done.is_set():
+                    response, elapsed = await _timed(client, "GET", "/auth/me", headers=headers)
+                    response.raise_for_status()
+                    probes.append(elapsed)
+                    await asyncio.sleep(probe_interval)
+
+            async def login():
+                return await _timed(client, "POST", "/auth/login", json={"email": EMAIL, "password": PASSWORD})
+
+            prober = asyncio.create_task(probe())
+            started = time.perf_counter()
+            results = await asyncio.gather(*(login() for _ in range(logins)))
+            burst_seconds = time.perf_counter() - started
+            burst_done.set()
+            await prober
+    finally:
+        handler.shutdown()
+        await async_engine.dispose()
+        engine.dispose()
+
+    succeeded = [elapsed for response, elapsed in results if response.status_code == 200]
+    rejected = sum(1 for response, _ in results if response.status_code == 503)
+    return BurstResult(
+        pool=pool,
+        logins=logins,
+        succeeded=len(succeeded),
+        rejected=rejected,
+        burst_seconds=round(burst_seconds, 3),
+        login_p50_ms=round(statistics.median(succeeded), 1) if succeeded else 0.0,
+        probe_count=len(probes),
+        probe_p50_ms=round(_percentile(probes, 0.5), 1),
+        probe_p95_ms=round(_percentile(probes, 0.95), 1),
+        probe_max_ms=round(max(probes, default=0.0), 1),
+    )
+
+
+def format_table(results: List[BurstResult]) -> str:
+    header = (
+        f"{'pool':<8} {'logins':>6} {'ok':>4} {'503':>4} {'burst s':>8} {'login p50':>10} "
+        f"{'probes':>6} {'probe p50':>10} {'probe p95':>10} {'probe max':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.pool:<8} {r.logins:>6} {r.succeeded:>4} {r.rejected:>4} {r.burst_seconds:>8.2f} {r.login_p50_ms:>10.1f} "
+            f"{r.probe_count:>6} {r.probe_p50_ms:>10.1f} {r.probe_p95_ms:>10.1f} {r.probe_max_ms:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure request latency during login bursts")
+    parser.add_argument("--pools", nargs="+", choices=POOL_KINDS, default=list(POOL_KINDS))
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent logins per burst")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing workers")
+    parser.add_argument("--max-pending", type=int, default=None, help="Admission limit")
+    args = parser.parse_args(argv)
+
+    results = [
+        asyncio.run(run_burst(pool, args.logins, args.rounds, args.workers, args.max_pending))
+        for pool in args.pools
+    ]
+    print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
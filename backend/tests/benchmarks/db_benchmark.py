@@ -0,0 +1,190 @@
+"""
+Database concurrency benchmark: write throughput per engine profile.
+
+Runs the same workload against a fresh SQLite file for each profile:
+
+- default: ``create_engine(url)`` as db/session.py used to build it
+  (rollback journal, ``synchronous=FULL``, SQLAlchemy's default pool)
+- tuned: ``create_configured_engine(url)`` (WAL, ``synchronous=NORMAL``,
+  busy timeout, mmap and cache size; see db/engine.py)
+
+Writer threads insert user sessions, one commit each (the login/refresh
+write path), while reader threads list a user's active sessions. The
+report shows committed writes and reads per second, write latency, failed
+operations ("database is locked") and, for the tuned engine, pool checkout
+waits.
+
+Usage:
+    python -m backend.tests.benchmarks.db_benchmark
+    python -m backend.tests.benchmarks.db_benchmark --writers 16 --readers 8 --writes 200
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, UTC, timedelta
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db.engine import create_configured_engine, get_engine_metrics
+from backend.app.models.base import Base
+from backend.app.models import curriculum, node, zotero_item, youtube_video, user, user_session, sync_metadata, sync_job  # noqa: F401
+from backend.app.models.user import User
+from backend.app.models.user_session import UserSession
+
+PROFILES = ("default", "tuned")
+
+
+@dataclass
+class ProfileRun:
+    """Throughput and latency of one profile."""
+    profile: str
+    journal_mode: str
+    writers: int
+    readers: int
+    wall_seconds: float
+    writes: int
+    reads: int
+    failed: int
+    writes_per_second: float
+    reads_per_second: float
+    write_p50_ms: float
+    write_p95_ms: float
+    checkout_wait_max_ms: float
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_profile(profile: str, writers: int = 8, readers: int = 4, writes_per_writer: int = 100) -> ProfileRun:
+    """Run the workload against a new database file with one engine profile."""
+    directory = tempfile.mkdtemp(prefix="db-bench-")
+    url = f"sqlite+pysqlite:///{os.path.join(directory, 'bench.db')}"
+    engine = create_engine(url) if profile == "default" else create_configured_engine(url)
+    metrics = get_engine_metrics(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.connect() as conn:
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        db = session_factory()
+        bench_user = User(email="bench@example.com", name="Bench", role="user", is_active=True)
+        db.add(bench_user)
+        db.commit()
+        user_id = bench_user.user_id
+        db.close()
+
+        lock = threading.Lock()
+        write_latencies: List[float] = []
+        counts = {"reads": 0, "failed": 0}
+        writers_done = threading.Event()
+
+        def write_sessions():
+            for _ in range(writes_per_writer):
+                started = time.perf_counter()
+                db = session_factory()
+                try:
+                    db.add(UserSession(
+                        user_id=user_id,
+                        refresh_token_hash=uuid.uuid4().hex,
+                        expires_at=datetime.now(UTC) + timedelta(days=7),
+                    ))
+                    db.commit()
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        write_latencies.append(elapsed)
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        counts["failed"] += 1
+                finally:
+                    db.close()
+
+        def read_sessions():
+            while not writers_done.is_set():
+                db = session_factory()
+                try:
+                    db.query(UserSession).filter(
+                        UserSession.user_id == user_id,
+                        UserSession.revoked_at.is_(None),
+                    ).order_by(UserSession.created_at.desc()).limit(20).all()
+                    with lock:
+                        counts["reads"] += 1
+                except OperationalError:
+                    with lock:
+                        counts["failed"] += 1
+                finally:
+                    db.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers + readers) as pool:
+            reader_futures = [pool.submit(read_sessions) for _ in range(readers)]
+            writer_futures = [pool.submit(write_sessions) for _ in range(writers)]
+            for future in writer_futures:
+                future.result()
+            writers_done.set()
+            for future in reader_futures:
+                future.result()
+        wall_seconds = time.perf_counter() - started
+    finally:
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    checkout = metrics.checkout_wait.snapshot()
+    return ProfileRun(
+        profile=profile,
+        journal_mode=journal_mode,
+        writers=writers,
+        readers=readers,
+        wall_seconds=round(wall_seconds, 3),
+        writes=len(write_latencies),
+        reads=counts["reads"],
+        failed=counts["failed"],
+        writes_per_second=round(len(write_latencies) / wall_seconds, 1),
+        reads_per_second=round(counts["reads"] / wall_seconds, 1),
+        write_p50_ms=round(_percentile(write_latencies, 0.5) * 1000, 2),
+        write_p95_ms=round(_percentile(write_latencies, 0.95) * 1000, 2),
+        checkout_wait_max_ms=round(checkout["max_seconds"] * 1000, 2),
+    )
+
+
+def format_table(runs: List[ProfileRun]) -> str:
+    header = (
+        f"{'profile':<8} {'journal':<8} {'writes/s':>9} {'reads/s':>9} {'write p50':>10} "
+        f"{'write p95':>10} {'failed':>7} {'checkout max':>13}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in runs:
+        lines.append(
+            f"{r.profile:<8} {r.journal_mode:<8} {r.writes_per_second:>9.1f} {r.reads_per_second:>9.1f} "
+            f"{r.write_p50_ms:>10.2f} {r.write_p95_ms:>10.2f} {r.failed:>7} {r.checkout_wait_max_ms:>13.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare SQLite write throughput per engine profile")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--writers", type=int, default=8, help="Writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument("--writes", type=int, default=100, help="Commits per writer")
+    args = parser.parse_args(argv)
+
+    print(format_table([run_profile(profile, args.writers, args.readers, args.writes) for profile in args.profiles]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Middleware overhead benchmark: cost per request of each middleware variant.
+
+Requests are driven directly through ASGI, with no server or HTTP client in
+between. Each variant is measured twice:
+
+- around a bare ASGI app that answers at once, which isolates the
+  middleware's own cost (stable to a fraction of a microsecond)
+- around a trivial FastAPI app (one route returning a small JSON object),
+  the cost of a trivial request the overhead is compared against
+
+Variants:
+
+- none: no middleware
+- base_http: a pass-through BaseHTTPMiddleware (what ErrorLoggingMiddleware was)
+- metrics: RequestMetricsMiddleware (middleware/request_metrics.py)
+
+Rounds are interleaved with the garbage collector paused and the fastest
+round of each is reported. A request served by uvicorn also pays for HTTP
+parsing and socket I/O, so the share of a served request is several times
+smaller than the in-process figure.
+
+Usage:
+    python -m backend.tests.benchmarks.middleware_benchmark
+    python -m backend.tests.benchmarks.middleware_benchmark --requests 20000 --rounds 9
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.app.middleware.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+VARIANTS = ("none", "base_http", "metrics")
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+@dataclass
+class VariantRun:
+    """Per-request cost of one middleware variant."""
+    variant: str
+    requests: int
+    app_us_per_request: float
+    overhead_us: float
+    overhead_percent: float
+
+
+async def bare_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"item_id":1}'})
+
+
+def _with_middleware(app, variant: str):
+    if variant == "base_http":
+        return PassThroughMiddleware(app)
+    if variant == "metrics":
+        return RequestMetricsMiddleware(app, metrics=RequestMetrics())
+    return app
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    if variant == "base_http":
+        app.add_middleware(PassThroughMiddleware)
+    elif variant == "metrics":
+        app.add_middleware(RequestMetricsMiddleware, metrics=RequestMetrics())
+    return app
+
+
+def _scope(item_id: int) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": f"/items/{item_id}", "raw_path": f"/items/{item_id}".encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+async def _time_requests(app, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(_scope(i), _receive, _send)
+    return time.perf_counter() - started
+
+
+async def _fastest(apps: Dict[str, object], requests: int, rounds: int) -> Dict[str, float]:
+    """Fastest round of each app, in microseconds per request."""
+    best = {name: float("inf") for name in apps}
+    for app in apps.values():
+        await _time_requests(app, min(requests, 500))  # Warm up
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for name, app in apps.items():
+                best[name] = min(best[name], await _time_requests(app, requests))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {name: seconds / requests * 1e6 for name, seconds in best.items()}
+
+
+def run_variants(requests: int = 5000, rounds: int = 5, variants: Optional[List[str]] = None) -> List[VariantRun]:
+    """Time ``requests`` requests per round through each variant."""
+    variants = list(variants or VARIANTS)
+    if "none" not in variants:
+        variants.insert(0, "none")
+    isolated = asyncio.run(_fastest({v: _with_middleware(bare_app, v) for v in variants}, requests, rounds))
+    in_app = asyncio.run(_fastest({v: build_app(v) for v in variants}, requests, rounds))
+    trivial_request = in_app["none"]
+    runs = []
+    for variant in variants:
+        overhead = isolated[variant] - isolated["none"]
+        runs.append(VariantRun(
+            variant=variant,
+            requests=requests,
+            app_us_per_request=round(in_app[variant], 2),
+            overhead_us=round(overhead, 2),
+            overhead_percent=round(overhead / trivial_request * 100, 2),
+        ))
+    return runs
+
+
+def format_table(runs: List[VariantRun]) -> str:
+    header = f"{'variant':<10} {'requests':>9} {'app us/req':>11} {'overhead us':>12} {'% of trivial':>13}"
+    lines = [header, "-" * len(header)]
+    for r in runs:
+        lines.append(
+            f"{r.variant:<10} {r.requests:>9} {r.app_us_per_request:>11.2f} "
+            f"{r.overhead_us:>12.2f} {r.overhead_percent:>13.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-request middleware overhead")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds (the fastest is reported)")
+    args = parser.parse_args(argv)
+
+    print(format_table(run_variants(args.requests, args.rounds, args.variants)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Response benchmark: serialization CPU and bytes on the wire per payload.
+
+Builds the response content of the largest read endpoints the way FastAPI
+does (the response model dumped in JSON mode) and measures:
+
+- rendering it with JSONResponse (``json.dumps``) and ORJSONResponse
+  (``orjson.dumps``, the application's default response class)
+- its size as sent, and compressed by CompressionMiddleware with gzip and
+  Brotli (time and bytes; bodies under COMPRESSION_MINIMUM_SIZE go out
+  uncompressed)
+
+Payloads:
+
+- tree: ``GET /curriculums/{id}``, a curriculum map with its nodes and
+  their markdown contents
+- sync_plan: ``GET /sync/plan``, the node IDs a sync would touch
+- sync_history: ``GET /sync/history?limit=100``
+- sync_status: ``GET /sync/status``, a small object (below the threshold)
+
+Each figure is the fastest of several rounds.
+
+Usage:
+    python -m backend.tests.benchmarks.response_benchmark
+    python -m backend.tests.benchmarks.response_benchmark --nodes 1000 --rounds 9
+"""
+
+import argparse
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, UTC, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from backend.app.middleware.compression import CompressionMiddleware
+from backend.app.schemas.curriculum import CurriculumResponse
+from backend.app.schemas.node import NodeContentResponse, NodeResponse
+from backend.app.schemas.sync import SyncHistoryEntry, SyncHistoryResponse, SyncPlanResponse, SyncStatusResponse
+
+PAYLOADS = ("tree", "sync_plan", "sync_history", "sync_status")
+
+_MARKDOWN = (
+    "## 정의\n\n함수 $f: \\mathbb{R} \\to \\mathbb{R}$ 가 점 $a$ 에서 연속이라는 것은 "
+    "$\\lim_{x \\to a} f(x) = f(a)$ 를 뜻한다.\n\n"
+    "- 예: 다항함수는 모든 점에서 연속이다.\n- 반례: $\\lfloor x \\rfloor$ 는 정수점에서 불연속이다.\n\n"
+    "> 증명은 $\\varepsilon$-$\\delta$ 논법으로 한다.\n"
+) * 3
+
+
+@dataclass
+class PayloadRun:
+    """Render cost and response size of one payload."""
+    payload: str
+    items: int
+    json_us: float
+    orjson_us: float
+    speedup: float
+    raw_bytes: int
+    gzip_bytes: int
+    gzip_us: float
+    brotli_bytes: int
+    brotli_us: float
+
+
+def _tree(items: int) -> CurriculumResponse:
+    now = datetime.now(UTC)
+    curriculum_id = str(uuid.uuid4())
+    nodes, parents = [], [None]
+    for i in range(items):
+        node_id = str(uuid.uuid4())
+        nodes.append(NodeResponse(
+            node_id=node_id, curriculum_id=curriculum_id, parent_node_id=parents[i // 4],
+            node_type="CHAPTER" if i < 4 else "CONTENT", title=f"{i + 1}. 연속함수와 극한",
+            order_index=i % 4, created_at=now, updated_at=now,
+            content=NodeContentResponse(
+                content_id=str(uuid.uuid4()), node_id=node_id, markdown_content=_MARKDOWN,
+                created_at=now, updated_at=now,
+            ),
+        ))
+        parents.append(node_id)
+    return CurriculumResponse(
+        curriculum_id=curriculum_id, title="해석학 입문", description="실수의 완비성에서 미분까지",
+        is_public=True, created_at=now, updated_at=now, nodes=nodes,
+    )
+
+
+def _sync_plan(items: int) -> SyncPlanResponse:
+    ids = [str(uuid.uuid4()) for _ in range(items)]
+    return SyncPlanResponse(
+        curriculum_id=str(uuid.uuid4()), direction="bidirectional", mode="full",
+        upload_creates=ids[: items // 2], upload_updates=ids[items // 2:],
+        counts={"upload_creates": items // 2, "upload_updates": items - items // 2},
+    )
+
+
+def _sync_history(items: int) -> SyncHistoryResponse:
+    now = datetime.now(UTC)
+    entries = [
+        SyncHistoryEntry(
+            timestamp=(now - timedelta(minutes=5 * i)).isoformat(), status="completed",
+            synced_count=i % 7, updated_count=i % 3, unchanged_count=items - i % 7, duration_seconds=1.25,
+        )
+        for i in range(min(items, 100))
+    ]
+    return SyncHistoryResponse(
+        curriculum_id=str(uuid.uuid4()), entries=entries, total_entries=len(entries), next_cursor="eyJ0IjoxfQ",
+    )
+
+
+def _sync_status(items: int) -> SyncStatusResponse:
+    return SyncStatusResponse(
+        curriculum_id=str(uuid.uuid4()), total_nodes=items, synced_nodes=items - 3, pending_nodes=3,
+        last_sync_time=datetime.now(UTC).isoformat(), is_fully_synced=False,
+    )
+
+
+_BUILDERS: Dict[str, Callable[[int], Any]] = {
+    "tree": _tree,
+    "sync_plan": _sync_plan,
+    "sync_history": _sync_history,
+    "sync_status": _sync_status,
+}
+
+
+def _fastest_us(operation: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6
+
+
+def run_payload(payload: str, items: int = 200, rounds: int = 5) -> PayloadRun:
+    """Measure one payload built with ``items`` nodes (or IDs, or history entries)."""
+    content = _BUILDERS[payload](items).model_dump(mode="json")
+    body = ORJSONResponse(content).body
+    assert len(body) == len(JSONResponse(content).body)  # Same bytes on the wire, only faster
+
+    compression = CompressionMiddleware(app=None)
+    compressible = len(body) >= compression.minimum_size
+    gzip_body = compression.compress(body, "gzip") if compressible else body
+    brotli_body = compression.compress(body, "br") if compressible else body
+    json_us = _fastest_us(lambda: JSONResponse(content), rounds)
+    orjson_us = _fastest_us(lambda: ORJSONResponse(content), rounds)
+    return PayloadRun(
+        payload=payload,
+        items=items,
+        json_us=round(json_us, 1),
+        orjson_us=round(orjson_us, 1),
+        speedup=round(json_us / orjson_us, 1),
+        raw_bytes=len(body),
+        gzip_bytes=len(gzip_body),
+        gzip_us=round(_fastest_us(lambda: compression.compress(body, "gzip"), rounds), 1) if compressible else 0.0,
+        brotli_bytes=len(brotli_body),
+        brotli_us=round(_fastest_us(lambda: compression.compress(body, "br"), rounds), 1) if compressible else 0.0,
+    )
+
+
+def format_table(runs: List[PayloadRun]) -> str:
+    header = (
+        f"{'payload':<13} {'items':>6} {'json us':>9} {'orjson us':>10} {'speedup':>8} "
+        f"{'bytes':>9} {'gzip':>8} {'gzip us':>8} {'brotli':>8} {'br us':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in runs:
+        lines.append(
+            f"{r.payload:<13} {r.items:>6} {r.json_us:>9.1f} {r.orjson_us:>10.1f} {r.speedup:>7.1f}x "
+            f"{r.raw_bytes:>9} {r.gzip_bytes:>8} {r.gzip_us:>8.1f} {r.brotli_bytes:>8} {r.brotli_us:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure response rendering cost and compressed size")
+    parser.add_argument("--payloads", nargs="+", choices=PAYLOADS, default=list(PAYLOADS))
+    parser.add_argument("--nodes", type=int, default=200, help="Nodes, plan IDs or history entries per payload")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds (the fastest is reported)")
+    args = parser.parse_args(argv)
+
+    print(format_table([run_payload(payload, args.nodes, args.rounds) for payload in args.payloads]))
+
+
+if __name__ == "__main__":
+    main()
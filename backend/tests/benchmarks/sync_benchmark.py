@@ -0,0 +1,271 @@
+"""
+Sync throughput benchmark against the in-memory fake Drive.
+
+Runs the real ``SyncService.sync_curriculum`` over synthetic curriculums
+(100 to 10k nodes by default) on a private in-memory SQLite database, and
+reports per run:
+
+- Drive API calls (HTTP round trips, batch sub-requests, calls per method,
+  injected quota errors)
+- wall time
+- SQL statements executed
+
+Each curriculum size goes through four scenarios: the initial upload, a
+sync with nothing changed, a sync after 10% of the nodes were edited
+locally, and one after 10% were edited on Drive.
+
+Usage:
+    python -m backend.tests.benchmarks.sync_benchmark
+    python -m backend.tests.benchmarks.sync_benchmark --nodes 1000 --latency 0.02 --quota-error-rate 0.01
+    python -m backend.tests.benchmarks.sync_benchmark --nodes 100 1000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, UTC, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.models.base import Base
+from backend.app.models import curriculum, node, zotero_item, youtube_video, user, user_session, sync_metadata, sync_job  # noqa: F401
+from backend.app.db import search_index  # noqa: F401  (installs the search index DDL)
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node, NodeContent
+from backend.app.models.sync_metadata import CurriculumDriveFolder, SyncMetadata
+from backend.app.services.drive_executor import DriveExecutor
+from backend.app.services.google_drive_service import GoogleDriveService
+from backend.app.services.sync_service import SyncService
+from backend.tests.fakes.fake_drive import FakeDrive, MAX_PAGE_SIZE
+
+DEFAULT_SIZES = (100, 1000, 10000)
+SCENARIOS = ("initial", "noop", "local_edit", "remote_edit")
+EDIT_FRACTION = 0.1
+
+
+@dataclass
+class SyncRun:
+    """Measurements of one sync_curriculum call."""
+    scenario: str
+    nodes: int
+    mode: str
+    wall_seconds: float
+    api_calls: int
+    batched_calls: int
+    quota_errors: int
+    db_queries: int
+    calls_by_method: Dict[str, int] = field(default_factory=dict)
+    result_counts: Dict[str, int] = field(default_factory=dict)
+
+
+class _QueryCounter:
+    """Counts statements executed on an engine."""
+
+    def __init__(self, engine: Engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+class SyncBenchmark:
+    """
+    One synthetic curriculum on a fresh database and fake Drive.
+    """
+
+    def __init__(
+        self,
+        nodes: int,
+        latency: float = 0.0,
+        quota_error_rate: float = 0.0,
+        page_size: int = MAX_PAGE_SIZE,
+        max_workers: int = 8,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            nodes: Number of nodes in the curriculum
+            latency: Simulated seconds per Drive round trip
+            quota_error_rate: Probability of a 403 rate-limit error per Drive request
+            page_size: Largest page the fake Drive returns from list calls
+            max_workers: Drive executor threads
+            seed: Seed for quota error draws
+        """
+        self.nodes = nodes
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.queries = _QueryCounter(self.engine)
+
+        self.drive = FakeDrive(
+            latency=latency, max_page_size=page_size, quota_error_rate=quota_error_rate, seed=seed
+        )
+        # Quota is simulated by the fake, so the client-side limiter stays out
+        # of the way; short backoffs keep retries visible without dominating
+        self.executor = DriveExecutor(max_workers=max_workers, requests_per_second=1_000_000, backoff_base=0.01)
+        self.drive_service = GoogleDriveService(use_service_account=False, executor=self.executor)
+        self.drive_service.service = self.drive
+        self.curriculum_id = self._create_curriculum()
+
+    def _create_curriculum(self) -> str:
+        db = self.session_factory()
+        try:
+            curriculum = Curriculum(title=f"Benchmark ({self.nodes} nodes)")
+            db.add(curriculum)
+            db.flush()
+            node_ids = []
+            for i in range(self.nodes):
+                # A tree with ten children per node
+                parent = node_ids[(i - 1) // 10] if i else None
+                node = Node(
+                    curriculum_id=curriculum.curriculum_id,
+                    parent_node_id=parent,
+                    title=f"Node {i}",
+                    order_index=i % 10,
+                )
+                node.content = NodeContent(markdown_content=f"# Node {i}\n\n" + "Lorem ipsum. " * 20)
+                db.add(node)
+                db.flush()
+                node_ids.append(node.node_id)
+            db.add(CurriculumDriveFolder(
+                curriculum_id=curriculum.curriculum_id,
+                google_drive_folder_id=self.drive.add_folder(curriculum.title),
+            ))
+            db.commit()
+            return curriculum.curriculum_id
+        finally:
+            db.close()
+
+    def _edited_slice(self, db: Session) -> List[SyncMetadata]:
+        rows = (
+            db.query(SyncMetadata)
+            .filter(SyncMetadata.curriculum_id == self.curriculum_id)
+            .order_by(SyncMetadata.node_id)
+            .all()
+        )
+        return rows[:max(1, int(len(rows) * EDIT_FRACTION))]
+
+    def _edit_locally(self) -> None:
+        db = self.session_factory()
+        try:
+            later = datetime.now(UTC) + timedelta(seconds=1)
+            node_ids = [meta.node_id for meta in self._edited_slice(db)]
+            db.query(Node).filter(Node.node_id.in_(node_ids)).update(
+                {Node.title: Node.title + " (edited)", Node.updated_at: later}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _edit_on_drive(self) -> None:
+        db = self.session_factory()
+        try:
+            for meta in self._edited_slice(db):
+                document = self.drive.read_json(meta.google_drive_file_id)
+                document["title"] += " (edited on Drive)"
+                self.drive.edit_file(meta.google_drive_file_id, document)
+        finally:
+            db.close()
+
+    async def run_scenario(self, scenario: str) -> SyncRun:
+        """Prepare ``scenario``, run one sync and measure it."""
+        if scenario == "local_edit":
+            self._edit_locally()
+        elif scenario == "remote_edit":
+            self._edit_on_drive()
+
+        self.drive.reset_calls()
+        quota_errors = self.drive.quota_errors
+        queries = self.queries.count
+        db = self.session_factory()
+        try:
+            started = time.perf_counter()
+            result = await SyncService(db, self.drive_service).sync_curriculum(self.curriculum_id)
+            wall_seconds = time.perf_counter() - started
+        finally:
+            db.close()
+
+        return SyncRun(
+            scenario=scenario,
+            nodes=self.nodes,
+            mode=result["mode"],
+            wall_seconds=round(wall_seconds, 4),
+            api_calls=len(self.drive.calls),
+            batched_calls=len(self.drive.batched_calls),
+            quota_errors=self.drive.quota_errors - quota_errors,
+            db_queries=self.queries.count - queries,
+            calls_by_method=dict(Counter(self.drive.calls + [f"batch:{m}" for m in self.drive.batched_calls])),
+            result_counts={
+                key: result[key]
+                for key in ("synced_count", "updated_count", "deleted_count", "unchanged_count", "conflict_count", "error_count")
+            },
+        )
+
+    async def run(self, scenarios=SCENARIOS) -> List[SyncRun]:
+        return [await self.run_scenario(scenario) for scenario in scenarios]
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.engine.dispose()
+
+
+async def run_benchmarks(sizes=DEFAULT_SIZES, **options) -> List[SyncRun]:
+    """Run every scenario for each curriculum size (options go to SyncBenchmark)."""
+    runs = []
+    for size in sizes:
+        benchmark = SyncBenchmark(size, **options)
+        try:
+            runs.extend(await benchmark.run())
+        finally:
+            benchmark.close()
+    return runs
+
+
+def format_table(runs: List[SyncRun]) -> str:
+    header = f"{'nodes':>6} {'scenario':<12} {'mode':<12} {'wall s':>8} {'api':>6} {'batched':>8} {'quota':>6} {'queries':>8}"
+    lines = [header, "-" * len(header)]
+    for run in runs:
+        lines.append(
+            f"{run.nodes:>6} {run.scenario:<12} {run.mode:<12} {run.wall_seconds:>8.3f} "
+            f"{run.api_calls:>6} {run.batched_calls:>8} {run.quota_errors:>6} {run.db_queries:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SyncService against the fake Drive backend")
+    parser.add_argument("--nodes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Curriculum sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per Drive round trip")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="Probability of a 403 per request")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE, help="Largest list page the fake returns")
+    parser.add_argument("--workers", type=int, default=8, help="Drive executor threads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    runs = asyncio.run(run_benchmarks(
+        args.nodes,
+        latency=args.latency,
+        quota_error_rate=args.quota_error_rate,
+        page_size=args.page_size,
+        max_workers=args.workers,
+        seed=args.seed,
+    ))
+    if args.json:
+        print(json.dumps([asdict(run) for run in runs], indent=2))
+    else:
+        print(format_table(runs))
+
+
+if __name__ == "__main__":
+    main()
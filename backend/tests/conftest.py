@@ -1,16 +1,20 @@
 import pytest
+import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from unittest.mock import MagicMock
 
 from backend.app.main import app # This is the main app
-from backend.app.db.session import get_db
+from backend.app.db.session import get_async_db, get_db
 from backend.app.models.base import Base
 from backend.app.api.v1.api import api_router
 from backend.app.core.config import settings
+from backend.app.db.engine import async_database_url
 
 # Use the DATABASE_URL from settings, which will now point to PostgreSQL
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -44,16 +48,41 @@ def db_session() -> Generator[Session, None, None]:
     session.close()
     connection.close()
 
+@pytest_asyncio.fixture
+async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    # A fresh engine per test: async connections belong to the test's event loop
+    async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+    connection = await async_engine.connect()
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, expire_on_commit=False)
+
+    yield session
+    # Rollback the transaction to clean up changes
+    await transaction.rollback()
+    await session.close()
+    await connection.close()
+    await async_engine.dispose()
+
 @pytest.fixture(name="client")
-def client_fixture(db_session: Session):
+def client_fixture(db_session: Session, monkeypatch):
     def override_get_db():
         yield db_session
         # Expunge all objects from the session after each request
         # This ensures that subsequent requests get fresh data
         db_session.expunge_all()
 
+    async def override_get_async_db():
+        # Same connection and transaction as db_session: AsyncSession runs the
+        # wrapped sync session's calls, which here need no event loop I/O
+        yield AsyncSession(sync_session_class=lambda **kwargs: db_session)
+        db_session.expunge_all()
+
     app.dependency_overrides = {}
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # The scheduler writes its lease and jobs through its own sessions, outside
+    # the test transaction (see tests/integration/test_sync_scheduler_app.py)
+    monkeypatch.setattr(settings, "SYNC_SCHEDULER_ENABLED", False)
 
     with TestClient(app) as c:
         yield c
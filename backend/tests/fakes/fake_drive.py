@@ -0,0 +1,433 @@
+"""
+In-memory Google Drive v3 backend for tests.
+
+Implements the part of the googleapiclient ``drive`` resource that
+GoogleDriveService uses (``files()`` and ``changes()``), with Drive's query,
+paging, ``fields`` projection and changes-feed semantics. Services run against
+it unchanged by assigning ``GoogleDriveService.service = FakeDrive()``.
+
+Every executed request is recorded in ``calls`` so tests can assert API budgets.
+An HTTP batch counts as one ``"batch"`` call; its sub-requests are recorded in
+``batched_calls``.
+
+Latency, page sizes and a rate of random quota errors are configurable, so
+the same fake backs the sync benchmark (tests/benchmarks/sync_benchmark.py).
+"""
+
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 100
+
+_QUERY_CLAUSES = [
+    (re.compile(r"^name\s*=\s*'(.*)'$"), lambda f, v: f["name"] == v),
+    (re.compile(r"^'(.*)'\s+in\s+parents$"), lambda f, v: v in f["parents"]),
+    (re.compile(r"^mimeType\s*=\s*'(.*)'$"), lambda f, v: f["mimeType"] == v),
+    (re.compile(r"^mimeType\s*!=\s*'(.*)'$"), lambda f, v: f["mimeType"] != v),
+    (re.compile(r"^trashed\s*=\s*(true|false)$"), lambda f, v: f["trashed"] == (v == "true")),
+]
+
+
+def http_error(status: int, reason: str = "error") -> HttpError:
+    """Build the HttpError googleapiclient raises for a failed response."""
+    resp = httplib2.Response({"status": status})
+    resp.reason = reason
+    content = json.dumps({"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}})
+    return HttpError(resp, content.encode("utf-8"))
+
+
+def _parse_fields(fields: str) -> Dict[str, Any]:
+    """Parse a partial-response selector like ``files(id, name), nextPageToken``."""
+    spec: Dict[str, Any] = {}
+    stack = [spec]
+    name = ""
+    for char in fields + ",":
+        if char == "(":
+            child: Dict[str, Any] = {}
+            stack[-1][name.strip()] = child
+            stack.append(child)
+            name = ""
+        elif char in ",)":
+            if name.strip():
+                stack[-1][name.strip()] = None
+            name = ""
+            if char == ")":
+                stack.pop()
+        else:
+            name += char
+    return spec
+
+
+def _project(value: Any, spec: Optional[Dict[str, Any]]) -> Any:
+    if spec is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, spec) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(value[key], sub) for key, sub in spec.items() if key in value}
+    return value
+
+
+def _media_bytes(media_body: Any) -> bytes:
+    """Read the payload of a MediaUpload, file-like object or bytes."""
+    if hasattr(media_body, "getbytes"):
+        return media_body.getbytes(0, media_body.size())
+    if hasattr(media_body, "getvalue"):
+        return media_body.getvalue()
+    if hasattr(media_body, "read"):
+        return media_body.read()
+    return bytes(media_body)
+
+
+def _timestamp() -> str:
+    return datetime.now(UTC).isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
+class FakeRequest:
+    """A prepared API call; nothing happens until ``execute``."""
+
+    def __init__(self, drive: "FakeDrive", method: str, kwargs: Dict[str, Any]):
+        self.drive = drive
+        self.method = method
+        self.kwargs = kwargs
+
+    def execute(self, http=None, num_retries: int = 0) -> Any:
+        return self.drive._execute(self)
+
+
+class _Files:
+    def __init__(self, drive: "FakeDrive"):
+        self._drive = drive
+
+    def list(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.list", kwargs)
+
+    def get(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.get", kwargs)
+
+    def get_media(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.get_media", kwargs)
+
+    def create(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.create", kwargs)
+
+    def update(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.update", kwargs)
+
+    def delete(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "files.delete", kwargs)
+
+
+class _Changes:
+    def __init__(self, drive: "FakeDrive"):
+        self._drive = drive
+
+    def getStartPageToken(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "changes.getStartPageToken", kwargs)
+
+    def list(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self._drive, "changes.list", kwargs)
+
+
+class FakeBatch:
+    """``BatchHttpRequest`` stand-in: sub-requests share one round trip."""
+
+    def __init__(self, drive: "FakeDrive", callback=None):
+        self.drive = drive
+        self.callback = callback
+        self.requests: List[Tuple[str, FakeRequest, Any]] = []
+
+    def add(self, request: FakeRequest, callback=None, request_id: Optional[str] = None) -> None:
+        request_id = request_id if request_id is not None else str(len(self.requests) + 1)
+        self.requests.append((request_id, request, callback))
+
+    def execute(self, http=None) -> None:
+        self.drive._execute_batch(self)
+
+
+class FakeDrive:
+    """In-memory Drive: file store, change log and API call recorder."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        default_page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_size: int = MAX_PAGE_SIZE,
+        quota_error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds each executed request takes (simulated round trip)
+            default_page_size: Page size of list calls that do not pass pageSize
+            max_page_size: Largest page a list call returns, whatever it asks for
+            quota_error_rate: Probability that a request (or batch sub-request)
+                fails with 403 userRateLimitExceeded
+            seed: Seed for the quota error draws
+        """
+        self.latency = latency
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self.quota_error_rate = quota_error_rate
+        self.quota_errors = 0
+        self._random = random.Random(seed)
+        self.files_by_id: Dict[str, Dict[str, Any]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.change_log: List[str] = []  # file IDs, in change order
+        self.calls: List[str] = []
+        self.batched_calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures: List[Tuple[Optional[str], int, str]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    # --- googleapiclient resource surface ---
+
+    def files(self) -> _Files:
+        return _Files(self)
+
+    def changes(self) -> _Changes:
+        return _Changes(self)
+
+    def new_batch_http_request(self, callback=None) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+    # --- test helpers ---
+
+    def call_count(self, method: Optional[str] = None) -> int:
+        """Number of executed requests (optionally of one method, e.g. 'files.list')."""
+        return len(self.calls) if method is None else self.calls.count(method)
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+        self.batched_calls.clear()
+        self.max_in_flight = 0
+
+    def fail_next(self, status: int, reason: str = "error", method: Optional[str] = None, times: int = 1) -> None:
+        """
+        Make the next ``times`` requests (of ``method``, or any) fail with an HTTP error.
+
+        Sub-requests of a batch fail individually; ``method="batch"`` fails a whole batch.
+        """
+        self._failures.extend([(method, status, reason)] * times)
+
+    def add_folder(self, name: str, parent_id: Optional[str] = None) -> str:
+        """Create a folder directly (not recorded as an API call)."""
+        return self._create({"name": name, "mimeType": FOLDER_MIME_TYPE, "parents": [parent_id] if parent_id else []}, None)["id"]
+
+    def add_file(self, name: str, parent_id: str, content: Any, mime_type: str = "application/json") -> str:
+        """Create a file directly, as another Drive client would; dicts are stored as JSON."""
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode("utf-8")
+        return self._create({"name": name, "mimeType": mime_type, "parents": [parent_id]}, content)["id"]
+
+    def edit_file(self, file_id: str, content: Any = None, **metadata) -> None:
+        """Modify a file directly, as another Drive client would."""
+        if content is not None and not isinstance(content, bytes):
+            content = json.dumps(content).encode("utf-8")
+        with self._lock:
+            self._update(file_id, metadata, content)
+
+    def read_json(self, file_id: str) -> Any:
+        return json.loads(self.contents[file_id].decode("utf-8"))
+
+    # --- request execution ---
+
+    def _take_failure(self, method: str, match_any: bool = True) -> Optional[Tuple[Optional[str], int, str]]:
+        failure = next(
+            (f for f in self._failures if f[0] == method or (match_any and f[0] is None)), None
+        )
+        if failure:
+            self._failures.remove(failure)
+        elif self.quota_error_rate and self._random.random() < self.quota_error_rate:
+            self.quota_errors += 1
+            failure = (method, 403, "userRateLimitExceeded")
+        return failure
+
+    def _round_trip(self, method: str, match_any: bool = True):
+        """Record a call and simulate its latency; returns an injected failure, if any."""
+        with self._lock:
+            self.calls.append(method)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failure = self._take_failure(method, match_any)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return failure
+
+    def _handle(self, request: FakeRequest) -> Any:
+        kwargs = dict(request.kwargs)
+        fields = kwargs.pop("fields", None)
+        with self._lock:
+            handler = getattr(self, "_" + request.method.replace(".", "_"))
+            response = handler(**kwargs)
+        if fields and isinstance(response, dict):
+            response = _project(response, _parse_fields(fields))
+        return response
+
+    def _execute(self, request: FakeRequest) -> Any:
+        failure = self._round_trip(request.method)
+        if failure:
+            raise http_error(failure[1], failure[2])
+        return self._handle(request)
+
+    def _execute_batch(self, batch: FakeBatch) -> None:
+        if len(batch.requests) > MAX_BATCH_SIZE:
+            raise http_error(400, "batchSizeTooLarge")
+        failure = self._round_trip("batch", match_any=False)
+        if failure:
+            raise http_error(failure[1], failure[2])
+        for request_id, request, callback in batch.requests:
+            if request.method == "files.get_media" or "media_body" in request.kwargs:
+                raise http_error(400, "mediaNotSupportedInBatch")
+            response, exception = None, None
+            with self._lock:
+                self.batched_calls.append(request.method)
+                failure = self._take_failure(request.method)
+            try:
+                if failure:
+                    raise http_error(failure[1], failure[2])
+                response = self._handle(request)
+            except HttpError as error:
+                exception = error
+            for handler in (callback, batch.callback):
+                if handler is not None:
+                    handler(request_id, response, exception)
+
+    def _require(self, file_id: str) -> Dict[str, Any]:
+        if file_id not in self.files_by_id:
+            raise http_error(404, "notFound")
+        return self.files_by_id[file_id]
+
+    def _record_change(self, file_id: str) -> None:
+        self.change_log.append(file_id)
+
+    def _create(self, body: Dict[str, Any], content: Optional[bytes]) -> Dict[str, Any]:
+        with self._lock:
+            file_id = f"fake-file-{next(self._ids)}"
+            resource = {
+                "kind": "drive#file",
+                "id": file_id,
+                "name": body.get("name", "Untitled"),
+                "mimeType": body.get("mimeType", "application/octet-stream"),
+                "parents": list(body.get("parents", [])),
+                "trashed": False,
+                "modifiedTime": _timestamp(),
+            }
+            self.files_by_id[file_id] = resource
+            if content is not None:
+                self._set_content(file_id, content)
+            self._record_change(file_id)
+            return dict(resource)
+
+    def _set_content(self, file_id: str, content: bytes) -> None:
+        self.contents[file_id] = content
+        self.files_by_id[file_id]["md5Checksum"] = hashlib.md5(content).hexdigest()
+        self.files_by_id[file_id]["size"] = str(len(content))
+
+    def _update(self, file_id: str, body: Dict[str, Any], content: Optional[bytes]) -> Dict[str, Any]:
+        resource = self._require(file_id)
+        for key in ("name", "mimeType", "trashed"):
+            if key in body:
+                resource[key] = body[key]
+        if "parents" in body:
+            resource["parents"] = list(body["parents"])
+        if content is not None:
+            self._set_content(file_id, content)
+        resource["modifiedTime"] = _timestamp()
+        self._record_change(file_id)
+        return dict(resource)
+
+    def _matches(self, resource: Dict[str, Any], q: Optional[str]) -> bool:
+        if not q:
+            return True
+        for clause in q.split(" and "):
+            for pattern, predicate in _QUERY_CLAUSES:
+                match = pattern.match(clause.strip())
+                if match:
+                    if not predicate(resource, match.group(1)):
+                        return False
+                    break
+            else:
+                raise ValueError(f"FakeDrive does not support query clause: {clause!r}")
+        return True
+
+    def _page(self, items: List[Any], page_token: Optional[str], page_size: Optional[int]):
+        size = min(page_size or self.default_page_size, self.max_page_size)
+        start = int(page_token) if page_token else 0
+        end = start + size
+        return items[start:end], (str(end) if end < len(items) else None)
+
+    def _files_list(self, q=None, pageSize=None, pageToken=None, spaces=None, orderBy=None):
+        matching = [dict(r) for r in self.files_by_id.values() if self._matches(r, q)]
+        page, next_token = self._page(matching, pageToken, pageSize)
+        response = {"kind": "drive#fileList", "files": page}
+        if next_token:
+            response["nextPageToken"] = next_token
+        return response
+
+    def _files_get(self, fileId):
+        return dict(self._require(fileId))
+
+    def _files_get_media(self, fileId):
+        self._require(fileId)
+        return self.contents.get(fileId, b"")
+
+    def _files_create(self, body=None, media_body=None):
+        return self._create(body or {}, _media_bytes(media_body) if media_body is not None else None)
+
+    def _files_update(self, fileId, body=None, media_body=None, addParents=None, removeParents=None):
+        body = dict(body or {})
+        if addParents or removeParents:
+            parents = [p for p in self._require(fileId)["parents"] if p not in (removeParents or "").split(",")]
+            body["parents"] = parents + [p for p in (addParents or "").split(",") if p]
+        return self._update(fileId, body, _media_bytes(media_body) if media_body is not None else None)
+
+    def _files_delete(self, fileId):
+        self._require(fileId)
+        del self.files_by_id[fileId]
+        self.contents.pop(fileId, None)
+        self._record_change(fileId)
+        return ""
+
+    def _changes_getStartPageToken(self):
+        return {"kind": "drive#startPageToken", "startPageToken": str(len(self.change_log) + 1)}
+
+    def _changes_list(self, pageToken, pageSize=None, spaces=None, includeRemoved=True):
+        # Tokens are 1-based positions in the change log
+        offset = int(pageToken) - 1
+        if offset < 0 or offset > len(self.change_log):
+            raise http_error(404, "invalidPageToken")
+        page, next_offset = self._page(self.change_log, str(offset), pageSize)
+        changes = []
+        for file_id in page:
+            resource = self.files_by_id.get(file_id)
+            change = {"kind": "drive#change", "changeType": "file", "fileId": file_id, "removed": resource is None}
+            if resource is not None:
+                change["file"] = dict(resource)
+            if resource is not None or includeRemoved:
+                changes.append(change)
+        response = {"kind": "drive#changeList", "changes": changes}
+        if next_offset is not None:
+            response["nextPageToken"] = str(int(next_offset) + 1)
+        else:
+            response["newStartPageToken"] = str(len(self.change_log) + 1)
+        return response
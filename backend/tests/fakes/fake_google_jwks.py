@@ -0,0 +1,115 @@
+"""
+Local stand-in for Google's signing key endpoint (JWKS) for tests.
+
+Serves a JSON Web Key Set with a ``Cache-Control: max-age`` header through an
+httpx ``MockTransport`` and signs ID tokens with the matching private keys,
+so GoogleOAuthHandler verifies real RS256 signatures without any network:
+
+    jwks = FakeGoogleJWKS()
+    handler = GoogleOAuthHandler("client-id", key_set=GoogleKeySet(transport=jwks.transport))
+    handler.verify_id_token(jwks.id_token("client-id", email="a@example.com"))
+
+Keys can be rotated and the endpoint made to fail; every request is counted
+in ``requests``.
+"""
+
+import base64
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import rsa
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from backend.app.auth.google_keys import GOOGLE_JWKS_URL
+
+KEY_BITS = 1024  # Small keys keep generation fast; the size does not matter here
+
+# Generated keys, shared by every stub in the test run
+_generated: Dict[str, Tuple[rsa.PublicKey, rsa.PrivateKey]] = {}
+
+
+def _key_pair(kid: str) -> Tuple[rsa.PublicKey, rsa.PrivateKey]:
+    if kid not in _generated:
+        _generated[kid] = rsa.newkeys(KEY_BITS)
+    return _generated[kid]
+
+
+def _b64(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class FakeGoogleJWKS:
+    """JWKS endpoint stub and ID token signer."""
+
+    def __init__(self, max_age: int = 3600, kid: str = "test-key-1"):
+        """
+        Args:
+            max_age: Cache-Control max-age of key set responses
+            kid: Key id of the initial signing key
+        """
+        self.max_age = max_age
+        self.kids = [kid]
+        self.fail = False
+        self.requests = 0
+        _key_pair(kid)
+
+    @property
+    def signing_kid(self) -> str:
+        return self.kids[-1]
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    def rotate(self, kid: str) -> None:
+        """Publish a new key and sign with it from now on (the old key stays published)."""
+        _key_pair(kid)
+        self.kids.append(kid)
+
+    def jwks(self) -> Dict[str, Any]:
+        keys = []
+        for kid in self.kids:
+            public_key, _ = _key_pair(kid)
+            keys.append({
+                "kty": "RSA", "alg": "RS256", "use": "sig", "kid": kid,
+                "n": _b64(public_key.n), "e": _b64(public_key.e),
+            })
+        return {"keys": keys}
+
+    def sign(self, claims: Dict[str, Any], kid: Optional[str] = None) -> str:
+        """RS256 JWT of ``claims`` signed with key ``kid`` (default: the current key)."""
+        kid = kid or self.signing_kid
+        _, private_key = _key_pair(kid)
+        signer = crypt.RSASigner.from_string(private_key.save_pkcs1().decode("ascii"), key_id=kid)
+        return google_jwt.encode(signer, claims).decode("ascii")
+
+    def id_token(self, audience: str, kid: Optional[str] = None, **claims) -> str:
+        """A Google ID token for ``audience``; ``claims`` override the defaults."""
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": audience,
+            "sub": "google-user-1",
+            "email": "user@example.com",
+            "email_verified": True,
+            "name": "Google User",
+            "iat": now,
+            "exp": now + 3600,
+        }
+        payload.update(claims)
+        return self.sign(payload, kid)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if str(request.url) != GOOGLE_JWKS_URL:
+            return httpx.Response(404)
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(
+            200,
+            json=self.jwks(),
+            headers={"Cache-Control": f"public, max-age={self.max_age}, must-revalidate, no-transform"},
+        )
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import SessionLocal
+from backend.app.models.user import User
+
+EMAIL = "override-check@example.com"
+PASSWORD = "Str0ng-Passw0rd!"
+
+
+def test_auth_requests_use_the_test_transaction(client: TestClient, db_session: Session):
+    registered = client.post("/api/v1/auth/register", json={"email": EMAIL, "name": "Override", "password": PASSWORD})
+    assert registered.status_code == 201
+    headers = {"Authorization": f"Bearer {registered.json()['access_token']}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).json()["email"] == EMAIL
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+
+    # Written through the test session (rolled back), never the application database
+    assert db_session.query(User).filter(User.email == EMAIL).count() == 1
+    app_db = SessionLocal()
+    try:
+        assert app_db.query(User).filter(User.email == EMAIL).count() == 0
+    finally:
+        app_db.close()
@@ -157,4 +157,20 @@ def test_read_literature_items_pagination(client: TestClient, db_session: Sessio
     response = client.get("/api/v1/literature?skip=10&limit=5")
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 0
\ No newline at end of file
+    assert len(data) == 0
+
+def test_read_literature_items_cursor_pagination(client: TestClient, db_session: Session):
+    """
+    GET /api/v1/literature 엔드포인트가 태그 필터와 함께 커서 페이지네이션을 처리하는지 테스트합니다.
+    """
+    for i in range(5):
+        tags = "keyset" if i % 2 == 0 else "other"
+        response = client.post("/api/v1/literature", json={"title": f"Cursor Item {i}", "tags": tags})
+        assert response.status_code == 201
+
+    first = client.get("/api/v1/literature?tags=keyset&limit=2")
+    assert [item["title"] for item in first.json()] == ["Cursor Item 0", "Cursor Item 2"]
+
+    second = client.get(f"/api/v1/literature?tags=keyset&limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert [item["title"] for item in second.json()] == ["Cursor Item 4"]
+    assert "X-Next-Cursor" not in second.headers
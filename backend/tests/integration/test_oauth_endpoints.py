@@ -9,13 +9,15 @@ Tests the complete OAuth2 flow including:
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.app.main import app
 from backend.app.models.user import User
 from backend.app.core.dependencies import get_db
+from backend.app.db.session import get_async_db
 
 
 @pytest.fixture
@@ -46,7 +48,11 @@ def client(db_session):
     def override_get_db():
         yield db_session
 
+    async def override_get_async_db():
+        yield AsyncSession(sync_session_class=lambda **kwargs: db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     return TestClient(app)
 
 
@@ -93,7 +99,7 @@ class TestGoogleAuthUrl:
 class TestVerifyGoogleToken:
     """Test POST /auth/google/verify-token endpoint"""
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_google_token_success_new_user(self, mock_verify, client, db_session, monkeypatch):
         """Test successful ID token verification and new user creation"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -105,6 +111,7 @@ class TestVerifyGoogleToken:
             "picture": "https://example.com/photo.jpg",
             "email_verified": True,
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
 
         response = client.post(
@@ -127,7 +134,7 @@ class TestVerifyGoogleToken:
         assert user.password_hash is None  # OAuth users have no password
         assert user.is_active is True
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_google_token_existing_user(self, mock_verify, client, db_session, monkeypatch):
         """Test ID token verification for existing user"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -150,6 +157,7 @@ class TestVerifyGoogleToken:
             "picture": "https://example.com/photo.jpg",
             "email_verified": True,
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
 
         response = client.post(
@@ -162,7 +170,7 @@ class TestVerifyGoogleToken:
         assert data["user"]["email"] == "existing@example.com"
         assert data["user"]["user_id"] == existing_user.user_id
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_google_token_inactive_user(self, mock_verify, client, db_session, monkeypatch):
         """Test that inactive user cannot login"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -182,6 +190,7 @@ class TestVerifyGoogleToken:
             "email": "inactive@example.com",
             "name": "Inactive User",
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
 
         response = client.post(
@@ -204,7 +213,7 @@ class TestVerifyGoogleToken:
         assert response.status_code == 400
         assert "id_token" in response.json()["detail"].lower()
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_google_token_invalid_token(self, mock_verify, client, monkeypatch):
         """Test that invalid ID token returns error"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -219,7 +228,7 @@ class TestVerifyGoogleToken:
         assert response.status_code == 400
         assert "invalid" in response.json()["detail"].lower()
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_google_token_wrong_audience(self, mock_verify, client, monkeypatch):
         """Test that wrong audience raises error"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -242,8 +251,8 @@ class TestVerifyGoogleToken:
 class TestGoogleOAuthCallback:
     """Test POST /auth/google/callback endpoint"""
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
-    @patch("backend.app.auth.oauth_handler.httpx.post")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
     def test_google_callback_success(self, mock_post, mock_verify, client, db_session, monkeypatch):
         """Test successful OAuth2 callback with code exchange"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -267,6 +276,7 @@ class TestGoogleOAuthCallback:
             "picture": "https://example.com/photo.jpg",
             "email_verified": True,
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
 
         response = client.post(
@@ -288,7 +298,7 @@ class TestGoogleOAuthCallback:
         user = db_session.query(User).filter(User.email == "callbackuser@example.com").first()
         assert user is not None
 
-    @patch("backend.app.auth.oauth_handler.httpx.post")
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
     def test_google_callback_invalid_code(self, mock_post, client, monkeypatch):
         """Test that invalid authorization code returns error"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -324,8 +334,8 @@ class TestGoogleOAuthCallback:
 
         assert response.status_code == 422  # Validation error
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
-    @patch("backend.app.auth.oauth_handler.httpx.post")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
     def test_google_callback_no_id_token_in_response(self, mock_post, mock_verify, client, monkeypatch):
         """Test that missing ID token in response returns error"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -356,7 +366,7 @@ class TestGoogleOAuthCallback:
 class TestOAuthTokenUsage:
     """Test using OAuth-generated tokens to access protected endpoints"""
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_use_oauth_access_token(self, mock_verify, client, db_session, monkeypatch):
         """Test that OAuth-generated JWT can access protected endpoints"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -369,6 +379,7 @@ class TestOAuthTokenUsage:
             "picture": "https://example.com/photo.jpg",
             "email_verified": True,
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
 
         login_response = client.post(
@@ -389,3 +400,55 @@ class TestOAuthTokenUsage:
         user_data = me_response.json()
         assert user_data["email"] == "tokentest@example.com"
         assert user_data["name"] == "Token Test User"
+
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
+    def test_google_refresh_token_can_be_refreshed(self, mock_verify, client, monkeypatch):
+        """Test that the refresh token from Google sign-in has a session and rotates"""
+        monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
+        mock_verify.return_value = {
+            "sub": "google-user-321",
+            "email": "refresher@example.com",
+            "name": "Refresher",
+            "email_verified": True,
+            "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
+        }
+
+        login_response = client.post("/api/v1/auth/google/verify-token", json={"id_token": "test-id-token"})
+        assert login_response.status_code == 200
+        refresh_token = login_response.json()["refresh_token"]
+
+        refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+        assert refreshed.status_code == 200
+        assert refreshed.json()["user"]["email"] == "refresher@example.com"
+
+        # The rotated token is spent
+        reused = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+        assert reused.status_code == 401
+
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
+    def test_google_callback_refresh_token_can_be_refreshed(self, mock_post, mock_verify, client, monkeypatch):
+        """Test that the refresh token from the code flow has a session too"""
+        monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
+        monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test-secret")
+        mock_post_response = Mock()
+        mock_post_response.status_code = 200
+        mock_post_response.json.return_value = {"access_token": "google-access-token", "id_token": "google-id-token"}
+        mock_post.return_value = mock_post_response
+        mock_verify.return_value = {
+            "sub": "google-user-654",
+            "email": "callback-refresher@example.com",
+            "name": "Callback Refresher",
+            "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
+        }
+
+        login_response = client.post(
+            "/api/v1/auth/google/callback",
+            json={"code": "auth-code-123", "redirect_uri": "http://localhost:3000/auth/google/callback"},
+        )
+        assert login_response.status_code == 200
+
+        refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": login_response.json()["refresh_token"]})
+        assert refreshed.status_code == 200
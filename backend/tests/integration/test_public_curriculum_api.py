@@ -146,3 +146,31 @@ def test_read_public_curriculums_pagination(client: TestClient, db_session: Sess
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 0
+
+def test_read_public_curriculums_cursor_pagination(client: TestClient, db_session: Session):
+    """
+    GET /api/v1/curriculums/public 엔드포인트가 X-Next-Cursor 커서로 모든 항목을 중복 없이 순회하는지 테스트합니다.
+    """
+    for i in range(7):
+        db_session.add(Curriculum(title=f"Public Curriculum {i}", is_public=True))
+    db_session.add(Curriculum(title="Private Curriculum", is_public=False))
+    db_session.commit()
+
+    response = client.get("/api/v1/curriculums/public?limit=3&include_total=true")
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "7"
+
+    seen = [c["title"] for c in response.json()]
+    while "X-Next-Cursor" in response.headers:
+        response = client.get(f"/api/v1/curriculums/public?limit=3&cursor={response.headers['X-Next-Cursor']}")
+        assert response.status_code == 200
+        seen.extend(c["title"] for c in response.json())
+
+    assert seen == [f"Public Curriculum {i}" for i in range(7)]
+
+def test_read_public_curriculums_invalid_cursor(client: TestClient):
+    """
+    잘못된 커서는 400 응답을 반환해야 합니다.
+    """
+    response = client.get("/api/v1/curriculums/public?cursor=not-a-cursor")
+    assert response.status_code == 400
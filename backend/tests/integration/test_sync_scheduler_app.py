@@ -0,0 +1,129 @@
+"""
+Integration tests for the application's Sync Scheduler.
+
+Each test runs an application from get_application() on its own in-memory
+database, lifespan included, so the scheduler is the one built at startup.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.api.v1.endpoints import sync as sync_endpoints
+from backend.app.core.config import settings
+from backend.app.db.session import get_db
+from backend.app.main import get_application
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.sync_metadata import CurriculumDriveFolder
+from backend.app.services.google_drive_service import GoogleDriveService
+from backend.tests.fakes.fake_drive import FakeDrive
+
+
+@pytest.fixture
+def app_sessions():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def sync_app(app_sessions, monkeypatch):
+    drive_service = GoogleDriveService(use_service_account=False)
+    drive_service.service = FakeDrive()
+    monkeypatch.setattr(sync_endpoints, "get_google_drive_service", lambda: drive_service)
+    app = get_application(app_sessions.kw["bind"])
+
+    def override_get_db():
+        db = app_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+class RecordingSyncService:
+    def __init__(self):
+        self.synced = []
+
+    async def sync_curriculum(self, curriculum_id, direction="bidirectional"):
+        self.synced.append(curriculum_id)
+        return {"status": "completed", "errors": []}
+
+
+def _add_curriculum(app_sessions, title: str, drive_folder_id: str = None) -> str:
+    db = app_sessions()
+    try:
+        curriculum = Curriculum(title=title)
+        db.add(curriculum)
+        db.flush()
+        if drive_folder_id:
+            db.add(CurriculumDriveFolder(curriculum_id=curriculum.curriculum_id, google_drive_folder_id=drive_folder_id))
+        db.commit()
+        return curriculum.curriculum_id
+    finally:
+        db.close()
+
+
+def test_sync_endpoints_use_the_scheduler_built_at_startup(sync_app, app_sessions):
+    with TestClient(sync_app) as client:
+        curriculum_id = _add_curriculum(app_sessions, "Paused")
+        scheduler = sync_app.state.sync_scheduler
+
+        assert client.post("/api/v1/sync/pause", params={"curriculum_id": curriculum_id}).status_code == 204
+        all_status = client.get("/api/v1/sync/all-status").json()
+
+    assert curriculum_id in scheduler.paused
+    # Read through the scheduler's own sessions on the application's engine
+    assert all_status["total_curriculums"] == 1
+    assert all_status["curriculums"][curriculum_id]["status"] == "paused"
+
+
+def test_node_edit_triggers_a_sync(sync_app, app_sessions, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(settings, "SYNC_DEBOUNCE_SECONDS", 0.05)
+    recorder = RecordingSyncService()
+
+    with TestClient(sync_app) as client:
+        curriculum_id = _add_curriculum(app_sessions, "On Drive", drive_folder_id="folder-1")
+        scheduler = sync_app.state.sync_scheduler
+        scheduler.sync_service_factory = lambda db: recorder
+
+        created = client.post("/api/v1/nodes/", params={"curriculum_id": curriculum_id}, json={"title": "Draft"})
+        assert created.status_code == 201
+        edited = client.put(f"/api/v1/nodes/{created.json()['node_id']}", json={"title": "Final"})
+        assert edited.status_code == 200
+
+        deadline = time.monotonic() + 5
+        while not recorder.synced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)  # no second sync for the same burst of edits
+
+    # Both edits settle into one sync; stopping the scheduler released its lease
+    assert recorder.synced == [curriculum_id]
+    assert not scheduler.scheduler.running and not scheduler.is_leader
+
+
+def test_manual_sync_runs_through_the_scheduler(sync_app, app_sessions):
+    recorder = RecordingSyncService()
+
+    with TestClient(sync_app) as client:
+        curriculum_id = _add_curriculum(app_sessions, "On Drive", drive_folder_id="folder-1")
+        scheduler = sync_app.state.sync_scheduler
+        scheduler.sync_service_factory = lambda db: recorder
+        request = {"curriculum_id": curriculum_id, "direction": "up"}
+
+        scheduler.in_flight.add(curriculum_id)  # a debounced sync is running
+        busy = client.post("/api/v1/sync/start", json=request)
+        scheduler.in_flight.discard(curriculum_id)
+        done = client.post("/api/v1/sync/start", json=request)
+
+    assert busy.status_code == 409 and busy.json()["detail"] == "already_running"
+    assert done.status_code == 200 and done.json()["status"] == "completed"
+    assert recorder.synced == [curriculum_id]
@@ -0,0 +1,86 @@
+"""
+Query audit pytest plugin: fail tests that regress into N+1 query patterns.
+
+Audits the statements a test body executes (fixtures are not counted; see
+app/db/query_audit.py) and fails the test when it exceeds its budget:
+
+- ``@pytest.mark.query_budget(max_repeats=3, max_queries=20, max_db_time_ms=200)``
+  always applies to the marked test, so a test covering a bulk code path
+  pins how many times any one statement may run
+- ``--query-audit`` audits every other test with the QUERY_AUDIT_* settings
+  as budget
+- ``--query-audit-report=PATH`` writes the ranked report of offending tests
+
+Registered for the whole repository by the root conftest.py
+(``pytest_plugins``); suites run from elsewhere can enable it with
+``-p backend.tests.query_audit_plugin``.
+
+Usage:
+    pytest backend/tests --query-audit --query-audit-report=query_audit.txt
+"""
+
+from typing import Optional
+
+import pytest
+
+from backend.app.db.query_audit import QueryAuditLog, QueryBudget, audit
+
+_LOG_KEY = pytest.StashKey[QueryAuditLog]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("query-audit", "database query audit")
+    group.addoption(
+        "--query-audit", action="store_true", default=False,
+        help="Fail tests repeating a statement or spending longer in the database than QUERY_AUDIT_* allows",
+    )
+    group.addoption(
+        "--query-audit-report", metavar="PATH", default=None,
+        help="Write the ranked query audit report to PATH",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_repeats=None, max_queries=None, max_db_time_ms=None): "
+        "fail the test if its statements exceed the budget",
+    )
+    config.stash[_LOG_KEY] = QueryAuditLog()
+
+
+def _budget_for(item) -> Optional[QueryBudget]:
+    marker = item.get_closest_marker("query_budget")
+    if marker is not None:
+        return QueryBudget(**marker.kwargs)
+    if item.config.getoption("query_audit"):
+        return QueryBudget.from_settings()
+    return None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    budget = _budget_for(item)
+    if budget is None:
+        return (yield)
+
+    with audit(item.nodeid, budget, item.config.stash[_LOG_KEY]) as unit:
+        result = yield
+    if unit.violations:
+        pytest.fail(f"Query budget exceeded by {unit.describe()}", pytrace=False)
+    return result
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    log = config.stash.get(_LOG_KEY, None)
+    if log is None or not log.ranked():
+        return
+    terminalreporter.write_sep("=", "query audit")
+    terminalreporter.write(log.format_report(limit=10))
+
+
+def pytest_unconfigure(config):
+    log = config.stash.get(_LOG_KEY, None)
+    path = config.getoption("query_audit_report", None)
+    if log is not None and path:
+        log.write_report(path)
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.auth.jwt_handler import JWTHandler
+from backend.app.auth.password_handler import PasswordHandler
+from backend.app.auth.token_digest import refresh_token_digest
+from backend.app.models.user_session import UserSession
+from backend.app.services.auth_service import AuthService, TokenRefreshError, TokenReuseError
+
+PASSWORD = "Secret-Passw0rd!"
+
+
+@pytest.fixture
+def auth_service(async_db_session: AsyncSession) -> AuthService:
+    return AuthService(async_db_session, JWTHandler(secret_key="test-secret"), PasswordHandler(rounds=4, pool="inline"))
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_are_stored_as_digests(auth_service: AuthService, async_db_session: AsyncSession):
+    user, _, refresh_token = await auth_service.register("digest@example.com", "Digest", PASSWORD)
+
+    session = (await async_db_session.scalars(select(UserSession).where(UserSession.user_id == user.user_id))).one()
+    assert session.refresh_token_hash == refresh_token_digest(refresh_token)
+    assert refresh_token not in session.refresh_token_hash
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_detects_reuse(auth_service: AuthService, async_db_session: AsyncSession):
+    user, _, first = await auth_service.register("rotate@example.com", "Rotate", PASSWORD)
+
+    _, second = await auth_service.refresh_token(first)
+    _, third = await auth_service.refresh_token(second)
+    assert len({first, second, third}) == 3
+
+    # A rotated token coming back means it leaked: the whole family is revoked
+    with pytest.raises(TokenReuseError):
+        await auth_service.refresh_token(first)
+    with pytest.raises(TokenRefreshError):
+        await auth_service.refresh_token(third)
+    assert await auth_service.get_user_sessions(user.user_id) == []
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_the_given_session(auth_service: AuthService):
+    user, _, phone = await auth_service.register("devices@example.com", "Devices", PASSWORD)
+    _, _, laptop = await auth_service.login("devices@example.com", PASSWORD)
+
+    await auth_service.logout(user.user_id, refresh_token=phone)
+
+    with pytest.raises(TokenRefreshError, match="revoked"):
+        await auth_service.refresh_token(phone)
+    await auth_service.refresh_token(laptop)
+    with pytest.raises(TokenRefreshError, match="Unknown"):
+        await auth_service.refresh_token(JWTHandler(secret_key="test-secret").create_refresh_token(user.user_id))
+
+
+@pytest.mark.asyncio
+async def test_logout_all_is_one_update(auth_service: AuthService, async_db_session: AsyncSession):
+    user, _, _ = await auth_service.register("everywhere@example.com", "Everywhere", PASSWORD)
+    for _ in range(3):
+        await auth_service.login("everywhere@example.com", PASSWORD)
+    user_id = user.user_id
+
+    statements = []
+    event.listen(async_db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    await auth_service.logout(user_id)
+
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+    assert await auth_service.get_user_sessions(user_id) == []
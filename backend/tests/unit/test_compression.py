@@ -0,0 +1,109 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.app.middleware.compression import CompressionMiddleware, negotiate_encoding
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node
+from backend.tests.benchmarks.response_benchmark import PAYLOADS, format_table, run_payload
+
+ITEMS = [{"node_id": f"node-{i}", "title": f"{i}. 연속함수와 극한"} for i in range(200)]
+
+
+@pytest.fixture
+def compressing_client() -> TestClient:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/items")
+    def items():
+        return ITEMS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"i":{i}}}\n' * 200 for i in range(3)), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    def events():
+        return Response("data: x\n\n" * 500, media_type="text/event-stream")
+
+    @app.get("/bundle")
+    def bundle():
+        return Response(gzip.compress(b"{}" * 1000), media_type="application/x-ndjson", headers={"Content-Encoding": "gzip"})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_large_json_is_compressed_with_the_preferred_encoding(compressing_client, encoding):
+    response = compressing_client.get("/items", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    # The client decodes the body; Content-Length is the compressed size
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == ITEMS
+
+
+def test_responses_left_uncompressed(compressing_client):
+    headers = {"Accept-Encoding": "br, gzip"}
+
+    assert "content-encoding" not in compressing_client.get("/items", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in compressing_client.get("/small", headers=headers).headers
+    assert "content-encoding" not in compressing_client.get("/events", headers=headers).headers
+
+    streamed = compressing_client.get("/stream", headers=headers)
+    assert "content-encoding" not in streamed.headers
+    assert streamed.text.count("\n") == 600
+
+    bundle = compressing_client.get("/bundle", headers=headers)
+    assert bundle.headers["content-encoding"] == "gzip"
+    assert bundle.content == b"{}" * 1000
+
+
+def test_application_compresses_curriculum_tree_but_not_exports(client, db_session):
+    curriculum = Curriculum(title="압축 테스트", description="Tree large enough to compress")
+    db_session.add(curriculum)
+    db_session.flush()
+    curriculum_id = curriculum.curriculum_id
+    db_session.add_all(
+        Node(curriculum_id=curriculum_id, title=f"{i}. 연속함수와 극한", order_index=i) for i in range(10)
+    )
+    db_session.commit()
+
+    tree = client.get(f"/api/v1/curriculums/{curriculum_id}", headers={"Accept-Encoding": "br"})
+    export = client.get(f"/api/v1/curriculums/{curriculum_id}/export", headers={"Accept-Encoding": "br"})
+
+    assert tree.headers["content-encoding"] == "br"
+    assert tree.headers["content-type"] == "application/json"
+    assert len(tree.json()["nodes"]) == 10
+    assert export.status_code == 200 and "content-encoding" not in export.headers
+
+
+def test_response_benchmark_runs():
+    runs = [run_payload(payload, items=20, rounds=1) for payload in PAYLOADS]
+
+    tree = runs[0]
+    assert tree.brotli_bytes < tree.raw_bytes and tree.gzip_bytes < tree.raw_bytes
+    assert runs[-1].raw_bytes == runs[-1].brotli_bytes  # sync_status stays below the threshold
+    assert "sync_history" in format_table(runs)
@@ -0,0 +1,143 @@
+import gzip
+import io
+import json
+from datetime import datetime, UTC
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node, NodeContent, NodeLink
+from backend.app.models.youtube_video import YouTubeVideo
+from backend.app.services.curriculum_bundle_service import CurriculumBundleService
+
+
+@pytest.fixture
+def bundle_service(db_session: Session):
+    return CurriculumBundleService(db_session)
+
+
+@pytest.fixture
+def source_curriculum(db_session: Session):
+    """A small curriculum: chapter -> (section A, section B), with content and links."""
+    curriculum = Curriculum(title="Source Curriculum", description="Exported", is_public=True)
+    db_session.add(curriculum)
+    db_session.flush()
+
+    chapter = Node(curriculum_id=curriculum.curriculum_id, title="Chapter", node_type="CHAPTER", order_index=0)
+    db_session.add(chapter)
+    db_session.flush()
+    section_a = Node(curriculum_id=curriculum.curriculum_id, parent_node_id=chapter.node_id, title="Section A", order_index=0)
+    section_b = Node(curriculum_id=curriculum.curriculum_id, parent_node_id=chapter.node_id, title="Section B", order_index=1)
+    db_session.add_all([section_a, section_b])
+    db_session.flush()
+
+    db_session.add(NodeContent(node_id=section_a.node_id, markdown_content="# Limits"))
+    video = YouTubeVideo(video_id="dQw4w9WgXcQ", title="Lecture")
+    db_session.add(video)
+    db_session.flush()
+    db_session.add_all([
+        NodeLink(node_id=section_b.node_id, link_type="NODE", linked_node_id=section_a.node_id, link_relationship="DEPENDS_ON"),
+        NodeLink(node_id=section_a.node_id, link_type="YOUTUBE", youtube_video_id=video.youtube_video_id),
+    ])
+    db_session.commit()
+    return curriculum
+
+
+def _records(chunks) -> list:
+    return [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()]
+
+
+def test_export_streams_parents_before_children(bundle_service: CurriculumBundleService, source_curriculum):
+    records = _records(bundle_service.export_curriculum(source_curriculum.curriculum_id))
+
+    assert [r["type"] for r in records] == ["header", "curriculum", "node", "node", "node", "link", "link"]
+    nodes = [r for r in records if r["type"] == "node"]
+    assert nodes[0]["title"] == "Chapter" and nodes[0]["parent_node_id"] is None
+    assert [n["title"] for n in nodes[1:]] == ["Section A", "Section B"]
+    assert nodes[1]["content"]["markdown_content"] == "# Limits"
+    youtube_link = next(r for r in records if r["type"] == "link" and r["link_type"] == "YOUTUBE")
+    assert youtube_link["youtube"]["video_id"] == "dQw4w9WgXcQ"
+
+
+def test_export_skips_soft_deleted_nodes(bundle_service: CurriculumBundleService, source_curriculum, db_session: Session):
+    from backend.app.services.node_service import NodeService
+
+    section_b = db_session.query(Node).filter(Node.title == "Section B").first()
+    NodeService(db_session).delete_node(section_b.node_id)
+
+    records = _records(bundle_service.export_curriculum(source_curriculum.curriculum_id))
+
+    assert [r["title"] for r in records if r["type"] == "node"] == ["Chapter", "Section A"]
+    assert [r["link_type"] for r in records if r["type"] == "link"] == ["YOUTUBE"]
+
+
+def test_export_skips_links_to_nodes_under_a_deleted_ancestor(bundle_service: CurriculumBundleService, source_curriculum, db_session: Session):
+    chapter = db_session.query(Node).filter(Node.title == "Chapter").first()
+    section_a = db_session.query(Node).filter(Node.title == "Section A").first()
+    appendix = Node(curriculum_id=source_curriculum.curriculum_id, title="Appendix", order_index=1)
+    db_session.add(appendix)
+    db_session.flush()
+    db_session.add(NodeLink(node_id=appendix.node_id, link_type="NODE", linked_node_id=section_a.node_id, link_relationship="RELATED"))
+    # Only the chapter row is soft-deleted; its sections stay live underneath it
+    chapter.deleted_at = datetime.now(UTC)
+    db_session.commit()
+
+    bundle = b"".join(bundle_service.export_curriculum(source_curriculum.curriculum_id))
+    records = _records([bundle])
+
+    assert [r["title"] for r in records if r["type"] == "node"] == ["Appendix"]
+    assert [r for r in records if r["type"] == "link"] == []
+    assert bundle_service.import_curriculum(io.BytesIO(bundle))["link_count"] == 0
+
+
+def test_export_unknown_curriculum_raises(bundle_service: CurriculumBundleService):
+    with pytest.raises(ValueError, match="not found"):
+        bundle_service.export_curriculum("00000000-0000-0000-0000-000000000000")
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_import_round_trip_remaps_ids(bundle_service: CurriculumBundleService, source_curriculum, db_session: Session, compression):
+    bundle = b"".join(bundle_service.export_curriculum(source_curriculum.curriculum_id, compression=compression))
+    if compression == "gzip":
+        assert bundle[:2] == b"\x1f\x8b"
+
+    summary = bundle_service.import_curriculum(io.BytesIO(bundle), title="Imported Copy")
+
+    assert summary["node_count"] == 3
+    assert summary["link_count"] == 2
+    imported = db_session.query(Curriculum).filter(Curriculum.curriculum_id == summary["curriculum_id"]).first()
+    assert imported.title == "Imported Copy"
+    assert imported.is_public is True
+
+    nodes = {n.title: n for n in db_session.query(Node).filter(Node.curriculum_id == summary["curriculum_id"]).all()}
+    original_ids = {n.node_id for n in db_session.query(Node).filter(Node.curriculum_id == source_curriculum.curriculum_id)}
+    assert not original_ids & {n.node_id for n in nodes.values()}
+    assert nodes["Section A"].parent_node_id == nodes["Chapter"].node_id
+    assert nodes["Section B"].order_index == 1
+    assert nodes["Section A"].content.markdown_content == "# Limits"
+
+    node_link = db_session.query(NodeLink).filter(
+        NodeLink.node_id == nodes["Section B"].node_id, NodeLink.link_type == "NODE"
+    ).one()
+    assert node_link.linked_node_id == nodes["Section A"].node_id
+    # The YouTube video is matched by its external ID instead of being duplicated
+    assert db_session.query(YouTubeVideo).filter(YouTubeVideo.video_id == "dQw4w9WgXcQ").count() == 1
+
+
+def test_import_rejects_links_to_nodes_not_in_the_bundle(bundle_service: CurriculumBundleService, source_curriculum, db_session: Session):
+    records = _records(bundle_service.export_curriculum(source_curriculum.curriculum_id))
+    section_b = next(r for r in records if r["type"] == "node" and r["title"] == "Section B")
+    records.remove(section_b)
+    bundle = "\n".join(json.dumps(record) for record in records).encode("utf-8")
+
+    with pytest.raises(ValueError, match=f"references node '{section_b['node_id']}'"):
+        bundle_service.import_curriculum(io.BytesIO(bundle), title="Broken Copy")
+    assert db_session.query(Curriculum).filter(Curriculum.title == "Broken Copy").count() == 0
+
+
+def test_import_rejects_non_bundle(bundle_service: CurriculumBundleService):
+    stream = io.BytesIO(gzip.compress(b'{"type": "node"}\n'))
+
+    with pytest.raises(ValueError, match="missing header"):
+        bundle_service.import_curriculum(stream)
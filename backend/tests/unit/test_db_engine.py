@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import text
+
+from backend.app.db.engine import (
+    async_database_url,
+    create_configured_async_engine,
+    create_configured_engine,
+    engine_options,
+    get_engine_metrics,
+)
+from backend.tests.benchmarks.db_benchmark import format_table, run_profile
+
+
+def test_sqlite_file_profile_sets_pragmas_and_records_metrics(tmp_path):
+    engine = create_configured_engine(f"sqlite+pysqlite:///{tmp_path / 'profile.db'}")
+    try:
+        with engine.connect() as conn:
+            pragmas = {
+                name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+            }
+        stats = get_engine_metrics(engine).snapshot()
+    finally:
+        engine.dispose()
+
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "cache_size": -65536}
+    assert stats["checkout_wait"]["count"] == 1
+    assert stats["query_time"]["count"] >= 4
+    assert stats["pool"]["class"] == "TimedQueuePool"
+
+
+def test_postgres_profile_uses_pool_settings_and_statement_timeout():
+    options = engine_options("postgresql+psycopg2://app@db/mathesis")
+    assert options["pool_pre_ping"] is True
+    assert options["pool_size"] == 5 and options["max_overflow"] == 10
+    assert options["connect_args"] == {"options": "-c statement_timeout=30000"}
+    assert engine_options("sqlite://") == {}
+
+
+@pytest.mark.asyncio
+async def test_async_engine_uses_async_driver_with_same_profile(tmp_path):
+    assert async_database_url("postgresql+psycopg2://app:secret@db/mathesis") == "postgresql+asyncpg://app:secret@db/mathesis"
+    assert engine_options("postgresql+asyncpg://app@db/mathesis", is_async=True)["connect_args"] == {
+        "server_settings": {"statement_timeout": "30000"}
+    }
+
+    engine = create_configured_async_engine(f"sqlite+pysqlite:///{tmp_path / 'profile.db'}")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        stats = get_engine_metrics(engine.sync_engine).snapshot()
+    finally:
+        await engine.dispose()
+
+    assert engine.url.drivername == "sqlite+aiosqlite"
+    assert journal_mode == "wal"
+    assert stats["pool"]["class"] == "TimedAsyncQueuePool"
+    assert stats["checkout_wait"]["count"] == 1
+
+
+def test_concurrent_writes_complete_on_both_profiles():
+    runs = [run_profile(profile, writers=4, readers=2, writes_per_writer=10) for profile in ("default", "tuned")]
+
+    assert [run.journal_mode for run in runs] == ["delete", "wal"]
+    assert all(run.writes == 40 and run.failed == 0 for run in runs)
+    assert "tuned" in format_table(runs)
@@ -0,0 +1,184 @@
+import pytest
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import NodeLink
+from backend.app.schemas.node import NodeCreate
+from backend.app.services import dependency_graph
+from backend.app.services.dependency_graph import (
+    DependencyCycleError,
+    DependencyGraph,
+    DependencyGraphService,
+    invalidate_dependency_graph,
+)
+from backend.app.services.node_service import NodeService
+
+
+# --- Pure graph ---
+
+def test_topological_order_respects_prerequisites_and_outline():
+    # c depends on a, b depends on c; d is independent
+    graph = DependencyGraph(["a", "b", "c", "d"], [("c", "a"), ("b", "c")])
+
+    assert graph.topological_order() == ["a", "c", "b", "d"]
+
+
+def test_topological_order_reports_cycle():
+    graph = DependencyGraph(["a", "b", "c"], [("a", "b"), ("b", "c"), ("c", "a")])
+
+    with pytest.raises(DependencyCycleError) as exc_info:
+        graph.topological_order()
+    cycle = exc_info.value.cycle
+    assert cycle[0] == cycle[-1] and set(cycle) == {"a", "b", "c"}
+
+
+def test_transitive_queries_and_shortest_path():
+    # d -> b -> a, d -> c -> a, e -> d ; plus a longer route e -> c
+    graph = DependencyGraph(
+        ["a", "b", "c", "d", "e"],
+        [("b", "a"), ("c", "a"), ("d", "b"), ("d", "c"), ("e", "d"), ("e", "c")],
+    )
+
+    assert graph.prerequisites("e") == ["a", "b", "c", "d"]
+    assert graph.prerequisites("e", transitive=False) == ["c", "d"]
+    assert graph.dependents("a") == ["b", "c", "d", "e"]
+    assert graph.dependents("d") == ["e"]
+    assert graph.shortest_prerequisite_path("a", "e") == ["a", "c", "e"]
+    assert graph.shortest_prerequisite_path("e", "a") is None
+
+
+def test_cycle_if_linked():
+    graph = DependencyGraph(["a", "b", "c"], [("b", "a"), ("c", "b")])
+
+    assert graph.cycle_if_linked("a", "c") == ["a", "b", "c", "a"]
+    assert graph.cycle_if_linked("c", "a") is None
+
+
+def test_unknown_node_raises():
+    graph = DependencyGraph(["a"], [])
+
+    with pytest.raises(ValueError):
+        graph.prerequisites("missing")
+
+
+# --- Service ---
+
+@pytest.fixture
+def node_service(db_session: Session):
+    return NodeService(db_session)
+
+
+@pytest.fixture
+def curriculum_nodes(db_session: Session, node_service: NodeService):
+    curriculum = Curriculum(title="Graph Curriculum")
+    db_session.add(curriculum)
+    db_session.commit()
+    cid = UUID(curriculum.curriculum_id)
+    nodes = [node_service.create_node(NodeCreate(title=title), cid) for title in ("Sets", "Functions", "Limits")]
+    return curriculum, nodes
+
+
+def test_graph_loads_in_one_query_and_is_cached(db_session: Session, node_service: NodeService, curriculum_nodes):
+    curriculum, (sets, functions, limits) = curriculum_nodes
+    node_service.create_node_link(limits.node_id, functions.node_id, "DEPENDS_ON")
+    node_service.create_node_link(functions.node_id, sets.node_id, "EXTENDS")
+    node_service.create_node_link(sets.node_id, limits.node_id, "REFERENCE")  # not a prerequisite
+    cid, expected = curriculum.curriculum_id, [sets.node_id, functions.node_id, limits.node_id]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        service = DependencyGraphService(db_session)
+        order = service.learning_order(cid)
+        service.prerequisites(cid, expected[-1])
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert order == expected
+    assert len(statements) == 1
+
+
+def test_create_node_link_rejects_prerequisite_cycle(node_service: NodeService, curriculum_nodes):
+    _, (sets, functions, limits) = curriculum_nodes
+    node_service.create_node_link(limits.node_id, functions.node_id, "DEPENDS_ON")
+    node_service.create_node_link(functions.node_id, sets.node_id, "DEPENDS_ON")
+
+    with pytest.raises(DependencyCycleError):
+        node_service.create_node_link(sets.node_id, limits.node_id, "DEPENDS_ON")
+
+    # Non-prerequisite relationships may point "backwards"
+    node_service.create_node_link(sets.node_id, limits.node_id, "RELATED")
+
+
+def test_graph_cache_follows_link_and_node_changes(db_session: Session, node_service: NodeService, curriculum_nodes):
+    curriculum, (sets, functions, limits) = curriculum_nodes
+    service = DependencyGraphService(db_session)
+    assert service.prerequisites(curriculum.curriculum_id, limits.node_id) == []
+
+    link = node_service.create_node_link(limits.node_id, sets.node_id, "DEPENDS_ON")
+    assert service.prerequisites(curriculum.curriculum_id, limits.node_id) == [sets.node_id]
+
+    node_service.delete_node_link(link.link_id)
+    assert service.prerequisites(curriculum.curriculum_id, limits.node_id) == []
+
+    node_service.create_node_link(limits.node_id, functions.node_id, "DEPENDS_ON")
+    node_service.delete_node(functions.node_id)
+    assert service.learning_order(curriculum.curriculum_id) == [sets.node_id, limits.node_id]
+
+
+def test_graph_loaded_across_an_invalidation_is_not_cached(db_session: Session, node_service: NodeService, curriculum_nodes, monkeypatch):
+    curriculum, (sets, _, limits) = curriculum_nodes
+    cid = curriculum.curriculum_id
+    service = DependencyGraphService(db_session)
+    invalidate_dependency_graph(cid)
+    load = service._load
+
+    def load_racing_a_link(curriculum_id):
+        graph = load(curriculum_id)
+        # Another request links the nodes after this load read the database
+        node_service.create_node_link(limits.node_id, sets.node_id, "DEPENDS_ON")
+        return graph
+
+    monkeypatch.setattr(service, "_load", load_racing_a_link)
+    assert service.prerequisites(cid, limits.node_id) == []
+
+    monkeypatch.setattr(service, "_load", load)
+    assert service.prerequisites(cid, limits.node_id) == [sets.node_id]
+
+
+def test_cycle_check_reads_links_the_cache_has_not_seen(db_session: Session, node_service: NodeService, curriculum_nodes):
+    curriculum, (sets, functions, _) = curriculum_nodes
+    assert DependencyGraphService(db_session).prerequisites(curriculum.curriculum_id, sets.node_id) == []
+
+    # Linked by another worker: this process's cached graph is not invalidated
+    db_session.add(NodeLink(
+        node_id=sets.node_id, link_type="NODE", linked_node_id=functions.node_id, link_relationship="DEPENDS_ON",
+    ))
+    db_session.commit()
+
+    with pytest.raises(DependencyCycleError):
+        node_service.create_node_link(functions.node_id, sets.node_id, "DEPENDS_ON")
+
+
+def test_cached_graph_expires_after_its_ttl(db_session: Session, curriculum_nodes, monkeypatch):
+    curriculum, (sets, functions, _) = curriculum_nodes
+    now = [1000.0]
+    monkeypatch.setattr(dependency_graph, "_clock", lambda: now[0])
+    monkeypatch.setattr(settings, "DEPENDENCY_GRAPH_CACHE_TTL_SECONDS", 60.0)
+    service = DependencyGraphService(db_session)
+    invalidate_dependency_graph(curriculum.curriculum_id)
+    assert service.prerequisites(curriculum.curriculum_id, functions.node_id) == []
+
+    # Linked by another worker: seen once the cached graph expires
+    db_session.add(NodeLink(
+        node_id=functions.node_id, link_type="NODE", linked_node_id=sets.node_id, link_relationship="DEPENDS_ON",
+    ))
+    db_session.commit()
+    now[0] += 59
+    assert service.prerequisites(curriculum.curriculum_id, functions.node_id) == []
+    now[0] += 1
+    assert service.prerequisites(curriculum.curriculum_id, functions.node_id) == [sets.node_id]
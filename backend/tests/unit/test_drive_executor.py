@@ -0,0 +1,67 @@
+import pytest
+
+from backend.app.services.drive_executor import DriveExecutor, TokenBucket, is_retryable
+from backend.tests.fakes.fake_drive import FakeDrive, http_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_throttles_to_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(7)]
+
+    assert waits[:5] == [0.0] * 5
+    assert waits[5] == pytest.approx(0.1) and waits[6] == pytest.approx(0.1)
+    clock.now += 10
+    assert bucket.acquire() == 0.0  # refilled, capped at capacity
+
+
+def test_retryable_errors():
+    assert is_retryable(http_error(429, "rateLimitExceeded"))
+    assert is_retryable(http_error(503, "backendError"))
+    assert is_retryable(http_error(403, "userRateLimitExceeded"))
+    assert not is_retryable(http_error(403, "insufficientPermissions"))
+    assert not is_retryable(http_error(404, "notFound"))
+
+
+def test_call_backs_off_exponentially_then_succeeds():
+    sleeps = []
+    executor = DriveExecutor(max_workers=1, requests_per_second=1000, backoff_base=0.5, sleep=sleeps.append)
+    drive = FakeDrive()
+    drive.fail_next(429, "rateLimitExceeded", times=2)
+    drive.fail_next(500, "backendError")
+
+    token = executor.call(drive.changes().getStartPageToken())
+
+    assert token["startPageToken"] == "1"
+    assert drive.call_count() == 4 and executor.retries == 3
+    # 0.5, 1, 2 seconds plus up to backoff_base of jitter
+    for attempt, delay in enumerate(sleeps):
+        assert 0.5 * 2 ** attempt <= delay <= 0.5 * 2 ** attempt + 0.5
+
+
+def test_call_gives_up_on_permanent_errors_and_after_max_retries():
+    executor = DriveExecutor(max_workers=1, requests_per_second=1000, max_retries=2, sleep=lambda _: None)
+    drive = FakeDrive()
+
+    with pytest.raises(Exception) as exc_info:
+        executor.call(drive.files().get(fileId="missing"))
+    assert exc_info.value.resp.status == 404 and drive.call_count() == 1
+
+    drive.fail_next(503, "backendError", times=5)
+    with pytest.raises(Exception) as exc_info:
+        executor.call(drive.changes().getStartPageToken())
+    assert exc_info.value.resp.status == 503 and drive.call_count() == 4
@@ -0,0 +1,467 @@
+"""
+Sync tests against the in-memory fake Drive (tests/fakes/fake_drive.py).
+
+These run the real SyncService and GoogleDriveService code paths with a real
+database session; only the Drive HTTP transport is replaced.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, UTC, timedelta
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node
+from backend.app.models.sync_metadata import CurriculumDriveFolder, SyncMetadata
+from backend.app.api.v1.endpoints.sync import get_sync_dependencies
+from backend.app.main import app
+from backend.app.schemas.node import NodeCreate, NodeUpdate
+from backend.app.services.dependency_graph import DependencyGraphService
+from backend.app.services.drive_executor import DriveExecutor
+from backend.app.services.google_drive_service import GoogleDriveService
+from backend.app.services.node_service import NodeService
+from backend.app.services.sync_service import SyncService
+from backend.tests.fakes.fake_drive import FakeDrive
+
+
+@pytest.fixture
+def fake_drive():
+    return FakeDrive()
+
+
+def _sync_service(db_session: Session, fake_drive: FakeDrive, max_workers: int = 8) -> SyncService:
+    executor = DriveExecutor(max_workers=max_workers, requests_per_second=10_000, sleep=lambda _: None)
+    drive_service = GoogleDriveService(use_service_account=False, executor=executor)
+    drive_service.service = fake_drive
+    return SyncService(db_session, drive_service)
+
+
+@pytest.fixture
+def sync_service(db_session: Session, fake_drive: FakeDrive):
+    return _sync_service(db_session, fake_drive)
+
+
+@pytest.fixture
+def synced_curriculum(db_session: Session, fake_drive: FakeDrive):
+    curriculum = Curriculum(title="Drive Curriculum")
+    db_session.add(curriculum)
+    db_session.commit()
+    node_service = NodeService(db_session)
+    nodes = [node_service.create_node(NodeCreate(title=f"Node {i}"), UUID(curriculum.curriculum_id)) for i in range(3)]
+    folder = CurriculumDriveFolder(
+        curriculum_id=curriculum.curriculum_id,
+        google_drive_folder_id=fake_drive.add_folder("Drive Curriculum"),
+    )
+    db_session.add(folder)
+    db_session.commit()
+    return curriculum, folder, nodes
+
+
+def _file_id(db_session: Session, node_id: str) -> str:
+    return db_session.query(SyncMetadata).filter(SyncMetadata.node_id == node_id).one().google_drive_file_id
+
+
+@pytest.mark.asyncio
+async def test_unchanged_sync_costs_one_api_call(sync_service, fake_drive, synced_curriculum):
+    curriculum, folder, nodes = synced_curriculum
+
+    first = await sync_service.sync_curriculum(curriculum.curriculum_id)
+    assert first["mode"] == "full"
+    assert sorted(first["synced_nodes"]) == sorted(n.node_id for n in nodes)
+    assert folder.changes_page_token is not None
+    # The full listing reads modifiedTime from files.list; no per-file metadata calls
+    assert fake_drive.call_count("files.get") == 0
+
+    fake_drive.reset_calls()
+    second = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    assert second["mode"] == "incremental"
+    assert fake_drive.calls == ["changes.list"]
+    assert second["synced_count"] == second["updated_count"] == second["deleted_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_applies_remote_changes(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (edited, trashed, _) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    fake_drive.edit_file(_file_id(db_session, edited.node_id), {"id": edited.node_id, "title": "Edited on Drive"})
+    fake_drive.edit_file(_file_id(db_session, trashed.node_id), trashed=True)
+    added_id = "550e8400-e29b-41d4-a716-446655440099"
+    fake_drive.add_file(
+        f"node_{added_id}.json", folder.google_drive_folder_id,
+        {"id": added_id, "title": "Added on Drive", "content": "# Hello"},
+    )
+    fake_drive.add_file("elsewhere.json", fake_drive.add_folder("Other"), {"id": "x", "title": "Not ours"})
+
+    fake_drive.reset_calls()
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="down")
+
+    assert result["mode"] == "incremental"
+    assert result["updated_nodes"] == [edited.node_id]
+    assert result["synced_nodes"] == [added_id]
+    assert result["deleted_nodes"] == [trashed.node_id]
+    # One changes.list plus one download per changed/added file
+    assert fake_drive.calls == ["changes.list", "files.get_media", "files.get_media"]
+
+    assert db_session.get(Node, edited.node_id).title == "Edited on Drive"
+    assert db_session.get(Node, trashed.node_id).deleted_at is not None
+    added = db_session.get(Node, added_id)
+    assert added.curriculum_id == curriculum.curriculum_id and added.content.markdown_content == "# Hello"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_neither_uploaded_nor_downloaded(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, _, (touched, edited, renamed) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    meta = db_session.query(SyncMetadata).filter_by(node_id=edited.node_id).one()
+    assert meta.drive_md5 == fake_drive.files_by_id[meta.google_drive_file_id]["md5Checksum"]
+
+    # Only the timestamp moves on one node; the other gets a real edit
+    touched.updated_at = datetime.now(UTC) + timedelta(seconds=1)
+    edited.title = "Edited locally"
+    db_session.commit()
+    fake_drive.reset_calls()
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="up")
+
+    assert fake_drive.calls == ["files.update"]
+    assert result["updated_nodes"] == [edited.node_id]
+    assert result["unchanged_nodes"] == [touched.node_id]
+    assert fake_drive.read_json(_file_id(db_session, edited.node_id))["title"] == "Edited locally"
+
+    # A rename on Drive bumps modifiedTime but leaves md5Checksum alone
+    fake_drive.edit_file(_file_id(db_session, renamed.node_id), name="renamed.json")
+    fake_drive.reset_calls()
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="down")
+
+    assert fake_drive.calls == ["changes.list"]
+    assert result["updated_count"] == result["conflict_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_changes_token_falls_back_to_full_listing(sync_service, fake_drive, synced_curriculum):
+    curriculum, folder, _ = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    folder.changes_page_token = "999999"
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    assert result["mode"] == "full"
+    assert folder.changes_page_token == str(len(fake_drive.change_log) + 1)
+
+
+@pytest.fixture
+def large_curriculum(db_session: Session, fake_drive: FakeDrive):
+    curriculum = Curriculum(title="Large Curriculum")
+    db_session.add(curriculum)
+    db_session.flush()
+    db_session.add_all([
+        Node(curriculum_id=curriculum.curriculum_id, title=f"Node {i}", order_index=i) for i in range(40)
+    ])
+    db_session.add(CurriculumDriveFolder(
+        curriculum_id=curriculum.curriculum_id,
+        google_drive_folder_id=fake_drive.add_folder("Large Curriculum"),
+    ))
+    db_session.commit()
+    return curriculum
+
+
+@pytest.mark.asyncio
+async def test_full_listing_follows_every_page(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, nodes = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    added = [f"550e8400-e29b-41d4-a716-{i:012d}" for i in range(2100)]
+    for node_id in added:
+        fake_drive.add_file(f"node_{node_id}.json", folder.google_drive_folder_id, {"id": node_id})
+    folder.changes_page_token = None
+    db_session.commit()
+
+    fake_drive.reset_calls()
+    plan = await sync_service.plan_sync(curriculum.curriculum_id, direction="down")
+
+    # 2103 files at Drive's maximum page size of 1000
+    assert fake_drive.call_count("files.list") == 3
+    assert len(plan.download_creates) == len(added)
+    assert plan.local_deletes == []
+
+
+@pytest.mark.asyncio
+async def test_uploads_run_concurrently_without_blocking_the_event_loop(db_session: Session, large_curriculum):
+    fake_drive = FakeDrive(latency=0.01)
+    folder = db_session.query(CurriculumDriveFolder).filter_by(curriculum_id=large_curriculum.curriculum_id).one()
+    folder.google_drive_folder_id = fake_drive.add_folder("Large Curriculum")
+    sync_service = _sync_service(db_session, fake_drive, max_workers=8)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        result = await sync_service.sync_curriculum(large_curriculum.curriculum_id, direction="up")
+    finally:
+        ticker_task.cancel()
+
+    assert result["synced_count"] == 40 and result["error_count"] == 0
+    assert 1 < fake_drive.max_in_flight <= 8
+    # 40 uploads at 10ms each: the loop kept running while they were in flight
+    assert ticks >= 5
+    # Results are recorded in node order regardless of completion order
+    ordered = [n.node_id for n in db_session.query(Node).filter_by(curriculum_id=large_curriculum.curriculum_id).order_by(Node.order_index)]
+    assert result["synced_nodes"] == ordered
+
+
+@pytest.mark.asyncio
+async def test_failed_uploads_are_reported_and_retried_next_sync(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, _, nodes = synced_curriculum
+    fake_drive.fail_next(404, "notFound", method="files.create")
+
+    first = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="up")
+    assert first["synced_count"] == 2 and first["error_count"] == 1
+
+    second = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="up")
+    assert second["synced_count"] == 1 and second["error_count"] == 0
+    assert db_session.query(SyncMetadata).filter_by(curriculum_id=curriculum.curriculum_id).count() == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_downloads_are_retried_next_sync(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (edited, *_) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    token = folder.changes_page_token
+
+    fake_drive.edit_file(_file_id(db_session, edited.node_id), {"id": edited.node_id, "title": "Edited on Drive"})
+    added_id = "550e8400-e29b-41d4-a716-446655440099"
+    fake_drive.add_file(
+        f"node_{added_id}.json", folder.google_drive_folder_id, {"id": added_id, "title": "Added on Drive"},
+    )
+    fake_drive.fail_next(404, "notFound", method="files.get_media")
+
+    first = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="down")
+    assert first["error_count"] == 1
+    assert first["updated_count"] + first["synced_count"] == 1
+    assert folder.changes_page_token == token
+
+    second = await sync_service.sync_curriculum(curriculum.curriculum_id, direction="down")
+
+    assert second["error_count"] == 0
+    assert second["updated_count"] + second["synced_count"] == 1
+    assert folder.changes_page_token != token
+    assert db_session.get(Node, edited.node_id).title == "Edited on Drive"
+    assert db_session.get(Node, added_id).title == "Added on Drive"
+
+
+@pytest.mark.asyncio
+async def test_file_untrashed_on_drive_restores_its_node(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, _, (restored, *_) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    file_id = _file_id(db_session, restored.node_id)
+
+    fake_drive.edit_file(file_id, trashed=True)
+    trashed = await sync_service.sync_curriculum(curriculum.curriculum_id)
+    assert trashed["deleted_nodes"] == [restored.node_id]
+
+    fake_drive.edit_file(file_id, {"id": restored.node_id, "title": "Back from the trash"}, trashed=False)
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    assert result["synced_nodes"] == [restored.node_id] and result["error_count"] == 0
+    node = db_session.get(Node, restored.node_id)
+    assert node.deleted_at is None and node.title == "Back from the trash"
+    assert _file_id(db_session, restored.node_id) == file_id
+
+    # The next run starts from the saved token and finds nothing to do
+    fake_drive.reset_calls()
+    assert (await sync_service.sync_curriculum(curriculum.curriculum_id))["synced_count"] == 0
+    assert fake_drive.calls == ["changes.list"]
+
+
+@pytest.mark.asyncio
+async def test_synced_deletes_and_restores_reach_the_cached_dependency_graph(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, _, (node, *_) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    file_id = _file_id(db_session, node.node_id)
+    graph_service = DependencyGraphService(db_session)
+    assert node.node_id in graph_service.learning_order(curriculum.curriculum_id)
+
+    fake_drive.edit_file(file_id, trashed=True)
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    assert node.node_id not in graph_service.learning_order(curriculum.curriculum_id)
+
+    fake_drive.edit_file(file_id, trashed=False)
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    assert node.node_id in graph_service.learning_order(curriculum.curriculum_id)
+
+
+@pytest.mark.asyncio
+async def test_drive_copy_of_a_tracked_file_is_skipped(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (original, *_) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    content = fake_drive.read_json(_file_id(db_session, original.node_id))
+    # Known from its name before downloading, or from its JSON after
+    same_name_id = fake_drive.add_file(f"node_{original.node_id}.json", folder.google_drive_folder_id, content)
+    copy_id = fake_drive.add_file(f"Copy of node_{original.node_id}.json", folder.google_drive_folder_id, content)
+    original.title = "Edited locally"
+    db_session.commit()
+
+    fake_drive.reset_calls()
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    assert result["error_count"] == 0 and result["synced_count"] == 0
+    assert result["conflicts"] == [
+        {"node_id": original.node_id, "file_id": file_id, "resolution": "duplicate_file_skipped"}
+        for file_id in (same_name_id, copy_id)
+    ]
+    assert fake_drive.call_count("files.get_media") == 1
+    # Local edits still go up, to the tracked file
+    assert result["updated_nodes"] == [original.node_id]
+    assert fake_drive.read_json(_file_id(db_session, original.node_id))["title"] == "Edited locally"
+
+
+@pytest.mark.asyncio
+async def test_a_file_that_cannot_be_stored_does_not_stop_the_sync(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (edited, *_) = synced_curriculum
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    bad_id = "550e8400-e29b-41d4-a716-446655440098"
+    good_id = "550e8400-e29b-41d4-a716-446655440099"
+    bad_file = fake_drive.add_file(f"node_{bad_id}.json", folder.google_drive_folder_id, {"id": bad_id, "title": None})
+    fake_drive.add_file(f"node_{good_id}.json", folder.google_drive_folder_id, {"id": good_id, "title": "Fine"})
+    edited.title = "Edited locally"
+    db_session.commit()
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    assert [error["file_id"] for error in result["errors"]] == [bad_file]
+    assert result["synced_nodes"] == [good_id] and result["updated_nodes"] == [edited.node_id]
+    assert db_session.get(Node, bad_id) is None
+
+
+@pytest.mark.asyncio
+async def test_full_sync_adopts_existing_files_without_probing(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (adopted, *_) = synced_curriculum
+    existing = fake_drive.add_file(f"node_{adopted.node_id}.json", folder.google_drive_folder_id, {"id": adopted.node_id})
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+
+    # The folder listing is the only files.list; no per-node existence probes
+    assert fake_drive.call_count("files.list") == 1
+    assert fake_drive.call_count("batch") == 0
+    assert fake_drive.call_count("files.create") == 2
+    assert result["synced_count"] == 3 and result["error_count"] == 0
+    assert _file_id(db_session, adopted.node_id) == existing
+    assert fake_drive.read_json(existing)["title"] == adopted.title
+
+
+@pytest.mark.asyncio
+async def test_probes_and_trashes_go_out_in_batches(db_session: Session, fake_drive, large_curriculum):
+    sync_service = _sync_service(db_session, fake_drive)
+    cid = large_curriculum.curriculum_id
+
+    await sync_service.sync_curriculum(cid, direction="up")
+    # Without a listing, the 40 creates are looked up in a single batch
+    assert fake_drive.calls.count("batch") == 1
+    assert fake_drive.batched_calls == ["files.list"] * 40
+    assert fake_drive.call_count("files.list") == 0
+
+    fake_drive.reset_calls()
+    for node in db_session.query(Node).filter_by(curriculum_id=cid):
+        node.deleted_at = datetime.now(UTC)
+    db_session.commit()
+    fake_drive.fail_next(429, "rateLimitExceeded", method="files.update", times=3)
+
+    result = await sync_service.sync_curriculum(cid, direction="up")
+
+    # One batch of 40 trashes, then one retry batch for the rate-limited ones
+    assert fake_drive.calls == ["batch", "batch"]
+    assert fake_drive.batched_calls == ["files.update"] * 43
+    assert result["error_count"] == 0
+    assert db_session.query(SyncMetadata).filter_by(curriculum_id=cid).count() == 0
+    assert all(f["trashed"] for f in fake_drive.files_by_id.values() if f["mimeType"] != "application/vnd.google-apps.folder")
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_drive_sub_request_limit(fake_drive):
+    executor = DriveExecutor(requests_per_second=10_000, sleep=lambda _: None)
+    drive_service = GoogleDriveService(use_service_account=False, executor=executor)
+    drive_service.service = fake_drive
+    folder_id = fake_drive.add_folder("Folder")
+    file_ids = [fake_drive.add_file(f"node_{i}.json", folder_id, {}) for i in range(250)]
+
+    errors = await drive_service.trash_files(file_ids + ["missing"])
+
+    assert fake_drive.calls == ["batch"] * 3
+    assert errors == {file_id: None for file_id in file_ids + ["missing"]}
+
+
+@pytest.mark.asyncio
+async def test_plan_covers_every_action_with_constant_queries(sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, (local_edit, remote_edit, both_edit) = synced_curriculum
+    node_service = NodeService(db_session)
+    extra = [node_service.create_node(NodeCreate(title=f"Extra {i}"), UUID(curriculum.curriculum_id)) for i in range(2)]
+    await sync_service.sync_curriculum(curriculum.curriculum_id)
+    local_delete, remote_delete = extra
+
+    later = datetime.now(UTC) + timedelta(seconds=1)
+    for node in (local_edit, both_edit):
+        node_service.update_node(node.node_id, NodeUpdate(title=f"{node.title} (local)"))
+        db_session.get(Node, node.node_id).updated_at = later
+    for node in (remote_edit, both_edit):
+        fake_drive.edit_file(_file_id(db_session, node.node_id), {"id": node.node_id, "title": "remote"})
+    fake_drive.edit_file(_file_id(db_session, remote_delete.node_id), trashed=True)
+    node_service.delete_node(local_delete.node_id)
+    new_local = node_service.create_node(NodeCreate(title="New local"), UUID(curriculum.curriculum_id))
+    new_remote = fake_drive.add_file("node_new.json", folder.google_drive_folder_id, {"id": "new", "title": "New remote"})
+    db_session.commit()
+    cid = curriculum.curriculum_id
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    fake_drive.reset_calls()
+    try:
+        plan = await sync_service.plan_sync(cid)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert plan.mode == "incremental"
+    assert plan.upload_creates == [new_local.node_id]
+    assert plan.upload_updates == [local_edit.node_id]
+    assert plan.remote_trashes == [local_delete.node_id]
+    assert plan.download_creates == [new_remote]
+    assert plan.download_updates == [_file_id(db_session, remote_edit.node_id)]
+    assert plan.local_deletes == [remote_delete.node_id]
+    assert plan.conflicts == [both_edit.node_id]
+    # Folder mapping, sync metadata and node state: three queries regardless of size
+    assert len(statements) == 3
+    # A dry run only reads the changes feed
+    assert fake_drive.calls == ["changes.list"]
+
+    result = await sync_service.sync_curriculum(curriculum.curriculum_id)
+    assert result["conflict_count"] == 1 and result["error_count"] == 0
+    assert fake_drive.files_by_id[_file_id(db_session, local_edit.node_id)]["trashed"] is False
+    assert (await sync_service.plan_sync(curriculum.curriculum_id)).is_empty
+
+
+def test_plan_endpoint_is_a_dry_run(client, sync_service, fake_drive, db_session: Session, synced_curriculum):
+    curriculum, folder, nodes = synced_curriculum
+    app.dependency_overrides[get_sync_dependencies] = lambda: (sync_service, None)
+
+    response = client.get("/api/v1/sync/plan", params={"curriculum_id": curriculum.curriculum_id})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mode"] == "full"
+    assert sorted(body["upload_creates"]) == sorted(n.node_id for n in nodes)
+    assert body["counts"]["upload_creates"] == 3
+    assert fake_drive.call_count("files.create") == 0
+    assert db_session.query(SyncMetadata).count() == 0
+
+    missing = client.get("/api/v1/sync/plan", params={"curriculum_id": "no-such-curriculum"})
+    assert missing.status_code == 404
@@ -142,6 +142,20 @@ def test_get_nodes_by_curriculum(node_service: NodeService, test_curriculum):
     assert nodes[0].title == "Node 1"
     assert nodes[1].title == "Node 2"
 
+def test_get_nodes_page_walks_keyset(node_service: NodeService, test_curriculum):
+    """Test keyset pagination over a curriculum's nodes ordered by order_index."""
+    for i in range(5):
+        node_service.db.add(Node(curriculum_id=test_curriculum.curriculum_id, title=f"Node {i}", order_index=4 - i))
+    node_service.db.commit()
+
+    first = node_service.get_nodes_page(UUID(test_curriculum.curriculum_id), limit=3, include_total=True)
+    second = node_service.get_nodes_page(UUID(test_curriculum.curriculum_id), limit=3, cursor=first["next_cursor"])
+
+    assert [n.title for n in first["items"]] == ["Node 4", "Node 3", "Node 2"]
+    assert first["total_estimate"] == 5
+    assert [n.title for n in second["items"]] == ["Node 1", "Node 0"]
+    assert second["next_cursor"] is None
+
 def test_update_node(node_service: NodeService, test_curriculum):
     """Test updating a node."""
     node = Node(
@@ -5,13 +5,18 @@ Tests OAuth token verification, user info extraction, and URL generation.
 """
 
 import os
+import threading
+import time
+import httpx
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from backend.app.auth.google_keys import GoogleKeySet, cache_lifetime
 from backend.app.auth.oauth_handler import (
     GoogleOAuthHandler,
     OAuthError,
     InvalidOAuthTokenError,
 )
+from backend.tests.fakes.fake_google_jwks import FakeGoogleJWKS
 
 
 class TestGoogleOAuthHandlerInitialization:
@@ -39,7 +44,7 @@ class TestGoogleOAuthHandlerInitialization:
 class TestVerifyIdToken:
     """Test ID token verification"""
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_id_token_success(self, mock_verify, monkeypatch):
         """Test successful ID token verification"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -51,6 +56,7 @@ class TestVerifyIdToken:
             "picture": "https://example.com/photo.jpg",
             "email_verified": True,
             "aud": "test-client-id",
+            "iss": "https://accounts.google.com",
         }
         mock_verify.return_value = mock_payload
 
@@ -60,7 +66,7 @@ class TestVerifyIdToken:
         assert result == mock_payload
         mock_verify.assert_called_once()
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_id_token_invalid_audience(self, mock_verify, monkeypatch):
         """Test that invalid audience raises InvalidOAuthTokenError"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -78,7 +84,7 @@ class TestVerifyIdToken:
             handler.verify_id_token("test-id-token")
         assert "audience" in str(exc_info.value).lower()
 
-    @patch("backend.app.auth.oauth_handler.id_token.verify_oauth2_token")
+    @patch("backend.app.auth.oauth_handler.google_jwt.decode")
     def test_verify_id_token_invalid_signature(self, mock_verify, monkeypatch):
         """Test that invalid signature raises InvalidOAuthTokenError"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
@@ -220,8 +226,9 @@ class TestGetAuthorizationUrl:
 class TestExchangeCodeForToken:
     """Test authorization code to token exchange"""
 
-    @patch("backend.app.auth.oauth_handler.httpx.post")
-    def test_exchange_code_for_token_success(self, mock_post, monkeypatch):
+    @pytest.mark.asyncio
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_exchange_code_for_token_success(self, mock_post, monkeypatch):
         """Test successful code to token exchange"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test-secret")
@@ -237,7 +244,7 @@ class TestExchangeCodeForToken:
         mock_post.return_value = mock_response
 
         handler = GoogleOAuthHandler()
-        result = handler.exchange_code_for_token(
+        result = await handler.exchange_code_for_token(
             code="auth-code-123",
             redirect_uri="http://localhost:3000/callback"
         )
@@ -246,8 +253,9 @@ class TestExchangeCodeForToken:
         assert result["id_token"] == "id-token-123"
         mock_post.assert_called_once()
 
-    @patch("backend.app.auth.oauth_handler.httpx.post")
-    def test_exchange_code_for_token_failure(self, mock_post, monkeypatch):
+    @pytest.mark.asyncio
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_exchange_code_for_token_failure(self, mock_post, monkeypatch):
         """Test failed code to token exchange"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test-secret")
@@ -260,13 +268,14 @@ class TestExchangeCodeForToken:
         handler = GoogleOAuthHandler()
 
         with pytest.raises(InvalidOAuthTokenError) as exc_info:
-            handler.exchange_code_for_token(
+            await handler.exchange_code_for_token(
                 code="invalid-code",
                 redirect_uri="http://localhost:3000/callback"
             )
         assert "failed" in str(exc_info.value).lower()
 
-    def test_exchange_code_without_client_secret(self, monkeypatch):
+    @pytest.mark.asyncio
+    async def test_exchange_code_without_client_secret(self, monkeypatch):
         """Test that missing client secret raises OAuthError"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
         monkeypatch.delenv("GOOGLE_OAUTH_CLIENT_SECRET", raising=False)
@@ -274,14 +283,15 @@ class TestExchangeCodeForToken:
         handler = GoogleOAuthHandler()
 
         with pytest.raises(OAuthError) as exc_info:
-            handler.exchange_code_for_token(
+            await handler.exchange_code_for_token(
                 code="auth-code-123",
                 redirect_uri="http://localhost:3000/callback"
             )
         assert "CLIENT_SECRET" in str(exc_info.value)
 
-    @patch("backend.app.auth.oauth_handler.httpx.post")
-    def test_exchange_code_network_error(self, mock_post, monkeypatch):
+    @pytest.mark.asyncio
+    @patch("backend.app.auth.oauth_handler.httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_exchange_code_network_error(self, mock_post, monkeypatch):
         """Test handling of network errors during token exchange"""
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test-client-id")
         monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test-secret")
@@ -292,8 +302,129 @@ class TestExchangeCodeForToken:
         handler = GoogleOAuthHandler()
 
         with pytest.raises(OAuthError) as exc_info:
-            handler.exchange_code_for_token(
+            await handler.exchange_code_for_token(
                 code="auth-code-123",
                 redirect_uri="http://localhost:3000/callback"
             )
         assert "failed" in str(exc_info.value).lower()
+
+
+class TestGoogleKeyCache:
+    """Test local ID token verification against cached Google signing keys"""
+
+    @pytest.fixture
+    def jwks(self):
+        return FakeGoogleJWKS(max_age=1000)
+
+    @pytest.fixture
+    def clock(self):
+        return [0.0]
+
+    @pytest.fixture
+    def handler(self, jwks, clock):
+        key_set = GoogleKeySet(transport=jwks.transport, clock=lambda: clock[0])
+        return GoogleOAuthHandler(google_client_id="test-client-id", key_set=key_set)
+
+    def test_keys_are_fetched_once_per_max_age(self, handler, jwks, clock):
+        """Test that sign-ins within max-age verify without fetching keys"""
+        for _ in range(3):
+            payload = handler.verify_id_token(jwks.id_token("test-client-id", email="a@example.com"))
+        assert payload["email"] == "a@example.com"
+        assert jwks.requests == 1
+
+        clock[0] = 1001
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        assert jwks.requests == 2
+
+    def test_keys_refresh_in_background_before_expiry(self, handler, jwks, clock):
+        """Test that a nearly expired key set is refreshed without blocking verification"""
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        clock[0] = 900
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+
+        deadline = time.monotonic() + 5
+        while handler.key_set.fetch_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert handler.key_set.fetch_count == 2
+
+    def test_rotated_key_triggers_refetch(self, handler, jwks, clock):
+        """Test that an unknown key id refetches the key set (rate limited)"""
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        jwks.rotate("test-key-2")
+
+        with pytest.raises(InvalidOAuthTokenError):
+            handler.verify_id_token(jwks.id_token("test-client-id"))
+        assert jwks.requests == 1
+
+        clock[0] = GoogleKeySet.MIN_REFETCH_SECONDS
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        assert jwks.requests == 2
+
+    def test_stale_keys_are_used_when_refresh_fails(self, handler, jwks, clock):
+        """Test that an unreachable key endpoint does not break sign-in once keys are cached"""
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        jwks.fail = True
+        clock[0] = 2000
+
+        handler.verify_id_token(jwks.id_token("test-client-id"))
+        assert jwks.requests == 2
+
+    def test_forged_and_foreign_tokens_are_rejected(self, handler, jwks):
+        """Test that bad signatures, audiences and issuers fail verification"""
+        token = jwks.id_token("test-client-id")
+        header, payload, signature = token.split(".")
+        forged = ".".join([header, jwks.id_token("test-client-id", sub="someone-else").split(".")[1], signature])
+
+        for bad in (
+            forged,
+            jwks.id_token("other-client-id"),
+            jwks.id_token("test-client-id", iss="https://evil.example.com"),
+            jwks.id_token("test-client-id", exp=int(time.time()) - 3600),
+        ):
+            with pytest.raises(InvalidOAuthTokenError):
+                handler.verify_id_token(bad)
+
+    @pytest.mark.asyncio
+    async def test_async_verification_fetches_keys_off_the_event_loop(self, jwks):
+        """Test that a cold-cache key fetch does not block the event loop thread"""
+        fetch_threads = []
+
+        class RecordingTransport(httpx.BaseTransport):
+            def handle_request(self, request: httpx.Request) -> httpx.Response:
+                fetch_threads.append(threading.get_ident())
+                return jwks.transport.handle_request(request)
+
+        key_set = GoogleKeySet(transport=RecordingTransport())
+        handler = GoogleOAuthHandler(google_client_id="test-client-id", key_set=key_set)
+
+        payload = await handler.verify_id_token_async(jwks.id_token("test-client-id", email="a@example.com"))
+
+        assert payload["email"] == "a@example.com"
+        assert len(fetch_threads) == 1 and fetch_threads[0] != threading.get_ident()
+
+    def test_cache_lifetime_honours_max_age_and_age(self):
+        """Test Cache-Control parsing"""
+        assert cache_lifetime(httpx.Headers({"Cache-Control": "public, max-age=19937"}), 60) == 19937
+        assert cache_lifetime(httpx.Headers({"Cache-Control": "max-age=100", "Age": "30"}), 60) == 70
+        assert cache_lifetime(httpx.Headers({"Cache-Control": "no-cache"}), 60) == 60
+
+    @pytest.mark.asyncio
+    async def test_code_exchange_reuses_pooled_client(self, monkeypatch):
+        """Test that code exchanges share one async client"""
+        monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test-secret")
+        exchanged = []
+
+        def token_endpoint(request: httpx.Request) -> httpx.Response:
+            exchanged.append(dict(httpx.QueryParams(request.content.decode())))
+            return httpx.Response(200, json={"access_token": "a", "id_token": "i"})
+
+        handler = GoogleOAuthHandler("test-client-id", transport=httpx.MockTransport(token_endpoint))
+        for code in ("code-1", "code-2"):
+            result = await handler.exchange_code_for_token(code=code, redirect_uri="http://localhost/cb")
+        client = handler._http
+        await handler.exchange_code_for_token(code="code-3", redirect_uri="http://localhost/cb")
+        assert handler._http is client
+        await handler.aclose()
+
+        assert result["id_token"] == "i"
+        assert [params["code"] for params in exchanged] == ["code-1", "code-2", "code-3"]
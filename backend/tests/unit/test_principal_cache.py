@@ -0,0 +1,122 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.auth import principal_cache
+from backend.app.auth.jwt_handler import JWTHandler
+from backend.app.auth.password_handler import PasswordHandler
+from backend.app.auth.principal_cache import Principal, PrincipalCache
+from backend.app.core.dependencies import get_current_user
+from backend.app.services.auth_service import AuthService
+
+PASSWORD = "Secret-Passw0rd!"
+
+
+class CountingJWTHandler(JWTHandler):
+    def __init__(self):
+        super().__init__(secret_key="test-secret")
+        self.verified = 0
+
+    def verify_access_token(self, token: str) -> dict:
+        self.verified += 1
+        return super().verify_access_token(token)
+
+
+@pytest.fixture
+def cache(monkeypatch) -> PrincipalCache:
+    cache = PrincipalCache(ttl_seconds=60, max_entries=100)
+    monkeypatch.setattr(principal_cache, "_principal_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def jwt_handler() -> CountingJWTHandler:
+    return CountingJWTHandler()
+
+
+@pytest.fixture
+def auth_service(async_db_session: AsyncSession, jwt_handler: JWTHandler) -> AuthService:
+    return AuthService(async_db_session, jwt_handler, PasswordHandler(rounds=4, pool="inline"))
+
+
+@pytest.fixture
+def queries(async_db_session: AsyncSession):
+    statements = []
+    event.listen(async_db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def _bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def _authenticate(token, async_db_session, jwt_handler, cache) -> Principal:
+    return await get_current_user(_bearer(token), async_db_session, jwt_handler, cache)
+
+
+@pytest.mark.asyncio
+async def test_hot_token_skips_verification_and_query(auth_service, async_db_session, jwt_handler, cache, queries):
+    user, access_token, _ = await auth_service.register("hot@example.com", "Hot", PASSWORD)
+
+    first = await _authenticate(access_token, async_db_session, jwt_handler, cache)
+    verified, queried = jwt_handler.verified, len(queries)
+    second = await _authenticate(access_token, async_db_session, jwt_handler, cache)
+
+    assert first == second == Principal(user.user_id, "hot@example.com", "Hot", user.role, True)
+    assert (jwt_handler.verified, len(queries)) == (verified, queried)
+
+
+@pytest.mark.asyncio
+async def test_password_change_and_logout_all_invalidate(auth_service, async_db_session, jwt_handler, cache):
+    user, access_token, _ = await auth_service.register("rotate@example.com", "Rotate", PASSWORD)
+    await _authenticate(access_token, async_db_session, jwt_handler, cache)
+
+    await auth_service.change_password(user.user_id, PASSWORD, "Another-Passw0rd!")
+    assert cache.get_principal(user.user_id) is None
+    assert cache.get_claims(access_token) is None
+
+    await _authenticate(access_token, async_db_session, jwt_handler, cache)
+    await auth_service.logout(user.user_id)
+    assert cache.get_principal(user.user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_rejected_at_once(auth_service, async_db_session, jwt_handler, cache):
+    user, access_token, _ = await auth_service.register("leaver@example.com", "Leaver", PASSWORD)
+    await _authenticate(access_token, async_db_session, jwt_handler, cache)
+
+    user.is_active = False
+    await async_db_session.commit()
+
+    with pytest.raises(HTTPException) as excinfo:
+        await _authenticate(access_token, async_db_session, jwt_handler, cache)
+    assert excinfo.value.status_code == 403
+
+
+def test_entries_expire_and_are_bounded():
+    now = [1000.0]
+    cache = PrincipalCache(ttl_seconds=30, max_entries=2, clock=lambda: now[0])
+
+    cache.put_claims("short-lived", {"sub": "u1", "exp": 1010})
+    cache.put_claims("expired", {"sub": "u1", "exp": 999})
+    for user_id in ("u1", "u2", "u3"):
+        cache.put_principal(Principal(user_id, f"{user_id}@example.com", user_id, "user", True))
+
+    assert cache.get_claims("expired") is None
+    assert cache.get_principal("u1") is None  # Least recently used
+    now[0] = 1011
+    assert cache.get_claims("short-lived") is None  # Never outlives the token
+    assert cache.get_principal("u3") is not None
+    now[0] = 1031
+    assert cache.get_principal("u3") is None
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = PrincipalCache()
+    generation = cache.generation
+    cache.invalidate_user("u1")
+
+    cache.put_principal(Principal("u1", "u1@example.com", "u1", "user", True), generation)
+    assert cache.get_principal("u1") is None
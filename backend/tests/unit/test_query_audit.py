@@ -0,0 +1,140 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.app.db.query_audit import QueryAuditLog, QueryBudget, audit, fingerprint
+from backend.app.middleware.query_audit import QueryAuditMiddleware
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE nodes (node_id INTEGER PRIMARY KEY, parent_id INTEGER, title TEXT)"))
+        conn.execute(text("INSERT INTO nodes VALUES (1, NULL, 'root')"))
+        for node_id in range(2, 22):
+            conn.execute(text("INSERT INTO nodes VALUES (:id, 1, :title)"), {"id": node_id, "title": f"n{node_id}"})
+    yield engine
+    engine.dispose()
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM nodes WHERE node_id = 42 AND title = 'it''s'") == (
+        "SELECT * FROM nodes WHERE node_id = ? AND title = ?"
+    )
+    assert fingerprint("SELECT * FROM nodes\n  WHERE parent_id = %(parent_id_1)s") == (
+        "SELECT * FROM nodes WHERE parent_id = ?"
+    )
+    assert fingerprint("DELETE FROM nodes WHERE node_id IN (?, ?, ?)") == fingerprint(
+        "DELETE FROM nodes WHERE node_id IN ($1, $2)"
+    )
+    # Digits inside identifiers are not literals
+    assert fingerprint("SELECT t1.col2 FROM t1") == "SELECT t1.col2 FROM t1"
+
+
+def test_per_row_queries_are_flagged_and_batched_ones_pass(engine):
+    log = QueryAuditLog()
+    budget = QueryBudget(max_repeats=5)
+
+    with audit("per_row", budget, log) as per_row, engine.connect() as conn:
+        for node_id in range(2, 22):
+            conn.execute(text("SELECT title FROM nodes WHERE node_id = :id"), {"id": node_id})
+    with audit("batched", budget, log) as batched, engine.connect() as conn:
+        conn.execute(
+            text("SELECT title FROM nodes WHERE node_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(range(2, 22))},
+        )
+
+    assert per_row.query_count == 20
+    assert per_row.violations == ["20 identical statements (limit 5)"]
+    assert batched.query_count == 1 and batched.violations == []
+
+    report = log.format_report()
+    assert report.startswith("Query audit: 1 unit(s) flagged, 2 audited")
+    assert "1. [flagged 1x] per_row: 20 statements" in report
+    assert "   20x" in report and "SELECT title FROM nodes WHERE node_id = ?" in report
+
+
+def test_statements_outside_a_unit_are_not_recorded(engine):
+    log = QueryAuditLog()
+    with audit("outer", QueryBudget(max_queries=1), log) as unit:
+        pass
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert unit.query_count == 0 and log.ranked() == []
+
+
+def test_report_ranks_units_by_database_time():
+    log = QueryAuditLog()
+    for name, seconds in (("fast", 0.2), ("slow", 0.9), ("fast", 0.1)):
+        with audit(name, QueryBudget(max_db_time_ms=50), log) as unit:
+            unit.record("SELECT 1", seconds)
+
+    assert [(unit.name, unit.db_seconds, flagged) for unit, flagged in log.ranked()] == [
+        ("slow", 0.9, 1), ("fast", 0.2, 2),
+    ]
+
+
+def test_middleware_names_units_by_route_template(engine):
+    log = QueryAuditLog()
+    app = FastAPI()
+
+    @app.get("/nodes/{node_id}/children")
+    def children(node_id: int):
+        with engine.connect() as conn:
+            ids = conn.execute(text("SELECT node_id FROM nodes WHERE parent_id = :id"), {"id": node_id}).scalars()
+            return [conn.execute(text("SELECT title FROM nodes WHERE node_id = :id"), {"id": i}).scalar() for i in ids]
+
+    app.add_middleware(QueryAuditMiddleware, budget=QueryBudget(max_repeats=10), log=log)
+    client = TestClient(app)
+    assert len(client.get("/nodes/1/children").json()) == 20
+    assert client.get("/nodes/5/children").json() == []
+
+    [(unit, flagged)] = log.ranked()
+    assert unit.name == "GET /nodes/{node_id}/children"
+    assert flagged == 1 and log.units_audited == 2
+
+
+def test_plugin_fails_tests_over_their_query_budget(tmp_path):
+    test_file = tmp_path / "test_budget.py"
+    test_file.write_text(textwrap.dedent("""
+        import pytest
+        from sqlalchemy import create_engine, text
+
+        engine = create_engine("sqlite://")
+
+        @pytest.mark.query_budget(max_repeats=3)
+        def test_per_row():
+            with engine.connect() as conn:
+                for i in range(5):
+                    conn.execute(text("SELECT :i"), {"i": i})
+
+        @pytest.mark.query_budget(max_repeats=3)
+        def test_batched():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1, 2, 3, 4, 5"))
+    """))
+    report_path = tmp_path / "report.txt"
+
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pytest", str(test_file), "-q", "-p", "no:cacheprovider",
+            "-p", "backend.tests.query_audit_plugin", f"--query-audit-report={report_path}",
+        ],
+        cwd=tmp_path, env={"PYTHONPATH": str(REPO_ROOT), "PATH": ""}, capture_output=True, text=True,
+    )
+
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "1 failed, 1 passed" in result.stdout
+    assert "Query budget exceeded by test_budget.py::test_per_row: 5 statements" in result.stdout
+    assert "test_budget.py::test_per_row" in report_path.read_text()
@@ -0,0 +1,148 @@
+"""
+Query-plan regression tests for hot node/link query paths.
+
+Each test runs a real service call, captures the SELECT/UPDATE statements it
+issues, re-runs them under EXPLAIN and fails if any of them reads ``nodes`` or
+``node_links`` with a full table scan.
+"""
+
+import json
+import re
+from contextlib import contextmanager
+from uuid import UUID
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node, NodeLink
+from backend.app.schemas.node import NodeCreate
+from backend.app.services.node_service import NodeService
+
+HOT_TABLES = ("nodes", "node_links")
+
+_SQLITE_SCAN = re.compile(r"^SCAN (TABLE )?(%s)\b" % "|".join(HOT_TABLES))
+
+
+@contextmanager
+def _captured_statements(db_session: Session):
+    """Collect (statement, parameters) for every statement touching a hot table."""
+    captured = []
+    connection = db_session.connection()
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        first_word = statement.lstrip().split(None, 1)[0].upper()
+        if not executemany and first_word in ("SELECT", "UPDATE") and any(t in statement for t in HOT_TABLES):
+            captured.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", _capture)
+    try:
+        yield captured
+    finally:
+        event.remove(connection, "before_cursor_execute", _capture)
+
+
+def _full_scans(db_session: Session, statement: str, parameters) -> list:
+    """Return the plan lines that scan a hot table without using an index."""
+    cursor = db_session.connection().connection.cursor()
+    dialect = db_session.get_bind().dialect.name
+    try:
+        if dialect == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            details = [row[-1] for row in cursor.fetchall()]
+            # "SEARCH" is an index seek; "SCAN" (with or without an index) reads every row
+            return [d for d in details if _SQLITE_SCAN.match(d)]
+        # PostgreSQL: with tiny test tables the planner prefers sequential scans,
+        # so disable them and check that an index path exists at all.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = cursor.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        scans, stack = [], [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                scans.append(f"Seq Scan on {node['Relation Name']}")
+            stack.extend(node.get("Plans", []))
+        return scans
+    finally:
+        cursor.close()
+
+
+def _assert_indexed(db_session: Session, captured: list):
+    assert captured, "expected the call to query nodes/node_links"
+    for statement, parameters in captured:
+        scans = _full_scans(db_session, statement, parameters)
+        assert not scans, f"full scan in hot query:\n{statement}\nplan: {scans}"
+
+
+@pytest.fixture
+def node_service(db_session: Session):
+    if db_session.get_bind().dialect.name not in ("sqlite", "postgresql"):
+        pytest.skip("query plan assertions are written for SQLite and PostgreSQL")
+    return NodeService(db_session)
+
+
+@pytest.fixture
+def tree(db_session: Session):
+    """A curriculum with a root, three children and node-to-node links between them."""
+    curriculum = Curriculum(title="Plan Curriculum")
+    db_session.add(curriculum)
+    db_session.flush()
+    root = Node(curriculum_id=curriculum.curriculum_id, title="Root", order_index=0)
+    db_session.add(root)
+    db_session.flush()
+    children = [
+        Node(curriculum_id=curriculum.curriculum_id, parent_node_id=root.node_id, title=f"Child {i}", order_index=i)
+        for i in range(3)
+    ]
+    db_session.add_all(children)
+    db_session.flush()
+    db_session.add_all([
+        NodeLink(node_id=children[1].node_id, link_type="NODE", linked_node_id=children[0].node_id, link_relationship="DEPENDS_ON"),
+        NodeLink(node_id=children[2].node_id, link_type="NODE", linked_node_id=children[1].node_id, link_relationship="DEPENDS_ON"),
+    ])
+    db_session.commit()
+    return curriculum, root, children
+
+
+def test_create_node_sibling_lookup_uses_index(node_service: NodeService, db_session: Session, tree):
+    curriculum, root, _ = tree
+    with _captured_statements(db_session) as captured:
+        node_service.create_node(NodeCreate(title="Child 3", parent_node_id=root.node_id), UUID(curriculum.curriculum_id))
+    _assert_indexed(db_session, captured)
+
+
+def test_curriculum_listings_use_index(node_service: NodeService, db_session: Session, tree):
+    curriculum, _, _ = tree
+    with _captured_statements(db_session) as captured:
+        node_service.get_nodes_by_curriculum(UUID(curriculum.curriculum_id))
+        page = node_service.get_nodes_page(UUID(curriculum.curriculum_id), limit=2)
+        node_service.get_nodes_page(UUID(curriculum.curriculum_id), limit=2, cursor=page["next_cursor"])
+    _assert_indexed(db_session, captured)
+
+
+def test_reorder_nodes_uses_index(node_service: NodeService, db_session: Session, tree):
+    curriculum, root, children = tree
+    with _captured_statements(db_session) as captured:
+        node_service.reorder_nodes(UUID(curriculum.curriculum_id), UUID(children[2].node_id), None, 0)
+    _assert_indexed(db_session, captured)
+
+
+def test_delete_node_descendant_walk_uses_index(node_service: NodeService, db_session: Session, tree):
+    _, root, _ = tree
+    with _captured_statements(db_session) as captured:
+        node_service.delete_node(root.node_id)
+    _assert_indexed(db_session, captured)
+
+
+def test_node_link_lookups_use_index(node_service: NodeService, db_session: Session, tree):
+    _, _, children = tree
+    with _captured_statements(db_session) as captured:
+        node_service.get_node_links(UUID(children[1].node_id))
+        node_service.get_node_to_node_links(UUID(children[1].node_id))
+        node_service.get_pdf_links(UUID(children[1].node_id))
+        # Incoming node-to-node links (dependents)
+        db_session.query(NodeLink).filter(NodeLink.linked_node_id == children[0].node_id).all()
+    _assert_indexed(db_session, captured)
@@ -4,7 +4,7 @@ RAG Service 통합 테스트
 
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.services.rag.rag_service import RAGService
 from backend.app.services.rag.vector_store import MockVectorStore, SearchResult
@@ -14,11 +14,10 @@ from backend.app.services.rag.embedding_service import MockEmbeddingService
 @pytest.fixture
 def mock_db():
     """Mock 데이터베이스 세션"""
-    db = Mock(spec=Session)
+    db = Mock(spec=AsyncSession)
     db.add = Mock()
-    db.commit = Mock()
-    db.rollback = Mock()
-    db.query = Mock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
     return db
 
 
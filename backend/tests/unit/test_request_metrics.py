@@ -0,0 +1,95 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.app.middleware.request_metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    RequestMetrics,
+    RequestMetricsMiddleware,
+    render_prometheus,
+)
+from backend.tests.benchmarks.middleware_benchmark import format_table, run_variants
+
+
+@pytest.fixture
+def metrics() -> RequestMetrics:
+    return RequestMetrics()
+
+
+@pytest.fixture
+def app(metrics: RequestMetrics) -> FastAPI:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"item_id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+    return app
+
+
+def test_requests_are_recorded_per_route_template(app, metrics):
+    client = TestClient(app, raise_server_exceptions=False)
+    for item_id in (1, 2, 3):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    client.get("/items/nope")
+    client.get("/missing")
+    client.get("/boom")
+
+    routes = metrics.snapshot()
+    items = routes[("GET", "/items/{item_id}")]
+    assert items.statuses == {200: 3, 422: 1}
+    assert items.queries.count == 4 and items.queries.sum == 6
+    assert items.response_size.sum == 3 * len('{"item_id":1}') + len(client.get("/items/nope").content)
+    assert routes[("GET", "UNMATCHED")].statuses == {404: 1}
+    assert routes[("GET", "/boom")].statuses == {500: 1}
+    assert metrics.in_flight == 0
+
+    exposition = render_prometheus(metrics)
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 5' in exposition
+    assert 'http_request_db_queries_bucket{method="GET",route="/items/{item_id}",le="2"} 5' in exposition
+    assert 'http_responses_total{method="GET",route="/items/{item_id}",status="422"} 2' in exposition
+
+
+def test_batches_fold_into_the_same_buckets(metrics):
+    for seconds in (0.0005, 0.001, 0.003, 7.0):
+        metrics.observe(("GET", "/x"), 200, seconds, 100, 1)
+    metrics.snapshot()
+    metrics.observe(("GET", "/x"), 200, 0.001, 100, 1)
+    stats = metrics.snapshot()[("GET", "/x")]
+
+    # Upper bounds are inclusive; 7s only lands in +Inf
+    assert stats.duration.counts[:3] == [3, 1, 0]
+    assert stats.duration.counts[-1] == 1
+    assert stats.duration.count == 5
+
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.get("/api/v1/curriculums/")
+    client.get("/metrics")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+    assert 'route="/api/v1/curriculums/"' in response.text
+    # Scrapes are labelled by their own route, not counted as UNMATCHED
+    assert 'http_responses_total{method="GET",route="/metrics",status="200"}' in response.text
+    assert "http_requests_in_flight 1" in response.text
+
+
+def test_overhead_benchmark_runs():
+    runs = {run.variant: run for run in run_variants(requests=200, rounds=1)}
+
+    assert set(runs) == {"none", "base_http", "metrics"}
+    assert runs["none"].overhead_us == 0
+    assert "metrics" in format_table(list(runs.values()))
@@ -0,0 +1,125 @@
+import pytest
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from backend.app.models.curriculum import Curriculum
+from backend.app.schemas.node import NodeCreate, NodeUpdate, NodeContentCreate, NodeContentUpdate
+from backend.app.services.node_service import NodeService
+from backend.app.services import search_service as search_module
+from backend.app.services.search_service import SearchService
+
+
+@pytest.fixture
+def node_service(db_session: Session):
+    return NodeService(db_session)
+
+
+@pytest.fixture
+def search_service(db_session: Session):
+    return SearchService(db_session)
+
+
+@pytest.fixture
+def curriculum(db_session: Session):
+    curriculum = Curriculum(title="Calculus")
+    db_session.add(curriculum)
+    db_session.commit()
+    return curriculum
+
+
+def _create_node(node_service: NodeService, curriculum, title: str, content: str = None, node_type: str = "CONTENT"):
+    node = node_service.create_node(NodeCreate(title=title, node_type=node_type), UUID(curriculum.curriculum_id))
+    if content is not None:
+        node_service.create_node_content(node.node_id, NodeContentCreate(node_id=node.node_id, markdown_content=content))
+    return node
+
+
+def _hit_ids(page) -> list:
+    return [hit["node_id"] for hit in page["results"]]
+
+
+def test_search_matches_title_and_content_with_highlights(node_service, search_service, curriculum):
+    limits = _create_node(node_service, curriculum, "Limits", "Epsilon-delta definition of a limit")
+    derivative = _create_node(node_service, curriculum, "Derivatives", "The derivative is a limit of difference quotients")
+
+    page = search_service.search_nodes("limit")
+
+    # Title match ranks above a body-only match
+    assert _hit_ids(page) == [limits.node_id, derivative.node_id]
+    assert page["results"][0]["title_highlight"] == "<mark>Limits</mark>"
+    assert "<mark>limit</mark>" in page["results"][1]["snippet"]
+    assert page["has_more"] is False
+
+
+def test_highlights_escape_node_markup(node_service, search_service, curriculum):
+    _create_node(
+        node_service, curriculum, "<script>alert(1)</script> Limits",
+        'Limits of <img src=x onerror="alert(1)"> & friends',
+    )
+
+    hit, = search_service.search_nodes("limits")["results"]
+
+    assert hit["title_highlight"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Limits</mark>"
+    assert hit["snippet"] == "<mark>Limits</mark> of &lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; friends"
+
+
+def test_search_prefix_matches_korean_terms(node_service, search_service, curriculum):
+    node = _create_node(node_service, curriculum, "미분", "미분계수와 도함수의 정의")
+
+    assert _hit_ids(search_service.search_nodes("도함수")) == [node.node_id]
+    assert _hit_ids(search_service.search_nodes("미분")) == [node.node_id]
+
+
+def test_search_index_follows_writes(node_service, search_service, curriculum):
+    node = _create_node(node_service, curriculum, "Sequences", "Convergent sequences")
+
+    node_service.update_node(node.node_id, NodeUpdate(title="Series"))
+    node_service.update_node_content(node.node_id, NodeContentUpdate(markdown_content="Geometric series"))
+    assert _hit_ids(search_service.search_nodes("sequences")) == []
+    assert _hit_ids(search_service.search_nodes("geometric series")) == [node.node_id]
+
+    node_service.delete_node(node.node_id)
+    assert _hit_ids(search_service.search_nodes("series")) == []
+
+    node_service.restore_node(node.node_id)
+    assert _hit_ids(search_service.search_nodes("series")) == [node.node_id]
+
+
+def test_search_scoped_by_curriculum_and_type(node_service, search_service, curriculum, db_session: Session):
+    other = Curriculum(title="Other")
+    db_session.add(other)
+    db_session.commit()
+    chapter = _create_node(node_service, curriculum, "Integration chapter", node_type="CHAPTER")
+    topic = _create_node(node_service, curriculum, "Integration by parts", node_type="TOPIC")
+    _create_node(node_service, other, "Integration elsewhere")
+
+    assert set(_hit_ids(search_service.search_nodes("integration", curriculum_id=curriculum.curriculum_id))) == {
+        chapter.node_id, topic.node_id
+    }
+    assert _hit_ids(search_service.search_nodes("integration", curriculum_id=curriculum.curriculum_id, node_type="TOPIC")) == [topic.node_id]
+
+
+def test_search_paginates(node_service, search_service, curriculum):
+    for i in range(5):
+        _create_node(node_service, curriculum, f"Vector space {i}")
+
+    first = search_service.search_nodes("vector", curriculum_id=curriculum.curriculum_id, limit=3)
+    second = search_service.search_nodes("vector", curriculum_id=curriculum.curriculum_id, limit=3, offset=3)
+
+    assert len(first["results"]) == 3 and first["has_more"] is True
+    assert len(second["results"]) == 2 and second["has_more"] is False
+    assert not set(_hit_ids(first)) & set(_hit_ids(second))
+
+
+def test_search_rejects_query_without_terms(search_service):
+    with pytest.raises(ValueError):
+        search_service.search_nodes('"*"')
+
+
+def test_search_endpoint_reports_unsupported_databases(client, monkeypatch):
+    monkeypatch.setattr(search_module, "is_search_supported", lambda dialect: False)
+
+    response = client.get("/api/v1/search/nodes", params={"q": "limits"})
+
+    assert response.status_code == 501
+    assert response.json()["detail"] == "Full-text search is not supported on 'sqlite' databases."
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, UTC, timedelta
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.user import User
+from backend.app.models.user_session import UserSession
+from backend.app.services.session_sweeper import SessionSweeper
+
+
+def _session(user: User, expires_in: timedelta, revoked: bool = False) -> UserSession:
+    now = datetime.now(UTC)
+    return UserSession(
+        user_id=user.user_id,
+        refresh_token_hash=uuid.uuid4().hex,
+        expires_at=now + expires_in,
+        revoked_at=now if revoked else None,
+    )
+
+
+def test_sweep_deletes_expired_sessions_in_batches(db_session: Session):
+    user = User(email="sweep@example.com", name="Sweep", role="user", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    expired = [_session(user, timedelta(days=-d), revoked=d % 2 == 0) for d in range(1, 6)]
+    rotated = _session(user, timedelta(days=3), revoked=True)  # Kept for reuse detection
+    active = _session(user, timedelta(days=7))
+    db_session.add_all(expired + [rotated, active])
+    db_session.commit()
+    user_id, kept = user.user_id, {rotated.session_id, active.session_id}
+
+    sweeper = SessionSweeper(lambda: db_session, batch_size=2)
+    assert sweeper.sweep() == 5
+    remaining = {s.session_id for s in db_session.query(UserSession).filter(UserSession.user_id == user_id)}
+    assert remaining == kept
+    assert sweeper.sweep() == 0
+
+
+def test_sweep_stops_after_max_batches(db_session: Session):
+    user = User(email="backlog@example.com", name="Backlog", role="user", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    db_session.add_all([_session(user, timedelta(hours=-h)) for h in range(1, 8)])
+    db_session.commit()
+
+    sweeper = SessionSweeper(lambda: db_session, batch_size=2, max_batches=2)
+    assert sweeper.sweep() == 4
+    assert sweeper.sweep() == 3
@@ -0,0 +1,35 @@
+import pytest
+
+from backend.tests.benchmarks.sync_benchmark import SyncBenchmark, format_table
+
+
+@pytest.mark.asyncio
+async def test_sync_api_budget_for_small_curriculum():
+    benchmark = SyncBenchmark(100)
+    try:
+        runs = {run.scenario: run for run in await benchmark.run()}
+    finally:
+        benchmark.close()
+
+    # One create per node plus the start token and a single folder listing
+    assert runs["initial"].api_calls == 102
+    assert runs["initial"].result_counts["synced_count"] == 100
+    assert runs["noop"].api_calls == 1
+    # 10 edited nodes: one changes.list, then one write or read per node
+    assert runs["local_edit"].api_calls == runs["remote_edit"].api_calls == 11
+    assert runs["remote_edit"].result_counts["updated_count"] == 10
+    assert "noop" in format_table(list(runs.values()))
+
+
+@pytest.mark.asyncio
+async def test_sync_completes_through_quota_errors_and_small_pages():
+    benchmark = SyncBenchmark(60, quota_error_rate=0.1, page_size=7, seed=1)
+    try:
+        runs = await benchmark.run(("initial", "remote_edit"))
+    finally:
+        benchmark.close()
+
+    assert sum(run.quota_errors for run in runs) > 0
+    assert all(run.result_counts["error_count"] == 0 for run in runs)
+    assert runs[0].result_counts["synced_count"] == 60
+    assert runs[1].result_counts["updated_count"] == 6
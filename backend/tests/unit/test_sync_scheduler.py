@@ -0,0 +1,315 @@
+import asyncio
+import pytest
+from datetime import datetime, UTC, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.models.curriculum import Curriculum
+from backend.app.models.node import Node
+from backend.app.models.sync_job import SchedulerLease, SyncHistory, SyncJob
+from backend.app.models.sync_metadata import CurriculumDriveFolder
+from backend.app.schemas.node import NodeCreate, NodeUpdate
+from backend.app.services.node_service import NodeService
+from backend.app.services.sync_job_store import SyncJobStore
+from backend.app.services.sync_scheduler import LEASE_NAME, SyncScheduler
+from backend.app.services.sync_service import SyncException
+
+
+class FakeSyncService:
+    """Records calls; each curriculum takes ``durations[cid]`` seconds and fails ``failures[cid]`` times first."""
+
+    def __init__(self, durations=None, failures=None):
+        self.durations = durations or {}
+        self.failures = dict(failures or {})
+        self.attempts = []
+        self.directions = []
+        self.finished = []
+        self.running = 0
+        self.max_running = 0
+
+    async def sync_curriculum(self, curriculum_id, direction="bidirectional"):
+        self.attempts.append(curriculum_id)
+        self.directions.append(direction)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.durations.get(curriculum_id, 0))
+            failure = self.failures.get(curriculum_id)
+            if failure:
+                self.failures[curriculum_id] = failure[1:]
+                raise failure[0]
+        finally:
+            self.running -= 1
+        self.finished.append(curriculum_id)
+        return {"status": "completed", "synced_count": 0, "errors": []}
+
+
+def _scheduler(db_session: Session, fake: FakeSyncService, **kwargs) -> SyncScheduler:
+    return SyncScheduler(
+        session_factory=lambda: db_session,
+        sync_service_factory=lambda _: fake,
+        retry_delay_seconds=0.001,
+        **kwargs,
+    )
+
+
+def _curriculums(db_session: Session, last_syncs):
+    ids = []
+    for i, last_sync in enumerate(last_syncs):
+        curriculum = Curriculum(title=f"Curriculum {i}")
+        db_session.add(curriculum)
+        db_session.flush()
+        db_session.add(CurriculumDriveFolder(
+            curriculum_id=curriculum.curriculum_id,
+            google_drive_folder_id=f"folder-{i}",
+            last_sync_at=last_sync,
+        ))
+        ids.append(curriculum.curriculum_id)
+    db_session.commit()
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_round_runs_syncs_concurrently_up_to_limit(db_session: Session):
+    ids = _curriculums(db_session, [None] * 6)
+    slow = ids[0]
+    fake = FakeSyncService(durations={cid: 0.01 for cid in ids} | {slow: 0.2})
+    scheduler = _scheduler(db_session, fake, max_concurrent_syncs=2)
+
+    started = await scheduler._sync_all_curriculums()
+    await scheduler.wait_idle()
+
+    assert sorted(started) == sorted(ids)
+    assert fake.max_running == 2
+    # The slow curriculum holds one slot; the other five finish through the second
+    assert fake.finished[-1] == slow
+    assert scheduler.get_duration_stats(slow)["count"] == 1
+    assert scheduler.get_duration_stats(slow)["max_seconds"] >= 0.2
+    assert not scheduler.in_flight
+
+
+@pytest.mark.asyncio
+async def test_curriculums_with_local_changes_go_first(db_session: Session):
+    now = datetime.now(UTC)
+    recent, stale, edited, marked = _curriculums(
+        db_session, [now + timedelta(hours=1), now - timedelta(days=1), now + timedelta(hours=2), now + timedelta(hours=3)]
+    )
+    db_session.add(Node(curriculum_id=edited, title="Edited", order_index=0, updated_at=now + timedelta(hours=4)))
+    db_session.commit()
+    scheduler = _scheduler(db_session, FakeSyncService())
+    scheduler.mark_dirty(marked)
+
+    # Clean curriculums are only due for a Drive poll once remote_poll_minutes have passed
+    assert scheduler._due_curriculums(db_session) == [edited, marked, stale]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_and_paused_curriculums_are_skipped(db_session: Session):
+    running, paused, idle = _curriculums(db_session, [None] * 3)
+    fake = FakeSyncService(durations={running: 0.05})
+    scheduler = _scheduler(db_session, fake)
+    scheduler.pause_sync(paused)
+
+    assert scheduler.sync_curriculum_now(running)["status"] == "scheduled"
+    assert scheduler.sync_curriculum_now(running)["status"] == "already_running"
+    assert await scheduler._sync_all_curriculums() == [idle]
+    await scheduler.wait_idle()
+
+    assert sorted(fake.attempts) == sorted([running, idle])
+
+
+@pytest.mark.asyncio
+async def test_failed_syncs_are_retried_until_they_succeed(db_session: Session):
+    flaky, missing = _curriculums(db_session, [None] * 2)
+    fake = FakeSyncService(failures={
+        flaky: [RuntimeError("quota"), RuntimeError("timeout")],
+        missing: [SyncException("no folder")],
+    })
+    scheduler = _scheduler(db_session, fake, max_retries=3)
+
+    await scheduler._sync_all_curriculums()
+    await scheduler.wait_idle()
+
+    assert fake.attempts.count(flaky) == 3
+    assert scheduler.get_sync_status(flaky)["status"] == "completed"
+    assert scheduler.get_duration_stats(flaky)["failures"] == 2
+    # SyncException means the curriculum cannot be synced at all: no retries
+    assert fake.attempts.count(missing) == 1
+    assert scheduler.get_sync_status(missing)["status"] == "failed"
+    assert scheduler.get_sync_history(missing)["items"][0]["error"] == "no folder"
+    assert missing in scheduler.dirty
+
+
+@pytest.mark.asyncio
+async def test_node_edits_trigger_one_debounced_sync(db_session: Session):
+    mapped, = _curriculums(db_session, [datetime.now(UTC)])
+    unmapped = Curriculum(title="Not on Drive")
+    db_session.add(unmapped)
+    db_session.commit()
+    unmapped_id = unmapped.curriculum_id
+    fake = FakeSyncService()
+    scheduler = _scheduler(db_session, fake, debounce_seconds=0.05)
+    node_service = NodeService(db_session)
+
+    scheduler.start()
+    try:
+        node = node_service.create_node(NodeCreate(title="Draft"), mapped)
+        for title in ("Draft 2", "Draft 3"):
+            await asyncio.sleep(0.01)
+            node_service.update_node(node.node_id, NodeUpdate(title=title))
+        node_service.create_node(NodeCreate(title="Elsewhere"), unmapped_id)
+        assert fake.attempts == []  # still settling
+
+        await asyncio.sleep(0.15)
+        await scheduler.wait_idle()
+    finally:
+        scheduler.stop()
+
+    assert fake.attempts == [mapped]
+    assert mapped not in scheduler.dirty
+
+
+@pytest.mark.asyncio
+async def test_edit_during_sync_triggers_another_sync(db_session: Session):
+    cid, = _curriculums(db_session, [datetime.now(UTC)])
+    fake = FakeSyncService(durations={cid: 0.1})
+    scheduler = _scheduler(db_session, fake, debounce_seconds=0.01)
+    node_service = NodeService(db_session)
+
+    scheduler.start()
+    try:
+        node_service.create_node(NodeCreate(title="First"), cid)
+        await asyncio.sleep(0.05)
+        assert fake.attempts == [cid] and cid in scheduler.in_flight
+
+        node_service.create_node(NodeCreate(title="Second"), cid)
+        await asyncio.sleep(0.25)
+        await scheduler.wait_idle()
+    finally:
+        scheduler.stop()
+
+    assert fake.attempts == [cid, cid]
+
+
+@pytest.mark.asyncio
+async def test_manual_sync_shares_the_per_curriculum_slot(db_session: Session):
+    cid, = _curriculums(db_session, [None])
+    fake = FakeSyncService(durations={cid: 0.05})
+    scheduler = _scheduler(db_session, fake)
+
+    scheduler.sync_curriculum_now(cid)
+    assert (await scheduler.run_manual_sync(cid, direction="up"))["status"] == "already_running"
+    await scheduler.wait_idle()
+
+    result = await scheduler.run_manual_sync(cid, direction="up")
+
+    assert result["status"] == "completed" and cid not in scheduler.in_flight
+    assert fake.directions == ["bidirectional", "up"]
+    assert scheduler.get_sync_status(cid)["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_followers_queue_manual_syncs_for_the_leader(db_session: Session):
+    cid, = _curriculums(db_session, [None])
+    leader = _scheduler(db_session, FakeSyncService(), job_store=SyncJobStore(lambda: db_session, "leader"))
+    follower_fake = FakeSyncService()
+    follower = _scheduler(db_session, follower_fake, job_store=SyncJobStore(lambda: db_session, "follower"))
+    assert leader._renew_lease()
+
+    follower.start()
+    try:
+        result = await follower.run_manual_sync(cid)
+    finally:
+        follower.stop()
+
+    assert result["status"] == "pending" and follower_fake.attempts == []
+    assert await leader._sync_all_curriculums() == [cid]
+    await leader.wait_idle()
+
+
+def test_job_store_flushes_buffered_writes_in_bulk(db_session: Session):
+    store = SyncJobStore(lambda: db_session, worker_id="worker-a")
+    ids = [f"curriculum-{i}" for i in range(3)]
+    store.record_job(ids[0], status="completed")
+    store.flush()
+    for cid in ids:
+        store.record_job(cid, status="in_progress", attempt=1)
+        store.record_job(cid, status="completed")
+        for _ in range(4):
+            store.record_history(cid, {"status": "completed", "synced_count": 2})
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        assert store.flush() == 15
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    # History insert, existing-job lookup, job update and job insert: one statement each
+    assert len(statements) == 4
+    assert store.pending_writes == 0
+    assert db_session.query(SyncHistory).count() == 12
+    assert {job.status for job in db_session.query(SyncJob)} == {"completed"}
+    with pytest.raises(ValueError):
+        store.record_job(ids[0], result={})
+
+
+def test_history_is_paged_newest_first(db_session: Session):
+    store = SyncJobStore(lambda: db_session)
+    start = datetime(2026, 1, 1)
+    db_session.add_all([
+        SyncHistory(curriculum_id="c1", status="completed", synced_count=i, created_at=start + timedelta(minutes=i))
+        for i in range(5)
+    ] + [SyncHistory(curriculum_id="c2", status="completed", created_at=start)])
+    db_session.commit()
+
+    first = store.history_page("c1", limit=2)
+    second = store.history_page("c1", limit=2, cursor=first["next_cursor"])
+    last = store.history_page("c1", limit=2, cursor=second["next_cursor"])
+
+    assert [entry["synced_count"] for entry in first["items"] + second["items"] + last["items"]] == [4, 3, 2, 1, 0]
+    assert last["next_cursor"] is None
+    with pytest.raises(ValueError):
+        store.history_page("c1", cursor="not-a-cursor")
+
+
+def test_only_one_worker_holds_the_scheduler_lease(db_session: Session):
+    a = SyncJobStore(lambda: db_session, worker_id="worker-a")
+    b = SyncJobStore(lambda: db_session, worker_id="worker-b")
+
+    assert a.acquire_lease(LEASE_NAME, 60)
+    assert not b.acquire_lease(LEASE_NAME, 60)
+    assert a.acquire_lease(LEASE_NAME, 60)  # renewal
+
+    # A crashed leader's lease lapses and another worker takes over
+    db_session.get(SchedulerLease, LEASE_NAME).expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    db_session.commit()
+    assert b.acquire_lease(LEASE_NAME, 60)
+    assert not a.acquire_lease(LEASE_NAME, 60)
+
+    b.release_lease(LEASE_NAME)
+    assert a.acquire_lease(LEASE_NAME, 60)
+
+
+@pytest.mark.asyncio
+async def test_followers_leave_syncs_to_the_leader(db_session: Session):
+    now = datetime.now(UTC)
+    stale, edited = _curriculums(db_session, [now - timedelta(days=1), now])
+    leader_fake, follower_fake = FakeSyncService(), FakeSyncService()
+    leader = _scheduler(db_session, leader_fake, job_store=SyncJobStore(lambda: db_session, "leader"))
+    follower = _scheduler(db_session, follower_fake, job_store=SyncJobStore(lambda: db_session, "follower"))
+    assert leader._renew_lease()
+
+    # A follower runs no rounds; its debounced edits become pending jobs
+    assert await follower._sync_all_curriculums() == []
+    follower._debounce_elapsed(edited)
+    assert follower_fake.attempts == []
+
+    assert await leader._sync_all_curriculums() == [edited, stale]
+    await leader.wait_idle()
+    leader.stop()  # writes the buffered job state and hands over the lease
+
+    assert follower.get_sync_status(edited)["status"] == "completed"
+    assert follower.get_sync_status(edited)["worker_id"] == "leader"
+    assert follower._renew_lease()
@@ -75,111 +75,6 @@ class TestSyncServiceInitialization:
         assert service.conflict_strategy == ConflictResolutionStrategy.DRIVE_WINS
 
 
-class TestSyncUpOperation:
-    """Test sync up (local → Drive) operations"""
-
-    @pytest.mark.asyncio
-    async def test_sync_up_modified_node(self, sync_service, mock_db, mock_drive_service):
-        """Test syncing a modified node up to Drive"""
-        curriculum_id = "550e8400-e29b-41d4-a716-446655440000"
-        folder_id = "drive-folder-123"
-
-        # Create mock node
-        node = Mock(spec=Node)
-        node.node_id = "node-123"
-        node.curriculum_id = curriculum_id
-        node.title = "Updated Node"
-        node.updated_at = datetime.now(UTC)
-        node.node_content = Mock()
-        node.node_content.markdown_content = "# Updated"
-        node.children = []
-
-        # Create mock sync metadata (not synced)
-        sync_meta = Mock(spec=SyncMetadata)
-        sync_meta.node_id = "node-123"
-        sync_meta.google_drive_file_id = "drive-file-123"
-        sync_meta.is_synced = False
-        sync_meta.last_local_modified = datetime.now(UTC)
-        sync_meta.last_drive_modified = datetime.now(UTC)
-        sync_meta.last_sync_time = datetime.now(UTC)
-
-        # Mock database queries
-        mock_query_nodes = Mock()
-        mock_query_nodes.all.return_value = [node]
-        mock_query_sync = Mock()
-        mock_query_sync.first.return_value = sync_meta
-
-        def mock_db_query(model):
-            if model == Node:
-                return Mock(filter=Mock(return_value=mock_query_nodes))
-            elif model == SyncMetadata:
-                return Mock(filter=Mock(return_value=mock_query_sync))
-            return Mock()
-
-        mock_db.query = mock_db_query
-
-        # Mock Drive service
-        mock_drive_service.update_node_on_drive = AsyncMock()
-
-        # Run sync up
-        result = {
-            "synced_nodes": [],
-            "updated_nodes": [],
-            "deleted_nodes": [],
-            "conflicts": [],
-            "errors": [],
-        }
-        await sync_service._sync_up(curriculum_id, folder_id, result)
-
-        # Verify update was called
-        mock_drive_service.update_node_on_drive.assert_called_once()
-
-
-class TestSyncDownOperation:
-    """Test sync down (Drive → local) operations"""
-
-    @pytest.mark.asyncio
-    async def test_sync_down_new_file(self, sync_service, mock_db, mock_drive_service):
-        """Test syncing a new file from Drive"""
-        curriculum_id = "550e8400-e29b-41d4-a716-446655440000"
-        folder_id = "drive-folder-123"
-
-        # Mock Drive files
-        drive_files = [
-            {
-                "id": "drive-file-123",
-                "name": "node_550e8400-e29b-41d4-a716-446655440001.json",
-                "modifiedTime": datetime.now(UTC).isoformat(),
-            }
-        ]
-
-        # Mock database queries
-        mock_db.query(SyncMetadata).filter().all.return_value = []  # No local files
-        mock_db.query(SyncMetadata).filter().first.return_value = None  # New file
-
-        # Mock Drive service
-        mock_drive_service.list_nodes_on_drive.return_value = drive_files
-        mock_drive_service.load_node_from_drive.return_value = {
-            "id": "550e8400-e29b-41d4-a716-446655440001",
-            "title": "New Node from Drive",
-            "content": "# New Content",
-            "modified_at": datetime.now(UTC).isoformat(),
-        }
-
-        # Run sync down
-        result = {
-            "synced_nodes": [],
-            "updated_nodes": [],
-            "deleted_nodes": [],
-            "conflicts": [],
-            "errors": [],
-        }
-        await sync_service._sync_down(curriculum_id, folder_id, result)
-
-        # Verify load was called
-        mock_drive_service.load_node_from_drive.assert_called_once_with("drive-file-123")
-
-
 class TestConflictResolution:
     """Test conflict resolution strategies"""
 
@@ -0,0 +1,2 @@
+# Query budget marker and --query-audit (see backend/tests/query_audit_plugin.py)
+pytest_plugins = ["backend.tests.query_audit_plugin"]